@@ -0,0 +1,25 @@
+"""Add keyset pagination indexes to executionhistory table
+
+Revision ID: add_executionhistory_keyset_idx
+Revises: add_global_enabled_mcp
+Create Date: 2025-09-01 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_executionhistory_keyset_idx'
+down_revision = 'add_global_enabled_mcp'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """Add (group_id, created_at, id) and (created_at, id) indexes to executionhistory table"""
+    op.create_index('ix_executionhistory_group_created_id', 'executionhistory', ['group_id', 'created_at', 'id'])
+    op.create_index('ix_executionhistory_created_id', 'executionhistory', ['created_at', 'id'])
+
+def downgrade():
+    """Remove keyset pagination indexes from executionhistory table"""
+    op.drop_index('ix_executionhistory_created_id', table_name='executionhistory')
+    op.drop_index('ix_executionhistory_group_created_id', table_name='executionhistory')
@@ -0,0 +1,30 @@
+"""Add compressed payload columns to executionhistory and execution_trace tables
+
+Revision ID: add_execution_payload_columns
+Revises: add_executionhistory_keyset_idx
+Create Date: 2025-09-08 10:00:00.000000
+
+Existing rows keep their inline JSON. With PAYLOAD_COMPRESSION_ENABLED set,
+run repack_payloads.py to move their large payloads to the new columns. Before
+downgrading, run it with PAYLOAD_COMPRESSION_ENABLED unset to put the full
+payloads back inline.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_execution_payload_columns'
+down_revision = 'add_executionhistory_keyset_idx'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """Add payload columns to executionhistory and execution_trace tables"""
+    op.add_column('executionhistory', sa.Column('payload', sa.LargeBinary(), nullable=True))
+    op.add_column('execution_trace', sa.Column('payload', sa.LargeBinary(), nullable=True))
+
+def downgrade():
+    """Remove payload columns from executionhistory and execution_trace tables"""
+    op.drop_column('execution_trace', 'payload')
+    op.drop_column('executionhistory', 'payload')
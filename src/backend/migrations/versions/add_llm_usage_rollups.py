@@ -0,0 +1,52 @@
+"""Add llm_usage_rollups table with hourly and daily LLM usage totals
+
+Revision ID: add_llm_usage_rollups
+Revises: add_execution_payload_columns
+Create Date: 2025-09-15 10:00:00.000000
+
+The table is filled as new usage records are written. Usage recorded before
+this migration is not rolled up.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_llm_usage_rollups'
+down_revision = 'add_execution_payload_columns'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """Create the llm_usage_rollups table"""
+    op.create_table(
+        'llm_usage_rollups',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('period_type', sa.String(length=10), nullable=False),
+        sa.Column('period_start', sa.DateTime(), nullable=False),
+        sa.Column('group_id', sa.String(length=100), nullable=False),
+        sa.Column('user_email', sa.String(length=255), nullable=False),
+        sa.Column('model_name', sa.String(), nullable=False),
+        sa.Column('model_provider', sa.String(), nullable=False),
+        sa.Column('prompt_tokens', sa.BigInteger(), nullable=True),
+        sa.Column('completion_tokens', sa.BigInteger(), nullable=True),
+        sa.Column('total_tokens', sa.BigInteger(), nullable=True),
+        sa.Column('cost_usd', sa.Numeric(precision=14, scale=6), nullable=True),
+        sa.Column('request_count', sa.Integer(), nullable=True),
+        sa.Column('error_count', sa.Integer(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'period_type', 'period_start', 'group_id', 'user_email', 'model_name', 'model_provider',
+            name='uq_llm_usage_rollup_key'
+        ),
+    )
+    op.create_index(
+        'idx_rollup_group_period', 'llm_usage_rollups',
+        ['period_type', 'group_id', 'period_start'], unique=False
+    )
+
+def downgrade():
+    """Drop the llm_usage_rollups table"""
+    op.drop_index('idx_rollup_group_period', table_name='llm_usage_rollups')
+    op.drop_table('llm_usage_rollups')
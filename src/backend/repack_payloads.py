@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Script to store existing execution results and traces the way new ones are stored.
+
+With PAYLOAD_COMPRESSION_ENABLED set, large results and trace outputs written
+before compression was enabled are compressed. Without it, compressed payloads
+are put back inline, e.g. before downgrading the add_execution_payload_columns
+migration.
+"""
+import os
+import sys
+import asyncio
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("RepackPayloads")
+
+# Ensure the current directory is in the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+async def run_repack(batch_size: int):
+    """Repack execution results and trace payloads."""
+    from src.config.settings import settings
+    from src.repositories.execution_history_repository import execution_history_repository
+    from src.repositories.execution_trace_repository import execution_trace_repository
+
+    mode = "Compressing" if settings.PAYLOAD_COMPRESSION_ENABLED else "Decompressing"
+    try:
+        logger.info(f"{mode} execution results...")
+        executions = await execution_history_repository.repack_payloads(batch_size)
+        logger.info(f"Updated {executions} executions")
+
+        logger.info(f"{mode} execution traces...")
+        traces = await execution_trace_repository.repack_payloads(batch_size)
+        logger.info(f"Updated {traces} traces")
+    except Exception as e:
+        logger.error(f"Error repacking payloads: {e}")
+        import traceback
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(run_repack(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
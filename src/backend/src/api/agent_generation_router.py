@@ -10,10 +10,12 @@ import logging
 from typing import Dict, Any, List, Optional
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from src.services.agent_generation_service import AgentGenerationService
 from src.core.dependencies import GroupContextDep
+from src.utils.sse import sse_response
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -68,4 +70,34 @@ async def generate_agent(
     except Exception as e:
         # For all other errors
         logger.error(f"Error generating agent: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to generate agent configuration") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to generate agent configuration")
+
+
+@router.post("/generate/stream", response_class=StreamingResponse)
+async def generate_agent_stream(
+    prompt: AgentPrompt,
+    group_context: GroupContextDep
+):
+    """
+    Generate agent configuration, streaming progress as server-sent events.
+    
+    Sends a "field" event for each top-level field as soon as the model has
+    generated it, then an "agent" event with the same configuration as
+    /generate, or an "error" event if generation fails.
+    
+    Args:
+        prompt: Request payload with prompt text, model, and optional tools
+        
+    Returns:
+        StreamingResponse with media type text/event-stream
+    """
+    service = AgentGenerationService.create()
+    return sse_response(
+        service.stream_agent(
+            prompt_text=prompt.prompt,
+            model=prompt.model,
+            tools=prompt.tools,
+            group_context=group_context
+        ),
+        error_detail="Failed to generate agent configuration"
+    )
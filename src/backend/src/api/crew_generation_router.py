@@ -8,10 +8,12 @@ with agents and tasks in the CrewAI ecosystem.
 import logging
 import traceback
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
 from src.schemas.crew import CrewGenerationRequest, CrewGenerationResponse, CrewCreationResponse
 from src.services.crew_generation_service import CrewGenerationService
 from src.core.dependencies import GroupContextDep
+from src.utils.sse import sse_response
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -63,4 +65,24 @@ async def create_crew(
         error_msg = f"Error creating crew: {str(e)}"
         logger.error(error_msg)
         logger.error(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=error_msg) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=error_msg)
+
+
+@router.post("/create-crew/stream", response_class=StreamingResponse)
+async def create_crew_stream(
+    request: CrewGenerationRequest,
+    group_context: GroupContextDep
+):
+    """
+    Generate and create a crew, streaming progress as server-sent events.
+    
+    Sends an "agent" or "task" event for each agent and task as soon as the
+    model has generated it, then a "crew" event with the created agents and
+    tasks, or an "error" event if generation fails.
+    """
+    crew_service = CrewGenerationService.create()
+    logger.info(f"Streaming crew creation from prompt: {request.prompt[:50]}...")
+    return sse_response(
+        crew_service.stream_crew(request, group_context),
+        error_detail="Error creating crew"
+    )
@@ -6,6 +6,8 @@ execution history records and related data.
 """
 
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
 
 from src.core.logger import LoggerManager
@@ -13,6 +15,7 @@ from src.core.dependencies import GroupContextDep
 from src.services.execution_history_service import ExecutionHistoryService, get_execution_history_service
 from src.schemas.execution_history import (
     ExecutionHistoryList,
+    ExecutionHistoryPage,
     ExecutionHistoryItem,
     ExecutionOutputList,
     ExecutionOutputDebugList,
@@ -55,6 +58,41 @@ async def get_execution_history(
             detail=f"Failed to retrieve execution history: {str(e)}"
         )
 
+@router.get("/history/page", response_model=ExecutionHistoryPage)
+async def get_execution_history_page(
+    group_context: GroupContextDep,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    service: ExecutionHistoryService = Depends(get_execution_history_service)
+):
+    """
+    Get a page of execution summaries, newest first, with group filtering.
+    
+    Summaries do not include inputs and result; fetch a single execution for those.
+    
+    Args:
+        limit: Maximum number of executions to return (1-100)
+        cursor: Cursor returned with the previous page, omitted for the first page
+        group_context: Group context for filtering
+        service: ExecutionHistoryService instance
+    
+    Returns:
+        ExecutionHistoryPage with execution summaries and the cursor of the next page
+    """
+    try:
+        return await service.get_execution_history_page(limit, cursor, group_ids=group_context.group_ids)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error getting execution history page: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve execution history: {str(e)}"
+        )
+
 @router.head("/history/{execution_id}")
 async def check_execution_exists(
     execution_id: int,
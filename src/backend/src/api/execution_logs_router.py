@@ -5,7 +5,7 @@ This module provides endpoints for real-time execution log streaming
 and retrieving historical execution logs.
 """
 
-from typing import List, Dict, Annotated
+from typing import Any, List, Dict, Annotated
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Query, Depends
 
 from src.core.logger import LoggerManager
@@ -43,19 +43,26 @@ async def websocket_execution_logs(websocket: WebSocket, execution_id: str):
     This endpoint allows clients to connect via WebSocket and receive
     real-time updates about execution progress. For tenant isolation,
     the tenant context should be passed as a query parameter.
+    
+    Live messages carry a "seq" number. A client that reconnects with
+    ?resume_after=<last seq received> gets only the messages it missed when
+    they are still buffered, otherwise the stored history as on a new connection.
     """
     try:
         # Extract group information from query parameters for WebSocket
         query_params = websocket.query_params
         tenant_email = query_params.get('tenant_email')  # Keep for backward compatibility
+        resume_after = query_params.get('resume_after')
+        resume_after = int(resume_after) if resume_after and resume_after.isdigit() else None
         
         # Create a basic group context from query params
-        # Note: WebSocket doesn't use standard headers, so we get group info from query params
+        # Note: WebSocket doesn't use standard headers, so we get group info from query params.
+        # Group memberships are served from the user context cache.
         from src.utils.user_context import GroupContext
         group_context = await GroupContext.from_email(tenant_email) if tenant_email else GroupContext()
         
         # Connect to the WebSocket with group context
-        await execution_logs_service.connect_with_group(websocket, execution_id, group_context)
+        await execution_logs_service.connect_with_group(websocket, execution_id, group_context, resume_after=resume_after)
         logger.info(f"WebSocket connection established for execution {execution_id} (group: {group_context.primary_group_id})")
         
         # Keep the connection alive until disconnect
@@ -72,6 +79,19 @@ async def websocket_execution_logs(websocket: WebSocket, execution_id: str):
         # Ensure connection is properly cleaned up
         await execution_logs_service.disconnect(websocket, execution_id)
 
+@logs_router.get("/streams/stats", response_model=Dict[str, Any])
+async def get_log_stream_stats(group_context: GroupContextDep):
+    """
+    Get connection and lag metrics of the live execution log streams.
+    
+    Only aggregate counters are returned, no execution IDs.
+    
+    Returns:
+        Dictionary with publish/send/drop/coalesce counters, topic and
+        subscriber counts, pending messages and send delays
+    """
+    return execution_logs_service.hub.get_stats()
+
 @logs_router.get("/executions/{execution_id}", response_model=List[ExecutionLogResponse])
 async def get_execution_logs(
     execution_id: str,
@@ -8,10 +8,12 @@ with proper validation and error handling.
 import logging
 import json
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
 from src.schemas.task_generation import TaskGenerationRequest, TaskGenerationResponse
 from src.services.task_generation_service import TaskGenerationService
 from src.core.dependencies import GroupContextDep
+from src.utils.sse import sse_response
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -61,4 +63,24 @@ async def generate_task(
         # Handle other errors with a 500 response
         error_msg = f"Error generating task: {str(e)}"
         logger.error(error_msg)
-        raise HTTPException(status_code=500, detail=error_msg) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=error_msg)
+
+
+@router.post("/generate-task/stream", response_class=StreamingResponse)
+async def generate_task_stream(
+    request: TaskGenerationRequest,
+    group_context: GroupContextDep
+):
+    """
+    Generate a task, streaming progress as server-sent events.
+    
+    Sends a "field" event for each top-level field as soon as the model has
+    generated it, then a "task" event with the same task as /generate-task,
+    or an "error" event if generation fails.
+    """
+    task_generation_service = TaskGenerationService.create()
+    logger.info(f"Streaming task generation from prompt: {request.text[:50]}...")
+    return sse_response(
+        task_generation_service.stream_task(request, group_context),
+        error_detail="Error generating task"
+    )
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 import os
 from pathlib import Path
 
@@ -89,6 +89,159 @@ class Settings(BaseSettings):
     # Add the following setting to control database seeding
     AUTO_SEED_DATABASE: bool = True
 
+    # Trace writer batching: flush when this many traces are buffered or the
+    # oldest buffered trace has waited this many seconds
+    TRACE_WRITER_BATCH_SIZE: int = 200
+    TRACE_WRITER_FLUSH_INTERVAL: float = 0.5
+
+    # Execution logs writer batching, same semantics as the trace writer
+    LOGS_WRITER_BATCH_SIZE: int = 500
+    LOGS_WRITER_FLUSH_INTERVAL: float = 0.5
+
+    # Capacity of the trace and log event buses and what happens when one is
+    # full: "drop_oldest", "coalesce" (merge into the newest queued entry) or
+    # "backpressure" (block a worker thread that calls put(); the trace and log
+    # callbacks use put_nowait(), which is rejected with queue.Full instead)
+    TRACE_QUEUE_MAX_SIZE: int = 10000
+    TRACE_QUEUE_OVERFLOW_POLICY: Literal["drop_oldest", "coalesce", "backpressure"] = "drop_oldest"
+    LOGS_QUEUE_MAX_SIZE: int = 50000
+    LOGS_QUEUE_OVERFLOW_POLICY: Literal["drop_oldest", "coalesce", "backpressure"] = "coalesce"
+
+    # Live execution logs over WebSocket: messages buffered per client and what
+    # happens when that buffer is full ("drop_oldest" or "coalesce" into the
+    # newest buffered message), messages kept per execution for clients that
+    # resume after a sequence number, seconds an execution's messages are kept
+    # after its last client left, and seconds one send may take before the
+    # client is disconnected
+    LOGS_WS_CLIENT_BUFFER_SIZE: int = 1000
+    LOGS_WS_OVERFLOW_POLICY: Literal["drop_oldest", "coalesce"] = "coalesce"
+    LOGS_WS_REPLAY_BUFFER_SIZE: int = 1000
+    LOGS_WS_RESUME_WINDOW: float = 300.0
+    LOGS_WS_SEND_TIMEOUT: float = 10.0
+
+    # Trace capture: default level of a crew ("full", "summary" or "off", a crew
+    # can override it with trace_level), largest payload kept per trace at the
+    # full and summary levels, payload bytes per execution after which traces are
+    # kept as summaries, and the smallest payload checked for duplicates
+    TRACE_CAPTURE_LEVEL: str = "full"
+    TRACE_EVENT_MAX_BYTES: int = 64 * 1024
+    TRACE_SUMMARY_MAX_BYTES: int = 2048
+    TRACE_EXECUTION_MAX_BYTES: int = 16 * 1024 * 1024
+    TRACE_DEDUP_MIN_BYTES: int = 512
+
+    # Compressed storage of execution results and trace outputs: when enabled,
+    # JSON payloads of at least PAYLOAD_COMPRESSION_MIN_BYTES are stored
+    # compressed (zstd if the zstandard package is installed, zlib otherwise)
+    # and only a preview of PAYLOAD_PREVIEW_CHARS characters is kept inline for
+    # list queries; detail queries load the full payload
+    PAYLOAD_COMPRESSION_ENABLED: bool = False
+    PAYLOAD_COMPRESSION_MIN_BYTES: int = 4096
+    PAYLOAD_PREVIEW_CHARS: int = 500
+
+    # LLM usage metering: tokens and cost of the LiteLLM calls made by an
+    # execution are written to llm_usage_billing and its hourly and daily
+    # rollups, in batches of LLM_USAGE_WRITER_BATCH_SIZE calls at least every
+    # LLM_USAGE_WRITER_FLUSH_INTERVAL seconds. At most LLM_USAGE_QUEUE_MAX_SIZE
+    # calls wait to be written; beyond that consecutive calls of the same
+    # execution and model are merged into one record, and other calls wait
+    # for room. Calls that still find no room are counted as lost
+    LLM_USAGE_METERING_ENABLED: bool = True
+    LLM_USAGE_WRITER_BATCH_SIZE: int = 200
+    LLM_USAGE_WRITER_FLUSH_INTERVAL: float = 5.0
+    LLM_USAGE_QUEUE_MAX_SIZE: int = 10000
+
+    # LLM interaction logs (llmlog) of the generation and dispatcher services
+    # are queued and written by a background writer in batches of
+    # LLM_LOG_WRITER_BATCH_SIZE logs at least every LLM_LOG_WRITER_FLUSH_INTERVAL
+    # seconds. At most LLM_LOG_QUEUE_MAX_SIZE logs wait to be written, the oldest
+    # are dropped beyond that. Prompts and responses longer than
+    # LLM_LOG_MAX_TEXT_CHARS characters are truncated, 0 keeps them whole.
+    # With the writer disabled every log is written before the request continues
+    LLM_LOG_WRITER_ENABLED: bool = True
+    LLM_LOG_WRITER_BATCH_SIZE: int = 100
+    LLM_LOG_WRITER_FLUSH_INTERVAL: float = 2.0
+    LLM_LOG_QUEUE_MAX_SIZE: int = 5000
+    LLM_LOG_MAX_TEXT_CHARS: int = 0
+
+    # Seconds resolved LLM configurations are cached by LLMManager, 0 disables the cache
+    LLM_CONFIG_CACHE_TTL: int = 300
+    # Seconds the tool catalog and decrypted API keys are cached for ToolFactory,
+    # 0 disables the cache
+    TOOL_CATALOG_CACHE_TTL: float = 300.0
+    # Seconds decrypted secrets are kept by EncryptionUtils.decrypt_value, keyed
+    # by their ciphertext (0 disables the cache), and the most values kept
+    SECRET_CACHE_TTL: float = 300.0
+    SECRET_CACHE_MAX_SIZE: int = 1024
+    # Seconds the total shown with the paginated execution history is cached per
+    # set of groups, 0 counts on every request
+    EXECUTION_HISTORY_COUNT_CACHE_TTL: float = 30.0
+    # Seconds prompt template contents are cached for the generation services
+    # (0 disables the cache), and whether all templates are loaded into the
+    # cache at startup once the seeders have run
+    PROMPT_TEMPLATE_CACHE_TTL: float = 300.0
+    PROMPT_TEMPLATE_CACHE_PREWARM: bool = True
+
+    # Request context caching in user_context_middleware: group memberships and the
+    # Databricks Apps flag are cached for this many seconds (0 disables the cache)
+    USER_CONTEXT_CACHE_TTL: float = 30.0
+    USER_CONTEXT_CACHE_MAX_SIZE: int = 1024
+    # Path prefixes served without resolving user or group context
+    USER_CONTEXT_SKIP_PATHS: List[str] = ["/static/", "/favicon.ico", "/manifest.json", "/health"]
+
+    # Background event loop used by synchronous CrewAI memory calls: seconds to
+    # wait for a call
+    BACKGROUND_LOOP_CALL_TIMEOUT: float = 120.0
+    # Pooled engine created per event loop for status updates, the background
+    # loop and other database work done outside the request loop
+    LOOP_ENGINE_POOL_SIZE: int = 5
+    LOOP_ENGINE_MAX_OVERFLOW: int = 5
+
+    # Pooled Databricks REST sessions: connections per session and seconds idle
+    # connections are kept alive
+    DATABRICKS_HTTP_CONNECTION_LIMIT: int = 20
+    DATABRICKS_HTTP_KEEPALIVE_TIMEOUT: float = 60.0
+    # Seconds a resolved Databricks PAT is cached (0 disables the cache); it is
+    # refreshed this many seconds before the cache entry expires
+    DATABRICKS_AUTH_TOKEN_CACHE_TTL: float = 300.0
+    DATABRICKS_AUTH_TOKEN_REFRESH_MARGIN: float = 30.0
+    # Polling of long-running Databricks operations (Genie messages, SQL
+    # statements): first delay in seconds, upper bound of the exponential
+    # backoff, growth factor and the +/- fraction of random jitter
+    DATABRICKS_POLL_INITIAL_DELAY: float = 0.5
+    DATABRICKS_POLL_MAX_DELAY: float = 10.0
+    DATABRICKS_POLL_BACKOFF_MULTIPLIER: float = 2.0
+    DATABRICKS_POLL_JITTER: float = 0.2
+    # Databricks embeddings: concurrent requests are coalesced for this many
+    # seconds into batches of at most EMBEDDING_MAX_BATCH_SIZE texts, and vectors
+    # are kept in an LRU cache keyed by content hash, persisted to
+    # EMBEDDING_CACHE_PATH (an SQLite file) when set. One batch queue is kept per
+    # endpoint and credentials, the least recently used beyond
+    # EMBEDDING_MAX_BATCHERS are dropped
+    EMBEDDING_BATCH_WINDOW: float = 0.01
+    EMBEDDING_MAX_BATCH_SIZE: int = 64
+    EMBEDDING_MAX_BATCHERS: int = 256
+    EMBEDDING_REQUEST_TIMEOUT: float = 30.0
+    EMBEDDING_CACHE_MAX_SIZE: int = 10000
+    EMBEDDING_CACHE_PATH: Optional[str] = None
+
+    # Persistent MCP sessions used when a tool cannot run on the caller's loop:
+    # concurrent calls per server, seconds to wait for a call and to connect,
+    # seconds between session pings and before an idle session is closed
+    MCP_WORKER_MAX_CONCURRENCY: int = 4
+    MCP_WORKER_CALL_TIMEOUT: float = 120.0
+    MCP_WORKER_CONNECT_TIMEOUT: float = 30.0
+    MCP_WORKER_HEALTH_CHECK_INTERVAL: float = 30.0
+    MCP_WORKER_IDLE_TIMEOUT: float = 600.0
+
+    # Scheduler: scheduled runs executing at once, what happens when a schedule
+    # fires while its previous run is still going ("skip" the new run, "queue"
+    # it behind the running one, or "allow" both), and seconds between reloads
+    # of the schedule times from the database to pick up changes made by other
+    # workers
+    SCHEDULER_MAX_CONCURRENT_RUNS: int = 4
+    SCHEDULER_OVERLAP_POLICY: Literal["skip", "queue", "allow"] = "skip"
+    SCHEDULER_RESYNC_INTERVAL: float = 300.0
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,111 @@
+"""
+Cache of resolved LLM configurations.
+
+LLMManager resolves model parameters from the model config, the provider API
+keys and the Databricks configuration, which costs several database round
+trips per call. Resolved parameters are cached here per model and group for a
+limited time. The services that own those inputs call
+invalidate_llm_config_cache() whenever they change.
+
+This module deliberately has no dependencies on litellm or CrewAI so that the
+services can import it without pulling in LLMManager.
+"""
+import copy
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from src.config.settings import settings
+from src.utils.user_context import UserContext
+
+logger = logging.getLogger(__name__)
+
+# (kind, model, group_id)
+CacheKey = Tuple[str, str, Optional[str]]
+
+
+class LLMConfigCache:
+    """TTL cache of resolved LLM parameters keyed by kind, model and group."""
+
+    def __init__(self, ttl: Optional[float] = None):
+        self._ttl = ttl
+        self._entries: Dict[CacheKey, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def ttl(self) -> float:
+        """Entry lifetime in seconds, 0 disables the cache."""
+        return settings.LLM_CONFIG_CACHE_TTL if self._ttl is None else self._ttl
+
+    @staticmethod
+    def make_key(kind: str, model: str) -> CacheKey:
+        """Build a cache key for the current group context."""
+        group_context = UserContext.get_group_context()
+        group_id = group_context.primary_group_id if group_context else None
+        return (kind, model, group_id)
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Returns:
+            A deep copy of the cached value, or None if missing or expired
+        """
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            value = entry[1]
+        return copy.deepcopy(value)
+
+    def set(self, key: CacheKey, value: Any) -> None:
+        """Store a copy of a resolved value."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+
+    def invalidate(self, model: Optional[str] = None) -> None:
+        """
+        Drop cached entries.
+
+        Args:
+            model: Only drop entries for this model, or None to drop everything
+        """
+        with self._lock:
+            if model is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[1] == model]:
+                    del self._entries[key]
+            self._stats["invalidations"] += 1
+        logger.debug(f"[LLMConfigCache] Invalidated {'all models' if model is None else model}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/invalidation counters and the number of cached entries."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        return stats
+
+
+# Create a singleton instance
+llm_config_cache = LLMConfigCache()
+
+
+def invalidate_llm_config_cache(model: Optional[str] = None) -> None:
+    """
+    Invalidate resolved LLM configurations.
+
+    Args:
+        model: Only invalidate this model, or None to invalidate all models
+    """
+    llm_config_cache.invalidate(model)
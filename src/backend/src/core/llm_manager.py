@@ -8,7 +8,7 @@ different LLM providers through litellm.
 import logging
 import os
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import time
 
 from crewai import LLM
@@ -17,6 +17,9 @@ from src.utils.databricks_url_utils import DatabricksURLUtils
 from src.services.model_config_service import ModelConfigService
 from src.services.api_keys_service import ApiKeysService
 from src.core.unit_of_work import UnitOfWork
+from src.core.llm_config_cache import llm_config_cache, invalidate_llm_config_cache
+from src.services.databricks_embedding_service import databricks_embedding_service, DatabricksEmbeddingError
+from src.services.llm_usage_meter import bind_llm_call, record_llm_usage
 import pathlib
 
 # CRITICAL: Import and apply model handlers BEFORE importing litellm
@@ -70,8 +73,45 @@ class LiteLLMFileLogger(CustomLogger):
         file_handler.setFormatter(formatter)
         self.logger.addHandler(file_handler)
     
+    def _meter_usage(self, kwargs, response_obj, start_time, end_time, status="success"):
+        """Report the tokens and cost of a call to the LLM usage meter."""
+        try:
+            model = kwargs.get('model', 'unknown')
+            provider = (kwargs.get('litellm_params') or {}).get('custom_llm_provider')
+            if not provider:
+                provider = model.split('/', 1)[0] if '/' in model else 'unknown'
+            usage = {}
+            cost = kwargs.get('response_cost')
+            error_message = None
+            if status == "success":
+                usage = response_obj.get('usage', {}) or {}
+                if cost is None:
+                    try:
+                        cost = litellm.completion_cost(completion_response=response_obj)
+                    except Exception:
+                        # No pricing for this model: keep the tokens, without a cost
+                        cost = 0.0
+            else:
+                error_message = str(kwargs.get('exception') or response_obj or "Unknown error")
+            record_llm_usage(
+                call_id=kwargs.get('litellm_call_id'),
+                model_name=model,
+                model_provider=provider,
+                prompt_tokens=usage.get('prompt_tokens', 0),
+                completion_tokens=usage.get('completion_tokens', 0),
+                total_tokens=usage.get('total_tokens', 0),
+                cost_usd=cost or 0.0,
+                duration_ms=int((end_time - start_time).total_seconds() * 1000),
+                status=status,
+                error_message=error_message
+            )
+        except Exception as e:
+            self.logger.error(f"Error metering LLM usage: {str(e)}")
+    
     def log_pre_api_call(self, model, messages, kwargs):
         try:
+            # Runs on the calling thread, unlike the success callbacks
+            bind_llm_call(kwargs.get('litellm_call_id'))
             self.logger.info(f"Pre-API Call - Model: {model}")
             self.logger.info(f"Messages: {json.dumps(messages, indent=2)}")
             # Log all kwargs except messages which we've already logged
@@ -141,6 +181,7 @@ class LiteLLMFileLogger(CustomLogger):
                 self.logger.warning(f"Could not calculate token usage: {str(e)}")
         except Exception as e:
             self.logger.error(f"Error in log_success_event: {str(e)}")
+        self._meter_usage(kwargs, response_obj, start_time, end_time)
     
     def log_failure_event(self, kwargs, response_obj, start_time, end_time):
         try:
@@ -163,10 +204,12 @@ class LiteLLMFileLogger(CustomLogger):
                 self.logger.error(f"Traceback: {str(traceback)}")
         except Exception as e:
             self.logger.error(f"Error in log_failure_event: {str(e)}")
+        self._meter_usage(kwargs, response_obj, start_time, end_time, status="error")
     
     # Async versions of callback methods for async operations
     async def async_log_pre_api_call(self, model, messages, kwargs):
         try:
+            bind_llm_call(kwargs.get('litellm_call_id'))
             self.logger.info(f"Pre-API Call - Model: {model}")
             self.logger.info(f"Messages: {json.dumps(messages, indent=2)}")
             # Log all kwargs except messages which we've already logged
@@ -236,6 +279,7 @@ class LiteLLMFileLogger(CustomLogger):
                 self.logger.warning(f"Could not calculate token usage: {str(e)}")
         except Exception as e:
             self.logger.error(f"Error in async_log_success_event: {str(e)}")
+        self._meter_usage(kwargs, response_obj, start_time, end_time)
     
     async def async_log_failure_event(self, kwargs, response_obj, start_time, end_time):
         try:
@@ -258,6 +302,7 @@ class LiteLLMFileLogger(CustomLogger):
                 self.logger.error(f"Traceback: {str(traceback)}")
         except Exception as e:
             self.logger.error(f"Error in async_log_failure_event: {str(e)}")
+        self._meter_usage(kwargs, response_obj, start_time, end_time, status="error")
 
 # Create logger instance
 litellm_file_logger = LiteLLMFileLogger()
@@ -267,7 +312,9 @@ litellm.modify_params = True  # This helps with Anthropic API compatibility
 litellm.num_retries = 5  # Global retries setting
 litellm.retry_on = ["429", "timeout", "rate_limit_error"]  # Retry on these error types
 
-# Add the file logger to litellm callbacks
+# Add the file logger to litellm callbacks. Only litellm.callbacks also registers
+# it for the pre-call hook, which binds calls to their execution for metering
+litellm.callbacks = [litellm_file_logger]
 litellm.success_callback = [litellm_file_logger]
 litellm.failure_callback = [litellm_file_logger]
 
@@ -285,11 +332,34 @@ class LLMManager:
     _embedding_failure_threshold = 3  # Number of failures before circuit opens
     _circuit_reset_time = 300  # Reset circuit after 5 minutes
     
+    @staticmethod
+    def _is_cacheable(params: Dict[str, Any]) -> bool:
+        """
+        Check whether resolved parameters can be served from the config cache.
+        
+        Databricks models without an API key authenticate through Databricks Apps
+        OAuth, whose environment setup has to run on every call.
+        """
+        return bool(params.get("api_key")) or not params.get("model", "").startswith("databricks/")
+    
+    @staticmethod
+    def invalidate_config_cache(model: Optional[str] = None) -> None:
+        """
+        Drop cached LLM configurations.
+        
+        Args:
+            model: Only drop this model, or None to drop all models
+        """
+        invalidate_llm_config_cache(model)
+    
     @staticmethod
     async def configure_litellm(model: str) -> Dict[str, Any]:
         """
         Configure litellm for the specified model.
         
+        Resolved parameters are cached per model and group for
+        LLM_CONFIG_CACHE_TTL seconds.
+        
         Args:
             model: Model identifier to configure
             
@@ -300,6 +370,28 @@ class LLMManager:
             ValueError: If model configuration is not found
             Exception: For other configuration errors
         """
+        cache_key = llm_config_cache.make_key("litellm", model)
+        model_params = llm_config_cache.get(cache_key)
+        if model_params is not None:
+            logger.debug(f"Using cached litellm configuration for model: {model}")
+            return model_params
+        
+        model_params = await LLMManager._resolve_litellm_params(model)
+        if LLMManager._is_cacheable(model_params):
+            llm_config_cache.set(cache_key, model_params)
+        return model_params
+    
+    @staticmethod
+    async def _resolve_litellm_params(model: str) -> Dict[str, Any]:
+        """
+        Resolve litellm parameters from the model config, API keys and Databricks config.
+        
+        Args:
+            model: Model identifier to configure
+            
+        Returns:
+            Dict[str, Any]: Model configuration parameters for litellm
+        """
         # Get model configuration from database using ModelConfigService
         async with UnitOfWork() as uow:
             model_config_service = await ModelConfigService.from_unit_of_work(uow)
@@ -461,6 +553,10 @@ class LLMManager:
         """
         Create and configure a CrewAI LLM instance with the correct provider prefix.
         
+        The resolved LLM parameters are cached per model and group for
+        LLM_CONFIG_CACHE_TTL seconds. A new LLM instance is created on every call
+        because CrewAI keeps per-instance state such as callbacks.
+        
         Args:
             model_name: The model identifier to configure
             
@@ -471,6 +567,36 @@ class LLMManager:
             ValueError: If model configuration is not found
             Exception: For other configuration errors
         """
+        cache_key = llm_config_cache.make_key("crewai", model_name)
+        llm_params = llm_config_cache.get(cache_key)
+        if llm_params is not None:
+            logger.debug(f"Using cached CrewAI LLM configuration for model: {model_name}")
+        else:
+            llm_params = await LLMManager._resolve_crewai_llm_params(model_name)
+            if LLMManager._is_cacheable(llm_params):
+                llm_config_cache.set(cache_key, llm_params)
+        
+        prefixed_model = llm_params["model"]
+        logger.info(f"Creating CrewAI LLM with model: {prefixed_model}, has_api_key: {bool(llm_params.get('api_key'))}, api_base: {llm_params.get('api_base')}")
+        
+        # Use custom wrapper for Databricks GPT-OSS models
+        if prefixed_model.startswith("databricks/") and DatabricksGPTOSSHandler.is_gpt_oss_model(prefixed_model):
+            logger.info(f"Using DatabricksGPTOSSLLM wrapper for GPT-OSS model: {prefixed_model}")
+            return DatabricksGPTOSSLLM(**llm_params)
+        # litellm 1.75.8+ handles GPT-5 natively, no need for custom wrapper
+        return LLM(**llm_params)
+    
+    @staticmethod
+    async def _resolve_crewai_llm_params(model_name: str) -> Dict[str, Any]:
+        """
+        Resolve CrewAI LLM parameters from the model config, API keys and Databricks config.
+        
+        Args:
+            model_name: The model identifier to configure
+            
+        Returns:
+            Dict[str, Any]: Keyword arguments for the CrewAI LLM constructor
+        """
         # Get model configuration using ModelConfigService
         async with UnitOfWork() as uow:
             model_config_service = await ModelConfigService.from_unit_of_work(uow)
@@ -574,15 +700,8 @@ class LLMManager:
                 # Since this is inside Databricks provider block, this won't apply to GPT-5
                 llm_params["max_tokens"] = model_config_dict["max_output_tokens"]
                 logger.info(f"Setting max_tokens to {model_config_dict['max_output_tokens']} for model {prefixed_model}")
-                
-            logger.info(f"Creating CrewAI LLM with model: {prefixed_model}, has_api_key: {bool(api_key)}, api_base: {api_base}")
             
-            # Use custom wrapper for GPT-OSS models
-            if DatabricksGPTOSSHandler.is_gpt_oss_model(model_name_value):
-                logger.info(f"Using DatabricksGPTOSSLLM wrapper for GPT-OSS model: {model_name_value}")
-                return DatabricksGPTOSSLLM(**llm_params)
-            else:
-                return LLM(**llm_params)
+            return llm_params
         elif provider == ModelProvider.GEMINI:
             api_key = await ApiKeysService.get_provider_api_key(provider)
             # Set in environment variables for better compatibility with various libraries
@@ -636,10 +755,7 @@ class LLMManager:
             llm_params["max_tokens"] = model_config_dict["max_output_tokens"]
             logger.info(f"Setting max_tokens to {model_config_dict['max_output_tokens']} for model {prefixed_model}")
         
-        # Create and return the CrewAI LLM
-        # litellm 1.75.8+ handles GPT-5 natively, no need for custom wrapper
-        logger.info(f"Creating CrewAI LLM with model: {prefixed_model}")
-        return LLM(**llm_params)
+        return llm_params
 
     @staticmethod
     async def get_llm(model_name: str) -> LLM:
@@ -656,6 +772,126 @@ class LLMManager:
         llm = await LLMManager.configure_crewai_llm(model_name)
         return llm
 
+    @staticmethod
+    async def _resolve_databricks_embedding_auth() -> Optional[Tuple[str, Dict[str, str]]]:
+        """
+        Resolve the workspace URL and request headers for Databricks embeddings.
+        
+        Tries OAuth/OBO headers, the API key service, client credentials and the
+        environment in that order. The result is cached per group for
+        LLM_CONFIG_CACHE_TTL seconds, and dropped when API keys or the Databricks
+        configuration change.
+        
+        Returns:
+            Tuple of workspace URL and request headers, or None without credentials
+        """
+        cache_key = llm_config_cache.make_key("embedding_auth", "databricks")
+        cached = llm_config_cache.get(cache_key)
+        if cached is not None:
+            return cached["workspace_url"], cached["headers"]
+        
+        # Use enhanced Databricks authentication for embeddings - follow GenieTool pattern
+        try:
+            from src.utils.databricks_auth import is_databricks_apps_environment, get_databricks_auth_headers
+            
+            # First try: OBO authentication if available
+            logger.info("Attempting enhanced Databricks authentication for embeddings")
+            headers_result, error = await get_databricks_auth_headers()
+            if headers_result and not error:
+                logger.info("Using enhanced Databricks authentication (OAuth/OBO) for embeddings")
+                headers = headers_result
+                api_key = None  # OAuth handled by headers
+            else:
+                logger.info(f"Enhanced auth failed ({error}), falling back to API key service")
+                # Second try: API key from service
+                api_key = await ApiKeysService.get_provider_api_key("DATABRICKS")
+                if api_key:
+                    logger.info("Using API key from service for embeddings")
+                    headers = None
+                else:
+                    # Third try: Client credentials from environment
+                    client_id = os.getenv("DATABRICKS_CLIENT_ID")
+                    client_secret = os.getenv("DATABRICKS_CLIENT_SECRET")
+                    if client_id and client_secret:
+                        logger.info("Using client credentials for embeddings")
+                        # Let the enhanced auth handle client credentials
+                        headers_result, error = await get_databricks_auth_headers()
+                        if headers_result and not error:
+                            headers = headers_result
+                            api_key = None
+                        else:
+                            # Fourth try: Environment variable DATABRICKS_TOKEN
+                            api_key = os.getenv("DATABRICKS_TOKEN") or os.getenv("DATABRICKS_API_KEY")
+                            if api_key:
+                                logger.info("Using DATABRICKS_TOKEN from environment for embeddings")
+                                headers = None
+                            else:
+                                logger.error("No Databricks authentication method available")
+                                return None
+                    else:
+                        # Fourth try: Environment variable DATABRICKS_TOKEN
+                        api_key = os.getenv("DATABRICKS_TOKEN") or os.getenv("DATABRICKS_API_KEY")
+                        if api_key:
+                            logger.info("Using DATABRICKS_TOKEN from environment for embeddings")
+                            headers = None
+                        else:
+                            logger.error("No Databricks authentication method available")
+                            return None
+                
+        except ImportError:
+            logger.warning("Enhanced Databricks auth not available for embeddings, using fallback methods")
+            # Try API key service first
+            api_key = await ApiKeysService.get_provider_api_key("DATABRICKS")
+            if not api_key:
+                # Fall back to environment variable
+                api_key = os.getenv("DATABRICKS_TOKEN") or os.getenv("DATABRICKS_API_KEY")
+                if api_key:
+                    logger.info("Using DATABRICKS_TOKEN from environment for embeddings (no enhanced auth)")
+            headers = None
+        
+        # Get workspace URL from environment first, then database
+        workspace_url = os.getenv("DATABRICKS_HOST", "")
+        if workspace_url:
+            # Use centralized URL utility for consistent handling
+            api_base = DatabricksURLUtils.construct_serving_endpoints_url(workspace_url)
+            logger.info(f"Using Databricks workspace URL from environment for embeddings: {workspace_url}")
+        else:
+            # Fallback to database configuration
+            api_base = None
+            from src.services.databricks_service import DatabricksService
+            try:
+                async with UnitOfWork() as uow:
+                    databricks_service = await DatabricksService.from_unit_of_work(uow)
+                    config = await databricks_service.get_databricks_config()
+                    if config and config.workspace_url:
+                        workspace_url = config.workspace_url
+                        # Use centralized URL utility for consistent handling
+                        api_base = DatabricksURLUtils.construct_serving_endpoints_url(workspace_url)
+                        logger.info(f"Using workspace URL from database for embeddings: {workspace_url}")
+            except Exception as e:
+                logger.error(f"Error getting Databricks workspace URL for embeddings: {e}")
+        
+        # Check if we have either OAuth headers or API key + base URL
+        if not ((headers and api_base) or (api_key and api_base)):
+            logger.warning(f"Missing Databricks credentials - OAuth headers: {bool(headers)}, API key: {bool(api_key)}, API base: {bool(api_base)}")
+            return None
+        
+        workspace_url = DatabricksURLUtils.extract_workspace_from_endpoint(api_base)
+        
+        # Use OAuth headers if available, otherwise fall back to API key
+        if headers:
+            request_headers = headers.copy()
+            if "Content-Type" not in request_headers:
+                request_headers["Content-Type"] = "application/json"
+        else:
+            request_headers = {
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json"
+            }
+        
+        llm_config_cache.set(cache_key, {"workspace_url": workspace_url, "headers": request_headers})
+        return workspace_url, request_headers
+    
     @staticmethod
     async def get_embedding(text: str, model: str = "databricks-gte-large-en", embedder_config: Optional[Dict[str, Any]] = None) -> Optional[List[float]]:
         """
@@ -701,137 +937,33 @@ class LLMManager:
             
             # Handle different embedding providers
             if provider == 'databricks' or 'databricks' in embedding_model:
-                # Use enhanced Databricks authentication for embeddings - follow GenieTool pattern
-                try:
-                    from src.utils.databricks_auth import is_databricks_apps_environment, get_databricks_auth_headers
-                    
-                    # First try: OBO authentication if available
-                    logger.info("Attempting enhanced Databricks authentication for embeddings")
-                    headers_result, error = await get_databricks_auth_headers()
-                    if headers_result and not error:
-                        logger.info("Using enhanced Databricks authentication (OAuth/OBO) for embeddings")
-                        headers = headers_result
-                        api_key = None  # OAuth handled by headers
-                    else:
-                        logger.info(f"Enhanced auth failed ({error}), falling back to API key service")
-                        # Second try: API key from service
-                        api_key = await ApiKeysService.get_provider_api_key("DATABRICKS")
-                        if api_key:
-                            logger.info("Using API key from service for embeddings")
-                            headers = None
-                        else:
-                            # Third try: Client credentials from environment
-                            client_id = os.getenv("DATABRICKS_CLIENT_ID")
-                            client_secret = os.getenv("DATABRICKS_CLIENT_SECRET")
-                            if client_id and client_secret:
-                                logger.info("Using client credentials for embeddings")
-                                # Let the enhanced auth handle client credentials
-                                headers_result, error = await get_databricks_auth_headers()
-                                if headers_result and not error:
-                                    headers = headers_result
-                                    api_key = None
-                                else:
-                                    # Fourth try: Environment variable DATABRICKS_TOKEN
-                                    api_key = os.getenv("DATABRICKS_TOKEN") or os.getenv("DATABRICKS_API_KEY")
-                                    if api_key:
-                                        logger.info("Using DATABRICKS_TOKEN from environment for embeddings")
-                                        headers = None
-                                    else:
-                                        logger.error("No Databricks authentication method available")
-                                        return None
-                            else:
-                                # Fourth try: Environment variable DATABRICKS_TOKEN
-                                api_key = os.getenv("DATABRICKS_TOKEN") or os.getenv("DATABRICKS_API_KEY")
-                                if api_key:
-                                    logger.info("Using DATABRICKS_TOKEN from environment for embeddings")
-                                    headers = None
-                                else:
-                                    logger.error("No Databricks authentication method available")
-                                    return None
-                        
-                except ImportError:
-                    logger.warning("Enhanced Databricks auth not available for embeddings, using fallback methods")
-                    # Try API key service first
-                    api_key = await ApiKeysService.get_provider_api_key("DATABRICKS")
-                    if not api_key:
-                        # Fall back to environment variable
-                        api_key = os.getenv("DATABRICKS_TOKEN") or os.getenv("DATABRICKS_API_KEY")
-                        if api_key:
-                            logger.info("Using DATABRICKS_TOKEN from environment for embeddings (no enhanced auth)")
-                    headers = None
-                
-                # Get workspace URL from environment first, then database
-                workspace_url = os.getenv("DATABRICKS_HOST", "")
-                if workspace_url:
-                    # Use centralized URL utility for consistent handling
-                    api_base = DatabricksURLUtils.construct_serving_endpoints_url(workspace_url)
-                    logger.info(f"Using Databricks workspace URL from environment for embeddings: {workspace_url}")
-                else:
-                    # Fallback to database configuration
-                    api_base = None
-                    from src.services.databricks_service import DatabricksService
-                    try:
-                        async with UnitOfWork() as uow:
-                            databricks_service = await DatabricksService.from_unit_of_work(uow)
-                            config = await databricks_service.get_databricks_config()
-                            if config and config.workspace_url:
-                                workspace_url = config.workspace_url
-                                # Use centralized URL utility for consistent handling
-                                api_base = DatabricksURLUtils.construct_serving_endpoints_url(workspace_url)
-                                logger.info(f"Using workspace URL from database for embeddings: {workspace_url}")
-                    except Exception as e:
-                        logger.error(f"Error getting Databricks workspace URL for embeddings: {e}")
-                
-                # Check if we have either OAuth headers or API key + base URL
-                if not ((headers and api_base) or (api_key and api_base)):
-                    logger.warning(f"Missing Databricks credentials - OAuth headers: {bool(headers)}, API key: {bool(api_key)}, API base: {bool(api_base)}")
+                auth = await LLMManager._resolve_databricks_embedding_auth()
+                if auth is None:
                     return None
+                workspace_url, request_headers = auth
                 
                 # Ensure model has databricks prefix for litellm
                 if not embedding_model.startswith('databricks/'):
                     embedding_model = f"databricks/{embedding_model}"
                 
-                # Use direct HTTP request to avoid config file issues
-                import aiohttp
-                
                 try:
-                    # Construct the direct API endpoint using centralized utility
-                    # Extract workspace URL from api_base (which contains /serving-endpoints)
-                    workspace_url = DatabricksURLUtils.extract_workspace_from_endpoint(api_base)
-                    endpoint_url = DatabricksURLUtils.construct_model_invocation_url(workspace_url, embedding_model)
-                    
-                    # Use OAuth headers if available, otherwise fall back to API key
-                    if headers:
-                        request_headers = headers.copy()
-                        if "Content-Type" not in request_headers:
-                            request_headers["Content-Type"] = "application/json"
-                    else:
-                        request_headers = {
-                            "Authorization": f"Bearer {api_key}",
-                            "Content-Type": "application/json"
-                        }
-                    
-                    payload = {
-                        "input": [text] if isinstance(text, str) else text
-                    }
-                    
-                    async with aiohttp.ClientSession() as session:
-                        async with session.post(endpoint_url, headers=request_headers, json=payload) as response:
-                            if response.status == 200:
-                                result = await response.json()
-                                # Databricks embedding API returns embeddings in 'data' field
-                                if 'data' in result and len(result['data']) > 0:
-                                    embedding = result['data'][0].get('embedding', result['data'][0])
-                                    logger.info(f"Successfully created embedding with {len(embedding)} dimensions using direct Databricks API")
-                                    return embedding
-                                else:
-                                    logger.warning("No embedding data found in Databricks response")
-                                    return None
-                            else:
-                                error_text = await response.text()
-                                logger.error(f"Databricks embedding API error {response.status}: {error_text}")
-                                return None
-                                
+                    # Batched, cached request on a pooled connection
+                    texts = [text] if isinstance(text, str) else list(text)
+                    embeddings = await databricks_embedding_service.embed(
+                        texts, model=embedding_model, workspace_url=workspace_url, headers=request_headers
+                    )
+                    embedding = embeddings[0]
+                    logger.info(f"Successfully created embedding with {len(embedding)} dimensions using direct Databricks API")
+                    return embedding
+                except DatabricksEmbeddingError as e:
+                    if e.status is None:
+                        logger.warning(str(e))
+                        return None
+                    if e.status == 401:
+                        # The cached credentials were rejected, resolve them again next time
+                        invalidate_llm_config_cache("databricks")
+                    logger.error(str(e))
+                    return None
                 except Exception as e:
                     logger.error(f"Error calling Databricks embedding API directly: {str(e)}")
                     return None
@@ -0,0 +1,138 @@
+"""
+Process-wide cache of prompt template contents.
+
+The generation services read their system prompt through
+TemplateService.get_template_content on every request, which opens a unit of
+work just to read one of a handful of rows. Template contents are cached here
+by name for a limited time, including names that do not exist, so a request
+goes straight to the LLM call.
+
+The cache has a version that is bumped whenever TemplateService changes the
+templates, once when the change is made and again after it is committed. A
+load that was started before an invalidation is returned to its caller but not
+stored, so neither a slow read nor a read that ran before the commit can put a
+replaced template back into the cache. The TTL bounds how long other worker processes, which do not
+see these invalidations, keep serving an old template.
+"""
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Receives the template name, returns its content or None if it does not exist
+TemplateLoader = Callable[[str], Awaitable[Optional[str]]]
+# Returns the content of every active template by name
+AllTemplatesLoader = Callable[[], Awaitable[Dict[str, str]]]
+
+
+class PromptTemplateCache:
+    """TTL cache of prompt template contents by name with versioned invalidation."""
+
+    def __init__(self, ttl: Optional[float] = None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._version = 0
+        # name -> (expires_at, content or None if the template does not exist)
+        self._entries: Dict[str, Tuple[float, Optional[str]]] = {}
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def ttl(self) -> float:
+        """Entry lifetime in seconds, 0 disables the cache."""
+        return settings.PROMPT_TEMPLATE_CACHE_TTL if self._ttl is None else self._ttl
+
+    @property
+    def version(self) -> int:
+        """Version of the templates, bumped on every invalidation."""
+        with self._lock:
+            return self._version
+
+    async def get(self, name: str, loader: TemplateLoader) -> Optional[str]:
+        """
+        Get the content of a template, loading it on a miss.
+
+        Errors raised by the loader are not cached.
+
+        Args:
+            name: Name of the template
+            loader: Coroutine function returning the content for a name
+
+        Returns:
+            Template content, or None if the template does not exist
+        """
+        ttl = self.ttl
+        if ttl <= 0:
+            return await loader(name)
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] >= time.monotonic():
+                self._stats["hits"] += 1
+                return entry[1]
+            self._stats["misses"] += 1
+            version = self._version
+
+        content = await loader(name)
+        with self._lock:
+            if self._version == version:
+                self._entries[name] = (time.monotonic() + ttl, content)
+        return content
+
+    async def warm(self, loader: AllTemplatesLoader) -> int:
+        """
+        Replace the cached contents with every active template.
+
+        Names that are not returned by the loader are loaded on their first use.
+
+        Args:
+            loader: Coroutine function returning the content of every template by name
+
+        Returns:
+            Number of templates cached
+        """
+        ttl = self.ttl
+        if ttl <= 0:
+            return 0
+
+        self.invalidate()
+        with self._lock:
+            version = self._version
+
+        templates = await loader()
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            if self._version != version:
+                return 0
+            for name, content in templates.items():
+                self._entries[name] = (expires_at, content)
+        logger.debug(f"[PromptTemplateCache] Warmed {len(templates)} templates")
+        return len(templates)
+
+    def invalidate(self) -> None:
+        """Drop all cached templates and reject loads that are in flight."""
+        with self._lock:
+            self._entries.clear()
+            self._version += 1
+            self._stats["invalidations"] += 1
+        logger.debug("[PromptTemplateCache] Invalidated templates")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/invalidation counters, the version and the number of cached templates."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["version"] = self._version
+            stats["size"] = len(self._entries)
+        return stats
+
+
+# Create a singleton instance
+prompt_template_cache = PromptTemplateCache()
+
+
+def invalidate_prompt_template_cache() -> None:
+    """Invalidate the cached prompt templates."""
+    prompt_template_cache.invalidate()
@@ -0,0 +1,202 @@
+"""
+Process-wide min-heap of schedule next-run times.
+
+The scheduler loop sleeps until the earliest entry is due instead of polling
+the database. The heap is seeded from ScheduleRepository when the loop starts
+and SchedulerService keeps it current whenever a schedule is created, updated,
+toggled or deleted. Every change wakes the loop so it can recompute how long
+to sleep.
+
+Entries are replaced lazily: a schedule whose time changes gets a new heap
+entry, and the old one is skipped when it reaches the top because it no
+longer matches the schedule's current time.
+
+All times are timezone-naive UTC, the format next_run_at is stored in.
+"""
+import asyncio
+import heapq
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.utils.cron_utils import ensure_utc
+
+logger = logging.getLogger(__name__)
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    return ensure_utc(value).replace(tzinfo=None)
+
+
+class ScheduleHeap:
+    """Next-run times of active schedules, ordered by time, with wake-up notification."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (next_run_at, schedule_id), may contain replaced entries
+        self._heap: List[Tuple[datetime, int]] = []
+        # schedule_id -> current next_run_at
+        self._next_runs: Dict[int, datetime] = {}
+        # Wake-up event of the loop currently waiting, recreated per event loop
+        self._wakeup: Optional[asyncio.Event] = None
+        self._wakeup_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats = {"updates": 0, "removals": 0, "popped": 0, "reloads": 0}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._next_runs)
+
+    def reset(self, entries: Iterable[Tuple[int, Optional[datetime]]]) -> None:
+        """
+        Replace the heap contents.
+
+        Args:
+            entries: (schedule_id, next_run_at) of the active schedules
+        """
+        with self._lock:
+            self._next_runs = {
+                schedule_id: _to_naive_utc(next_run_at)
+                for schedule_id, next_run_at in entries
+                if next_run_at is not None
+            }
+            self._heap = [(next_run_at, schedule_id) for schedule_id, next_run_at in self._next_runs.items()]
+            heapq.heapify(self._heap)
+            self._stats["reloads"] += 1
+            size = len(self._next_runs)
+        logger.debug(f"[ScheduleHeap] Loaded {size} schedules")
+        self._notify()
+
+    def update(self, schedule_id: int, next_run_at: Optional[datetime], is_active: bool = True) -> None:
+        """
+        Set when a schedule runs next, removing it if it is inactive or has no next run.
+
+        Args:
+            schedule_id: ID of the schedule
+            next_run_at: Next run time, naive UTC or timezone-aware
+            is_active: Whether the schedule is active
+        """
+        if not is_active or next_run_at is None:
+            self.remove(schedule_id)
+            return
+        next_run_at = _to_naive_utc(next_run_at)
+        with self._lock:
+            if self._next_runs.get(schedule_id) == next_run_at:
+                return
+            self._next_runs[schedule_id] = next_run_at
+            heapq.heappush(self._heap, (next_run_at, schedule_id))
+            self._stats["updates"] += 1
+            self._compact()
+        self._notify()
+
+    def remove(self, schedule_id: int) -> None:
+        """Stop tracking a schedule, its heap entry is discarded when it reaches the top."""
+        with self._lock:
+            if self._next_runs.pop(schedule_id, None) is None:
+                return
+            self._stats["removals"] += 1
+            self._compact()
+        self._notify()
+
+    def peek(self) -> Optional[datetime]:
+        """Get the earliest next-run time, or None if no schedule is tracked."""
+        with self._lock:
+            self._drop_replaced()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> List[Tuple[int, datetime]]:
+        """
+        Remove and return every schedule due at or before now.
+
+        Args:
+            now: Current time, naive UTC or timezone-aware
+
+        Returns:
+            (schedule_id, next_run_at) pairs in due order
+        """
+        now = _to_naive_utc(now)
+        due = []
+        with self._lock:
+            self._drop_replaced()
+            while self._heap and self._heap[0][0] <= now:
+                next_run_at, schedule_id = heapq.heappop(self._heap)
+                del self._next_runs[schedule_id]
+                due.append((schedule_id, next_run_at))
+                self._drop_replaced()
+            self._stats["popped"] += len(due)
+        return due
+
+    async def wait(self, timeout: Optional[float]) -> bool:
+        """
+        Wait until the heap changes or the timeout expires.
+
+        Args:
+            timeout: Seconds to wait, None waits for the next change
+
+        Returns:
+            True if the heap changed, False on timeout
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._wakeup is None or self._wakeup_loop is not loop:
+                self._wakeup = asyncio.Event()
+                self._wakeup_loop = loop
+            wakeup = self._wakeup
+        try:
+            await asyncio.wait_for(wakeup.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            wakeup.clear()
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._heap.clear()
+            self._next_runs.clear()
+        self._notify()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get update/removal/pop counters, the number of schedules and the next run time."""
+        with self._lock:
+            self._drop_replaced()
+            stats = dict(self._stats)
+            stats["schedules"] = len(self._next_runs)
+            stats["heap_entries"] = len(self._heap)
+            stats["next_run_at"] = self._heap[0][0] if self._heap else None
+        return stats
+
+    def _drop_replaced(self) -> None:
+        # Called with the lock held
+        while self._heap and self._next_runs.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def _compact(self) -> None:
+        # Called with the lock held; rebuild once replaced entries dominate
+        if len(self._heap) > 2 * len(self._next_runs) + 64:
+            self._heap = [(next_run_at, schedule_id) for schedule_id, next_run_at in self._next_runs.items()]
+            heapq.heapify(self._heap)
+
+    def _notify(self) -> None:
+        with self._lock:
+            wakeup, loop = self._wakeup, self._wakeup_loop
+        if wakeup is None or loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            wakeup.set()
+        else:
+            loop.call_soon_threadsafe(wakeup.set)
+
+
+# Create a singleton instance
+schedule_heap = ScheduleHeap()
+
+
+def clear_schedule_heap() -> None:
+    """Drop all tracked schedule times."""
+    schedule_heap.clear()
@@ -0,0 +1,176 @@
+"""
+Process-wide cache of the tool catalog and decrypted API keys.
+
+Every crew and flow preparation builds a ToolFactory, which needs the whole
+tool catalog and the provider API keys it exports to the environment. Both
+are cached here for a limited time, so building a factory is a cache hit
+instead of a catalog query plus one database round trip per key.
+
+Each section has a version that is bumped whenever ToolService or
+ApiKeysService changes the underlying rows. A load that was started before an
+invalidation is returned to its caller but not stored, so a slow reload can
+never put stale data back into the cache.
+
+This module deliberately has no dependencies on CrewAI so that the services
+can import it without pulling in ToolFactory.
+"""
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ToolLoader = Callable[[], Awaitable[List[Any]]]
+# Receives the missing key names, returns the decrypted value per name
+ApiKeyLoader = Callable[[List[str]], Awaitable[Dict[str, Optional[str]]]]
+
+
+class ToolCatalogCache:
+    """TTL cache of the tool catalog and decrypted API keys with versioned invalidation."""
+
+    def __init__(self, ttl: Optional[float] = None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._tools_version = 0
+        self._api_keys_version = 0
+        # (expires_at, tools)
+        self._tools: Optional[Tuple[float, List[Any]]] = None
+        # name -> (expires_at, decrypted value or None if the key does not exist)
+        self._api_keys: Dict[str, Tuple[float, Optional[str]]] = {}
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def ttl(self) -> float:
+        """Entry lifetime in seconds, 0 disables the cache."""
+        return settings.TOOL_CATALOG_CACHE_TTL if self._ttl is None else self._ttl
+
+    @property
+    def tools_version(self) -> int:
+        """Version of the tool catalog, bumped on every tool invalidation."""
+        with self._lock:
+            return self._tools_version
+
+    @property
+    def api_keys_version(self) -> int:
+        """Version of the API keys, bumped on every key invalidation."""
+        with self._lock:
+            return self._api_keys_version
+
+    async def get_tools(self, loader: ToolLoader) -> List[Any]:
+        """
+        Get the tool catalog, loading it on a miss.
+
+        The returned tools are shared between callers and must not be modified.
+
+        Args:
+            loader: Coroutine function returning all tools
+
+        Returns:
+            List of tools
+        """
+        ttl = self.ttl
+        if ttl <= 0:
+            return list(await loader())
+
+        with self._lock:
+            entry = self._tools
+            if entry is not None and entry[0] >= time.monotonic():
+                self._stats["hits"] += 1
+                return entry[1]
+            self._stats["misses"] += 1
+            version = self._tools_version
+
+        tools = list(await loader())
+        with self._lock:
+            if self._tools_version == version:
+                self._tools = (time.monotonic() + ttl, tools)
+        return tools
+
+    async def get_api_keys(self, names: Iterable[str], loader: ApiKeyLoader) -> Dict[str, Optional[str]]:
+        """
+        Get decrypted API keys, loading all missing names with one loader call.
+
+        Args:
+            names: Names of the keys
+            loader: Coroutine function returning the decrypted value per missing name
+
+        Returns:
+            Dictionary of name to decrypted value, None for keys that do not exist
+        """
+        names = list(dict.fromkeys(names))
+        ttl = self.ttl
+        if ttl <= 0:
+            loaded = await loader(names)
+            return {name: loaded.get(name) for name in names}
+
+        result: Dict[str, Optional[str]] = {}
+        missing: List[str] = []
+        now = time.monotonic()
+        with self._lock:
+            for name in names:
+                entry = self._api_keys.get(name)
+                if entry is not None and entry[0] >= now:
+                    result[name] = entry[1]
+                else:
+                    missing.append(name)
+            if missing:
+                self._stats["misses"] += 1
+            else:
+                self._stats["hits"] += 1
+            version = self._api_keys_version
+
+        if not missing:
+            return result
+
+        loaded = await loader(missing)
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            store = self._api_keys_version == version
+            for name in missing:
+                result[name] = loaded.get(name)
+                if store:
+                    self._api_keys[name] = (expires_at, result[name])
+        return result
+
+    def invalidate_tools(self) -> None:
+        """Drop the cached tool catalog and reject loads that are in flight."""
+        with self._lock:
+            self._tools = None
+            self._tools_version += 1
+            self._stats["invalidations"] += 1
+        logger.debug("[ToolCatalogCache] Invalidated tool catalog")
+
+    def invalidate_api_keys(self) -> None:
+        """Drop the cached API keys and reject loads that are in flight."""
+        with self._lock:
+            self._api_keys.clear()
+            self._api_keys_version += 1
+            self._stats["invalidations"] += 1
+        logger.debug("[ToolCatalogCache] Invalidated API keys")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/invalidation counters, versions and cache sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["tools_version"] = self._tools_version
+            stats["api_keys_version"] = self._api_keys_version
+            stats["tools"] = len(self._tools[1]) if self._tools is not None else 0
+            stats["api_keys"] = len(self._api_keys)
+        return stats
+
+
+# Create a singleton instance
+tool_catalog_cache = ToolCatalogCache()
+
+
+def invalidate_tool_catalog_cache() -> None:
+    """Invalidate the cached tool catalog."""
+    tool_catalog_cache.invalidate_tools()
+
+
+def invalidate_api_key_cache() -> None:
+    """Invalidate the cached decrypted API keys."""
+    tool_catalog_cache.invalidate_api_keys()
@@ -31,7 +31,15 @@ class UnitOfWork:
     All repositories share the same session within a single unit of work.
     """
     
-    def __init__(self):
+    def __init__(self, session_factory=None):
+        """
+        Initialize the unit of work.
+        
+        Args:
+            session_factory: Optional async session factory, defaults to the
+                application's async_session_factory
+        """
+        self._session_factory = session_factory
         self._session = None
         self.tool_repository: Optional[ToolRepository] = None
         self.api_key_repository: Optional[ApiKeyRepository] = None
@@ -53,8 +61,10 @@ class UnitOfWork:
         Returns:
             UnitOfWork: Self reference with all repositories initialized
         """
-        from src.db.session import async_session_factory
-        self._session = async_session_factory()
+        session_factory = self._session_factory
+        if session_factory is None:
+            from src.db.session import async_session_factory as session_factory
+        self._session = session_factory()
         session = await self._session.__aenter__()
         
         # Create repositories with the shared session
@@ -34,7 +34,7 @@ from src.models.chat_history import ChatHistory
 from src.models.user import User, UserProfile, RefreshToken, ExternalIdentity, Role, Privilege, RolePrivilege, UserRole, IdentityProvider
 
 # Billing models
-from src.models.billing import LLMUsageBilling, BillingPeriod, BillingAlert
+from src.models.billing import LLMUsageBilling, LLMUsageRollup, BillingPeriod, BillingAlert
 
 # Documentation models
 from src.models.documentation_embedding import DocumentationEmbedding
@@ -85,6 +85,7 @@ __all__ = [
     "IdentityProvider",
     # Billing models
     "LLMUsageBilling",
+    "LLMUsageRollup",
     "BillingPeriod", 
     "BillingAlert",
     # Documentation models
@@ -0,0 +1,306 @@
+"""
+Warm pool of persistent MCP client sessions.
+
+Calls to MCP tools that cannot run on the caller's event loop are handed to a
+dedicated worker loop that runs on its own daemon thread. The worker loop keeps
+one connected MCP client session per server, so a call costs one round trip
+instead of an interpreter start, an adapter and a connection handshake.
+
+- Calls are submitted from any thread or event loop and wait for their result
+  on the caller's side.
+- Each server allows at most MCP_WORKER_MAX_CONCURRENCY calls at a time.
+- Sessions are pinged every MCP_WORKER_HEALTH_CHECK_INTERVAL seconds. Sessions
+  that fail a ping or a call are closed and reopened on the next call, and
+  sessions idle for MCP_WORKER_IDLE_TIMEOUT seconds are closed.
+"""
+import asyncio
+import atexit
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.config.settings import settings
+from src.core.logger import LoggerManager
+from src.utils.background_loop import BackgroundEventLoop
+
+# Get logger from the centralized logging system
+logger = LoggerManager.get_instance().system
+
+
+def make_server_key(server_params: Dict[str, Any]) -> str:
+    """
+    Build the key identifying an MCP server connection.
+
+    Args:
+        server_params: Dictionary containing MCP server configuration
+
+    Returns:
+        The stdio command for stdio servers, otherwise the URL and auth type
+    """
+    if server_params.get('transport') == 'stdio' and server_params.get('command'):
+        command = server_params['command']
+        command_str = ' '.join(command) if isinstance(command, list) else command
+        return f"stdio_{command_str}"
+    # Include the auth type so different auth contexts get different connections
+    return f"{server_params.get('url', 'stdio')}_{server_params.get('auth_type', 'default')}"
+
+
+class _MCPServerWorker:
+    """Persistent MCP client session to one server. Only used on the worker loop."""
+
+    def __init__(self, key: str, server_params: Dict[str, Any]):
+        self.key = key
+        self.server_params = server_params
+        self._semaphore = asyncio.Semaphore(settings.MCP_WORKER_MAX_CONCURRENCY)
+        self._connect_lock = asyncio.Lock()
+        self._session = None
+        # Task that opened the session and keeps it open until _closing is set
+        self._owner: Optional[asyncio.Task] = None
+        self._closing: Optional[asyncio.Event] = None
+        self._active_calls = 0
+        self._last_used = time.monotonic()
+        self.stats = {"calls": 0, "connects": 0, "failures": 0, "health_check_failures": 0}
+
+    @property
+    def connected(self) -> bool:
+        return self._session is not None
+
+    async def _connect(self):
+        """Get the open session, connecting first if there is none."""
+        async with self._connect_lock:
+            if self._session is not None:
+                return self._session
+            ready = asyncio.get_running_loop().create_future()
+            self._closing = asyncio.Event()
+            self._owner = asyncio.create_task(self._own_session(ready, self._closing))
+            try:
+                self._session = await asyncio.wait_for(asyncio.shield(ready), settings.MCP_WORKER_CONNECT_TIMEOUT)
+            except BaseException:
+                self._owner.cancel()
+                await self.close()
+                raise
+            self.stats["connects"] += 1
+            logger.info(f"[MCPWorkerPool] Connected to MCP server {self.key}")
+            return self._session
+
+    async def _own_session(self, ready: asyncio.Future, closing: asyncio.Event) -> None:
+        """
+        Open the session and keep it open until closing is set.
+
+        The MCP client context managers must be entered and exited by the same
+        task, so a dedicated task owns them while calls use the session.
+        """
+        try:
+            from mcp import ClientSession
+            from mcp.client.streamable_http import streamablehttp_client as connect
+            from src.engines.common.mcp_adapter import MCPAdapter
+
+            headers = await MCPAdapter(self.server_params)._get_authentication_headers()
+            if not headers:
+                raise ValueError("No authentication headers available")
+            # Use only the Authorization header, as MCPAdapter does
+            clean_headers = {"Authorization": headers["Authorization"]}
+            async with connect(self.server_params.get('url', ''), headers=clean_headers) as (read_stream, write_stream, _):
+                async with ClientSession(read_stream, write_stream) as session:
+                    await session.initialize()
+                    ready.set_result(session)
+                    await closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(f"[MCPWorkerPool] Session to {self.key} ended with an error: {e}")
+        finally:
+            if not ready.done():
+                ready.cancel()
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Call a tool on the server's session, waiting for a free concurrency slot."""
+        async with self._semaphore:
+            self._active_calls += 1
+            self.stats["calls"] += 1
+            try:
+                session = await self._connect()
+                try:
+                    return await session.call_tool(tool_name, arguments)
+                except Exception:
+                    # Tool errors come back as results, so this is a broken
+                    # connection: reconnect on the next call
+                    self.stats["failures"] += 1
+                    if session is self._session:
+                        await self.close()
+                    raise
+            finally:
+                self._active_calls -= 1
+                self._last_used = time.monotonic()
+
+    async def check_health(self) -> bool:
+        """
+        Ping the session, closing it if the ping fails or it has been idle too long.
+
+        Returns:
+            False if the session failed its ping, otherwise True
+        """
+        session = self._session
+        if session is None:
+            return True
+        if self._active_calls == 0 and time.monotonic() - self._last_used > settings.MCP_WORKER_IDLE_TIMEOUT:
+            logger.info(f"[MCPWorkerPool] Closing idle session to {self.key}")
+            await self.close()
+            return True
+        try:
+            await asyncio.wait_for(session.send_ping(), settings.MCP_WORKER_CONNECT_TIMEOUT)
+            return True
+        except Exception as e:
+            self.stats["health_check_failures"] += 1
+            logger.warning(f"[MCPWorkerPool] Health check of {self.key} failed, closing the session: {e}")
+            if session is self._session:
+                await self.close()
+            return False
+
+    async def close(self) -> None:
+        """Close the session, it is reopened by the next call."""
+        owner, closing = self._owner, self._closing
+        self._session = None
+        self._owner = None
+        self._closing = None
+        if closing is not None:
+            closing.set()
+        if owner is not None and owner is not asyncio.current_task():
+            done, _ = await asyncio.wait({owner}, timeout=settings.MCP_WORKER_CONNECT_TIMEOUT)
+            if not done:
+                owner.cancel()
+
+
+class MCPWorkerPool:
+    """Persistent MCP sessions per server, served from a dedicated event loop thread."""
+
+    def __init__(self, name: str = "mcp-worker-loop"):
+        self._loop = BackgroundEventLoop(name)
+        # Only accessed from the worker loop
+        self._workers: Dict[str, _MCPServerWorker] = {}
+        self._health_task: Optional[asyncio.Task] = None
+        self._started = False
+
+    def call_tool(
+        self,
+        server_params: Dict[str, Any],
+        tool_name: str,
+        arguments: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Call an MCP tool from synchronous code.
+
+        Args:
+            server_params: Dictionary containing MCP server configuration
+            tool_name: Name of the tool on the server
+            arguments: Tool arguments
+            timeout: Seconds to wait, defaults to settings.MCP_WORKER_CALL_TIMEOUT
+
+        Returns:
+            The MCP call result
+        """
+        self._started = True
+        return self._loop.run(
+            self._call(server_params, tool_name, arguments),
+            settings.MCP_WORKER_CALL_TIMEOUT if timeout is None else timeout
+        )
+
+    async def acall_tool(
+        self,
+        server_params: Dict[str, Any],
+        tool_name: str,
+        arguments: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Call an MCP tool from any event loop without blocking it.
+
+        Args:
+            server_params: Dictionary containing MCP server configuration
+            tool_name: Name of the tool on the server
+            arguments: Tool arguments
+            timeout: Seconds to wait, defaults to settings.MCP_WORKER_CALL_TIMEOUT
+
+        Returns:
+            The MCP call result
+        """
+        self._started = True
+        if self._loop.owns_running_loop():
+            return await self._call(server_params, tool_name, arguments)
+        future = asyncio.run_coroutine_threadsafe(self._call(server_params, tool_name, arguments), self._loop.loop)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                settings.MCP_WORKER_CALL_TIMEOUT if timeout is None else timeout
+            )
+        finally:
+            future.cancel()
+
+    async def _call(self, server_params: Dict[str, Any], tool_name: str, arguments: Dict[str, Any]) -> Any:
+        key = make_server_key(server_params)
+        worker = self._workers.get(key)
+        if worker is None:
+            worker = _MCPServerWorker(key, server_params)
+            self._workers[key] = worker
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._run_health_checks())
+        return await worker.call_tool(tool_name, arguments)
+
+    async def _run_health_checks(self) -> None:
+        while True:
+            await asyncio.sleep(settings.MCP_WORKER_HEALTH_CHECK_INTERVAL)
+            for worker in list(self._workers.values()):
+                try:
+                    await worker.check_health()
+                except Exception as e:
+                    logger.error(f"[MCPWorkerPool] Error checking {worker.key}: {e}")
+
+    async def _close_all(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        workers = list(self._workers.values())
+        self._workers.clear()
+        await asyncio.gather(*(worker.close() for worker in workers), return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get call, connect and failure counters per server."""
+        return {
+            key: {**worker.stats, "connected": worker.connected}
+            for key, worker in list(self._workers.items())
+        }
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Close all sessions and stop the worker loop."""
+        if not self._started:
+            return
+        try:
+            self._loop.run(self._close_all(), timeout)
+        except Exception as e:
+            logger.warning(f"[MCPWorkerPool] Error closing MCP sessions: {e}")
+        self._loop.shutdown(timeout)
+        self._started = False
+
+
+_mcp_worker_pool: Optional[MCPWorkerPool] = None
+_mcp_worker_pool_lock = threading.Lock()
+
+
+def get_mcp_worker_pool() -> MCPWorkerPool:
+    """Get the process-wide MCP worker pool."""
+    global _mcp_worker_pool
+    with _mcp_worker_pool_lock:
+        if _mcp_worker_pool is None:
+            _mcp_worker_pool = MCPWorkerPool()
+            atexit.register(_mcp_worker_pool.shutdown)
+        return _mcp_worker_pool
+
+
+def shutdown_mcp_worker_pool() -> None:
+    """Close the pooled MCP sessions if the pool was ever used."""
+    with _mcp_worker_pool_lock:
+        pool = _mcp_worker_pool
+    if pool is not None:
+        pool.shutdown()
@@ -12,6 +12,7 @@ from datetime import datetime, timezone
 # Import queue services
 from src.services.execution_logs_queue import enqueue_log
 from src.services.trace_queue import get_trace_queue
+from src.engines.crewai.callbacks.trace_capture import capture_trace
 
 # Import group context
 from src.utils.user_context import GroupContext, UserContext
@@ -351,8 +352,10 @@ def create_execution_callbacks(job_id: str, config: Dict[str, Any] = None, group
                 trace_data["group_email"] = group_context.group_email
             
             try:
-                trace_queue.put_nowait(trace_data)
-                logger.debug(f"{log_prefix} Step trace enqueued successfully")
+                trace_data = capture_trace(trace_data)
+                if trace_data is not None:
+                    trace_queue.put_nowait(trace_data)
+                    logger.debug(f"{log_prefix} Step trace enqueued successfully")
             except Exception as trace_error:
                 logger.error(f"{log_prefix} Failed to enqueue step trace: {trace_error}")
             
@@ -532,8 +535,10 @@ def create_execution_callbacks(job_id: str, config: Dict[str, Any] = None, group
                 trace_data["group_email"] = group_context.group_email
             
             try:
-                trace_queue.put_nowait(trace_data)
-                logger.debug(f"{log_prefix} Task trace enqueued successfully")
+                trace_data = capture_trace(trace_data)
+                if trace_data is not None:
+                    trace_queue.put_nowait(trace_data)
+                    logger.debug(f"{log_prefix} Task trace enqueued successfully")
             except Exception as trace_error:
                 logger.error(f"{log_prefix} Failed to enqueue task trace: {trace_error}")
             
@@ -592,7 +597,9 @@ def create_crew_callbacks(job_id: str, config: Dict[str, Any] = None, group_cont
                 trace_data["group_email"] = group_context.group_email
             
             try:
-                trace_queue.put_nowait(trace_data)
+                trace_data = capture_trace(trace_data)
+                if trace_data is not None:
+                    trace_queue.put_nowait(trace_data)
             except Exception as trace_error:
                 logger.error(f"{log_prefix} Failed to enqueue crew start trace: {trace_error}")
             
@@ -638,7 +645,9 @@ def create_crew_callbacks(job_id: str, config: Dict[str, Any] = None, group_cont
                 trace_data["group_email"] = group_context.group_email
             
             try:
-                trace_queue.put_nowait(trace_data)
+                trace_data = capture_trace(trace_data)
+                if trace_data is not None:
+                    trace_queue.put_nowait(trace_data)
             except Exception as trace_error:
                 logger.error(f"{log_prefix} Failed to enqueue crew completion trace: {trace_error}")
             
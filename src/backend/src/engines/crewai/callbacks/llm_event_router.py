@@ -3,20 +3,36 @@ LLM Event Router for capturing CrewAI LLM events.
 
 This module provides a router that captures LLM events from the global CrewAI
 event bus and routes them to the appropriate execution based on agent context.
+
+Events are attributed through indexes built when executions register:
+
+1. The id of the agent that made the call, unique per agent instance.
+2. The execution bound to the current context. register_execution() runs in the
+   execution's task, and asyncio.to_thread copies the context into kickoff, so
+   handlers called on the crew's thread see it.
+3. The agent role, only when a single active execution has an agent with that
+   role. Ambiguous roles are dropped rather than attributed to the wrong job.
+
+The indexes are rebuilt under a lock and replaced as a whole, never mutated, so
+the event handler reads them without locking.
 """
 
 import logging
 import threading
-from typing import Dict, Set, Any, Optional
+from contextvars import ContextVar
+from typing import Dict, FrozenSet, Set, Any, Optional
 from datetime import datetime, timezone
-import weakref
 
 from crewai.utilities.events import crewai_event_bus, LLMCallCompletedEvent
 from src.services.trace_queue import get_trace_queue
+from src.engines.crewai.callbacks.trace_capture import capture_trace
 from src.utils.user_context import GroupContext
 
 logger = logging.getLogger(__name__)
 
+# Execution registered from the current context
+_llm_event_execution: ContextVar[Optional[str]] = ContextVar('llm_event_execution', default=None)
+
 
 class LLMEventRouter:
     """
@@ -29,7 +45,12 @@ class LLMEventRouter:
     _instance: Optional['LLMEventRouter'] = None
     _lock = threading.Lock()
     _initialized = False
+    # Copy-on-write: replaced under _lock, read without it
     _active_executions: Dict[str, Dict[str, Any]] = {}
+    # agent id -> execution id
+    _agent_index: Dict[str, str] = {}
+    # agent role -> ids of the executions with an agent of that role
+    _role_index: Dict[str, FrozenSet[str]] = {}
     
     def __new__(cls):
         """Ensure singleton pattern."""
@@ -44,6 +65,9 @@ class LLMEventRouter:
         """
         Register an execution with its agents for LLM event routing.
         
+        Must be called from the execution's own context so that events emitted
+        on the crew's thread can also be attributed through the context.
+        
         Args:
             execution_id: Unique identifier for the execution
             crew: The CrewAI crew instance
@@ -51,27 +75,37 @@ class LLMEventRouter:
         """
         router = cls()
         
-        # Extract agent roles from crew
+        # Extract agent roles and ids from crew
         agent_roles = set()
+        agent_ids = set()
         if crew and hasattr(crew, 'agents'):
             for agent in crew.agents:
                 if hasattr(agent, 'role'):
                     agent_roles.add(agent.role)
+                if getattr(agent, 'id', None) is not None:
+                    agent_ids.add(str(agent.id))
         
         # Store execution data
-        cls._active_executions[execution_id] = {
+        exec_data = {
             'agents': agent_roles,
+            'agent_ids': agent_ids,
             'group_context': group_context,
             'trace_queue': get_trace_queue()
         }
+        with cls._lock:
+            executions = dict(cls._active_executions)
+            executions[execution_id] = exec_data
+            cls._replace_executions(executions)
+            setup_handler = not cls._initialized
+            cls._initialized = True
+        _llm_event_execution.set(execution_id)
         
         log_prefix = f"[LLMEventRouter][{execution_id}]"
         logger.info(f"{log_prefix} Registered execution with agents: {agent_roles}")
         
         # Initialize global handler if needed
-        if not cls._initialized:
+        if setup_handler:
             router._setup_global_handler()
-            cls._initialized = True
     
     @classmethod
     def unregister_execution(cls, execution_id: str):
@@ -81,10 +115,58 @@ class LLMEventRouter:
         Args:
             execution_id: The execution to unregister
         """
-        if execution_id in cls._active_executions:
-            agent_roles = cls._active_executions[execution_id]['agents']
-            del cls._active_executions[execution_id]
-            logger.info(f"[LLMEventRouter][{execution_id}] Unregistered execution with agents: {agent_roles}")
+        with cls._lock:
+            exec_data = cls._active_executions.get(execution_id)
+            if exec_data is None:
+                return
+            cls._replace_executions({
+                exec_id: data for exec_id, data in cls._active_executions.items() if exec_id != execution_id
+            })
+        logger.info(f"[LLMEventRouter][{execution_id}] Unregistered execution with agents: {exec_data['agents']}")
+    
+    @classmethod
+    def _replace_executions(cls, executions: Dict[str, Dict[str, Any]]) -> None:
+        """Publish a new set of executions and the indexes built from it. Called with _lock held."""
+        agent_index: Dict[str, str] = {}
+        role_index: Dict[str, Set[str]] = {}
+        for exec_id, exec_data in executions.items():
+            for agent_id in exec_data.get('agent_ids', ()):
+                agent_index[agent_id] = exec_id
+            for role in exec_data['agents']:
+                role_index.setdefault(role, set()).add(exec_id)
+        cls._agent_index = agent_index
+        cls._role_index = {role: frozenset(exec_ids) for role, exec_ids in role_index.items()}
+        cls._active_executions = executions
+    
+    @classmethod
+    def resolve_execution(cls, event: Any) -> Optional[str]:
+        """
+        Find the execution an LLM event belongs to.
+        
+        Args:
+            event: The CrewAI LLM event
+            
+        Returns:
+            The execution ID, or None if the event cannot be attributed
+        """
+        agent_id = getattr(event, 'agent_id', None)
+        if agent_id:
+            exec_id = cls._agent_index.get(str(agent_id))
+            if exec_id is not None:
+                return exec_id
+        
+        exec_id = _llm_event_execution.get()
+        if exec_id is not None and exec_id in cls._active_executions:
+            return exec_id
+        
+        agent_role = getattr(event, 'agent_role', None)
+        exec_ids = cls._role_index.get(agent_role) if agent_role else None
+        if not exec_ids:
+            return None
+        if len(exec_ids) > 1:
+            logger.debug(f"[LLMEventRouter] Agent role {agent_role} is used by {len(exec_ids)} executions, dropping event")
+            return None
+        return next(iter(exec_ids))
     
     def _setup_global_handler(self):
         """Set up the global LLM event handler once."""
@@ -100,42 +182,44 @@ class LLMEventRouter:
                 
                 agent_role = event.agent_role
                 
-                # Find which execution(s) this belongs to
-                # Note: If multiple executions have the same agent role, the event
-                # will be routed to the first matching one (limitation)
-                for exec_id, exec_data in self._active_executions.items():
-                    if agent_role in exec_data['agents']:
-                        # Extract response content
-                        output_content = "LLM call completed"
-                        if hasattr(event, 'response') and event.response:
-                            output_content = str(event.response)
-                        
-                        # Create trace data
-                        trace_data = {
-                            "job_id": exec_id,
-                            "event_source": agent_role,
-                            "event_context": "llm_call",
-                            "event_type": "llm_call",
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
-                            "output_content": output_content,
-                            "extra_data": {
-                                "type": "llm_event",
-                                "agent_role": agent_role,
-                                "model": str(event.model) if hasattr(event, 'model') else "unknown",
-                                "call_type": str(event.call_type.value) if hasattr(event, 'call_type') else "unknown"
-                            }
-                        }
-                        
-                        # Add group context if available
-                        if exec_data['group_context']:
-                            trace_data["group_id"] = exec_data['group_context'].primary_group_id
-                            trace_data["group_email"] = exec_data['group_context'].group_email
-                        
-                        # Enqueue trace
-                        exec_data['trace_queue'].put_nowait(trace_data)
-                        
-                        logger.debug(f"[LLMEventRouter] Routed LLM event from {agent_role} to execution {exec_id}")
-                        break  # Event processed, don't route to other executions
+                exec_id = self.resolve_execution(event)
+                exec_data = self._active_executions.get(exec_id) if exec_id else None
+                if exec_data is None:
+                    return
+                
+                # Extract response content
+                output_content = "LLM call completed"
+                if hasattr(event, 'response') and event.response:
+                    output_content = str(event.response)
+                
+                # Create trace data
+                trace_data = {
+                    "job_id": exec_id,
+                    "event_source": agent_role,
+                    "event_context": "llm_call",
+                    "event_type": "llm_call",
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "output_content": output_content,
+                    "extra_data": {
+                        "type": "llm_event",
+                        "agent_role": agent_role,
+                        "model": str(event.model) if hasattr(event, 'model') else "unknown",
+                        "call_type": str(event.call_type.value) if hasattr(event, 'call_type') else "unknown"
+                    }
+                }
+                
+                # Add group context if available
+                if exec_data['group_context']:
+                    trace_data["group_id"] = exec_data['group_context'].primary_group_id
+                    trace_data["group_email"] = exec_data['group_context'].group_email
+                
+                # Enqueue trace, unless the execution's trace level leaves LLM calls out
+                trace_data = capture_trace(trace_data)
+                if trace_data is None:
+                    return
+                exec_data['trace_queue'].put_nowait(trace_data)
+                
+                logger.debug(f"[LLMEventRouter] Routed LLM event from {agent_role} to execution {exec_id}")
                 
             except Exception as e:
                 logger.error(f"[LLMEventRouter] Error handling LLM event: {e}")
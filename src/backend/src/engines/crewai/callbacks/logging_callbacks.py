@@ -25,6 +25,7 @@ from crewai.utilities.events.base_event_listener import BaseEventListener
 
 # Import our queue system
 from src.services.trace_queue import get_trace_queue
+from src.engines.crewai.callbacks.trace_capture import capture_trace
 
 # Import the job_output_queue
 from src.services.execution_logs_queue import enqueue_log, get_job_output_queue
@@ -442,6 +443,12 @@ class AgentTraceEventListener(BaseEventListener):
             logger.debug(f"{log_prefix} EVENT[{event_type}] Trace data prepared with keys: {', '.join(trace_data.keys())}")
             logger.debug(f"{log_prefix} EVENT[{event_type}] Queue state before enqueue: Size approximately {self._queue.qsize()}")
             
+            # Apply the execution's capture level, dedup and size budgets
+            trace_data = capture_trace(trace_data)
+            if trace_data is None:
+                logger.debug(f"{log_prefix} EVENT[{event_type}] Not captured at this execution's trace level")
+                return
+            
             # Enqueue the trace data
             self._queue.put_nowait(trace_data)
             
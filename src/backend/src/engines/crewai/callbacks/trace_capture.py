@@ -0,0 +1,265 @@
+"""
+Trace capture for CrewAI executions.
+
+Every producer of execution traces (step and task callbacks, crew callbacks,
+AgentTraceEventListener and the LLM event router) passes its trace through
+capture_trace() before putting it on the trace queue. Each execution has a
+TraceCapture that applies, in order:
+
+1. The execution's capture level:
+   - "full": every trace, payloads up to TRACE_EVENT_MAX_BYTES
+   - "summary": every trace, payloads up to TRACE_SUMMARY_MAX_BYTES
+   - "off": only crew and task lifecycle traces, as summaries
+2. Deduplication: a payload of at least TRACE_DEDUP_MIN_BYTES that was already
+   captured for the execution, e.g. an LLM response that comes back as the
+   agent's step output, is replaced by a reference to the first trace. Task and
+   crew results are always kept since they are read as results.
+3. Budgets: payloads over the level's limit keep their head and tail. Once the
+   execution has stored TRACE_EXECUTION_MAX_BYTES of payloads, further payloads
+   are cut to TRACE_SUMMARY_MAX_BYTES.
+
+Trimmed payloads record their original size and digest in extra_data.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+TRACE_LEVELS = ("full", "summary", "off")
+
+# Traces kept when capture is off
+_LIFECYCLE_EVENT_TYPES = frozenset({"crew_started", "crew_completed", "task_started", "task_completed"})
+# Traces read as results, never replaced by a reference to an earlier trace
+_RESULT_EVENT_TYPES = frozenset({"crew_completed", "task_completed"})
+# Payload digests remembered per execution for deduplication
+_MAX_DIGESTS = 4096
+# Captures kept for executions that were never ended, e.g. flows
+_MAX_CAPTURES = 1000
+
+
+def _normalize_level(level: Optional[str]) -> str:
+    level = (level or settings.TRACE_CAPTURE_LEVEL or "full").lower()
+    if level not in TRACE_LEVELS:
+        logger.warning(f"[TraceCapture] Unknown trace level '{level}', using 'full'")
+        return "full"
+    return level
+
+
+def _truncate(content: str, encoded: bytes, limit: int) -> str:
+    """Keep the head and tail of a payload within limit bytes."""
+    if len(encoded) <= limit:
+        return content
+    marker = f"\n... [truncated, {len(encoded)} bytes in total] ...\n"
+    keep = max(0, limit - len(marker))
+    head = keep * 3 // 4
+    tail = keep - head
+    return (
+        encoded[:head].decode("utf-8", errors="ignore")
+        + marker
+        + (encoded[len(encoded) - tail:].decode("utf-8", errors="ignore") if tail else "")
+    )
+
+
+class TraceCapture:
+    """Capture level, dedup index and byte budget of one execution."""
+
+    def __init__(self, job_id: str, level: Optional[str] = None):
+        self.job_id = job_id
+        self.level = _normalize_level(level)
+        self._lock = threading.Lock()
+        self._digests: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._stats = {
+            "captured": 0,
+            "skipped": 0,
+            "truncated": 0,
+            "deduplicated": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+        }
+
+    def prepare(self, trace_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Apply the capture level, deduplication and budgets to a trace.
+
+        Args:
+            trace_data: Trace as built by the producer
+
+        Returns:
+            The trace to enqueue, or None if it is not captured at this level
+        """
+        event_type = trace_data.get("event_type")
+        if self.level == "off" and event_type not in _LIFECYCLE_EVENT_TYPES:
+            with self._lock:
+                self._stats["skipped"] += 1
+            return None
+
+        content = trace_data.get("output_content")
+        if content is None:
+            content = ""
+        elif not isinstance(content, str):
+            content = str(content)
+        encoded = content.encode("utf-8", errors="replace")
+        size = len(encoded)
+
+        extra: Dict[str, Any] = {}
+        with self._lock:
+            self._stats["captured"] += 1
+            self._stats["bytes_in"] += size
+
+            if size >= settings.TRACE_DEDUP_MIN_BYTES:
+                digest = hashlib.sha256(encoded).hexdigest()
+                first = self._digests.get(digest)
+                if first is not None and event_type not in _RESULT_EVENT_TYPES:
+                    first_type, first_timestamp = first
+                    content = f"[same output as the {first_type} trace at {first_timestamp}]"
+                    extra["duplicate_of"] = {"event_type": first_type, "timestamp": first_timestamp}
+                    extra["output_size"] = size
+                    extra["output_digest"] = digest
+                    self._stats["deduplicated"] += 1
+                    encoded = content.encode("utf-8")
+                elif first is None and len(self._digests) < _MAX_DIGESTS:
+                    self._digests[digest] = (event_type, trace_data.get("timestamp"))
+            else:
+                digest = None
+
+            if self.level == "full" and self._stats["bytes_out"] < settings.TRACE_EXECUTION_MAX_BYTES:
+                limit = settings.TRACE_EVENT_MAX_BYTES
+            else:
+                limit = settings.TRACE_SUMMARY_MAX_BYTES
+            if len(encoded) > limit:
+                content = _truncate(content, encoded, limit)
+                extra["output_truncated"] = True
+                extra["output_size"] = size
+                extra["output_digest"] = digest or hashlib.sha256(encoded).hexdigest()
+                self._stats["truncated"] += 1
+                encoded = content.encode("utf-8")
+            self._stats["bytes_out"] += len(encoded)
+
+        if content is trace_data.get("output_content") and not extra:
+            return trace_data
+        captured = dict(trace_data)
+        captured["output_content"] = content
+        if extra:
+            captured["extra_data"] = {**(trace_data.get("extra_data") or {}), **extra}
+        return captured
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the capture counters of this execution."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["level"] = self.level
+        return stats
+
+
+_captures: "OrderedDict[str, TraceCapture]" = OrderedDict()
+_captures_lock = threading.Lock()
+# Counters of ended captures, added to get_trace_capture_stats()
+_ended_stats: Dict[str, int] = {}
+
+
+def start_trace_capture(job_id: str, level: Optional[str] = None) -> TraceCapture:
+    """
+    Start capturing traces for an execution.
+
+    Args:
+        job_id: Execution ID
+        level: "full", "summary" or "off", defaults to TRACE_CAPTURE_LEVEL
+
+    Returns:
+        The execution's capture
+    """
+    capture = TraceCapture(job_id, level)
+    with _captures_lock:
+        _captures[job_id] = capture
+        _captures.move_to_end(job_id)
+        while len(_captures) > _MAX_CAPTURES:
+            _end_locked(next(iter(_captures)))
+    logger.info(f"[TraceCapture][{job_id}] Capturing traces at level '{capture.level}'")
+    return capture
+
+
+def get_trace_capture(job_id: str) -> TraceCapture:
+    """Get the capture of an execution, starting one at the default level if needed."""
+    capture = _captures.get(job_id)
+    if capture is not None:
+        return capture
+    with _captures_lock:
+        capture = _captures.get(job_id)
+        if capture is None:
+            capture = _captures[job_id] = TraceCapture(job_id)
+            while len(_captures) > _MAX_CAPTURES:
+                _end_locked(next(iter(_captures)))
+    return capture
+
+
+def capture_trace(trace_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Prepare a trace for the trace queue.
+
+    Args:
+        trace_data: Trace with at least job_id, event_type and output_content
+
+    Returns:
+        The trace to enqueue, or None if the execution does not capture it
+    """
+    job_id = trace_data.get("job_id")
+    if not job_id:
+        return trace_data
+    return get_trace_capture(job_id).prepare(trace_data)
+
+
+def _end_locked(job_id: str) -> Optional[TraceCapture]:
+    capture = _captures.pop(job_id, None)
+    if capture is not None:
+        for key, value in capture.get_stats().items():
+            if key != "level":
+                _ended_stats[key] = _ended_stats.get(key, 0) + value
+    return capture
+
+
+def end_trace_capture(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Stop capturing traces for an execution and release its dedup index.
+
+    Returns:
+        The execution's capture counters, or None if it had no capture
+    """
+    with _captures_lock:
+        capture = _end_locked(job_id)
+    if capture is None:
+        return None
+    stats = capture.get_stats()
+    logger.info(f"[TraceCapture][{job_id}] Capture ended: {stats}")
+    return stats
+
+
+def get_trace_capture_stats() -> Dict[str, Any]:
+    """
+    Get trace capture counters over all executions.
+
+    Returns:
+        Dictionary with captured, skipped, truncated and deduplicated trace
+        counts, payload bytes before and after capture, and active captures
+    """
+    with _captures_lock:
+        stats = dict(_ended_stats)
+        captures = list(_captures.values())
+    for capture in captures:
+        for key, value in capture.get_stats().items():
+            if key != "level":
+                stats[key] = stats.get(key, 0) + value
+    stats["active_captures"] = len(captures)
+    return stats
+
+
+def clear_trace_captures() -> None:
+    """Drop all captures and counters."""
+    with _captures_lock:
+        _captures.clear()
+        _ended_stats.clear()
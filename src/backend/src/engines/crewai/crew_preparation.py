@@ -588,6 +588,7 @@ class CrewPreparation:
                             from chromadb import EmbeddingFunction, Documents, Embeddings
                             import litellm
                             from typing import cast
+                            from src.services.databricks_embedding_service import databricks_embedding_service
                             
                             # Get Databricks endpoint - prioritize environment variable
                             databricks_endpoint = os.getenv('DATABRICKS_HOST', '')
@@ -638,59 +639,32 @@ class CrewPreparation:
                                 
                                 def __call__(self, input: Documents) -> Embeddings:
                                     try:
-                                        # Always use direct HTTP request to avoid litellm/SDK authentication issues
-                                        import requests
-                                        
-                                        # Construct the correct endpoint URL using centralized utility
-                                        # Extract workspace URL from api_base then build full invocation URL
+                                        # Use the shared embedding service, which caches vectors and
+                                        # batches concurrent calls into one HTTP request
                                         workspace_url = DatabricksURLUtils.extract_workspace_from_endpoint(self.api_base)
-                                        endpoint_url = DatabricksURLUtils.construct_model_invocation_url(workspace_url, self.model)
-                                        if not endpoint_url:
-                                            raise Exception("Failed to construct valid endpoint URL")
-                                        logger.debug(f"Databricks embedding endpoint URL: {endpoint_url}")
-                                        payload = {"input": input if isinstance(input, list) else [input]}
                                         
                                         # Prepare headers - prioritize user token for OBO auth
                                         if self.user_token:
                                             # Use OBO token directly for Databricks Apps
-                                            headers = {
-                                                "Authorization": f"Bearer {self.user_token}",
-                                                "Content-Type": "application/json"
-                                            }
+                                            headers = {"Authorization": f"Bearer {self.user_token}"}
                                             logger.debug("Using OBO token for embeddings")
                                         elif self.auth_headers:
                                             # Use pre-fetched OAuth headers
                                             headers = self.auth_headers
                                         elif self.api_key:
                                             # Use API key authentication
-                                            headers = {
-                                                "Authorization": f"Bearer {self.api_key}",
-                                                "Content-Type": "application/json"
-                                            }
+                                            headers = {"Authorization": f"Bearer {self.api_key}"}
                                         else:
                                             logger.error("No authentication method available for Databricks embeddings")
                                             raise Exception("No authentication method available")
                                         
-                                        try:
-                                            response = requests.post(
-                                                endpoint_url, 
-                                                headers=headers, 
-                                                json=payload,
-                                                timeout=30
-                                            )
-                                            if response.status_code == 200:
-                                                result = response.json()
-                                                if 'data' in result and len(result['data']) > 0:
-                                                    embeddings = [item.get('embedding', item) for item in result['data']]
-                                                    return cast(Embeddings, embeddings)
-                                                else:
-                                                    raise Exception(f"Unexpected response format: {result}")
-                                            else:
-                                                error_text = response.text
-                                                raise Exception(f"Embedding API error {response.status_code}: {error_text}")
-                                        except requests.exceptions.RequestException as e:
-                                            logger.error(f"Request failed for Databricks embeddings: {e}")
-                                            raise e
+                                        embeddings = databricks_embedding_service.embed_sync(
+                                            input if isinstance(input, list) else [input],
+                                            model=self.model,
+                                            workspace_url=workspace_url,
+                                            headers=headers
+                                        )
+                                        return cast(Embeddings, embeddings)
                                     except Exception as e:
                                         logger.error(f"Error in Databricks embedding function: {e}")
                                         raise e
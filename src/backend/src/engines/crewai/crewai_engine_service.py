@@ -34,6 +34,7 @@ from src.core.logger import LoggerManager
 
 from src.schemas.execution import CrewConfig, FlowConfig
 from src.utils.user_context import GroupContext
+from src.utils.async_polling import cancel_execution_polls
 
 logger = LoggerManager.get_instance().crew
 
@@ -344,6 +345,10 @@ class CrewAIEngineService(BaseEngineService):
             job_info = self._running_jobs[execution_id]
             task = job_info["task"]
             
+            # Stop the Databricks polls of its tools, the crew thread itself
+            # cannot be interrupted
+            cancel_execution_polls(execution_id)
+            
             # Cancel the task
             task.cancel()
             
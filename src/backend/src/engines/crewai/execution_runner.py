@@ -102,6 +102,16 @@ async def run_crew(execution_id: str, crew: Crew, running_jobs: Dict, group_cont
     # Initialize logging for this job
     crew_logger.setup_for_job(execution_id, group_context)
     
+    # Start trace capture at the crew's trace level before any trace is produced
+    from src.engines.crewai.callbacks.trace_capture import start_trace_capture, end_trace_capture
+    start_trace_capture(execution_id, config.get("trace_level") if config else None)
+    
+    # Meter the tokens and cost of this execution's LLM calls (asyncio.to_thread
+    # copies the context into kickoff)
+    from src.services.llm_usage_meter import start_usage_metering, end_usage_metering, start_usage_writer
+    start_usage_metering(execution_id, group_context, execution_name=getattr(crew, "name", None))
+    await start_usage_writer()
+    
     # Create execution-scoped callbacks (replaces global event listeners)
     # Pass the crew for enhanced context tracking
     step_callback, task_callback = create_execution_callbacks(
@@ -138,6 +148,11 @@ async def run_crew(execution_id: str, crew: Crew, running_jobs: Dict, group_cont
     from src.engines.crewai.callbacks.llm_event_router import register_execution_for_llm_events
     register_execution_for_llm_events(execution_id, crew, group_context)
     logger.info(f"Registered execution {execution_id} for LLM event routing")
+
+    # Tie Databricks polls started by this execution's tools to it, so cancelling
+    # the execution also stops them (asyncio.to_thread copies the context into kickoff)
+    from src.utils.async_polling import bind_polling_execution, release_execution_polls
+    bind_polling_execution(execution_id)
     
     # Start the trace writer to process queued traces
     from src.engines.crewai.trace_management import TraceManager
@@ -434,6 +449,9 @@ async def run_crew(execution_id: str, crew: Crew, running_jobs: Dict, group_cont
         from src.engines.crewai.callbacks.llm_event_router import unregister_execution_from_llm_events
         unregister_execution_from_llm_events(execution_id)
         logger.info(f"Unregistered execution {execution_id} from LLM event routing")
+        release_execution_polls(execution_id)
+        end_trace_capture(execution_id)
+        end_usage_metering(execution_id)
         
         # Clean up MCP tools
         try:
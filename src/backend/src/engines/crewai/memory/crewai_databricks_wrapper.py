@@ -21,6 +21,7 @@ from src.core.logger import LoggerManager
 from src.engines.crewai.memory.databricks_vector_storage import DatabricksVectorStorage
 from src.schemas.databricks_index_schemas import DatabricksIndexSchemas
 from src.engines.crewai.memory.entity_relationship_retriever import EntityRelationshipRetriever
+from src.utils.background_loop import get_background_loop
 
 logger = LoggerManager.get_instance().crew
 entity_logger = LoggerManager.get_instance().databricks_entity
@@ -71,13 +72,34 @@ class CrewAIDatabricksWrapper:
                 
                 self.relationship_retriever = EntityRelationshipRetriever(
                     memory_backend_service=None,  # Will be created per request
-                    embedding_model="sentence-transformers/all-MiniLM-L6-v2"
+                    embedding_model="sentence-transformers/all-MiniLM-L6-v2",
+                    embedding_function=self._get_batch_embedding_function()
                 )
                 entity_logger.info("[__init__] Relationship-based entity retrieval enabled")
             except Exception as e:
                 entity_logger.warning(f"[__init__] Failed to initialize relationship retriever: {e}")
                 self.relationship_retriever = None
     
+    def _get_batch_embedding_function(self):
+        """
+        Get a function that embeds a list of texts with the configured embedder.
+        
+        Returns:
+            Callable taking a list of texts and returning one embedding per text,
+            or None if the embedder cannot embed batches
+        """
+        if isinstance(self.embedder, dict):
+            if self.embedder.get('provider') == 'custom':
+                custom_embedder = self.embedder.get('config', {}).get('embedder')
+                if callable(custom_embedder):
+                    return custom_embedder
+            return None
+        if callable(self.embedder):
+            return self.embedder
+        if hasattr(self.embedder, 'embed_documents'):
+            return self.embedder.embed_documents
+        return None
+    
     def set_agent_context(self, agent):
         """
         Set the current agent context for this wrapper.
@@ -117,7 +139,6 @@ class CrewAIDatabricksWrapper:
         Creates service instance dynamically to maintain async patterns.
         """
         try:
-            import asyncio
             from src.services.memory_backend_service import MemoryBackendService
             from src.core.unit_of_work import UnitOfWork
             
@@ -139,7 +160,7 @@ class CrewAIDatabricksWrapper:
                 entity_logger.info(f"[_service_search] Final filters: {filters}")
             
             async def _async_search():
-                async with UnitOfWork() as uow:
+                async with UnitOfWork(session_factory=background_loop.session_factory()) as uow:
                     service = MemoryBackendService(uow)
                     return await service.search_vectors(
                         workspace_url=self.workspace_url,
@@ -152,37 +173,9 @@ class CrewAIDatabricksWrapper:
                         user_token=self.user_token
                     )
             
-            # Handle async service call from sync context
-            try:
-                # Check if we're in an async context
-                loop = asyncio.get_running_loop()
-                # We're in an async context, create a new event loop in a thread
-                import concurrent.futures
-                import os
-                
-                # Ensure USE_NULLPOOL is set before creating new connections
-                if not os.environ.get("USE_NULLPOOL"):
-                    os.environ["USE_NULLPOOL"] = "true"
-                
-                def run_in_new_loop():
-                    """Run the async function in a completely new event loop."""
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    try:
-                        return new_loop.run_until_complete(_async_search())
-                    finally:
-                        new_loop.close()
-                
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(run_in_new_loop)
-                    return future.result()
-            except RuntimeError:
-                # No event loop running, safe to use asyncio.run
-                # Ensure USE_NULLPOOL is set
-                import os
-                if not os.environ.get("USE_NULLPOOL"):
-                    os.environ["USE_NULLPOOL"] = "true"
-                return asyncio.run(_async_search())
+            # Run on the shared background loop, reusing its pooled connections
+            background_loop = get_background_loop()
+            return background_loop.run(_async_search())
         except Exception as e:
             logger.error(f"Error in service search call: {e}")
             return []
@@ -195,42 +188,11 @@ class CrewAIDatabricksWrapper:
             data: Data dictionary to save
         """
         try:
-            import asyncio
-            
             async def _do_save():
                 await self.storage.save(data)
             
-            # Handle async call from sync context
-            try:
-                # Check if we're in an async context
-                loop = asyncio.get_running_loop()
-                # We're in an async context, create a new event loop in a thread
-                import concurrent.futures
-                import os
-                
-                # Ensure USE_NULLPOOL is set before creating new connections
-                if not os.environ.get("USE_NULLPOOL"):
-                    os.environ["USE_NULLPOOL"] = "true"
-                
-                def run_in_new_loop():
-                    """Run the async function in a completely new event loop."""
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    try:
-                        return new_loop.run_until_complete(_do_save())
-                    finally:
-                        new_loop.close()
-                
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(run_in_new_loop)
-                    future.result()
-            except RuntimeError:
-                # No event loop running, safe to use asyncio.run
-                # Ensure USE_NULLPOOL is set
-                import os
-                if not os.environ.get("USE_NULLPOOL"):
-                    os.environ["USE_NULLPOOL"] = "true"
-                asyncio.run(_do_save())
+            # Run on the shared background loop, reusing its pooled connections
+            get_background_loop().run(_do_save())
         except Exception as e:
             logger.error(f"Error in async save: {e}")
     
@@ -253,11 +215,11 @@ class CrewAIDatabricksWrapper:
             Enhanced search results
         """
         try:
-            import asyncio
+            background_loop = get_background_loop()
             
             async def _do_relationship_search():
                 # Create service instance within async context
-                async with self.unit_of_work_class() as uow:
+                async with self.unit_of_work_class(session_factory=background_loop.session_factory()) as uow:
                     service = self.memory_backend_service_class(uow)
                     # Temporarily set the service for the retriever
                     self.relationship_retriever.memory_backend_service = service
@@ -276,37 +238,8 @@ class CrewAIDatabricksWrapper:
                         relationship_weight=relationship_weight
                     )
             
-            # Handle async call from sync context
-            try:
-                # Check if we're in an async context
-                loop = asyncio.get_running_loop()
-                # We're in an async context, create a new event loop in a thread
-                import concurrent.futures
-                import os
-                
-                # Ensure USE_NULLPOOL is set before creating new connections
-                if not os.environ.get("USE_NULLPOOL"):
-                    os.environ["USE_NULLPOOL"] = "true"
-                
-                def run_in_new_loop():
-                    """Run the async function in a completely new event loop."""
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    try:
-                        return new_loop.run_until_complete(_do_relationship_search())
-                    finally:
-                        new_loop.close()
-                
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(run_in_new_loop)
-                    return future.result()
-            except RuntimeError:
-                # No event loop running, safe to use asyncio.run
-                # Ensure USE_NULLPOOL is set
-                import os
-                if not os.environ.get("USE_NULLPOOL"):
-                    os.environ["USE_NULLPOOL"] = "true"
-                return asyncio.run(_do_relationship_search())
+            # Run on the shared background loop, reusing its pooled connections
+            return background_loop.run(_do_relationship_search())
         except Exception as e:
             entity_logger.error(f"Error in async relationship search: {e}")
             # Return original results as fallback
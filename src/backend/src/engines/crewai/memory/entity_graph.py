@@ -0,0 +1,296 @@
+"""
+Incremental entity relationship graph for relationship-aware entity retrieval.
+
+Keeps L2-normalized description embeddings for every known entity so that
+semantic edges come from one thresholded matrix product instead of pairwise
+Python comparisons. Name similarity uses an inverted word index and
+co-occurrence uses substring scans over the joined descriptions, so both only
+look at candidate pairs. Upserting entities only recomputes the edges of the
+entities that were added or changed.
+"""
+
+import bisect
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+# Keyword groups used to type semantic edges, in priority order
+RELATIONSHIP_KEYWORDS: List[Tuple[str, List[str]]] = [
+    ('family', ['father', 'mother', 'son', 'daughter', 'birth name', 'real name', 'born', 'family']),
+    ('professional', ['mentor', 'trainer', 'boss', 'employee', 'colleague', 'worked', 'career']),
+    ('organizational', ['organization', 'company', 'institution', 'member', 'belongs']),
+]
+
+# (source, target, strength, relationship_type)
+GraphEdge = Tuple[str, str, float, str]
+
+
+def relationship_keyword_mask(description: str) -> int:
+    """Get a bit mask of the RELATIONSHIP_KEYWORDS groups a description mentions."""
+    description_lower = description.lower()
+    mask = 0
+    for bit, (_, keywords) in enumerate(RELATIONSHIP_KEYWORDS):
+        if any(keyword in description_lower for keyword in keywords):
+            mask |= 1 << bit
+    return mask
+
+
+def relationship_type_from_mask(mask: int) -> str:
+    """Get the relationship type for the combined keyword mask of two descriptions."""
+    for bit, (relationship_type, _) in enumerate(RELATIONSHIP_KEYWORDS):
+        if mask & (1 << bit):
+            return relationship_type
+    return 'semantic'
+
+
+class EntityGraph:
+    """
+    Cached relationship graph over the entities of one index.
+
+    Edges are stored undirected; semantic_edges() and name_based_edges() orient
+    them by the order of the requested names, matching the pairwise builders it replaces.
+    """
+
+    # Rows of the similarity matrix computed at once, bounds memory use
+    _SIMILARITY_CHUNK_SIZE = 512
+
+    def __init__(self, similarity_threshold: float = 0.7, name_similarity_threshold: float = 0.8):
+        self.similarity_threshold = similarity_threshold
+        self.name_similarity_threshold = name_similarity_threshold
+        self._descriptions: Dict[str, str] = {}
+        self._embeddings: Dict[str, np.ndarray] = {}
+        self._masks: Dict[str, int] = {}
+        self._words: Dict[str, Set[str]] = {}
+        self._word_index: Dict[str, Set[str]] = {}
+        # name -> {other name: similarity}
+        self._semantic: Dict[str, Dict[str, float]] = {}
+        # name -> {other name: (strength, relationship_type)}
+        self._name_based: Dict[str, Dict[str, Tuple[float, str]]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._descriptions)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._descriptions
+
+    def names(self) -> List[str]:
+        """Get the names of all entities in the graph."""
+        with self._lock:
+            return list(self._descriptions)
+
+    def stale_names(self, descriptions: Dict[str, str], require_embeddings: bool = False) -> List[str]:
+        """
+        Get the names that are new or whose description changed.
+
+        Args:
+            descriptions: Entity name -> current description
+            require_embeddings: Also treat entities with a description but no
+                embedding as stale, so failed embeddings are retried
+        """
+        with self._lock:
+            return [
+                name for name, description in descriptions.items()
+                if self._descriptions.get(name) != description
+                or (require_embeddings and description and name not in self._embeddings)
+            ]
+
+    def upsert(self, descriptions: Dict[str, str], embeddings: Dict[str, Sequence[float]]) -> None:
+        """
+        Add or update entities and recompute their edges.
+
+        Args:
+            descriptions: Entity name -> description for the entities to upsert
+            embeddings: Entity name -> description embedding, entities without
+                one get no semantic edges
+        """
+        if not descriptions:
+            return
+        with self._lock:
+            changed = list(descriptions)
+            self._detach(changed)
+            for name in changed:
+                description = descriptions[name] or ''
+                self._descriptions[name] = description
+                self._masks[name] = relationship_keyword_mask(description)
+                words = set(name.lower().split())
+                self._words[name] = words
+                for word in words:
+                    self._word_index.setdefault(word, set()).add(name)
+                vector = self._normalize(embeddings.get(name))
+                if vector is not None:
+                    self._embeddings[name] = vector
+            self._link_semantic(changed)
+            self._link_name_based(changed)
+
+    def remove(self, names: Iterable[str]) -> None:
+        """Remove entities and their edges."""
+        with self._lock:
+            self._detach([name for name in names if name in self._descriptions])
+
+    def semantic_edges(self, names: Sequence[str]) -> List[GraphEdge]:
+        """
+        Get the semantic similarity edges between the given entities.
+
+        Args:
+            names: Entity names, edges point from the earlier to the later name
+        """
+        with self._lock:
+            return self._collect(names, lambda name: (
+                (other, similarity, relationship_type_from_mask(self._masks[name] | self._masks[other]))
+                for other, similarity in self._semantic.get(name, {}).items()
+            ))
+
+    def name_based_edges(self, names: Sequence[str]) -> List[GraphEdge]:
+        """
+        Get the name similarity and co-occurrence edges between the given entities.
+
+        Args:
+            names: Entity names, edges point from the earlier to the later name
+        """
+        with self._lock:
+            return self._collect(names, lambda name: (
+                (other, strength, relationship_type)
+                for other, (strength, relationship_type) in self._name_based.get(name, {}).items()
+            ))
+
+    def _collect(self, names: Sequence[str], neighbours) -> List[GraphEdge]:
+        """Orient and order the edges produced by neighbours(name). Caller holds the lock."""
+        order = {name: position for position, name in enumerate(names)}
+        edges = []
+        for position, name in enumerate(names):
+            if name not in self._descriptions:
+                continue
+            targets = [
+                (order[other], other, strength, relationship_type)
+                for other, strength, relationship_type in neighbours(name)
+                if order.get(other, -1) > position
+            ]
+            targets.sort()
+            edges.extend((name, other, strength, relationship_type) for _, other, strength, relationship_type in targets)
+        return edges
+
+    def _detach(self, names: List[str]) -> None:
+        """Drop the given entities and every edge that touches them."""
+        for name in names:
+            for adjacency in (self._semantic, self._name_based):
+                for other in adjacency.pop(name, {}):
+                    neighbours = adjacency.get(other)
+                    if neighbours is not None:
+                        neighbours.pop(name, None)
+            for word in self._words.pop(name, ()):
+                postings = self._word_index.get(word)
+                if postings is not None:
+                    postings.discard(name)
+                    if not postings:
+                        del self._word_index[word]
+            self._descriptions.pop(name, None)
+            self._embeddings.pop(name, None)
+            self._masks.pop(name, None)
+
+    def _link_semantic(self, changed: List[str]) -> None:
+        """Add semantic edges between the changed entities and all entities."""
+        rows = [name for name in changed if name in self._embeddings]
+        if not rows:
+            return
+        names = list(self._embeddings)
+        dimension = self._embeddings[rows[0]].shape[0]
+        names = [name for name in names if self._embeddings[name].shape[0] == dimension]
+        matrix = np.stack([self._embeddings[name] for name in names])
+        for start in range(0, len(rows), self._SIMILARITY_CHUNK_SIZE):
+            chunk = [name for name in rows[start:start + self._SIMILARITY_CHUNK_SIZE]
+                     if self._embeddings[name].shape[0] == dimension]
+            if not chunk:
+                continue
+            # (chunk, d) @ (d, n) -> (chunk, n) cosine similarities
+            scores = np.stack([self._embeddings[name] for name in chunk]) @ matrix.T
+            for row, column in zip(*np.nonzero(scores > self.similarity_threshold)):
+                source, target = chunk[row], names[column]
+                if source == target:
+                    continue
+                similarity = float(scores[row, column])
+                self._semantic.setdefault(source, {})[target] = similarity
+                self._semantic.setdefault(target, {})[source] = similarity
+
+    def _link_name_based(self, changed: List[str]) -> None:
+        """Add name similarity and co-occurrence edges for the changed entities."""
+        changed_set = set(changed)
+        pairs: Set[Tuple[str, str]] = set()
+
+        # Candidate pairs for name similarity share at least one word
+        for name in changed:
+            for word in self._words[name]:
+                pairs.update((name, other) for other in self._word_index.get(word, ()) if other != name)
+
+        # Any entity name mentioned in a changed description
+        cooccurring: Set[Tuple[str, str]] = set()
+        changed_descriptions = [name for name in changed if self._descriptions[name]]
+        for name, mentioned_in in self._find_mentions(self._descriptions, changed_descriptions):
+            cooccurring.add(_pair(name, mentioned_in))
+        # Changed entity names mentioned in the other descriptions
+        others = [name for name in self._descriptions if name not in changed_set and self._descriptions[name]]
+        for name, mentioned_in in self._find_mentions(changed_set, others):
+            cooccurring.add(_pair(name, mentioned_in))
+
+        for first, second in {_pair(a, b) for a, b in pairs} | cooccurring:
+            name_similarity = self._name_similarity(first, second)
+            cooccurs = (first, second) in cooccurring
+            if name_similarity > self.name_similarity_threshold or cooccurs:
+                relationship_type = "name_based" if name_similarity > self.name_similarity_threshold else "contextual"
+                strength = max(name_similarity, 0.6 if cooccurs else 0.0)
+                self._name_based.setdefault(first, {})[second] = (strength, relationship_type)
+                self._name_based.setdefault(second, {})[first] = (strength, relationship_type)
+
+    def _find_mentions(self, names: Iterable[str], documents: List[str]):
+        """
+        Yield (name, document) pairs where the lowercased name occurs in the
+        lowercased description of document, scanning one joined string per name.
+        """
+        if not documents:
+            return
+        starts = []
+        parts = []
+        offset = 0
+        for document in documents:
+            starts.append(offset)
+            text = self._descriptions[document].lower()
+            parts.append(text)
+            offset += len(text) + 1
+        haystack = '\x00'.join(parts)
+        for name in names:
+            needle = name.lower()
+            if not needle:
+                continue
+            position = haystack.find(needle)
+            while position != -1:
+                index = bisect.bisect_right(starts, position) - 1
+                document = documents[index]
+                if document != name:
+                    yield name, document
+                if index + 1 >= len(starts):
+                    break
+                position = haystack.find(needle, starts[index + 1])
+
+    def _name_similarity(self, first: str, second: str) -> float:
+        """Jaccard similarity of the words in two entity names."""
+        words1, words2 = self._words[first], self._words[second]
+        if not words1 or not words2:
+            return 0.0
+        return len(words1 & words2) / len(words1 | words2)
+
+    @staticmethod
+    def _normalize(embedding: Optional[Sequence[float]]) -> Optional[np.ndarray]:
+        """Convert an embedding to a unit-length float32 vector, None if unusable."""
+        if embedding is None:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector) if vector.size else 0.0
+        if norm == 0:
+            return None
+        return vector / norm
+
+
+def _pair(first: str, second: str) -> Tuple[str, str]:
+    """Order a pair of names so each undirected pair has one key."""
+    return (first, second) if first <= second else (second, first)
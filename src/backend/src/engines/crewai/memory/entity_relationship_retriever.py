@@ -9,14 +9,38 @@ semantic analysis to infer relationships dynamically.
 import asyncio
 import json
 import logging
-from typing import Dict, List, Any, Set, Tuple, Optional
+import threading
+from typing import Callable, Dict, List, Any, Sequence, Set, Tuple, Optional
 from dataclasses import dataclass
 import numpy as np
 
 from src.core.logger import LoggerManager
+from src.engines.crewai.memory.entity_graph import EntityGraph
 
 entity_logger = LoggerManager.get_instance().databricks_entity
 
+# Maps a batch of texts to one embedding per text
+EmbeddingFunction = Callable[[List[str]], Sequence[Sequence[float]]]
+
+# Entity graphs cached per (workspace_url, index_name, group_id)
+_entity_graphs: Dict[Tuple[str, str, str], EntityGraph] = {}
+_entity_graphs_lock = threading.Lock()
+
+
+def _get_entity_graph(key: Tuple[str, str, str]) -> EntityGraph:
+    """Get the cached entity graph for an index, creating it if needed."""
+    with _entity_graphs_lock:
+        graph = _entity_graphs.get(key)
+        if graph is None:
+            graph = _entity_graphs[key] = EntityGraph()
+        return graph
+
+
+def clear_entity_graph_cache() -> None:
+    """Drop all cached entity graphs."""
+    with _entity_graphs_lock:
+        _entity_graphs.clear()
+
 
 @dataclass
 class EntityNode:
@@ -58,19 +82,27 @@ class EntityRelationshipRetriever:
     hard-coded patterns.
     """
     
-    def __init__(self, memory_backend_service, embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"):
+    # Number of descriptions sent to the embedding function per call
+    _EMBEDDING_BATCH_SIZE = 32
+    
+    def __init__(self, memory_backend_service, embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+                 embedding_function: Optional[EmbeddingFunction] = None):
         """
         Initialize the relationship retriever.
         
         Args:
             memory_backend_service: MemoryBackendService for all vector operations
             embedding_model: Model for computing embeddings
+            embedding_function: Embeds a batch of texts, normally the crew's memory embedder.
+                Without it no semantic edges are built.
         """
         self.memory_backend_service = memory_backend_service
         self.embedding_model = embedding_model
+        self.embedding_function = embedding_function
         self.entity_graph: Dict[str, EntityNode] = {}
         self.relationship_edges: List[RelationshipEdge] = []
-        self.description_embeddings: Dict[str, np.ndarray] = {}
+        # Graph of the index being searched, replaced by the cached one in the build methods
+        self._graph = EntityGraph()
         
     async def build_entity_graph(self, workspace_url: str, index_name: str, endpoint_name: str,
                                user_token: str, agent_id: str, group_id: str) -> None:
@@ -94,7 +126,7 @@ class EntityRelationshipRetriever:
             # Clear existing graph
             self.entity_graph.clear()
             self.relationship_edges.clear()
-            self.description_embeddings.clear()
+            self._graph = _get_entity_graph((workspace_url, index_name, group_id))
             
             # Build entity nodes
             for entity_data in all_entities:
@@ -109,11 +141,9 @@ class EntityRelationshipRetriever:
                     )
                 )
                 self.entity_graph[entity_node.name] = entity_node
-                
-                # Compute and store description embedding
-                if entity_node.description:
-                    embedding = await self._compute_embedding(entity_node.description)
-                    self.description_embeddings[entity_node.name] = embedding
+            
+            # This is the full entity set, forget entities that were deleted from the index
+            self._graph.remove([name for name in self._graph.names() if name not in self.entity_graph])
             
             # Build relationship edges
             await self._build_relationship_edges()
@@ -261,7 +291,7 @@ class EntityRelationshipRetriever:
             # Clear existing graph
             self.entity_graph.clear()
             self.relationship_edges.clear()
-            self.description_embeddings.clear()
+            self._graph = _get_entity_graph((workspace_url, index_name, group_id))
             
             # Add initial entities to the graph
             for entity_data in initial_results:
@@ -276,11 +306,6 @@ class EntityRelationshipRetriever:
                     )
                 )
                 self.entity_graph[entity_node.name] = entity_node
-                
-                # Compute and store description embedding
-                if entity_node.description:
-                    embedding = await self._compute_embedding(entity_node.description)
-                    self.description_embeddings[entity_node.name] = embedding
             
             entity_logger.info(f"[_build_focused_entity_graph] Added {len(self.entity_graph)} seed entities to graph")
             
@@ -341,6 +366,9 @@ class EntityRelationshipRetriever:
         try:
             # Create a simple embedding for the entity name to search
             name_embedding = await self._compute_embedding(entity_name)
+            if name_embedding is None:
+                entity_logger.info(f"[_search_and_add_entity_by_name] No embedding available for '{entity_name}', skipping search")
+                return
             
             # Search for entities with similar names
             results = await self.memory_backend_service.search_vectors(
@@ -372,11 +400,6 @@ class EntityRelationshipRetriever:
                         )
                         self.entity_graph[found_name] = entity_node
                         
-                        # Compute and store description embedding
-                        if entity_node.description:
-                            embedding = await self._compute_embedding(entity_node.description)
-                            self.description_embeddings[found_name] = embedding
-                        
                         entity_logger.info(f"[_search_and_add_entity_by_name] Added related entity: {found_name}")
                         break
             
@@ -491,24 +514,42 @@ class EntityRelationshipRetriever:
         
         return relationships
     
-    async def _compute_embedding(self, text: str) -> np.ndarray:
-        """Compute embedding for text using the configured model."""
-        try:
-            # This would use your actual embedding service
-            # For now, return a placeholder - you'd implement actual embedding computation
-            # using your databricks embedding service or similar
-            
-            # Placeholder: return random embedding of appropriate dimension
-            # In real implementation, use: await self.databricks_service.compute_embedding(text)
-            return np.random.rand(384)  # Common dimension for sentence transformers
-            
-        except Exception as e:
-            entity_logger.error(f"Error computing embedding: {e}")
-            return np.zeros(384)
+    async def _compute_embedding(self, text: str) -> Optional[np.ndarray]:
+        """Compute embedding for text using the configured embedding function."""
+        return (await self._compute_embeddings([text]))[0]
+    
+    async def _compute_embeddings(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Compute embeddings for texts in batches using the configured embedding function.
+        
+        Returns:
+            One embedding per text, None where no embedding could be computed
+        """
+        embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+        if not texts or self.embedding_function is None:
+            return embeddings
+        
+        for start in range(0, len(texts), self._EMBEDDING_BATCH_SIZE):
+            batch = texts[start:start + self._EMBEDDING_BATCH_SIZE]
+            try:
+                # The embedding function makes blocking HTTP calls
+                vectors = await asyncio.to_thread(self.embedding_function, batch)
+            except Exception as e:
+                entity_logger.error(f"Error computing embeddings for {len(batch)} texts: {e}")
+                continue
+            if vectors is None or len(vectors) != len(batch):
+                entity_logger.error(f"Embedding function returned {0 if vectors is None else len(vectors)} embeddings for {len(batch)} texts")
+                continue
+            for offset, vector in enumerate(vectors):
+                embeddings[start + offset] = np.asarray(vector, dtype=np.float32)
+        return embeddings
     
     async def _build_relationship_edges(self) -> None:
         """Build relationship edges using multiple strategies."""
         
+        # Bring the cached graph up to date with the current entities
+        await self._update_entity_graph()
+        
         # Strategy 1: Explicit relationships from the relationships field
         await self._build_explicit_relationship_edges()
         
@@ -518,6 +559,21 @@ class EntityRelationshipRetriever:
         # Strategy 3: Name similarity and co-occurrence patterns
         await self._build_name_based_relationship_edges()
     
+    async def _update_entity_graph(self) -> None:
+        """Embed new or changed entity descriptions in batches and upsert them into the graph."""
+        descriptions = {name: entity.description or '' for name, entity in self.entity_graph.items()}
+        stale = self._graph.stale_names(descriptions, require_embeddings=self.embedding_function is not None)
+        if not stale:
+            return
+        
+        to_embed = [name for name in stale if descriptions[name]]
+        vectors = await self._compute_embeddings([descriptions[name] for name in to_embed])
+        self._graph.upsert(
+            {name: descriptions[name] for name in stale},
+            {name: vector for name, vector in zip(to_embed, vectors) if vector is not None}
+        )
+        entity_logger.info(f"[_update_entity_graph] Updated {len(stale)} of {len(descriptions)} entities, graph holds {len(self._graph)} entities")
+    
     async def _build_explicit_relationship_edges(self) -> None:
         """Build edges from explicit relationship declarations."""
         for entity_name, entity in self.entity_graph.items():
@@ -536,68 +592,27 @@ class EntityRelationshipRetriever:
     
     async def _build_semantic_relationship_edges(self) -> None:
         """Build edges based on semantic similarity of descriptions."""
-        entity_names = list(self.entity_graph.keys())
-        
-        for i, name1 in enumerate(entity_names):
-            entity1 = self.entity_graph[name1]
-            embedding1 = self.description_embeddings.get(name1)
-            
-            if embedding1 is None:
-                continue
-                
-            for name2 in entity_names[i+1:]:
-                entity2 = self.entity_graph[name2]
-                embedding2 = self.description_embeddings.get(name2)
-                
-                if embedding2 is None:
-                    continue
-                
-                # Compute cosine similarity
-                similarity = self._cosine_similarity(embedding1, embedding2)
-                
-                # Create edge if similarity is above threshold
-                if similarity > 0.7:  # Adjustable threshold
-                    relationship_type = await self._infer_relationship_type_from_descriptions(
-                        entity1.description, entity2.description
-                    )
-                    
-                    edge = RelationshipEdge(
-                        source=name1,
-                        target=name2,
-                        strength=similarity,
-                        relationship_type=relationship_type,
-                        evidence=f"High semantic similarity ({similarity:.3f}) between descriptions"
-                    )
-                    self.relationship_edges.append(edge)
+        for source, target, similarity, relationship_type in self._graph.semantic_edges(list(self.entity_graph)):
+            edge = RelationshipEdge(
+                source=source,
+                target=target,
+                strength=similarity,
+                relationship_type=relationship_type,
+                evidence=f"High semantic similarity ({similarity:.3f}) between descriptions"
+            )
+            self.relationship_edges.append(edge)
     
     async def _build_name_based_relationship_edges(self) -> None:
         """Build edges based on name patterns and co-occurrence."""
-        entity_names = list(self.entity_graph.keys())
-        
-        for i, name1 in enumerate(entity_names):
-            entity1 = self.entity_graph[name1]
-            
-            for name2 in entity_names[i+1:]:
-                entity2 = self.entity_graph[name2]
-                
-                # Check for name similarity patterns
-                name_similarity = self._compute_name_similarity(name1, name2)
-                description_cooccurrence = self._check_description_cooccurrence(
-                    entity1.description, entity2.description, name1, name2
-                )
-                
-                if name_similarity > 0.8 or description_cooccurrence:
-                    relationship_type = "name_based" if name_similarity > 0.8 else "contextual"
-                    strength = max(name_similarity, 0.6 if description_cooccurrence else 0.0)
-                    
-                    edge = RelationshipEdge(
-                        source=name1,
-                        target=name2,
-                        strength=strength,
-                        relationship_type=relationship_type,
-                        evidence=f"Name similarity or contextual co-occurrence detected"
-                    )
-                    self.relationship_edges.append(edge)
+        for source, target, strength, relationship_type in self._graph.name_based_edges(list(self.entity_graph)):
+            edge = RelationshipEdge(
+                source=source,
+                target=target,
+                strength=strength,
+                relationship_type=relationship_type,
+                evidence=f"Name similarity or contextual co-occurrence detected"
+            )
+            self.relationship_edges.append(edge)
     
     def _find_entity_by_name(self, name: str) -> Optional[EntityNode]:
         """Find entity by name, handling variations and partial matches."""
@@ -618,39 +633,6 @@ class EntityRelationshipRetriever:
         
         return None
     
-    def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
-        """Compute cosine similarity between two vectors."""
-        try:
-            dot_product = np.dot(vec1, vec2)
-            norm1 = np.linalg.norm(vec1)
-            norm2 = np.linalg.norm(vec2)
-            
-            if norm1 == 0 or norm2 == 0:
-                return 0.0
-            
-            return dot_product / (norm1 * norm2)
-        except:
-            return 0.0
-    
-    async def _infer_relationship_type_from_descriptions(self, desc1: str, desc2: str) -> str:
-        """Infer relationship type using semantic analysis of descriptions."""
-        desc1_lower = desc1.lower()
-        desc2_lower = desc2.lower()
-        
-        # Look for relationship keywords in descriptions
-        family_keywords = ['father', 'mother', 'son', 'daughter', 'birth name', 'real name', 'born', 'family']
-        professional_keywords = ['mentor', 'trainer', 'boss', 'employee', 'colleague', 'worked', 'career']
-        organizational_keywords = ['organization', 'company', 'institution', 'member', 'belongs']
-        
-        if any(keyword in desc1_lower or keyword in desc2_lower for keyword in family_keywords):
-            return 'family'
-        elif any(keyword in desc1_lower or keyword in desc2_lower for keyword in professional_keywords):
-            return 'professional'
-        elif any(keyword in desc1_lower or keyword in desc2_lower for keyword in organizational_keywords):
-            return 'organizational'
-        else:
-            return 'semantic'
-    
     def _compute_name_similarity(self, name1: str, name2: str) -> float:
         """Compute name similarity using multiple strategies."""
         # Simple Jaccard similarity on words
@@ -665,15 +647,6 @@ class EntityRelationshipRetriever:
         
         return intersection / union if union > 0 else 0.0
     
-    def _check_description_cooccurrence(self, desc1: str, desc2: str, name1: str, name2: str) -> bool:
-        """Check if entities co-occur in each other's descriptions."""
-        desc1_lower = desc1.lower()
-        desc2_lower = desc2.lower()
-        name1_lower = name1.lower()
-        name2_lower = name2.lower()
-        
-        return name1_lower in desc2_lower or name2_lower in desc1_lower
-    
     async def _traverse_relationships(
         self, 
         seed_entities: List[str], 
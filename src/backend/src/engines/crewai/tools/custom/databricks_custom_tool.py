@@ -6,8 +6,15 @@ import asyncio
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field, PrivateAttr, model_validator
 
+from src.utils.async_polling import PollCancelledError, PollTimeoutError, poll_until, run_polling
+from src.utils.databricks_http_client import databricks_http_session
+
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for a SQL statement to reach a terminal state
+_STATEMENT_TIMEOUT = 300
+_TERMINAL_STATEMENT_STATES = ("SUCCEEDED", "FAILED", "CANCELED")
+
 if TYPE_CHECKING:
     from databricks.sdk import WorkspaceClient
 
@@ -647,61 +654,18 @@ class DatabricksCustomTool(BaseTool):
                 # Handle immediate execution errors
                 return f"Error starting query execution: {str(execute_error)}"
 
-            # Poll for results with better error handling
-            import time
-            result = None
-            timeout = 300  # 5 minutes timeout
-            start_time = time.time()
-            poll_count = 0
-            previous_state = None  # Track previous state to detect changes
-
-            while time.time() - start_time < timeout:
-                poll_count += 1
-                try:
-                    # Get statement status
-                    result = statement.get_statement(statement_id)
-
-                    # Check if finished - be very explicit about state checking
-                    if hasattr(result, 'status') and hasattr(result.status, 'state'):
-                        state_value = str(result.status.state)  # Convert to string to handle both string and enum
-
-                        # Track state changes for debugging
-                        if previous_state != state_value:
-                            previous_state = state_value
-
-                        # Check if state indicates completion
-                        if "SUCCEEDED" in state_value:
-                            break
-                        elif "FAILED" in state_value:
-                            # Extract error message with more robust handling
-                            error_info = "No detailed error info"
-                            try:
-                                # First try direct access to error.message
-                                if hasattr(result.status, 'error') and result.status.error:
-                                    if hasattr(result.status.error, 'message'):
-                                        error_info = result.status.error.message
-                                    # Some APIs may have a different structure
-                                    elif hasattr(result.status.error, 'error_message'):
-                                        error_info = result.status.error.error_message
-                                    # Last resort, try to convert the whole error object to string
-                                    else:
-                                        error_info = str(result.status.error)
-                            except Exception as err_extract_error:
-                                # If all else fails, try to get any info we can
-                                error_info = f"Error details unavailable: {str(err_extract_error)}"
-
-                            # Return immediately on first FAILED state detection
-                            return f"Query execution failed: {error_info}"
-                        elif "CANCELED" in state_value:
-                            return "Query was canceled"
-
-                except Exception as poll_error:
-                    # Don't immediately fail - try again a few times
-                    if poll_count > 3:
-                        return f"Error checking query status: {str(poll_error)}"
-
-                # Wait before polling again
-                time.sleep(2)
+            # Poll for results on the shared background loop, tolerating a few poll errors
+            try:
+                result = run_polling(
+                    self._wait_for_statement(statement_id, max_poll_errors=3),
+                    timeout=_STATEMENT_TIMEOUT
+                )
+            except PollTimeoutError as timeout_error:
+                result = timeout_error.last_result
+            except PollCancelledError:
+                return "Query was canceled because the execution was stopped"
+            except Exception as poll_error:
+                return f"Error checking query status: {str(poll_error)}"
 
             # Check if we timed out
             if result is None:
@@ -712,7 +676,27 @@ class DatabricksCustomTool(BaseTool):
 
             # Convert state to string for comparison
             state_value = str(result.status.state)
-            if not any(state in state_value for state in ["SUCCEEDED", "FAILED", "CANCELED"]):
+            if "FAILED" in state_value:
+                # Extract error message with more robust handling
+                error_info = "No detailed error info"
+                try:
+                    # First try direct access to error.message
+                    if hasattr(result.status, 'error') and result.status.error:
+                        if hasattr(result.status.error, 'message'):
+                            error_info = result.status.error.message
+                        # Some APIs may have a different structure
+                        elif hasattr(result.status.error, 'error_message'):
+                            error_info = result.status.error.error_message
+                        # Last resort, try to convert the whole error object to string
+                        else:
+                            error_info = str(result.status.error)
+                except Exception as err_extract_error:
+                    # If all else fails, try to get any info we can
+                    error_info = f"Error details unavailable: {str(err_extract_error)}"
+                return f"Query execution failed: {error_info}"
+            elif "CANCELED" in state_value:
+                return "Query was canceled"
+            elif "SUCCEEDED" not in state_value:
                 return f"Query timed out after 5 minutes (last state: {state_value})"
 
             # Get results - adapt this based on the actual structure of the result object
@@ -1130,42 +1114,34 @@ class DatabricksCustomTool(BaseTool):
 
             statement_id = execution.statement_id
 
-            # Poll for results
-            import time
-            result = None
-            timeout = 300  # 5 minutes timeout
-            start_time = time.time()
-
-            while time.time() - start_time < timeout:
-                try:
-                    result = statement_execution.get_statement(statement_id)
-
-                    if hasattr(result, 'status') and hasattr(result.status, 'state'):
-                        state_value = str(result.status.state)
-
-                        if "SUCCEEDED" in state_value:
-                            break
-                        elif "FAILED" in state_value:
-                            error_info = "No detailed error info"
-                            if hasattr(result.status, 'error') and result.status.error:
-                                if hasattr(result.status.error, 'message'):
-                                    error_info = result.status.error.message
-                                else:
-                                    error_info = str(result.status.error)
-                            return f"Statement execution failed: {error_info}"
-                        elif "CANCELED" in state_value:
-                            return "Statement was canceled"
-
-                except Exception as poll_error:
-                    return f"Error checking statement status: {str(poll_error)}"
-
-                time.sleep(2)
+            # Poll for results on the shared background loop
+            try:
+                result = run_polling(
+                    self._wait_for_statement(statement_id),
+                    timeout=_STATEMENT_TIMEOUT
+                )
+            except PollTimeoutError as timeout_error:
+                result = timeout_error.last_result
+            except PollCancelledError:
+                return "Statement was canceled because the execution was stopped"
+            except Exception as poll_error:
+                return f"Error checking statement status: {str(poll_error)}"
 
             if result is None:
                 return "Statement timed out"
 
             state_value = str(result.status.state)
-            if "SUCCEEDED" not in state_value:
+            if "FAILED" in state_value:
+                error_info = "No detailed error info"
+                if hasattr(result.status, 'error') and result.status.error:
+                    if hasattr(result.status.error, 'message'):
+                        error_info = result.status.error.message
+                    else:
+                        error_info = str(result.status.error)
+                return f"Statement execution failed: {error_info}"
+            elif "CANCELED" in state_value:
+                return "Statement was canceled"
+            elif "SUCCEEDED" not in state_value:
                 return f"Statement did not succeed (final state: {state_value})"
 
             # For INSERT statements, we typically just want to confirm success
@@ -1184,6 +1160,67 @@ class DatabricksCustomTool(BaseTool):
         except Exception as e:
             return f"Error executing statement: {str(e)}"
 
+    async def _get_statement(self, host: str, headers: dict, statement_id: str):
+        """
+        GET a statement on the pooled workspace session.
+
+        Same request and response as StatementExecutionAPI.get_statement, without
+        blocking the event loop.
+        """
+        from databricks.sdk.service.sql import StatementResponse
+
+        async with databricks_http_session(host) as session:
+            async with session.get(f"{host}/api/2.0/sql/statements/{statement_id}", headers=headers) as response:
+                response.raise_for_status()
+                return StatementResponse.from_dict(await response.json())
+
+    async def _wait_for_statement(self, statement_id: str, max_poll_errors: int = 0):
+        """
+        Poll a SQL statement until it reached a terminal state.
+
+        Polls are plain aiohttp requests authenticated like the workspace client
+        that executed the statement; the client's credentials are resolved once
+        per statement, in a worker thread since the SDK may refresh a token.
+
+        Args:
+            statement_id: ID of the executed statement
+            max_poll_errors: Failed polls tolerated before the error is raised
+
+        Returns:
+            The statement response in a terminal state
+
+        Raises:
+            PollTimeoutError: If the statement did not finish in _STATEMENT_TIMEOUT
+                seconds, last_result holds the last response
+        """
+        config = self.workspace_client.config
+        host = config.host.rstrip("/")
+        headers = await asyncio.to_thread(config.authenticate)
+        poll_errors = 0
+
+        async def fetch():
+            nonlocal poll_errors
+            try:
+                return await self._get_statement(host, headers, statement_id)
+            except Exception:
+                poll_errors += 1
+                if poll_errors > max_poll_errors:
+                    raise
+                return None
+
+        def is_done(result) -> bool:
+            if result is None or not hasattr(result, 'status') or not hasattr(result.status, 'state'):
+                return False
+            state_value = str(result.status.state)
+            return any(state in state_value for state in _TERMINAL_STATEMENT_STATES)
+
+        return await poll_until(
+            fetch,
+            is_done,
+            timeout=_STATEMENT_TIMEOUT,
+            description=f"SQL statement {statement_id}",
+        )
+
     def _clean_insert_statement(self, statement: str) -> str:
         """
         Clean INSERT statement to fix common data type and escaping issues.
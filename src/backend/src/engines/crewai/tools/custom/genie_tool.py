@@ -2,16 +2,22 @@ from crewai.tools import BaseTool
 from typing import Optional, Type, Union, Dict, Any, List
 from pydantic import BaseModel, Field, PrivateAttr, field_validator
 import logging
+import aiohttp
 import requests
-import time
 import os
 from pathlib import Path
 import asyncio
 
+from src.utils.async_polling import BackoffPolicy, PollCancelledError, PollTimeoutError, poll_until, run_polling
+from src.utils.databricks_http_client import databricks_http_session
+
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Message statuses that end polling without an answer
+_FAILED_STATUSES = ("FAILED", "CANCELLED", "QUERY_RESULT_EXPIRED")
+
 class GenieInput(BaseModel):
     """Input schema for Genie."""
     question: str = Field(..., description="The question to be answered using Genie.")
@@ -573,23 +579,14 @@ class GenieTool(BaseTool):
             logger.error(f"Error in _start_or_continue_conversation: {str(e)}")
             raise
 
-    def _get_message_status(self, conversation_id: str, message_id: str) -> dict:
-        """Get the status and content of a message."""
-        space_id = str(self._space_id) if self._space_id else "01efdd2cd03211d0ab74f620f0023b77"
-        url = self._make_url(
-            f"/api/2.0/genie/spaces/{space_id}/conversations/{conversation_id}/messages/{message_id}"
-        )
-        
-        # Get authentication headers
+    async def _get_request_headers(self) -> dict:
+        """Get authentication headers, falling back to the configured tokens."""
         headers = None
         try:
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            headers = loop.run_until_complete(self._get_auth_headers())
-            loop.close()
+            headers = await self._get_auth_headers()
         except Exception as e:
-            logger.debug(f"Async auth failed, falling back to sync: {e}")
+            logger.debug(f"Async auth failed, falling back to configured token: {e}")
+        if not headers:
             if self._user_token:
                 headers = {
                     "Authorization": f"Bearer {self._user_token}",
@@ -603,45 +600,90 @@ class GenieTool(BaseTool):
         
         if not headers:
             raise Exception("No authentication headers available")
-        
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        return headers
 
-    def _get_query_result(self, conversation_id: str, message_id: str) -> dict:
+    async def _get_json(self, url: str) -> dict:
+        """GET a Genie API URL on the pooled workspace session."""
+        headers = await self._get_request_headers()
+        async with databricks_http_session(f"https://{self._host}") as session:
+            async with session.get(url, headers=headers) as response:
+                response.raise_for_status()
+                return await response.json()
+
+    async def _get_message_status(self, conversation_id: str, message_id: str) -> dict:
+        """Get the status and content of a message."""
+        space_id = str(self._space_id) if self._space_id else "01efdd2cd03211d0ab74f620f0023b77"
+        url = self._make_url(
+            f"/api/2.0/genie/spaces/{space_id}/conversations/{conversation_id}/messages/{message_id}"
+        )
+        return await self._get_json(url)
+
+    async def _get_query_result(self, conversation_id: str, message_id: str) -> dict:
         """Get the SQL query results for a message."""
         space_id = str(self._space_id) if self._space_id else "01efdd2cd03211d0ab74f620f0023b77"
         url = self._make_url(
             f"/api/2.0/genie/spaces/{space_id}/conversations/{conversation_id}/messages/{message_id}/query-result"
         )
+        return await self._get_json(url)
+
+    def _has_answer(self, question: str, status_data: dict, result_data: Optional[dict]) -> bool:
+        """Check whether a completed message has a meaningful text response or query results."""
+        for attachment in status_data.get("attachments", []):
+            if "text" in attachment and attachment["text"].get("content"):
+                content = attachment["text"]["content"]
+                if content.strip() and content.strip() != question.strip():
+                    return True
         
-        # Get authentication headers
-        headers = None
-        try:
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            headers = loop.run_until_complete(self._get_auth_headers())
-            loop.close()
-        except Exception as e:
-            logger.debug(f"Async auth failed, falling back to sync: {e}")
-            if self._user_token:
-                headers = {
-                    "Authorization": f"Bearer {self._user_token}",
-                    "Content-Type": "application/json"
-                }
-            elif self._token:
-                headers = {
-                    "Authorization": f"Bearer {self._token}",
-                    "Content-Type": "application/json"
-                }
+        return (
+            result_data is not None and 
+            "statement_response" in result_data and
+            "result" in result_data["statement_response"] and
+            "data_typed_array" in result_data["statement_response"]["result"] and
+            len(result_data["statement_response"]["result"]["data_typed_array"]) > 0
+        )
+
+    async def _wait_for_message(self, question: str, conversation_id: str, message_id: str) -> str:
+        """
+        Poll a Genie message until it has an answer or reached a terminal state.
+
+        Polls back off exponentially up to _retry_delay seconds between polls,
+        for at most _max_retries * _retry_delay seconds in total.
+        """
+        async def fetch():
+            status_data = await self._get_message_status(conversation_id, message_id)
+            result_data = None
+            if status_data.get("status") == "COMPLETED":
+                try:
+                    result_data = await self._get_query_result(conversation_id, message_id)
+                except aiohttp.ClientError:
+                    result_data = None
+            return status_data, result_data
         
-        if not headers:
-            raise Exception("No authentication headers available")
+        def is_done(state) -> bool:
+            status_data, result_data = state
+            status = status_data.get("status")
+            if status in _FAILED_STATUSES:
+                return True
+            return status == "COMPLETED" and self._has_answer(question, status_data, result_data)
+        
+        timeout = self._max_retries * self._retry_delay
+        try:
+            status_data, result_data = await poll_until(
+                fetch,
+                is_done,
+                timeout=timeout,
+                policy=BackoffPolicy.from_settings(max_delay=self._retry_delay),
+                description=f"Genie message {message_id[:8]}",
+            )
+        except PollTimeoutError:
+            return f"Query timed out after {timeout} seconds. Please try a simpler question or check your Databricks Genie configuration."
         
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        status = status_data.get("status")
+        if status in _FAILED_STATUSES:
+            error_msg = f"Query {status.lower()}"
+            logger.error(error_msg)
+            return error_msg
+        return self._extract_response(status_data, result_data)
 
     def _extract_response(self, message_status: dict, result_data: Optional[dict] = None) -> str:
         """Extract the response from message status and query results."""
@@ -751,52 +793,21 @@ This tool can extract information from databases and provide structured data in
                 
                 logger.info(f"Using conversation {conversation_id[:8]} with message {message_id[:8]}")
                 
-                # Poll for completion
-                attempt = 0
-                while attempt < self._max_retries:
-                    status_data = self._get_message_status(conversation_id, message_id)
-                    status = status_data.get("status")
-                    
-                    if status in ["FAILED", "CANCELLED", "QUERY_RESULT_EXPIRED"]:
-                        error_msg = f"Query {status.lower()}"
-                        logger.error(error_msg)
-                        return error_msg
-                    
-                    if status == "COMPLETED":
-                        try:
-                            result_data = self._get_query_result(conversation_id, message_id)
-                        except requests.exceptions.RequestException:
-                            result_data = None
-                        
-                        # Check if we have meaningful data in either the response or query results
-                        has_meaningful_response = False
-                        if "attachments" in status_data:
-                            for attachment in status_data["attachments"]:
-                                if "text" in attachment and attachment["text"].get("content"):
-                                    content = attachment["text"]["content"]
-                                    if content.strip() and content.strip() != question.strip():
-                                        has_meaningful_response = True
-                                        break
-                        
-                        has_query_results = (
-                            result_data is not None and 
-                            "statement_response" in result_data and
-                            "result" in result_data["statement_response"] and
-                            "data_typed_array" in result_data["statement_response"]["result"] and
-                            len(result_data["statement_response"]["result"]["data_typed_array"]) > 0
-                        )
-                        
-                        if has_meaningful_response or has_query_results:
-                            return self._extract_response(status_data, result_data)
-                    
-                    time.sleep(self._retry_delay)
-                    attempt += 1
-                
-                return f"Query timed out after {self._max_retries * self._retry_delay} seconds. Please try a simpler question or check your Databricks Genie configuration."
+                # Poll for completion on the shared background loop
+                return run_polling(
+                    self._wait_for_message(question, conversation_id, message_id),
+                    timeout=self._max_retries * self._retry_delay
+                )
+            
+            except PollCancelledError:
+                return "Query cancelled because the execution was stopped."
             
-            except requests.exceptions.ConnectionError:
+            except (requests.exceptions.ConnectionError, aiohttp.ClientConnectionError):
                 return f"Error connecting to Databricks Genie API at {self._host}. Please check your network connection and host configuration."
             
+            except aiohttp.ClientResponseError as e:
+                return f"{str(e)} HTTP Error {e.status} when connecting to Databricks Genie API. Please verify your API token and permissions."
+            
             except requests.exceptions.HTTPError as e:
                 status_code = e.response.status_code if hasattr(e, 'response') and hasattr(e.response, 'status_code') else 'unknown'
                 return f"{str(e)} HTTP Error {status_code} when connecting to Databricks Genie API. Please verify your API token and permissions."
@@ -1,13 +1,10 @@
 import logging
-import os
 import asyncio
-import json
-import sys
-import subprocess
 import concurrent.futures
 import traceback
 import aiohttp
 from typing import Optional
+from src.engines.common.mcp_worker_pool import get_mcp_worker_pool, make_server_key
 from src.utils.databricks_auth import get_databricks_auth_headers, get_mcp_auth_headers
 
 logger = logging.getLogger(__name__)
@@ -33,17 +30,7 @@ async def get_or_create_mcp_adapter(server_params, adapter_id=None):
     global _mcp_connection_pool
     
     # Create a unique key for this server configuration
-    # Include URL and auth type to ensure different auth contexts get different adapters
-    server_url = server_params.get('url', 'stdio')
-    auth_type = server_params.get('auth_type', 'default')
-    
-    # For stdio transport, include the command in the key
-    if server_params.get('transport') == 'stdio' and server_params.get('command'):
-        command_str = ' '.join(server_params['command']) if isinstance(server_params['command'], list) else server_params['command']
-        pool_key = f"stdio_{command_str}"
-    else:
-        # For HTTP-based servers, use URL and auth type
-        pool_key = f"{server_url}_{auth_type}"
+    pool_key = make_server_key(server_params)
     
     # Check if we have a valid adapter in the pool
     if pool_key in _mcp_connection_pool:
@@ -216,6 +203,24 @@ async def call_databricks_api(endpoint, method="GET", data=None, params=None):
         logger.error(f"Error calling Databricks API: {e}")
         return {"error": f"API error: {str(e)}"}
 
+def _extract_text_content(result):
+    """
+    Get the text of an MCP call result.
+    
+    Args:
+        result: MCP result object or any other value
+        
+    Returns:
+        The joined text contents, or the result as a string
+    """
+    if hasattr(result, 'content') and result.content:
+        text_contents = []
+        for content in result.content:
+            if hasattr(content, 'text'):
+                text_contents.append(content.text)
+        return ' '.join(text_contents) if text_contents else str(result)
+    return str(result)
+
 def create_crewai_tool_from_mcp(mcp_tool_dict):
     """
     Create a CrewAI tool from an MCP tool dictionary.
@@ -306,14 +311,7 @@ def create_crewai_tool_from_mcp(mcp_tool_dict):
                     finally:
                         loop.close()
                 
-                # Extract text content if it's an MCP result object
-                if hasattr(result, 'content') and result.content:
-                    text_contents = []
-                    for content in result.content:
-                        if hasattr(content, 'text'):
-                            text_contents.append(content.text)
-                    return ' '.join(text_contents) if text_contents else str(result)
-                return str(result)
+                return _extract_text_content(result)
             except Exception as e:
                 logger.error(f"Error executing MCP tool {self._mcp_tool_wrapper.name}: {e}")
                 return f"Error: {str(e)}"
@@ -323,7 +321,7 @@ def create_crewai_tool_from_mcp(mcp_tool_dict):
 
 def wrap_mcp_tool(tool):
     """
-    Wrap an MCP tool to handle event loop issues by using process isolation
+    Wrap an MCP tool to handle event loop issues by using the MCP worker pool
     
     Args:
         tool: The MCP tool to wrap
@@ -346,22 +344,16 @@ def wrap_mcp_tool(tool):
                 logger.debug(f"Attempting direct execution of {tool_name}")
                 return original_run(*args, **kwargs)
             except Exception as direct_error:
-                # If we get an error, try the process isolation approach
+                # If we get an error, try the persistent MCP worker pool
                 logger.warning(f"Using alternate approach for MCP tool {tool_name} due to event loop issue: {direct_error}")
                 
                 try:
-                    logger.debug(f"Running {tool_name} in separate process")
-                    # Use a new event loop to avoid conflicts
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        result = loop.run_until_complete(run_in_separate_process(tool_name, kwargs))
-                    finally:
-                        loop.close()
+                    logger.debug(f"Running {tool_name} on the MCP worker pool")
+                    result = run_in_worker_pool(tool, kwargs)
                     
                     # If result indicates an error, try direct API call
                     if isinstance(result, str) and result.startswith("Error:"):
-                        logger.warning(f"Process isolation failed for {tool_name}, attempting direct API call")
+                        logger.warning(f"MCP worker pool failed for {tool_name}, attempting direct API call")
                         
                         # Try the direct API approach based on the tool (now async)
                         # Note: We can't use asyncio.run here as we're already in an async context
@@ -415,25 +407,19 @@ def wrap_mcp_tool(tool):
             logger.debug(f"Attempting direct execution of {tool_name}")
             return original_run(*args, **kwargs)
         except Exception as direct_error:
-            # If we get an error about event loop, use process isolation
+            # If we get an error about event loop, use the MCP worker pool
             error_message = str(direct_error)
             logger.warning(f"Error during direct execution of {tool_name}: {error_message}")
             
             if "Event loop is closed" in error_message or isinstance(direct_error, RuntimeError):
                 logger.warning(f"Using alternate approach for MCP tool {tool_name} due to event loop issue")
                 
-                # Start a fresh process with a new MCP connection
+                # Reuse the pooled MCP connection to the tool's server
                 try:
-                    logger.debug(f"Running {tool_name} in separate process")
-                    # Use a new event loop to avoid conflicts
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        return loop.run_until_complete(run_in_separate_process(tool_name, kwargs))
-                    finally:
-                        loop.close()
+                    logger.debug(f"Running {tool_name} on the MCP worker pool")
+                    return run_in_worker_pool(tool, kwargs)
                 except Exception as e:
-                    logger.error(f"Error running MCP tool {tool_name} in separate process: {e}")
+                    logger.error(f"Error running MCP tool {tool_name} on the MCP worker pool: {e}")
                     return f"Error executing tool: {str(e)}"
             else:
                 # For other errors, just log and return the error
@@ -450,95 +436,32 @@ def wrap_mcp_tool(tool):
     
     return tool
 
-async def run_in_separate_process(tool_name, kwargs):
+def run_in_worker_pool(tool, kwargs):
     """
-    Run an MCP tool in a separate process to avoid event loop issues (async version)
+    Run an MCP tool on the persistent MCP worker pool to avoid event loop issues
+    
+    The call is sent over a long-lived session to the tool's server on the
+    pool's own event loop, so no interpreter or connection is started per call.
     
     Args:
-        tool_name: Name of the tool to run
+        tool: The MCP tool to run, as created by create_crewai_tool_from_mcp
         kwargs: Keyword arguments for the tool
         
     Returns:
-        The result of running the tool
+        The text of the result, or a message starting with "Error:"
     """
-    script_path = None
-    try:
-        # Get the absolute path to the backend directory
-        backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
-        
-        # Create a temporary script to run the tool
-        script_content = f"""
-import asyncio
-import json
-import sys
-import os
-
-# Add the backend directory to Python path
-sys.path.insert(0, r"{backend_dir}")
-
-from src.engines.crewai.tools.mcp_handler import create_mcp_adapter
-
-async def run_tool():
+    mcp_tool = getattr(tool, '_mcp_tool_wrapper', None)
+    server_params = getattr(getattr(mcp_tool, 'adapter', None), 'server_params', None)
+    if not isinstance(server_params, dict):
+        return f"Error: No MCP server configuration available for tool {tool.name}"
+    
+    arguments = {key: value for key, value in kwargs.items() if key != 'dummy'}
     try:
-        # Create a new MCP adapter
-        adapter = await create_mcp_adapter()
-        
-        # Get the tool function
-        tool_func = getattr(adapter, tool_name)
-        
-        # Run the tool
-        result = await tool_func(**{json.dumps(kwargs)})
-        
-        # Log the result as JSON
-        print(json.dumps(result))
-        
-    except Exception as e:
-        print(json.dumps({{'error': str(e)}}))
-    finally:
-        # Clean up
-        if 'adapter' in locals():
-            await adapter.close()
-
-# Run the async function
-asyncio.run(run_tool())
-"""
-        
-        # Write the script to a temporary file
-        script_path = f"/tmp/mcp_tool_{tool_name}.py"
-        with open(script_path, "w") as f:
-            f.write(script_content)
-        
-        # Run the script in a separate process using async subprocess
-        env = os.environ.copy()
-        env["PYTHONPATH"] = backend_dir
-        
-        process = await asyncio.create_subprocess_exec(
-            sys.executable, script_path,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            env=env
-        )
-        
-        stdout, stderr = await process.communicate()
-        
-        if process.returncode != 0:
-            return {"error": f"Process error: {stderr.decode()}"}
-        
-        # Parse the result
-        try:
-            return json.loads(stdout.decode())
-        except json.JSONDecodeError:
-            return {"error": f"Failed to parse result: {stdout.decode()}"}
-            
+        result = get_mcp_worker_pool().call_tool(server_params, mcp_tool.name, arguments)
     except Exception as e:
-        return {"error": f"Error running tool: {str(e)}"}
-    finally:
-        # Clean up the temporary script
-        if script_path:
-            try:
-                os.remove(script_path)
-            except:
-                pass
+        logger.error(f"Error running MCP tool {tool.name} on the MCP worker pool: {e}")
+        return f"Error: {str(e)}"
+    return _extract_text_content(result)
 
 
 async def stop_mcp_adapter(adapter):
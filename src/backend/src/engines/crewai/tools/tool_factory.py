@@ -128,6 +128,50 @@ from src.services.tool_service import ToolService
 from src.services.api_keys_service import ApiKeysService
 from src.schemas.tool import ToolUpdate
 from src.utils.encryption_utils import EncryptionUtils
+from src.core.tool_catalog_cache import tool_catalog_cache
+from src.utils.asyncio_utils import dispose_loop_engine, execute_db_operation_with_loop_engine
+
+# API keys exported to the environment when a factory is initialized
+PRELOADED_API_KEYS = ["SERPER_API_KEY", "PERPLEXITY_API_KEY", "OPENAI_API_KEY", "FIRECRAWL_API_KEY", "LINKUP_API_KEY", "DATABRICKS_API_KEY"]
+
+
+async def _fetch_tool_catalog() -> List[object]:
+    """Load all tools through ToolService, used on tool catalog cache misses"""
+    from src.core.unit_of_work import UnitOfWork
+    
+    async with UnitOfWork() as uow:
+        tool_service = await ToolService.from_unit_of_work(uow)
+        tools_response = await tool_service.get_all_tools()
+        return tools_response.tools
+
+
+async def _fetch_api_keys(names: List[str]) -> Dict[str, Optional[str]]:
+    """Load and decrypt several API keys with one query, used on API key cache misses"""
+    async def _get_keys_operation(session):
+        api_keys = await ApiKeysService(session).find_by_names(names)
+        decrypted = {}
+        for api_key in api_keys:
+            if not api_key.encrypted_value:
+                continue
+            try:
+                decrypted[api_key.name] = EncryptionUtils.decrypt_value(api_key.encrypted_value)
+            except Exception as e:
+                logger.error(f"Error decrypting {api_key.name}: {str(e)}")
+        return decrypted
+    
+    # Use the engine of the current loop to avoid transaction conflicts with the caller's session
+    return await execute_db_operation_with_loop_engine(_get_keys_operation)
+
+
+def _close_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Close a throwaway event loop after closing the pooled connections _fetch_api_keys opened on it"""
+    try:
+        loop.run_until_complete(dispose_loop_engine())
+    except Exception as e:
+        logger.error(f"Error disposing the loop engine: {str(e)}")
+    finally:
+        loop.close()
+
 
 class ToolFactory:
     def __init__(self, config, api_keys_service=None, user_token=None):
@@ -233,41 +277,42 @@ class ToolFactory:
         return instance
     
     async def initialize(self):
-        """Initialize the tool factory asynchronously"""
+        """
+        Initialize the tool factory asynchronously.
+        
+        The tool catalog and the API keys come from the process-wide tool catalog
+        cache and are loaded concurrently, so on a warm cache this does not touch
+        the database at all.
+        """
         if not self._initialized:
             try:
-                await self._load_available_tools_async()
-                
-                # Setup API keys if we have the service
                 if self.api_keys_service:
-                    # Pre-load common API keys into environment
-                    api_keys_to_load = ["SERPER_API_KEY", "PERPLEXITY_API_KEY", "OPENAI_API_KEY", "FIRECRAWL_API_KEY", "LINKUP_API_KEY", "DATABRICKS_API_KEY"]
-                    for key_name in api_keys_to_load:
-                        try:
-                            # Use utility function to avoid event loop issues
-                            from src.utils.asyncio_utils import execute_db_operation_with_fresh_engine
-                            
-                            async def _get_key_operation(session):
-                                # Re-use the api_keys_service but with a fresh session
-                                from src.services.api_keys_service import ApiKeysService
-                                api_keys_service = ApiKeysService(session)
-                                return await api_keys_service.find_by_name(key_name)
-                                
-                            api_key_obj = await execute_db_operation_with_fresh_engine(_get_key_operation)
-                            
-                            if api_key_obj and api_key_obj.encrypted_value:
-                                # Decrypt the value
-                                api_key = EncryptionUtils.decrypt_value(api_key_obj.encrypted_value)
-                                os.environ[key_name] = api_key
-                                logger.info(f"Pre-loaded {key_name} from ApiKeysService")
-                        except Exception as e:
-                            logger.error(f"Error pre-loading {key_name}: {str(e)}")
+                    # Load the catalog and pre-load common API keys into the environment together
+                    await asyncio.gather(
+                        self._load_available_tools_async(),
+                        self._preload_api_keys_async()
+                    )
+                else:
+                    await self._load_available_tools_async()
                 
                 self._initialized = True
             except Exception as e:
                 logger.error(f"Error during async initialization: {e}")
                 raise
     
+    async def _preload_api_keys_async(self):
+        """Export the common API keys to the environment, loading them with one query on a cache miss"""
+        try:
+            api_keys = await tool_catalog_cache.get_api_keys(PRELOADED_API_KEYS, _fetch_api_keys)
+        except Exception as e:
+            logger.error(f"Error pre-loading API keys: {str(e)}")
+            return
+        
+        for key_name, api_key in api_keys.items():
+            if api_key:
+                os.environ[key_name] = api_key
+                logger.info(f"Pre-loaded {key_name} from ApiKeysService")
+    
     def _sync_load_available_tools(self):
         """
         Synchronous method to load available tools
@@ -293,48 +338,28 @@ class ToolFactory:
                     
                     # Also pre-load API keys if we have the service
                     if self.api_keys_service:
-                        # Pre-load common API keys into environment
-                        api_keys_to_load = ["SERPER_API_KEY", "PERPLEXITY_API_KEY", "OPENAI_API_KEY", "FIRECRAWL_API_KEY", "LINKUP_API_KEY", "DATABRICKS_API_KEY"]
-                        for key_name in api_keys_to_load:
-                            try:
-                                api_key = loop.run_until_complete(
-                                    self._get_api_key_async(key_name)
-                                )
-                                if api_key:
-                                    os.environ[key_name] = api_key
-                                    logger.info(f"Pre-loaded {key_name} from ApiKeysService (sync)")
-                            except Exception as e:
-                                logger.error(f"Error pre-loading {key_name} (sync): {str(e)}")
+                        loop.run_until_complete(self._preload_api_keys_async())
                 finally:
-                    loop.close()
+                    _close_loop(loop)
         except Exception as e:
             logger.error(f"Error in _sync_load_available_tools: {str(e)}")
             import traceback
             logger.error(traceback.format_exc())
     
     async def _load_available_tools_async(self):
-        """Load all available tools from the service asynchronously"""
+        """Load all available tools from the tool catalog cache"""
         try:
-            # Get services using Unit of Work pattern
-            from src.core.unit_of_work import UnitOfWork
-            from src.services.tool_service import ToolService
+            tools = await tool_catalog_cache.get_tools(_fetch_tool_catalog)
             
-            async with UnitOfWork() as uow:
-                # Create tool service from UnitOfWork
-                tool_service = await ToolService.from_unit_of_work(uow)
-                
-                # Get tools through service
-                tools_response = await tool_service.get_all_tools()
-                tools = tools_response.tools
-                
-                # Store tools by both title and ID
-                self._available_tools = {}
-                for tool in tools:
-                    self._available_tools[tool.title] = tool
-                    self._available_tools[str(tool.id)] = tool  # Convert ID to string since it might come as string from config
-                
-                logger.info(f"Loaded {len(tools)} tools from service using UnitOfWork")
-                logger.debug(f"Available tools: {[f'{t.id}:{t.title}' for t in tools]}")
+            # Store tools by both title and ID
+            available_tools = {}
+            for tool in tools:
+                available_tools[tool.title] = tool
+                available_tools[str(tool.id)] = tool  # Convert ID to string since it might come as string from config
+            self._available_tools = available_tools
+            
+            logger.info(f"Loaded {len(tools)} tools (catalog version {tool_catalog_cache.tools_version})")
+            logger.debug(f"Available tools: {[f'{t.id}:{t.title}' for t in tools]}")
         except Exception as e:
             logger.error(f"Error loading available tools: {str(e)}")
             import traceback
@@ -385,30 +410,17 @@ class ToolFactory:
                     logger.error(f"Error with existing API keys service for {key_name}: {str(e)}")
                     # Fall through to the alternative method
             
-            # Fallback to creating a new API keys service instance using isolated UnitOfWork
-            # Import necessary modules here to avoid circular imports
-            from src.utils.asyncio_utils import execute_db_operation_with_fresh_engine
-            
-            async def _get_key_with_fresh_engine(session):
-                from src.services.api_keys_service import ApiKeysService
-                api_keys_service = ApiKeysService(session)
-                api_key = await api_keys_service.find_by_name(key_name)
-                
-                if api_key and api_key.encrypted_value:
-                    # Decrypt the value
-                    return EncryptionUtils.decrypt_value(api_key.encrypted_value)
-                return None
-            
-            # Use a fresh engine to avoid transaction conflicts
-            decrypted_value = await execute_db_operation_with_fresh_engine(_get_key_with_fresh_engine)
+            # Fall back to the shared API key cache, which loads missing keys on the current loop's engine
+            api_keys = await tool_catalog_cache.get_api_keys([key_name], _fetch_api_keys)
+            decrypted_value = api_keys.get(key_name)
             
             if decrypted_value:
                 # Log first and last 4 characters of the key for debugging
                 key_preview = f"{decrypted_value[:4]}...{decrypted_value[-4:]}" if len(decrypted_value) > 8 else "***"
-                logger.info(f"Using {key_name} from isolated database operation: {key_preview}")
+                logger.info(f"Using {key_name} from the API key cache: {key_preview}")
                 return decrypted_value
             else:
-                logger.warning(f"{key_name} not found via isolated database operation")
+                logger.warning(f"{key_name} not found via the API key cache")
                 return None
                 
         except Exception as e:
@@ -440,7 +452,7 @@ class ToolFactory:
                     asyncio.set_event_loop(loop)
                     return loop.run_until_complete(self._get_api_key_async(key_name))
                 finally:
-                    loop.close()
+                    _close_loop(loop)
         except Exception as e:
             logger.error(f"Error getting {key_name} from service: {str(e)}")
             import traceback
@@ -456,7 +468,7 @@ class ToolFactory:
             asyncio.set_event_loop(loop)
             return loop.run_until_complete(async_func(*args, **kwargs))
         finally:
-            loop.close()
+            _close_loop(loop)
     
     def update_tool_config(self, tool_identifier: Union[str, int], config_update: Dict[str, any]) -> bool:
         """
@@ -495,7 +507,7 @@ class ToolFactory:
                     return loop.run_until_complete(self._update_tool_config_async(
                         tool_identifier, tool_info, config_update))
                 finally:
-                    loop.close()
+                    _close_loop(loop)
         except Exception as e:
             logger.error(f"Error updating tool configuration: {str(e)}")
             import traceback
@@ -630,7 +642,7 @@ class ToolFactory:
                                     self._get_api_key_async("PERPLEXITY_API_KEY")
                                 )
                             finally:
-                                loop.close()
+                                _close_loop(loop)
                     else:
                         # Fallback to original method
                         logger.info("No ApiKeysService provided, using fallback method for PERPLEXITY_API_KEY")
@@ -703,7 +715,7 @@ class ToolFactory:
                                     self._get_api_key_async("SERPER_API_KEY")
                                 )
                             finally:
-                                loop.close()
+                                _close_loop(loop)
                     else:
                         # Fallback to original method
                         logger.info("No ApiKeysService provided, using fallback method for SERPER_API_KEY")
@@ -771,7 +783,7 @@ class ToolFactory:
                                     self._get_api_key_async("FIRECRAWL_API_KEY")
                                 )
                             finally:
-                                loop.close()
+                                _close_loop(loop)
                     else:
                         # Fallback to original method
                         logger.info("No ApiKeysService provided, using fallback method for FIRECRAWL_API_KEY")
@@ -942,7 +954,7 @@ class ToolFactory:
                                     asyncio.set_event_loop(loop)
                                     databricks_host = loop.run_until_complete(get_databricks_config())
                                 finally:
-                                    loop.close()
+                                    _close_loop(loop)
                                     
                             if databricks_host:
                                 logger.info(f"Retrieved DATABRICKS_HOST from DatabricksService: {databricks_host}")
@@ -1029,7 +1041,7 @@ class ToolFactory:
                                     asyncio.set_event_loop(loop)
                                     databricks_host = loop.run_until_complete(get_databricks_config())
                                 finally:
-                                    loop.close()
+                                    _close_loop(loop)
                                     
                             if databricks_host:
                                 logger.info(f"Retrieved DATABRICKS_HOST from DatabricksService: {databricks_host}")
@@ -1121,7 +1133,7 @@ class ToolFactory:
                                         self._get_api_key_async("DATABRICKS_API_KEY")
                                     )
                                 finally:
-                                    loop.close()
+                                    _close_loop(loop)
                         else:
                             # Fallback to original method
                             logger.warning("DATABRICKS_API_KEY not found via service")
@@ -1230,7 +1242,7 @@ class ToolFactory:
                                     self._get_api_key_async("LINKUP_API_KEY")
                                 )
                             finally:
-                                loop.close()
+                                _close_loop(loop)
                     else:
                         # Fallback to original method
                         logger.info("No ApiKeysService provided, using fallback method for LINKUP_API_KEY")
@@ -6,7 +6,8 @@ This module provides functionality for managing trace data from CrewAI execution
 import logging
 import asyncio
 import queue
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, List, Set
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -26,180 +27,257 @@ class TraceManager:
     _writer_started: bool = False
     _lock = asyncio.Lock()  # Lock for starting the writer
     
+    # Event types that are persisted to execution_trace
+    _important_event_types = {
+        "agent_execution", "tool_usage", "crew_started",
+        "crew_completed", "task_started", "task_completed", "llm_call"
+    }
+    
+    # Writer metrics, exposed through get_writer_stats()
+    _writer_stats: Dict[str, Any] = {
+        "batches_flushed": 0,
+        "traces_written": 0,
+        "traces_failed": 0,
+        "last_batch_size": 0,
+        "last_flush_latency_ms": 0.0,
+        "max_flush_latency_ms": 0.0,
+        "last_flush_at": None,
+    }
+    
     @classmethod
-    async def _trace_writer_loop(cls):
+    def get_writer_stats(cls) -> Dict[str, Any]:
         """
-        Background task that reads from the trace queue and writes to the database.
+        Get trace writer metrics.
+        
+        Returns:
+            Dictionary with flush counters, flush latency, the current queue backlog,
+            the trace bus overflow counters and the trace capture counters
         """
         from src.services.trace_queue import get_trace_queue
-        from src.services.execution_trace_service import ExecutionTraceService
+        from src.engines.crewai.callbacks.trace_capture import get_trace_capture_stats
+        
+        from src.services.event_bus import EventBus
+        
+        trace_queue = get_trace_queue()
+        stats = dict(cls._writer_stats)
+        stats["backlog"] = trace_queue.qsize()
+        if isinstance(trace_queue, EventBus):
+            stats["queue"] = trace_queue.get_stats()
+        stats["running"] = cls._trace_writer_task is not None and not cls._trace_writer_task.done()
+        stats["capture"] = get_trace_capture_stats()
+        return stats
+    
+    @staticmethod
+    def _drain_queue(trace_queue: queue.Queue, max_items: int) -> List[Dict[str, Any]]:
+        """
+        Take up to max_items traces from the queue without blocking.
+        
+        Shutdown sentinels (None) are discarded.
+        """
+        items = []
+        while len(items) < max_items:
+            try:
+                trace_data = trace_queue.get_nowait()
+            except queue.Empty:
+                break
+            trace_queue.task_done()
+            if trace_data is not None:
+                items.append(trace_data)
+        return items
+    
+    @classmethod
+    async def _ensure_jobs_exist(cls, batch: List[Dict[str, Any]], confirmed_jobs: Set[str]) -> None:
+        """
+        Make sure an execution record exists for every job_id in the batch.
+        
+        Each unknown job is looked up (and auto-created if missing) once per batch
+        rather than once per trace. Confirmed jobs are added to confirmed_jobs.
+        """
         from src.services.execution_status_service import ExecutionStatusService
         from src.services.execution_history_service import get_execution_history_service
-        from queue import Empty  # Import the Empty exception from queue module
+        
+        pending = {}
+        for trace_data in batch:
+            job_id = trace_data.get("job_id", "unknown")
+            if job_id != "unknown" and job_id not in confirmed_jobs and job_id not in pending:
+                pending[job_id] = trace_data.get("event_type", "unknown")
+        
+        if not pending:
+            return
+        
+        execution_history_service = get_execution_history_service()
+        for job_id, event_type in pending.items():
+            try:
+                execution = await execution_history_service.get_execution_by_job_id(job_id)
+                if execution:
+                    confirmed_jobs.add(job_id)
+                    continue
+                
+                logger.info(f"[TraceManager._trace_writer_loop] [{job_id}] Job not found, creating new execution record")
+                job_data = {
+                    "job_id": job_id,
+                    "status": "running",
+                    "trigger_type": "api",
+                    "run_name": f"Auto-created for {event_type}",
+                    "inputs": {"auto_created": True}
+                }
+                if await ExecutionStatusService.create_execution(job_data):
+                    confirmed_jobs.add(job_id)
+                else:
+                    logger.error(f"[TraceManager._trace_writer_loop] [{job_id}] Failed to create job record")
+            except Exception as e:
+                logger.error(f"[TraceManager._trace_writer_loop] [{job_id}] Error checking job record: {e}", exc_info=True)
+    
+    @staticmethod
+    def _to_trace_record(trace_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a queued trace into the column layout of execution_trace."""
+        event_type = trace_data.get("event_type", "unknown")
+        trace_dict = {
+            "job_id": trace_data["job_id"],
+            "event_source": trace_data.get("event_source", event_type),  # Use event_type as fallback
+            "event_context": trace_data.get("event_context", ""),
+            "event_type": event_type,
+            "output": trace_data.get("output_content", ""),
+            "trace_metadata": trace_data.get("extra_data", {})
+        }
+        
+        # Add group context if available in trace data
+        if "group_id" in trace_data:
+            trace_dict["group_id"] = trace_data["group_id"]
+        if "group_email" in trace_data:
+            trace_dict["group_email"] = trace_data["group_email"]
+        return trace_dict
+    
+    @classmethod
+    async def _flush_batch(cls, batch: List[Dict[str, Any]], confirmed_jobs: Set[str]) -> int:
+        """
+        Persist a batch of queued traces with a single multi-row insert.
+        
+        If the bulk insert fails, the batch is retried row by row so that one bad
+        trace does not discard the others.
+        
+        Returns:
+            Number of traces that could not be stored
+        """
+        from src.services.execution_trace_service import ExecutionTraceService
+        
+        failures = 0
+        await cls._ensure_jobs_exist(batch, confirmed_jobs)
+        
+        records = []
+        for trace_data in batch:
+            job_id = trace_data.get("job_id", "unknown")
+            event_type = trace_data.get("event_type", "unknown")
+            if job_id == "unknown":
+                logger.warning(f"[TraceManager._trace_writer_loop] Skipping {event_type} trace with unknown job_id")
+                continue
+            if job_id not in confirmed_jobs:
+                logger.warning(f"[TraceManager._trace_writer_loop] [{job_id}:{event_type}] Skipping trace due to missing job record")
+                failures += 1
+                continue
+            if event_type not in cls._important_event_types:
+                logger.debug(f"[TraceManager._trace_writer_loop] [{job_id}] ⏭️ Skipping non-important event type: {event_type}")
+                continue
+            records.append(cls._to_trace_record(trace_data))
+        
+        if not records:
+            return failures
+        
+        try:
+            await ExecutionTraceService.create_traces_batch(records)
+            cls._writer_stats["traces_written"] += len(records)
+        except Exception as e:
+            logger.error(f"[TraceManager._trace_writer_loop] Bulk insert of {len(records)} traces failed, retrying individually: {e}")
+            for record in records:
+                try:
+                    await ExecutionTraceService.create_trace(record)
+                    cls._writer_stats["traces_written"] += 1
+                except Exception as row_error:
+                    logger.error(f"[TraceManager._trace_writer_loop] [{record['job_id']}:{record['event_type']}] Failed to store trace: {row_error}")
+                    failures += 1
+        return failures
+    
+    @classmethod
+    async def _trace_writer_loop(cls):
+        """
+        Background task that reads from the trace queue and writes to the database.
+        
+        The queue is drained without blocking the event loop. Traces are buffered
+        until TRACE_WRITER_BATCH_SIZE items are collected or the oldest buffered
+        trace has waited TRACE_WRITER_FLUSH_INTERVAL seconds, then written with one
+        bulk insert. A backlog larger than the batch size is flushed back to back.
+        Between flushes the loop awaits the trace bus instead of polling it.
+        """
+        from src.config.settings import settings
+        from src.services.event_bus import wait_for_items
+        from src.services.trace_queue import get_trace_queue
         
         try:
             logger.info("[TraceManager._trace_writer_loop] Writer task started.")
             
             # Get trace queue
-            queue = get_trace_queue()
-            logger.debug(f"[TraceManager._trace_writer_loop] Queue retrieved. Initial approximate size: {queue.qsize()}")
-            
-            # Get service instance
-            execution_history_service = get_execution_history_service()
+            trace_queue = get_trace_queue()
+            logger.debug(f"[TraceManager._trace_writer_loop] Queue retrieved. Initial approximate size: {trace_queue.qsize()}")
             
-            batch_count = 0
-            total_trace_count = 0
-            empty_count = 0  # Count consecutive empty queue occurrences
+            batch_size = max(1, settings.TRACE_WRITER_BATCH_SIZE)
+            flush_interval = max(0.01, settings.TRACE_WRITER_FLUSH_INTERVAL)
             
             # Keep track of jobs we've confirmed exist
-            confirmed_jobs = set()
+            confirmed_jobs: Set[str] = set()
+            batch: List[Dict[str, Any]] = []
+            batch_started = 0.0
             
-            while not cls._shutdown_event.is_set():
-                # Create a small batch of traces to process together
-                batch = []
-                batch_target_size = 10  # Process up to this many at once
-                
+            while True:
+                shutting_down = cls._shutdown_event.is_set()
                 try:
-                    # Try to collect a batch of traces
-                    for _ in range(batch_target_size):
-                        try:
-                            # Log queue status periodically
-                            if _ == 0:
-                                logger.debug(f"[TraceManager._trace_writer_loop] Waiting for traces... Queue size: ~{queue.qsize()}")
-                            
-                            # Non-blocking get with timeout
-                            trace_data = queue.get(block=True, timeout=0.1)
-                            
-                            # Check if this is the shutdown signal (None)
-                            if trace_data is None:
-                                logger.debug("[TraceManager._trace_writer_loop] Received shutdown signal (None) in queue.")
-                                continue
-                                
-                            batch.append(trace_data)
-                            queue.task_done()
-                            empty_count = 0  # Reset empty count when we get an item
-                        except Empty:  # Use the imported Empty exception
-                            # Queue is empty, break out of the batch collection loop
-                            empty_count += 1
-                            if empty_count % 100 == 0:  # Log every 100 consecutive empty checks
-                                logger.debug(f"[TraceManager._trace_writer_loop] Queue empty for {empty_count} consecutive checks")
-                            break
+                    if not batch:
+                        batch_started = time.monotonic()
+                    batch.extend(cls._drain_queue(trace_queue, batch_size - len(batch)))
                     
-                    # If we collected any traces, process them
-                    if batch:
-                        batch_count += 1
-                        total_trace_count += len(batch)
+                    due = (
+                        len(batch) >= batch_size
+                        or time.monotonic() - batch_started >= flush_interval
+                        or shutting_down
+                    )
+                    if batch and due:
+                        batch_was_full = len(batch) >= batch_size
+                        backlog = trace_queue.qsize()
+                        flush_started = time.monotonic()
+                        failures = await cls._flush_batch(batch, confirmed_jobs)
+                        latency_ms = (time.monotonic() - flush_started) * 1000
                         
-                        # Log batch processing
-                        logger.debug(f"[TraceManager._trace_writer_loop] Processing batch #{batch_count} with {len(batch)} traces. Total processed: {total_trace_count}")
+                        stats = cls._writer_stats
+                        stats["batches_flushed"] += 1
+                        stats["traces_failed"] += failures
+                        stats["last_batch_size"] = len(batch)
+                        stats["last_flush_latency_ms"] = latency_ms
+                        stats["max_flush_latency_ms"] = max(stats["max_flush_latency_ms"], latency_ms)
+                        stats["last_flush_at"] = datetime.utcnow().isoformat()
                         
-                        # Process each trace in the batch
-                        failures = 0
-                        for idx, trace_data in enumerate(batch):
-                            try:
-                                job_id = trace_data.get("job_id", "unknown")
-                                event_type = trace_data.get("event_type", "unknown")
-                                trace_info = f"[{job_id}:{event_type}:{idx+1}/{len(batch)}]"
-                                
-                                # Skip processing if this is an "unknown" job_id
-                                if job_id == "unknown":
-                                    logger.warning(f"[TraceManager._trace_writer_loop] {trace_info} Skipping trace with unknown job_id")
-                                    continue
-                                
-                                # Check if we've already confirmed this job exists
-                                job_exists = job_id in confirmed_jobs
-                                
-                                # If not confirmed, check the database
-                                if not job_exists:
-                                    # Check if job exists in executionhistory using the service
-                                    execution = await execution_history_service.get_execution_by_job_id(job_id)
-                                    
-                                    if execution:
-                                        # Job exists, add to confirmed set
-                                        confirmed_jobs.add(job_id)
-                                        job_exists = True
-                                        logger.debug(f"[TraceManager._trace_writer_loop] {trace_info} Found existing job in database")
-                                    else:
-                                        # Job doesn't exist, create it
-                                        logger.info(f"[TraceManager._trace_writer_loop] {trace_info} Job not found, creating new execution record")
-                                        
-                                        # Create minimal execution record
-                                        job_data = {
-                                            "job_id": job_id,
-                                            "status": "running",
-                                            "trigger_type": "api",
-                                            "run_name": f"Auto-created for {event_type}",
-                                            "inputs": {"auto_created": True}
-                                        }
-                                        
-                                        # Try to create the job record
-                                        success = await ExecutionStatusService.create_execution(job_data)
-                                        
-                                        if success:
-                                            logger.info(f"[TraceManager._trace_writer_loop] {trace_info} Successfully created job record")
-                                            confirmed_jobs.add(job_id)
-                                            job_exists = True
-                                        else:
-                                            logger.error(f"[TraceManager._trace_writer_loop] {trace_info} Failed to create job record")
-                                
-                                # Detailed logging of trace data
-                                logger.debug(f"[TraceManager._trace_writer_loop] {trace_info} Processing trace: {str(trace_data)[:200]}...")
-                                
-                                # Only proceed if job exists
-                                if job_exists:
-                                    # FILTER: Store important events in execution_trace
-                                    # Include agent_execution, tool_usage, crew_started, crew_completed, task_started, task_completed
-                                    important_event_types = [
-                                        "agent_execution", "tool_usage", "crew_started", 
-                                        "crew_completed", "task_started", "task_completed", "llm_call"
-                                    ]
-                                    
-                                    if event_type in important_event_types:
-                                        # Prepare trace data in the format expected by ExecutionTraceService
-                                        trace_dict = {
-                                            "job_id": job_id,
-                                            "event_source": trace_data.get("event_source", event_type),  # Use event_type as fallback
-                                            "event_context": trace_data.get("event_context", ""),
-                                            "event_type": event_type,
-                                            "output": trace_data.get("output_content", ""),
-                                            "trace_metadata": trace_data.get("extra_data", {})
-                                        }
-                                        
-                                        # Add group context if available in trace data
-                                        if "group_id" in trace_data:
-                                            trace_dict["group_id"] = trace_data["group_id"]
-                                        if "group_email" in trace_data:
-                                            trace_dict["group_email"] = trace_data["group_email"]
-                                        
-                                        try:
-                                            # Use the ExecutionTraceService to create the trace
-                                            await ExecutionTraceService.create_trace(trace_dict)
-                                            logger.info(f"[TraceManager._trace_writer_loop] {trace_info} Successfully stored {event_type} trace")
-                                        except Exception as e:
-                                            logger.error(f"[TraceManager._trace_writer_loop] {trace_info} Failed to store trace: {e}")
-                                            failures += 1
-                                    else:
-                                        # Log that we're skipping this trace type
-                                        logger.debug(f"[TraceManager._trace_writer_loop] {trace_info} ⏭️ Skipping non-important event type: {event_type}")
-                                else:
-                                    logger.warning(f"[TraceManager._trace_writer_loop] {trace_info} Skipping trace due to missing job record")
-                                    failures += 1
-                                
-                            except Exception as e:
-                                logger.error(f"[TraceManager._trace_writer_loop] Error processing trace: {e}", exc_info=True)
-                                failures += 1
+                        log = logger.warning if failures else logger.debug
+                        log(
+                            f"[TraceManager._trace_writer_loop] Batch #{stats['batches_flushed']} flushed "
+                            f"{len(batch)} traces in {latency_ms:.1f}ms with {failures} failures. Backlog: {backlog}"
+                        )
+                        batch = []
                         
-                        if failures > 0:
-                            logger.warning(f"[TraceManager._trace_writer_loop] Batch #{batch_count} processed with {failures} failures.")
-                        else:
-                            logger.debug(f"[TraceManager._trace_writer_loop] Batch #{batch_count} processed successfully.")
+                        # A full batch means more traces are likely waiting (also while
+                        # draining for shutdown): flush again without sleeping
+                        if batch_was_full:
+                            continue
                     
-                    # If no traces were collected, sleep briefly to avoid CPU spinning
-                    else:
-                        await asyncio.sleep(0.5)
+                    if shutting_down and not batch:
+                        break
+                    
+                    # Sleep until traces arrive, the partial batch is due or shutdown
+                    timeout = flush_interval - (time.monotonic() - batch_started) if batch else None
+                    await wait_for_items(trace_queue, timeout, cls._shutdown_event)
                     
                 except Exception as e:
                     logger.error(f"[TraceManager._trace_writer_loop] Batch processing error: {e}", exc_info=True)
+                    batch = []
+                    if shutting_down:
+                        break
                     # Sleep to avoid rapid retry on persistent errors
                     await asyncio.sleep(1)
                 
@@ -246,15 +324,6 @@ class TraceManager:
             logger.info("[TraceManager] Setting shutdown event for all writer tasks...")
             cls._shutdown_event.set()
             
-            # Add None to trace queue to help unblock queue.get()
-            try:
-                from queue import Full
-                from src.services.trace_queue import get_trace_queue
-                queue = get_trace_queue()
-                queue.put_nowait(None)
-            except Full:
-                logger.warning("[TraceManager] Trace queue full, writer might take longer to stop.")
-            
             # Stop trace writer task
             if cls._writer_started and cls._trace_writer_task and not cls._trace_writer_task.done():
                 logger.info("[TraceManager] Stopping trace writer task...")
@@ -68,6 +68,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         system_logger.warning(f"Error validating Databricks environment: {e}")
     
+    # Read and parse the encryption keys once, before the first secret is decrypted
+    try:
+        from src.utils.encryption_utils import EncryptionUtils
+        EncryptionUtils.preload_keys()
+    except Exception as e:
+        system_logger.warning(f"Error preloading encryption keys: {e}")
+    
     # Import needed for DB init
     # pylint: disable=unused-import,import-outside-toplevel
     import src.db.all_models  # noqa
@@ -143,6 +150,15 @@ async def lifespan(app: FastAPI):
         # Import needed for seeders
         # pylint: disable=unused-import,import-outside-toplevel
         from src.seeds.seed_runner import run_all_seeders
+        from src.services.template_service import TemplateService
+        
+        async def warm_prompt_template_cache():
+            if not settings.PROMPT_TEMPLATE_CACHE_PREWARM:
+                return
+            try:
+                await TemplateService.warm_template_cache()
+            except Exception as e:
+                system_logger.warning(f"Could not warm prompt template cache: {str(e)}")
         
         # Check if seeding is enabled
         should_seed = settings.AUTO_SEED_DATABASE
@@ -166,6 +182,8 @@ async def lifespan(app: FastAPI):
                         import traceback
                         error_trace = traceback.format_exc()
                         system_logger.error(f"Background seeder error trace: {error_trace}")
+                    # The seeders write templates directly, so warm only once they are done
+                    await warm_prompt_template_cache()
                 
                 # Create background task
                 asyncio.create_task(run_seeders_background())
@@ -178,6 +196,7 @@ async def lifespan(app: FastAPI):
                 # Don't raise so app can start even if seeding fails
         else:
             system_logger.info("Database seeding skipped (AUTO_SEED_DATABASE is False)")
+            await warm_prompt_template_cache()
     else:
         system_logger.warning("Skipping seeding as database is not initialized.")
     
@@ -222,6 +241,36 @@ async def lifespan(app: FastAPI):
                 system_logger.info("Scheduler shut down successfully.")
             except Exception as e:
                 system_logger.error(f"Error during scheduler shutdown: {e}")
+
+        # Write the LLM usage still queued
+        try:
+            from src.services.llm_usage_meter import stop_usage_writer
+            if not await stop_usage_writer():
+                system_logger.warning("LLM usage writer did not finish writing queued usage before shutdown")
+        except Exception as e:
+            system_logger.error(f"Error stopping LLM usage writer: {e}")
+
+        # Write the LLM interaction logs still queued
+        try:
+            from src.services.llm_log_writer import stop_llm_log_writer
+            if not await stop_llm_log_writer():
+                system_logger.warning("LLM log writer did not finish writing queued logs before shutdown")
+        except Exception as e:
+            system_logger.error(f"Error stopping LLM log writer: {e}")
+
+        # Close pooled Databricks REST sessions
+        try:
+            from src.utils.databricks_http_client import close_databricks_http_sessions
+            await close_databricks_http_sessions()
+        except Exception as e:
+            system_logger.error(f"Error closing Databricks HTTP sessions: {e}")
+        
+        # Close pooled MCP sessions
+        try:
+            from src.engines.common.mcp_worker_pool import shutdown_mcp_worker_pool
+            await asyncio.to_thread(shutdown_mcp_worker_pool)
+        except Exception as e:
+            system_logger.error(f"Error closing MCP worker pool: {e}")
         
         system_logger.info("Application shutdown complete.")
 
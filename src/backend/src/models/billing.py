@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, JSON, Index
+from sqlalchemy import Column, Integer, BigInteger, String, Numeric, DateTime, ForeignKey, JSON, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from uuid import uuid4
 
@@ -69,6 +69,46 @@ class LLMUsageBilling(Base):
     )
 
 
+class LLMUsageRollup(Base):
+    """
+    Hourly and daily LLM usage totals per group, user and model.
+    
+    Maintained incrementally as usage records are written, so cost dashboards
+    read these rows instead of scanning llm_usage_billing. A missing group or
+    user is stored as an empty string so the unique key also matches it.
+    """
+    
+    __tablename__ = "llm_usage_rollups"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    # Rollup key
+    period_type = Column(String(10), nullable=False)  # 'hour', 'day'
+    period_start = Column(DateTime, nullable=False)  # Start of the hour or day (UTC)
+    group_id = Column(String(100), nullable=False, default="")
+    user_email = Column(String(255), nullable=False, default="")
+    model_name = Column(String, nullable=False)
+    model_provider = Column(String, nullable=False)
+    
+    # Aggregated metrics
+    prompt_tokens = Column(BigInteger, default=0)
+    completion_tokens = Column(BigInteger, default=0)
+    total_tokens = Column(BigInteger, default=0)
+    cost_usd = Column(Numeric(precision=14, scale=6), default=0.000000)
+    request_count = Column(Integer, default=0)
+    error_count = Column(Integer, default=0)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint(
+            'period_type', 'period_start', 'group_id', 'user_email', 'model_name', 'model_provider',
+            name='uq_llm_usage_rollup_key'
+        ),
+        Index('idx_rollup_group_period', 'period_type', 'group_id', 'period_start'),
+    )
+
+
 class BillingPeriod(Base):
     """
     Billing Period model for tracking billing cycles and aggregated costs.
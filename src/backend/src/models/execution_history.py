@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, JSON, Text, DateTime, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, JSON, Text, DateTime, ForeignKey, Boolean, Index, LargeBinary
+from sqlalchemy.orm import relationship, deferred
 from uuid import uuid4
 
 from src.db.base import Base
@@ -23,12 +23,20 @@ class ExecutionHistory(Base):
     """
     
     __tablename__ = "executionhistory"
+    __table_args__ = (
+        # Keyset pagination of the history listing, newest first, per group and overall
+        Index('ix_executionhistory_group_created_id', 'group_id', 'created_at', 'id'),
+        Index('ix_executionhistory_created_id', 'created_at', 'id'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(String, primary_key=False, unique=True, default=generate_job_id, index=True)
     status = Column(String, nullable=False, default="pending")
     inputs = Column(JSON, default=dict)
     result = Column(JSON)
+    # Compressed full result when result holds a preview, only loaded by
+    # detail queries (see src.utils.payload_compression)
+    payload = deferred(Column(LargeBinary, nullable=True))
     error = Column(String)
     planning = Column(Boolean, default=False)
     trigger_type = Column(String, default="api")
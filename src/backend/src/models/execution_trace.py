@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey, LargeBinary
+from sqlalchemy.orm import relationship, deferred
 
 from src.db.base import Base
 
@@ -21,6 +21,9 @@ class ExecutionTrace(Base):
     event_type = Column(String, nullable=False, index=True)  # now required
     output = Column(JSON)
     trace_metadata = Column(JSON, nullable=True)
+    # Compressed full output and metadata when they are stored as previews,
+    # only loaded by detail queries (see src.utils.payload_compression)
+    payload = deferred(Column(LargeBinary, nullable=True))
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Group fields (formerly multi-tenant)
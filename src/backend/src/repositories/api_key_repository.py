@@ -37,6 +37,22 @@ class ApiKeyRepository(BaseRepository[ApiKey]):
         result = await self.session.execute(query)
         return result.scalars().first()
     
+    async def find_by_names(self, names: List[str]) -> List[ApiKey]:
+        """
+        Find several API keys by name with a single query.
+        
+        Args:
+            names: Names to search for
+            
+        Returns:
+            List of the API keys that exist
+        """
+        if not names:
+            return []
+        query = select(self.model).where(self.model.name.in_(names))
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+    
     def find_by_name_sync(self, name: str) -> Optional[ApiKey]:
         """
         Find an API key by name synchronously.
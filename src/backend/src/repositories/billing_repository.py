@@ -1,14 +1,48 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy import and_, func, desc, asc
+from sqlalchemy import and_, func, desc, asc, insert, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.base_repository import BaseRepository
-from src.models.billing import LLMUsageBilling, BillingPeriod, BillingAlert
+from src.models.billing import LLMUsageBilling, LLMUsageRollup, BillingPeriod, BillingAlert, generate_billing_id
+
+
+# Rollup granularities maintained for every usage record
+ROLLUP_PERIODS = ("hour", "day")
+# Columns identifying a rollup row, and the metrics summed into it
+ROLLUP_KEY_COLUMNS = ("period_type", "period_start", "group_id", "user_email", "model_name", "model_provider")
+ROLLUP_SUM_COLUMNS = ("prompt_tokens", "completion_tokens", "total_tokens", "cost_usd", "request_count", "error_count")
+# Ranges up to this long are answered from hourly rollups, longer ones from daily rollups
+HOURLY_ROLLUP_MAX_RANGE = timedelta(days=2)
+
+
+def truncate_period(value: datetime, period_type: str) -> datetime:
+    """Truncate a timestamp to the start of its hour, day, week (Monday) or month."""
+    if period_type == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+    day = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period_type == "week":
+        return day - timedelta(days=day.weekday())
+    if period_type == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _rollup_period_type(start_date: datetime, end_date: datetime) -> str:
+    """Pick the finest rollup granularity worth reading for a date range."""
+    return "hour" if end_date - start_date <= HOURLY_ROLLUP_MAX_RANGE else "day"
 
 
 class BillingRepository(BaseRepository[LLMUsageBilling]):
-    """Repository for billing operations"""
+    """
+    Repository for billing operations.
+    
+    Usage records are read from llm_usage_billing. Cost aggregations read the
+    hourly and daily rollups in llm_usage_rollups instead; a rollup bucket that
+    overlaps the start or the end of the requested range is counted in full.
+    """
     
     def __init__(self, session: AsyncSession):
         super().__init__(LLMUsageBilling, session)
@@ -20,16 +54,112 @@ class BillingRepository(BaseRepository[LLMUsageBilling]):
         await self.session.flush()
         return usage_record
     
+    async def create_usage_records(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Insert several LLM usage billing records in a single statement.
+        
+        The caller commits, so the records can be written in the same
+        transaction as their rollups.
+        
+        Args:
+            records: List of dictionaries with usage data
+            
+        Returns:
+            Number of inserted records
+        """
+        if not records:
+            return 0
+        now = datetime.utcnow()
+        rows = []
+        for record in records:
+            row = dict(record)
+            row.setdefault("id", generate_billing_id())
+            row.setdefault("usage_date", now)
+            row.setdefault("created_at", now)
+            row.setdefault("updated_at", now)
+            rows.append(row)
+        
+        # Give every row the same key set so the batch stays a single executemany
+        columns = set().union(*(row.keys() for row in rows))
+        for row in rows:
+            for column in columns:
+                row.setdefault(column, None)
+        
+        await self.session.execute(insert(LLMUsageBilling), rows)
+        return len(rows)
+    
+    async def add_to_rollups(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Add usage records to their hourly and daily rollups.
+        
+        Records are summed per rollup key first, then every touched rollup row
+        is upserted with a single INSERT ... ON CONFLICT DO UPDATE that adds the
+        new totals to the stored ones, so concurrent writers do not lose updates.
+        
+        Args:
+            records: List of dictionaries with usage data
+            
+        Returns:
+            Number of rollup rows inserted or updated
+        """
+        totals: Dict[Tuple, Dict[str, Any]] = {}
+        for record in records:
+            usage_date = record.get("usage_date") or datetime.utcnow()
+            for period_type in ROLLUP_PERIODS:
+                key = (
+                    period_type,
+                    truncate_period(usage_date, period_type),
+                    record.get("group_id") or "",
+                    record.get("user_email") or "",
+                    record["model_name"],
+                    record["model_provider"],
+                )
+                row = totals.get(key)
+                if row is None:
+                    row = totals[key] = dict.fromkeys(ROLLUP_SUM_COLUMNS, 0)
+                row["prompt_tokens"] += record.get("prompt_tokens") or 0
+                row["completion_tokens"] += record.get("completion_tokens") or 0
+                row["total_tokens"] += record.get("total_tokens") or 0
+                row["cost_usd"] += float(record.get("cost_usd") or 0)
+                row["request_count"] += record.get("request_count") or 1
+                if record.get("status", "success") != "success":
+                    # Coalesced records carry the number of calls they merged
+                    row["error_count"] += record.get("request_count") or 1
+        if not totals:
+            return 0
+        
+        now = datetime.utcnow()
+        values = [
+            {**dict(zip(ROLLUP_KEY_COLUMNS, key)), **row, "updated_at": now}
+            for key, row in totals.items()
+        ]
+        
+        # PostgreSQL and SQLite share the ON CONFLICT syntax
+        dialect = self.session.get_bind().dialect.name
+        insert_rollups = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert_rollups(LLMUsageRollup).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(ROLLUP_KEY_COLUMNS),
+            set_={
+                **{
+                    column: getattr(LLMUsageRollup, column) + getattr(stmt.excluded, column)
+                    for column in ROLLUP_SUM_COLUMNS
+                },
+                "updated_at": stmt.excluded.updated_at,
+            }
+        )
+        await self.session.execute(stmt)
+        return len(values)
+    
     async def get_usage_by_execution(self, execution_id: str, group_id: Optional[str] = None) -> List[LLMUsageBilling]:
         """Get all usage records for a specific execution"""
-        query = self.session.query(LLMUsageBilling).filter(
-            LLMUsageBilling.execution_id == execution_id
-        )
+        query = select(LLMUsageBilling).where(LLMUsageBilling.execution_id == execution_id)
         
         if group_id:
-            query = query.filter(LLMUsageBilling.group_id == group_id)
+            query = query.where(LLMUsageBilling.group_id == group_id)
         
-        return query.all()
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
     
     async def get_usage_by_date_range(
         self, 
@@ -39,7 +169,7 @@ class BillingRepository(BaseRepository[LLMUsageBilling]):
         user_email: Optional[str] = None
     ) -> List[LLMUsageBilling]:
         """Get usage records within a date range"""
-        query = self.session.query(LLMUsageBilling).filter(
+        query = select(LLMUsageBilling).where(
             and_(
                 LLMUsageBilling.usage_date >= start_date,
                 LLMUsageBilling.usage_date <= end_date
@@ -47,12 +177,30 @@ class BillingRepository(BaseRepository[LLMUsageBilling]):
         )
         
         if group_id:
-            query = query.filter(LLMUsageBilling.group_id == group_id)
+            query = query.where(LLMUsageBilling.group_id == group_id)
         
         if user_email:
-            query = query.filter(LLMUsageBilling.user_email == user_email)
+            query = query.where(LLMUsageBilling.user_email == user_email)
+        
+        result = await self.session.execute(query.order_by(desc(LLMUsageBilling.usage_date)))
+        return list(result.scalars().all())
+    
+    @staticmethod
+    def _rollup_range(period_type: str, start_date: datetime, end_date: datetime, group_id: Optional[str]):
+        """
+        Filter selecting the rollups of one granularity that overlap a date range.
         
-        return query.order_by(desc(LLMUsageBilling.usage_date)).all()
+        Buckets are not split: the bucket containing start_date and the one
+        containing end_date are both included whole.
+        """
+        conditions = [
+            LLMUsageRollup.period_type == period_type,
+            LLMUsageRollup.period_start >= truncate_period(start_date, period_type),
+            LLMUsageRollup.period_start <= end_date
+        ]
+        if group_id:
+            conditions.append(LLMUsageRollup.group_id == group_id)
+        return and_(*conditions)
     
     async def get_cost_summary_by_period(
         self,
@@ -61,48 +209,46 @@ class BillingRepository(BaseRepository[LLMUsageBilling]):
         group_id: Optional[str] = None,
         group_by: str = "day"  # 'day', 'week', 'month'
     ) -> List[Dict[str, Any]]:
-        """Get cost summary grouped by time period"""
-        
-        # Choose the appropriate date trunc function based on group_by
-        if group_by == "day":
-            date_trunc = func.date_trunc('day', LLMUsageBilling.usage_date)
-        elif group_by == "week":
-            date_trunc = func.date_trunc('week', LLMUsageBilling.usage_date)
-        elif group_by == "month":
-            date_trunc = func.date_trunc('month', LLMUsageBilling.usage_date)
-        else:
-            date_trunc = func.date_trunc('day', LLMUsageBilling.usage_date)
+        """Get cost summary grouped by time period, from the daily rollups"""
+        if group_by not in ("day", "week", "month"):
+            group_by = "day"
         
-        query = self.session.query(
-            date_trunc.label('period'),
-            func.sum(LLMUsageBilling.cost_usd).label('total_cost'),
-            func.sum(LLMUsageBilling.total_tokens).label('total_tokens'),
-            func.sum(LLMUsageBilling.prompt_tokens).label('total_prompt_tokens'),
-            func.sum(LLMUsageBilling.completion_tokens).label('total_completion_tokens'),
-            func.count(LLMUsageBilling.id).label('total_requests')
-        ).filter(
-            and_(
-                LLMUsageBilling.usage_date >= start_date,
-                LLMUsageBilling.usage_date <= end_date
-            )
-        )
+        query = select(
+            LLMUsageRollup.period_start.label('period'),
+            func.sum(LLMUsageRollup.cost_usd).label('total_cost'),
+            func.sum(LLMUsageRollup.total_tokens).label('total_tokens'),
+            func.sum(LLMUsageRollup.prompt_tokens).label('total_prompt_tokens'),
+            func.sum(LLMUsageRollup.completion_tokens).label('total_completion_tokens'),
+            func.sum(LLMUsageRollup.request_count).label('total_requests')
+        ).where(
+            self._rollup_range("day", start_date, end_date, group_id)
+        ).group_by(
+            LLMUsageRollup.period_start
+        ).order_by(asc(LLMUsageRollup.period_start))
         
-        if group_id:
-            query = query.filter(LLMUsageBilling.group_id == group_id)
+        result = await self.session.execute(query)
         
-        results = query.group_by(date_trunc).order_by(asc(date_trunc)).all()
+        # Days are folded into weeks and months here, which works on every database
+        summary: Dict[datetime, Dict[str, Any]] = {}
+        for row in result.all():
+            period = truncate_period(row.period, group_by)
+            entry = summary.get(period)
+            if entry is None:
+                entry = summary[period] = {
+                    "period": period,
+                    "total_cost": 0.0,
+                    "total_tokens": 0,
+                    "total_prompt_tokens": 0,
+                    "total_completion_tokens": 0,
+                    "total_requests": 0
+                }
+            entry["total_cost"] += float(row.total_cost or 0)
+            entry["total_tokens"] += row.total_tokens or 0
+            entry["total_prompt_tokens"] += row.total_prompt_tokens or 0
+            entry["total_completion_tokens"] += row.total_completion_tokens or 0
+            entry["total_requests"] += row.total_requests or 0
         
-        return [
-            {
-                "period": result.period,
-                "total_cost": float(result.total_cost or 0),
-                "total_tokens": result.total_tokens or 0,
-                "total_prompt_tokens": result.total_prompt_tokens or 0,
-                "total_completion_tokens": result.total_completion_tokens or 0,
-                "total_requests": result.total_requests or 0
-            }
-            for result in results
-        ]
+        return list(summary.values())
     
     async def get_cost_by_model(
         self,
@@ -110,37 +256,32 @@ class BillingRepository(BaseRepository[LLMUsageBilling]):
         end_date: datetime,
         group_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get cost breakdown by model"""
-        query = self.session.query(
-            LLMUsageBilling.model_name,
-            LLMUsageBilling.model_provider,
-            func.sum(LLMUsageBilling.cost_usd).label('total_cost'),
-            func.sum(LLMUsageBilling.total_tokens).label('total_tokens'),
-            func.count(LLMUsageBilling.id).label('total_requests')
-        ).filter(
-            and_(
-                LLMUsageBilling.usage_date >= start_date,
-                LLMUsageBilling.usage_date <= end_date
-            )
-        )
+        """Get cost breakdown by model, from the rollups"""
+        period_type = _rollup_period_type(start_date, end_date)
+        query = select(
+            LLMUsageRollup.model_name,
+            LLMUsageRollup.model_provider,
+            func.sum(LLMUsageRollup.cost_usd).label('total_cost'),
+            func.sum(LLMUsageRollup.total_tokens).label('total_tokens'),
+            func.sum(LLMUsageRollup.request_count).label('total_requests')
+        ).where(
+            self._rollup_range(period_type, start_date, end_date, group_id)
+        ).group_by(
+            LLMUsageRollup.model_name,
+            LLMUsageRollup.model_provider
+        ).order_by(desc('total_cost'))
         
-        if group_id:
-            query = query.filter(LLMUsageBilling.group_id == group_id)
-        
-        results = query.group_by(
-            LLMUsageBilling.model_name,
-            LLMUsageBilling.model_provider
-        ).order_by(desc('total_cost')).all()
+        result = await self.session.execute(query)
         
         return [
             {
-                "model_name": result.model_name,
-                "model_provider": result.model_provider,
-                "total_cost": float(result.total_cost or 0),
-                "total_tokens": result.total_tokens or 0,
-                "total_requests": result.total_requests or 0
+                "model_name": row.model_name,
+                "model_provider": row.model_provider,
+                "total_cost": float(row.total_cost or 0),
+                "total_tokens": row.total_tokens or 0,
+                "total_requests": row.total_requests or 0
             }
-            for result in results
+            for row in result.all()
         ]
     
     async def get_cost_by_user(
@@ -149,56 +290,52 @@ class BillingRepository(BaseRepository[LLMUsageBilling]):
         end_date: datetime,
         group_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get cost breakdown by user"""
-        query = self.session.query(
-            LLMUsageBilling.user_email,
-            func.sum(LLMUsageBilling.cost_usd).label('total_cost'),
-            func.sum(LLMUsageBilling.total_tokens).label('total_tokens'),
-            func.count(LLMUsageBilling.id).label('total_requests')
-        ).filter(
-            and_(
-                LLMUsageBilling.usage_date >= start_date,
-                LLMUsageBilling.usage_date <= end_date,
-                LLMUsageBilling.user_email.isnot(None)
-            )
-        )
+        """Get cost breakdown by user, from the rollups"""
+        period_type = _rollup_period_type(start_date, end_date)
+        query = select(
+            LLMUsageRollup.user_email,
+            func.sum(LLMUsageRollup.cost_usd).label('total_cost'),
+            func.sum(LLMUsageRollup.total_tokens).label('total_tokens'),
+            func.sum(LLMUsageRollup.request_count).label('total_requests')
+        ).where(
+            self._rollup_range(period_type, start_date, end_date, group_id),
+            LLMUsageRollup.user_email != ""
+        ).group_by(
+            LLMUsageRollup.user_email
+        ).order_by(desc('total_cost'))
         
-        if group_id:
-            query = query.filter(LLMUsageBilling.group_id == group_id)
-        
-        results = query.group_by(
-            LLMUsageBilling.user_email
-        ).order_by(desc('total_cost')).all()
+        result = await self.session.execute(query)
         
         return [
             {
-                "user_email": result.user_email,
-                "total_cost": float(result.total_cost or 0),
-                "total_tokens": result.total_tokens or 0,
-                "total_requests": result.total_requests or 0
+                "user_email": row.user_email,
+                "total_cost": float(row.total_cost or 0),
+                "total_tokens": row.total_tokens or 0,
+                "total_requests": row.total_requests or 0
             }
-            for result in results
+            for row in result.all()
         ]
     
     async def get_monthly_cost_for_group(self, group_id: str, year: int, month: int) -> float:
-        """Get total cost for a group in a specific month"""
+        """Get total cost for a group in a specific month, from the daily rollups"""
         start_date = datetime(year, month, 1)
         if month == 12:
             end_date = datetime(year + 1, 1, 1)
         else:
             end_date = datetime(year, month + 1, 1)
         
-        result = self.session.query(
-            func.sum(LLMUsageBilling.cost_usd).label('total_cost')
-        ).filter(
-            and_(
-                LLMUsageBilling.group_id == group_id,
-                LLMUsageBilling.usage_date >= start_date,
-                LLMUsageBilling.usage_date < end_date
+        result = await self.session.execute(
+            select(func.sum(LLMUsageRollup.cost_usd)).where(
+                and_(
+                    LLMUsageRollup.period_type == "day",
+                    LLMUsageRollup.group_id == group_id,
+                    LLMUsageRollup.period_start >= start_date,
+                    LLMUsageRollup.period_start < end_date
+                )
             )
-        ).scalar()
+        )
         
-        return float(result or 0)
+        return float(result.scalar() or 0)
     
     async def get_recent_expensive_executions(
         self,
@@ -210,19 +347,19 @@ class BillingRepository(BaseRepository[LLMUsageBilling]):
         start_date = datetime.utcnow() - timedelta(days=days)
         
         # Subquery to get cost per execution
-        subquery = self.session.query(
+        subquery = select(
             LLMUsageBilling.execution_id,
             LLMUsageBilling.execution_name,
             LLMUsageBilling.execution_type,
             func.sum(LLMUsageBilling.cost_usd).label('total_cost'),
             func.sum(LLMUsageBilling.total_tokens).label('total_tokens'),
             func.max(LLMUsageBilling.usage_date).label('latest_usage')
-        ).filter(
+        ).where(
             LLMUsageBilling.usage_date >= start_date
         )
         
         if group_id:
-            subquery = subquery.filter(LLMUsageBilling.group_id == group_id)
+            subquery = subquery.where(LLMUsageBilling.group_id == group_id)
         
         subquery = subquery.group_by(
             LLMUsageBilling.execution_id,
@@ -230,20 +367,20 @@ class BillingRepository(BaseRepository[LLMUsageBilling]):
             LLMUsageBilling.execution_type
         ).subquery()
         
-        results = self.session.query(subquery).order_by(
-            desc(subquery.c.total_cost)
-        ).limit(limit).all()
+        result = await self.session.execute(
+            select(subquery).order_by(desc(subquery.c.total_cost)).limit(limit)
+        )
         
         return [
             {
-                "execution_id": result.execution_id,
-                "execution_name": result.execution_name,
-                "execution_type": result.execution_type,
-                "total_cost": float(result.total_cost or 0),
-                "total_tokens": result.total_tokens or 0,
-                "latest_usage": result.latest_usage
+                "execution_id": row.execution_id,
+                "execution_name": row.execution_name,
+                "execution_type": row.execution_type,
+                "total_cost": float(row.total_cost or 0),
+                "total_tokens": row.total_tokens or 0,
+                "latest_usage": row.latest_usage
             }
-            for result in results
+            for row in result.all()
         ]
 
 
@@ -255,14 +392,13 @@ class BillingPeriodRepository(BaseRepository[BillingPeriod]):
     
     async def get_current_period(self, group_id: Optional[str] = None) -> Optional[BillingPeriod]:
         """Get the current active billing period"""
-        query = self.session.query(BillingPeriod).filter(
-            BillingPeriod.status == "active"
-        )
+        query = select(BillingPeriod).where(BillingPeriod.status == "active")
         
         if group_id:
-            query = query.filter(BillingPeriod.group_id == group_id)
+            query = query.where(BillingPeriod.group_id == group_id)
         
-        return query.first()
+        result = await self.session.execute(query)
+        return result.scalars().first()
     
     async def create_monthly_period(self, year: int, month: int, group_id: Optional[str] = None) -> BillingPeriod:
         """Create a new monthly billing period"""
@@ -293,14 +429,13 @@ class BillingAlertRepository(BaseRepository[BillingAlert]):
     
     async def get_active_alerts(self, group_id: Optional[str] = None) -> List[BillingAlert]:
         """Get all active billing alerts"""
-        query = self.session.query(BillingAlert).filter(
-            BillingAlert.is_active == "true"
-        )
+        query = select(BillingAlert).where(BillingAlert.is_active == "true")
         
         if group_id:
-            query = query.filter(BillingAlert.group_id == group_id)
+            query = query.where(BillingAlert.group_id == group_id)
         
-        return query.all()
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
     
     async def update_alert_current_value(self, alert_id: str, current_value: float) -> None:
         """Update the current value for an alert"""
@@ -5,7 +5,6 @@ This repository handles all interactions with Databricks Vector Search endpoints
 following the clean architecture pattern.
 """
 from typing import Optional, List, Dict, Any
-import aiohttp
 # No longer using VectorSearchClient - using REST API directly
 from src.core.logger import LoggerManager
 from src.schemas.databricks_vector_endpoint import (
@@ -17,6 +16,7 @@ from src.schemas.databricks_vector_endpoint import (
     EndpointType
 )
 from src.repositories.databricks_auth_helper import DatabricksAuthHelper
+from src.utils.databricks_http_client import databricks_http_pool, databricks_http_session
 
 logger = LoggerManager.get_instance().system
 
@@ -51,9 +51,14 @@ class DatabricksVectorEndpointRepository:
         Raises:
             Exception: If no authentication token can be obtained
         """
-        return await DatabricksAuthHelper.get_auth_token(
-            workspace_url=self.workspace_url,
-            user_token=user_token
+        # PAT lookups go through the database, so resolved tokens are cached per workspace
+        return await databricks_http_pool.get_auth_token(
+            self.workspace_url,
+            user_token,
+            lambda: DatabricksAuthHelper.get_auth_token(
+                workspace_url=self.workspace_url,
+                user_token=user_token
+            )
         )
     
     async def create_endpoint(
@@ -98,7 +103,7 @@ class DatabricksVectorEndpointRepository:
             logger.info(f"Creating endpoint {endpoint_data.name} via REST API")
             
             # Make the REST API call
-            async with aiohttp.ClientSession() as session:
+            async with databricks_http_session(self.workspace_url) as session:
                 async with session.post(url, headers=headers, json=payload) as response:
                     response_text = await response.text()
                     
@@ -168,7 +173,7 @@ class DatabricksVectorEndpointRepository:
             
             logger.info(f"Getting endpoint {endpoint_name} via REST API")
             
-            async with aiohttp.ClientSession() as session:
+            async with databricks_http_session(self.workspace_url) as session:
                 async with session.get(url, headers=headers) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -243,7 +248,7 @@ class DatabricksVectorEndpointRepository:
             logger.info("Listing all endpoints via REST API")
             
             # Make the REST API call
-            async with aiohttp.ClientSession() as session:
+            async with databricks_http_session(self.workspace_url) as session:
                 async with session.get(url, headers=headers) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -326,7 +331,7 @@ class DatabricksVectorEndpointRepository:
             logger.info(f"Deleting endpoint {endpoint_name} via REST API")
             
             # Make the REST API call
-            async with aiohttp.ClientSession() as session:
+            async with databricks_http_session(self.workspace_url) as session:
                 async with session.delete(url, headers=headers) as response:
                     if response.status in [200, 204]:
                         logger.info(f"Successfully deleted endpoint: {endpoint_name}")
@@ -5,7 +5,6 @@ This repository handles all interactions with Databricks Vector Search indexes,
 following the clean architecture pattern.
 """
 from typing import Optional, List, Dict, Any
-import aiohttp
 import asyncio
 import json
 import os
@@ -20,6 +19,7 @@ from src.schemas.databricks_vector_index import (
     IndexType
 )
 from src.repositories.databricks_auth_helper import DatabricksAuthHelper
+from src.utils.databricks_http_client import databricks_http_pool, databricks_http_session
 
 logger = LoggerManager.get_instance().system
 vector_search_logger = LoggerManager.get_instance().databricks_vector_search
@@ -66,9 +66,14 @@ class DatabricksVectorIndexRepository:
         Raises:
             Exception: If no authentication token can be obtained
         """
-        return await DatabricksAuthHelper.get_auth_token(
-            workspace_url=self.workspace_url,
-            user_token=user_token
+        # PAT lookups go through the database, so resolved tokens are cached per workspace
+        return await databricks_http_pool.get_auth_token(
+            self.workspace_url,
+            user_token,
+            lambda: DatabricksAuthHelper.get_auth_token(
+                workspace_url=self.workspace_url,
+                user_token=user_token
+            )
         )
     
     
@@ -120,7 +125,7 @@ class DatabricksVectorIndexRepository:
             logger.info(f"Creating index {index_data.name} via REST API at {url}")
             
             # Make the REST API call
-            async with aiohttp.ClientSession() as session:
+            async with databricks_http_session(self.workspace_url) as session:
                 async with session.post(url, headers=headers, json=payload) as response:
                     response_text = await response.text()
                     
@@ -191,7 +196,7 @@ class DatabricksVectorIndexRepository:
             logger.info(f"Getting index {index_name} via REST API at {url}")
             
             # Make the REST API call
-            async with aiohttp.ClientSession() as session:
+            async with databricks_http_session(self.workspace_url) as session:
                 async with session.get(url, headers=headers) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -326,7 +331,7 @@ class DatabricksVectorIndexRepository:
             logger.info(f"Listing indexes for endpoint {endpoint_name} via REST API")
             
             # Make the REST API call
-            async with aiohttp.ClientSession() as session:
+            async with databricks_http_session(self.workspace_url) as session:
                 async with session.get(url, headers=headers, params=params) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -431,7 +436,7 @@ class DatabricksVectorIndexRepository:
             logger.info(f"Deleting index {index_name} via REST API at {url}")
             
             # Make the REST API call
-            async with aiohttp.ClientSession() as session:
+            async with databricks_http_session(self.workspace_url) as session:
                 async with session.delete(url, headers=headers) as response:
                     response_text = await response.text()
                     
@@ -505,7 +510,7 @@ class DatabricksVectorIndexRepository:
             # Step 1: Get current index configuration
             describe_url = f"{self.workspace_url}/api/2.0/vector-search/indexes/{encoded_index_name}"
             
-            async with aiohttp.ClientSession() as session:
+            async with databricks_http_session(self.workspace_url) as session:
                 # Get index info
                 async with session.get(describe_url, headers=headers) as response:
                     if response.status != 200:
@@ -673,7 +678,7 @@ class DatabricksVectorIndexRepository:
                 payload["filters"] = filters
             
             # Make the REST API call
-            async with aiohttp.ClientSession() as session:
+            async with databricks_http_session(self.workspace_url) as session:
                 async with session.post(url, headers=headers, json=payload) as response:
                     if response.status == 200:
                         results = await response.json()
@@ -901,7 +906,7 @@ class DatabricksVectorIndexRepository:
             logger.debug(f"Payload has 'inputs_json' key with JSON string of {len(records)} records")
             
             # Make the REST API call
-            async with aiohttp.ClientSession() as session:
+            async with databricks_http_session(self.workspace_url) as session:
                 # Log the complete structure for debugging
                 logger.info(f"Sending upsert request to: {url}")
                 logger.info(f"Payload keys: {list(payload.keys())}")
@@ -1027,7 +1032,7 @@ class DatabricksVectorIndexRepository:
             logger.info(f"Deleting {len(primary_keys)} records from {index_name}")
             
             # Make the REST API call
-            async with aiohttp.ClientSession() as session:
+            async with databricks_http_session(self.workspace_url) as session:
                 async with session.post(url, headers=headers, json=payload) as response:
                     if response.status in [200, 204]:
                         logger.info(f"Successfully deleted {len(primary_keys)} records from {index_name}")
@@ -1,11 +1,34 @@
+import asyncio
+import threading
+import weakref
 from typing import Dict, List, Optional, Any, Union
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, select
+from sqlalchemy import desc, select, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.documentation_embedding import DocumentationEmbedding
 from src.schemas.documentation_embedding import DocumentationEmbeddingCreate
 from src.core.base_repository import BaseRepository
+from src.utils.vector_index import VectorIndex
+
+# Process-wide index of documentation embeddings used for SQLite similarity search.
+# It is loaded on the first search and then refreshed incrementally.
+_sqlite_vector_index = VectorIndex()
+# Searches run on the request loop and on worker threads' loops. An asyncio.Lock
+# binds to the first loop that waits on it, so each loop gets its own lock to
+# serialize its syncs, and the index itself is only touched under a thread lock.
+_sqlite_vector_index_mutex = threading.Lock()
+_sqlite_vector_index_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+def _get_sqlite_vector_index_lock() -> asyncio.Lock:
+    """Get the index lock of the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _sqlite_vector_index_mutex:
+        lock = _sqlite_vector_index_locks.get(loop)
+        if lock is None:
+            lock = _sqlite_vector_index_locks[loop] = asyncio.Lock()
+        return lock
 
 
 class DocumentationEmbeddingRepository(BaseRepository[DocumentationEmbedding]):
@@ -30,6 +53,8 @@ class DocumentationEmbeddingRepository(BaseRepository[DocumentationEmbedding]):
         )
         self.db.add(db_embedding)
         await self.db.flush()  # Flush to get the ID but don't commit
+        if db_embedding.id is not None:
+            _sqlite_vector_index.stale_ids.add(db_embedding.id)
         return db_embedding
 
     async def get_by_id(self, embedding_id: int) -> Optional[DocumentationEmbedding]:
@@ -67,6 +92,7 @@ class DocumentationEmbeddingRepository(BaseRepository[DocumentationEmbedding]):
             for key, value in update_data.items():
                 setattr(db_embedding, key, value)
             await self.db.flush()
+            _sqlite_vector_index.stale_ids.add(embedding_id)
         return db_embedding
 
     async def delete(self, embedding_id: int) -> bool:
@@ -74,6 +100,7 @@ class DocumentationEmbeddingRepository(BaseRepository[DocumentationEmbedding]):
         db_embedding = await self.get_by_id(embedding_id)
         if db_embedding:
             await self.db.delete(db_embedding)
+            _sqlite_vector_index.stale_ids.add(embedding_id)
             # Don't commit here, let UnitOfWork handle it
             return True
         return False
@@ -181,72 +208,42 @@ class DocumentationEmbeddingRepository(BaseRepository[DocumentationEmbedding]):
         query_embedding: List[float],
         limit: int
     ) -> List[DocumentationEmbedding]:
-        """SQLite implementation of similarity search using JSON functions."""
-        import json
-        from sqlalchemy import text
+        """
+        SQLite implementation of similarity search using an in-memory vector index.
         
-        query_json = json.dumps(query_embedding)
+        Embeddings are held in a normalized NumPy matrix (see VectorIndex) that is
+        synchronized with the table before each search, so a query is a single
+        matrix product plus a top-k selection instead of a JSON scan of every row.
+        """
+        async with _get_sqlite_vector_index_lock():
+            await self._sync_sqlite_vector_index()
+            with _sqlite_vector_index_mutex:
+                matches = _sqlite_vector_index.search(query_embedding, limit)
         
-        # Pure SQL cosine similarity calculation
-        similarity_query = text("""
-            WITH vector_calculations AS (
-                SELECT 
-                    id,
-                    source,
-                    title,
-                    content,
-                    doc_metadata,
-                    created_at,
-                    updated_at,
-                    embedding,
-                    -- Parse JSON and calculate dot product with query vector
-                    (
-                        SELECT SUM(
-                            CAST(d.value AS REAL) * CAST(q.value AS REAL)
-                        )
-                        FROM json_each(embedding) d, json_each(:query_vector) q
-                        WHERE d.key = q.key
-                    ) AS dot_product,
-                    -- Calculate norm of document vector
-                    (
-                        SELECT SQRT(SUM(
-                            CAST(value AS REAL) * CAST(value AS REAL)
-                        ))
-                        FROM json_each(embedding)
-                    ) AS doc_norm,
-                    -- Query vector norm (calculated once)
-                    (
-                        SELECT SQRT(SUM(
-                            CAST(value AS REAL) * CAST(value AS REAL)
-                        ))
-                        FROM json_each(:query_vector)
-                    ) AS query_norm
-                FROM documentation_embeddings
-                WHERE embedding IS NOT NULL
-            )
-            SELECT 
-                id, source, title, content, doc_metadata, created_at, updated_at,
-                -- Calculate cosine similarity
-                CASE 
-                    WHEN doc_norm > 0 AND query_norm > 0 
-                    THEN dot_product / (doc_norm * query_norm)
-                    ELSE 0 
-                END AS similarity
-            FROM vector_calculations
-            WHERE similarity > 0
-            ORDER BY similarity DESC
-            LIMIT :limit_val
-        """)
+        if not matches:
+            return []
         
-        result = await self.db.execute(similarity_query, {
-            "query_vector": query_json,
-            "limit_val": limit
-        })
-        rows = result.all()
+        # Fetch everything except the embedding for the matching documents
+        ids = [doc_id for doc_id, _ in matches]
+        result = await self.db.execute(
+            select(
+                DocumentationEmbedding.id,
+                DocumentationEmbedding.source,
+                DocumentationEmbedding.title,
+                DocumentationEmbedding.content,
+                DocumentationEmbedding.doc_metadata,
+                DocumentationEmbedding.created_at,
+                DocumentationEmbedding.updated_at
+            ).where(DocumentationEmbedding.id.in_(ids))
+        )
+        rows_by_id = {row.id: row for row in result.all()}
         
-        # Convert rows to DocumentationEmbedding objects
+        # Convert rows to DocumentationEmbedding objects, most similar first
         similar_docs = []
-        for row in rows:
+        for doc_id in ids:
+            row = rows_by_id.get(doc_id)
+            if row is None:
+                continue
             doc = DocumentationEmbedding(
                 id=row.id,
                 source=row.source,
@@ -261,6 +258,79 @@ class DocumentationEmbeddingRepository(BaseRepository[DocumentationEmbedding]):
         
         return similar_docs
     
+    async def _sync_sqlite_vector_index(self) -> None:
+        """
+        Bring the in-memory vector index up to date with documentation_embeddings.
+        
+        The index is fully loaded once. Afterwards a single aggregate query
+        (row count and latest updated_at) detects changes, and only rows touched
+        through this repository or updated since the last sync are reloaded.
+        Deleted rows are found by comparing ids when the row count differs.
+        """
+        index = _sqlite_vector_index
+        stats = await self.db.execute(
+            select(func.count(DocumentationEmbedding.id), func.max(DocumentationEmbedding.updated_at))
+            .where(DocumentationEmbedding.embedding.isnot(None))
+        )
+        count, last_updated = stats.one()
+        signature = (count, last_updated)
+        
+        if not index.loaded:
+            result = await self.db.execute(
+                select(DocumentationEmbedding.id, DocumentationEmbedding.embedding)
+                .where(DocumentationEmbedding.embedding.isnot(None))
+            )
+            rows = result.all()
+            with _sqlite_vector_index_mutex:
+                index.rebuild((row.id, row.embedding) for row in rows)
+                index.stale_ids.clear()
+                index.signature = signature
+            return
+        
+        if signature == index.signature and not index.stale_ids:
+            return
+        
+        # Reload rows changed through this repository or since the last sync
+        conditions = []
+        if index.stale_ids:
+            conditions.append(DocumentationEmbedding.id.in_(list(index.stale_ids)))
+        previous_updated = index.signature[1] if index.signature else None
+        if previous_updated is not None and last_updated != previous_updated:
+            conditions.append(DocumentationEmbedding.updated_at >= previous_updated)
+        if conditions:
+            result = await self.db.execute(
+                select(DocumentationEmbedding.id, DocumentationEmbedding.embedding)
+                .where(DocumentationEmbedding.embedding.isnot(None))
+                .where(or_(*conditions))
+            )
+            rows = result.all()
+            with _sqlite_vector_index_mutex:
+                index.upsert((row.id, row.embedding) for row in rows)
+                # Stale ids that were not found have been deleted
+                index.remove(index.stale_ids - {row.id for row in rows})
+        
+        # Drop rows that no longer exist
+        if len(index) != count:
+            result = await self.db.execute(
+                select(DocumentationEmbedding.id).where(DocumentationEmbedding.embedding.isnot(None))
+            )
+            existing_ids = set(result.scalars().all())
+            with _sqlite_vector_index_mutex:
+                index.remove(index.ids() - existing_ids)
+                missing_ids = existing_ids - index.ids()
+            if missing_ids:
+                result = await self.db.execute(
+                    select(DocumentationEmbedding.id, DocumentationEmbedding.embedding)
+                    .where(DocumentationEmbedding.id.in_(list(missing_ids)))
+                )
+                rows = result.all()
+                with _sqlite_vector_index_mutex:
+                    index.upsert((row.id, row.embedding) for row in rows)
+        
+        with _sqlite_vector_index_mutex:
+            index.stale_ids.clear()
+            index.signature = signature
+    
     async def _search_similar_postgres(
         self,
         query_embedding: List[float],
@@ -4,14 +4,37 @@ Repository for execution history data access.
 This module provides database operations for execution history models.
 """
 
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import desc, func, delete
+from sqlalchemy import and_, desc, func, delete, or_, update
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import undefer
 
+from src.config.settings import settings
 from src.models.execution_history import ExecutionHistory, TaskStatus, ErrorTrace
 from src.db.session import async_session_factory
+from src.utils.payload_compression import decompress_payload, load_payload_columns, pack_payload_columns
+
+
+# Columns loaded for the history listing; inputs and result are only loaded
+# when a single execution is fetched
+SUMMARY_COLUMNS = (
+    ExecutionHistory.id,
+    ExecutionHistory.job_id,
+    ExecutionHistory.run_name,
+    ExecutionHistory.status,
+    ExecutionHistory.error,
+    ExecutionHistory.trigger_type,
+    ExecutionHistory.planning,
+    ExecutionHistory.created_at,
+    ExecutionHistory.completed_at,
+    ExecutionHistory.group_email,
+)
+
+# JSON columns stored compressed when large (see src.utils.payload_compression)
+PAYLOAD_COLUMNS = ("result",)
 
 
 class ExecutionHistoryRepository:
@@ -62,10 +85,65 @@ class ExecutionHistoryRepository:
             
             return runs, total_count
     
+    async def get_execution_summaries(
+        self,
+        limit: int = 50,
+        before: Optional[Tuple[datetime, int]] = None,
+        group_ids: List[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a page of execution summaries, newest first, with keyset pagination.
+        
+        Args:
+            limit: Maximum number of items to return
+            before: (created_at, id) of the last item of the previous page
+            group_ids: List of group IDs for filtering
+            
+        Returns:
+            List of dictionaries with the summary columns
+        """
+        async with async_session_factory() as session:
+            filters = []
+            if group_ids and len(group_ids) > 0:
+                filters.append(ExecutionHistory.group_id.in_(group_ids))
+            if before is not None:
+                created_at, execution_id = before
+                filters.append(or_(
+                    ExecutionHistory.created_at < created_at,
+                    and_(ExecutionHistory.created_at == created_at, ExecutionHistory.id < execution_id)
+                ))
+            
+            stmt = (select(*SUMMARY_COLUMNS)
+                   .where(*filters)
+                   .order_by(ExecutionHistory.created_at.desc(), ExecutionHistory.id.desc())
+                   .limit(limit))
+            result = await session.execute(stmt)
+            return [dict(row._mapping) for row in result.all()]
+    
+    async def count_executions(self, group_ids: List[str] = None) -> int:
+        """
+        Count executions with group filtering.
+        
+        Args:
+            group_ids: List of group IDs for filtering
+            
+        Returns:
+            Number of executions
+        """
+        async with async_session_factory() as session:
+            stmt = select(func.count()).select_from(ExecutionHistory)
+            if group_ids and len(group_ids) > 0:
+                stmt = stmt.where(ExecutionHistory.group_id.in_(group_ids))
+            result = await session.execute(stmt)
+            return result.scalar() or 0
+    
     async def get_execution_by_id(self, execution_id: int, group_ids: List[str] = None) -> Optional[ExecutionHistory]:
         """
         Get a specific execution by ID with group filtering.
         
+        Unlike the listings, this loads the full result of executions stored
+        with a compressed payload.
+        
         Args:
             execution_id: ID of the execution
             group_ids: List of group IDs for filtering
@@ -80,13 +158,13 @@ class ExecutionHistoryRepository:
             if group_ids and len(group_ids) > 0:
                 filters.append(ExecutionHistory.group_id.in_(group_ids))
             
-            stmt = select(ExecutionHistory).where(*filters)
+            stmt = select(ExecutionHistory).where(*filters).options(undefer(ExecutionHistory.payload))
             result = await session.execute(stmt)
-            return result.scalars().first()
+            return load_payload_columns(result.scalars().first())
     
     async def get_execution_by_job_id(self, job_id: str, group_ids: List[str] = None) -> Optional[ExecutionHistory]:
         """
-        Get a specific execution by job_id with group filtering.
+        Get a specific execution by job_id with group filtering, with its full result.
         
         Args:
             job_id: Job ID of the execution
@@ -102,9 +180,9 @@ class ExecutionHistoryRepository:
             if group_ids and len(group_ids) > 0:
                 filters.append(ExecutionHistory.group_id.in_(group_ids))
             
-            stmt = select(ExecutionHistory).where(*filters)
+            stmt = select(ExecutionHistory).where(*filters).options(undefer(ExecutionHistory.payload))
             result = await session.execute(stmt)
-            return result.scalars().first()
+            return load_payload_columns(result.scalars().first())
     
     async def find_by_id(self, execution_id: int) -> Optional[ExecutionHistory]:
         """
@@ -283,6 +361,56 @@ class ExecutionHistoryRepository:
             except Exception as e:
                 await session.rollback()
                 raise e
+    
+    async def repack_payloads(self, batch_size: int = 500) -> int:
+        """
+        Store existing execution results the way new results are stored.
+        
+        With PAYLOAD_COMPRESSION_ENABLED, executions without a payload have a
+        large result compressed; without it, compressed executions get their
+        full result back inline. Executions are updated in id order, one commit
+        per batch.
+        
+        Args:
+            batch_size: Number of executions read per batch
+            
+        Returns:
+            Number of updated executions
+        """
+        if settings.PAYLOAD_COMPRESSION_ENABLED:
+            pending = ExecutionHistory.payload.is_(None)
+        else:
+            pending = ExecutionHistory.payload.isnot(None)
+        updated = 0
+        last_id = 0
+        async with async_session_factory() as session:
+            try:
+                while True:
+                    stmt = (select(ExecutionHistory.id, ExecutionHistory.result, ExecutionHistory.payload)
+                           .where(ExecutionHistory.id > last_id, pending)
+                           .order_by(ExecutionHistory.id)
+                           .limit(batch_size))
+                    result = await session.execute(stmt)
+                    runs = result.all()
+                    if not runs:
+                        return updated
+                    last_id = runs[-1].id
+                    
+                    rows = []
+                    for run in runs:
+                        run_result = run.result
+                        if run.payload is not None:
+                            run_result = decompress_payload(run.payload).get("result", run_result)
+                        row = pack_payload_columns({"id": run.id, "result": run_result}, PAYLOAD_COLUMNS)
+                        if row["payload"] is not None or run.payload is not None:
+                            rows.append(row)
+                    if rows:
+                        await session.execute(update(ExecutionHistory), rows)
+                    await session.commit()
+                    updated += len(rows)
+            except Exception as e:
+                await session.rollback()
+                raise e
 
 
 # Create a singleton instance
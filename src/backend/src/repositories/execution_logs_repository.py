@@ -4,10 +4,10 @@ Repository for execution logs data access.
 This module provides database operations for execution logs.
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import desc, func, delete, text
+from sqlalchemy import desc, func, delete, text, insert
 import logging
 from datetime import datetime, timezone
 
@@ -399,6 +399,59 @@ class ExecutionLogsRepository:
             logger.error(f"[ExecutionLogsRepository.create_with_group_managed_session] Error creating log: {e}", exc_info=True)
             raise
 
+    
+    async def create_many(self, session: AsyncSession, logs: List[Dict[str, Any]]) -> int:
+        """
+        Insert several execution log entries with a single multi-row INSERT.
+        
+        Args:
+            session: Database session
+            logs: List of dictionaries with execution_id, content and optional
+                timestamp, group_id and group_email keys
+            
+        Returns:
+            Number of inserted records
+        """
+        if not logs:
+            return 0
+        
+        rows = [
+            {
+                "execution_id": log["execution_id"],
+                "content": log["content"],
+                "timestamp": self._normalize_timestamp(log.get("timestamp")) or datetime.utcnow(),
+                "group_id": log.get("group_id"),
+                "group_email": log.get("group_email"),
+            }
+            for log in logs
+        ]
+        
+        try:
+            await session.execute(insert(ExecutionLog), rows)
+            await session.commit()
+            return len(rows)
+        except Exception as e:
+            logger.error(f"[ExecutionLogsRepository.create_many] Error creating {len(rows)} logs: {e}")
+            try:
+                await session.rollback()
+            except Exception as rollback_error:
+                logger.error(f"[ExecutionLogsRepository.create_many] Rollback failed: {rollback_error}")
+            raise
+    
+    async def create_many_with_managed_session(self, logs: List[Dict[str, Any]]) -> int:
+        """
+        Insert several execution log entries with internal session management.
+        
+        Args:
+            logs: List of dictionaries with execution_id, content and optional
+                timestamp, group_id and group_email keys
+            
+        Returns:
+            Number of inserted records
+        """
+        async with async_session_factory() as session:
+            return await self.create_many(session, logs)
+
 
 # Create a singleton instance
 execution_logs_repository = ExecutionLogsRepository() 
\ No newline at end of file
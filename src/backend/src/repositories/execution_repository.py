@@ -8,12 +8,17 @@ from typing import Dict, List, Optional, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import desc, func, delete, update
+from sqlalchemy.orm import undefer
 from datetime import datetime, UTC
 import logging
 
 from src.models.execution_history import ExecutionHistory
 from src.core.base_repository import BaseRepository
 from src.schemas.execution import ExecutionStatus
+from src.utils.payload_compression import load_payload_columns, pack_payload_columns
+
+# JSON columns stored compressed when large (see src.utils.payload_compression)
+PAYLOAD_COLUMNS = ("result",)
 
 
 class ExecutionRepository(BaseRepository[ExecutionHistory]):
@@ -76,13 +81,20 @@ class ExecutionRepository(BaseRepository[ExecutionHistory]):
         
         return executions, total_count
     
-    async def get_execution_by_job_id(self, job_id: str, group_ids: List[str] = None) -> Optional[ExecutionHistory]:
+    async def get_execution_by_job_id(
+        self,
+        job_id: str,
+        group_ids: List[str] = None,
+        with_payload: bool = False
+    ) -> Optional[ExecutionHistory]:
         """
         Get a specific execution by job_id with group filtering.
         
         Args:
             job_id: Job ID of the execution
             group_ids: List of group IDs for filtering
+            with_payload: Load the full result of an execution stored with a
+                compressed payload instead of its preview
             
         Returns:
             Execution object if found, None otherwise
@@ -93,8 +105,11 @@ class ExecutionRepository(BaseRepository[ExecutionHistory]):
             base_filter = base_filter & ExecutionHistory.group_id.in_(group_ids)
         
         stmt = select(ExecutionHistory).where(base_filter)
+        if with_payload:
+            stmt = stmt.options(undefer(ExecutionHistory.payload))
         result = await self.session.execute(stmt)
-        return result.scalars().first()
+        execution = result.scalars().first()
+        return load_payload_columns(execution) if with_payload else execution
     
     async def create_execution(self, data: Dict[str, Any]) -> ExecutionHistory:
         """
@@ -113,7 +128,7 @@ class ExecutionRepository(BaseRepository[ExecutionHistory]):
                 raise ValueError(f"Missing required field '{field}' in execution data")
         
         # Create execution object
-        execution = ExecutionHistory(**data)
+        execution = ExecutionHistory(**pack_payload_columns(data, PAYLOAD_COLUMNS))
         self.session.add(execution)
         await self.session.flush()
         return execution
@@ -129,7 +144,7 @@ class ExecutionRepository(BaseRepository[ExecutionHistory]):
         Returns:
             Updated execution instance or None if not found
         """
-        return await self.update(execution_id, data)
+        return await self.update(execution_id, pack_payload_columns(data, PAYLOAD_COLUMNS))
     
     async def update_execution_by_job_id(self, job_id: str, data: Dict[str, Any]) -> Optional[ExecutionHistory]:
         """
@@ -146,7 +161,7 @@ class ExecutionRepository(BaseRepository[ExecutionHistory]):
         if not execution:
             return None
             
-        for key, value in data.items():
+        for key, value in pack_payload_columns(data, PAYLOAD_COLUMNS).items():
             setattr(execution, key, value)
             
         await self.session.flush()
@@ -215,7 +230,7 @@ class ExecutionRepository(BaseRepository[ExecutionHistory]):
             stmt = (
                 update(self.model)
                 .where(self.model.job_id == job_id)
-                .values(**update_data)
+                .values(**pack_payload_columns(update_data, PAYLOAD_COLUMNS))
                 .returning(self.model) # Return the updated row
             )
             
@@ -257,7 +272,7 @@ class ExecutionRepository(BaseRepository[ExecutionHistory]):
         if result:
             update_data["result"] = result
             
-        return await self.update(execution_id, update_data)
+        return await self.update(execution_id, pack_payload_columns(update_data, PAYLOAD_COLUMNS))
     
     async def mark_execution_failed(self, execution_id: int, error: str) -> Optional[ExecutionHistory]:
         """
@@ -5,20 +5,27 @@ This module provides functions for CRUD operations on execution traces.
 """
 
 import logging
+from datetime import datetime
 from typing import List, Optional, Dict, Any, Tuple
-from sqlalchemy import select, delete, update, func
+from sqlalchemy import select, delete, update, func, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import undefer
 
 from src.models.execution_trace import ExecutionTrace
 from src.models.execution_history import ExecutionHistory
 from src.core.logger import LoggerManager
 from src.db.session import async_session_factory
+from src.utils.payload_compression import decompress_payload, load_payload_columns, pack_payload_columns
+from src.config.settings import settings
 
 # Get logger from the centralized logging system
 logger = LoggerManager.get_instance().system
 
+# JSON columns stored compressed when large (see src.utils.payload_compression)
+PAYLOAD_COLUMNS = ("output", "trace_metadata")
+
 class ExecutionTraceRepository:
     """Repository class for handling ExecutionTrace database operations."""
     
@@ -36,7 +43,7 @@ class ExecutionTraceRepository:
             Created ExecutionTrace record
         """
         try:
-            trace = ExecutionTrace(**trace_data)
+            trace = ExecutionTrace(**pack_payload_columns(trace_data, PAYLOAD_COLUMNS))
             session.add(trace)
             await session.commit()
             await session.refresh(trace)
@@ -46,10 +53,65 @@ class ExecutionTraceRepository:
             logger.error(f"Database error creating execution trace: {str(e)}")
             raise
     
+    async def _create_many(self, session: AsyncSession, traces_data: List[Dict[str, Any]]) -> int:
+        """
+        Insert several execution trace records in a single statement with provided session.
+        
+        Missing run_id values are resolved from executionhistory with one lookup
+        for all job_ids in the batch. Unlike _create, jobs are not auto-created here;
+        callers are expected to ensure the parent executions exist.
+        
+        Args:
+            session: Database session
+            traces_data: List of dictionaries with trace data
+        
+        Returns:
+            Number of inserted records
+        """
+        if not traces_data:
+            return 0
+        try:
+            missing_run_ids = {
+                t["job_id"] for t in traces_data
+                if t.get("job_id") and t.get("run_id") is None
+            }
+            run_ids: Dict[str, int] = {}
+            if missing_run_ids:
+                stmt = select(ExecutionHistory.job_id, ExecutionHistory.id).where(
+                    ExecutionHistory.job_id.in_(missing_run_ids)
+                )
+                result = await session.execute(stmt)
+                run_ids = {job_id: run_id for job_id, run_id in result.all()}
+            
+            rows = []
+            for trace_data in traces_data:
+                row = pack_payload_columns(dict(trace_data), PAYLOAD_COLUMNS)
+                if row.get("run_id") is None and row.get("job_id") in run_ids:
+                    row["run_id"] = run_ids[row["job_id"]]
+                row.setdefault("created_at", datetime.utcnow())
+                rows.append(row)
+            
+            # Give every row the same key set so the batch stays a single executemany
+            columns = set().union(*(row.keys() for row in rows))
+            for row in rows:
+                for column in columns:
+                    row.setdefault(column, None)
+            
+            await session.execute(insert(ExecutionTrace), rows)
+            await session.commit()
+            return len(rows)
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Database error bulk creating {len(traces_data)} execution traces: {str(e)}")
+            raise
+    
     async def _get_by_id(self, session: AsyncSession, trace_id: int) -> Optional[ExecutionTrace]:
         """
         Get an execution trace by ID with provided session.
         
+        Unlike the list queries, this loads the full output and metadata of
+        traces stored with compressed payloads.
+        
         Args:
             session: Database session
             trace_id: ID of the trace to retrieve
@@ -58,9 +120,11 @@ class ExecutionTraceRepository:
             ExecutionTrace if found, None otherwise
         """
         try:
-            stmt = select(ExecutionTrace).where(ExecutionTrace.id == trace_id)
+            stmt = (select(ExecutionTrace)
+                   .where(ExecutionTrace.id == trace_id)
+                   .options(undefer(ExecutionTrace.payload)))
             result = await session.execute(stmt)
-            return result.scalars().first()
+            return load_payload_columns(result.scalars().first())
         except SQLAlchemyError as e:
             logger.error(f"Database error retrieving execution trace {trace_id}: {str(e)}")
             raise
@@ -216,6 +280,58 @@ class ExecutionTraceRepository:
             logger.error(f"Database error retrieving run_id for job_id {job_id}: {str(e)}")
             raise
     
+    async def _repack_payloads(self, session: AsyncSession, batch_size: int) -> int:
+        """
+        Store existing traces the way new traces are stored with provided session.
+        
+        With PAYLOAD_COMPRESSION_ENABLED, traces without a payload have their
+        large output and metadata compressed; without it, compressed traces get
+        their full values back inline. Traces are updated in id order, one
+        commit per batch.
+        
+        Args:
+            session: Database session
+            batch_size: Number of traces read per batch
+            
+        Returns:
+            Number of updated records
+        """
+        if settings.PAYLOAD_COMPRESSION_ENABLED:
+            pending = ExecutionTrace.payload.is_(None)
+        else:
+            pending = ExecutionTrace.payload.isnot(None)
+        updated = 0
+        last_id = 0
+        try:
+            while True:
+                stmt = (select(ExecutionTrace.id, ExecutionTrace.output,
+                               ExecutionTrace.trace_metadata, ExecutionTrace.payload)
+                       .where(ExecutionTrace.id > last_id, pending)
+                       .order_by(ExecutionTrace.id)
+                       .limit(batch_size))
+                result = await session.execute(stmt)
+                traces = result.all()
+                if not traces:
+                    return updated
+                last_id = traces[-1].id
+                
+                rows = []
+                for trace in traces:
+                    values = {"id": trace.id, "output": trace.output, "trace_metadata": trace.trace_metadata}
+                    if trace.payload is not None:
+                        values.update(decompress_payload(trace.payload))
+                    row = pack_payload_columns(values, PAYLOAD_COLUMNS)
+                    if row["payload"] is not None or trace.payload is not None:
+                        rows.append(row)
+                if rows:
+                    await session.execute(update(ExecutionTrace), rows)
+                await session.commit()
+                updated += len(rows)
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Database error repacking trace payloads after id {last_id}: {str(e)}")
+            raise
+    
     async def _delete_by_id(self, session: AsyncSession, trace_id: int) -> int:
         """
         Delete an execution trace by ID with provided session.
@@ -351,6 +467,19 @@ class ExecutionTraceRepository:
             # Now create the trace with the existing or newly created job
             return await self._create(session, trace_data)
     
+    async def create_many(self, traces_data: List[Dict[str, Any]]) -> int:
+        """
+        Insert several execution trace records with one multi-row INSERT.
+        
+        Args:
+            traces_data: List of dictionaries with trace data
+        
+        Returns:
+            Number of inserted records
+        """
+        async with async_session_factory() as session:
+            return await self._create_many(session, traces_data)
+    
     async def get_by_id(self, trace_id: int) -> Optional[ExecutionTrace]:
         """
         Get an execution trace by ID.
@@ -448,6 +577,19 @@ class ExecutionTraceRepository:
         async with async_session_factory() as session:
             return await self._get_execution_run_id_by_job_id(session, job_id)
     
+    async def repack_payloads(self, batch_size: int = 500) -> int:
+        """
+        Store existing traces the way new traces are stored.
+        
+        Args:
+            batch_size: Number of traces read per batch
+            
+        Returns:
+            Number of updated records
+        """
+        async with async_session_factory() as session:
+            return await self._repack_payloads(session, batch_size)
+    
     async def delete_by_id(self, trace_id: int) -> int:
         """
         Delete an execution trace by ID.
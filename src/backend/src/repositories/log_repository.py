@@ -1,7 +1,7 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.base_repository import BaseRepository
@@ -109,6 +109,38 @@ class LLMLogRepository(BaseRepository[LLMLog]):
             await session.refresh(db_obj)
             return db_obj
     
+    async def create_many(self, objs_in: List[Dict[str, Any]]) -> int:
+        """
+        Insert several log entries in a single statement and transaction.
+        
+        Args:
+            objs_in: List of dictionaries with log values
+            
+        Returns:
+            Number of inserted log entries
+        """
+        if not objs_in:
+            return 0
+        rows = []
+        for obj_in in objs_in:
+            row = dict(obj_in)
+            for key, value in row.items():
+                if isinstance(value, datetime) and value.tzinfo is not None:
+                    row[key] = value.replace(tzinfo=None)
+            row.setdefault("created_at", datetime.utcnow())
+            rows.append(row)
+        
+        # Give every row the same key set so the batch stays a single executemany
+        columns = set().union(*(row.keys() for row in rows))
+        for row in rows:
+            for column in columns:
+                row.setdefault(column, None)
+        
+        async with async_session_factory() as session:
+            await session.execute(insert(self.model), rows)
+            await session.commit()
+        return len(rows)
+    
     # Tenant-aware methods
     async def get_logs_paginated_by_tenant(
         self, 
@@ -1,5 +1,6 @@
 import logging
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -115,7 +116,23 @@ class ScheduleRepository:
         )
         result = await self.session.execute(query)
         return list(result.scalars().all())
-    
+
+    async def find_active_next_runs(self) -> List[Tuple[int, datetime]]:
+        """
+        Find the next run time of every active schedule.
+
+        Only the ID and next run time are loaded, to seed the scheduler's heap.
+
+        Returns:
+            List of (schedule_id, next_run_at) tuples
+        """
+        query = select(Schedule.id, Schedule.next_run_at).where(
+            Schedule.is_active == True,
+            Schedule.next_run_at.is_not(None)
+        )
+        result = await self.session.execute(query)
+        return [(row.id, row.next_run_at) for row in result.all()]
+
     async def update(self, schedule_id: int, schedule_data: Dict[str, Any]) -> Optional[Schedule]:
         """
         Update a schedule by ID.
@@ -38,6 +38,7 @@ class CrewConfig(BaseModel):
     llm_provider: Optional[str] = Field(None, description="LLM provider to use (openai, anthropic, etc)")
     execution_type: Optional[str] = Field("crew", description="Type of execution (crew or flow)")
     schema_detection_enabled: Optional[bool] = Field(True, description="Whether schema detection is enabled")
+    trace_level: Optional[str] = Field(None, description="Trace capture level (full, summary or off), defaults to TRACE_CAPTURE_LEVEL")
 
     @property
     def tasks(self) -> Dict:
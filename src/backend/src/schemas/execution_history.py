@@ -36,6 +36,31 @@ class ExecutionHistoryList(BaseModel):
     limit: int = Field(description="Maximum number of items per page")
     offset: int = Field(description="Offset for pagination")
     
+class ExecutionHistorySummary(BaseModel):
+    """Schema for an execution in the history listing, without inputs and result."""
+    
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    job_id: str = Field(description="Unique string identifier for the execution")
+    name: Optional[str] = Field(None, alias="run_name")
+    status: Optional[str] = None
+    error: Optional[str] = None
+    trigger_type: Optional[str] = None
+    planning: Optional[bool] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    group_email: Optional[str] = Field(None, description="Email of the user who submitted the execution")
+
+class ExecutionHistoryPage(BaseModel):
+    """Schema for a cursor-paginated page of execution summaries."""
+    
+    executions: List[ExecutionHistorySummary]
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, None on the last page")
+    has_more: bool = Field(description="Whether there are older executions")
+    total: int = Field(description="Total number of executions, cached for a few seconds")
+    limit: int = Field(description="Maximum number of items per page")
+    
 class ExecutionOutput(BaseModel):
     """Schema for an execution output entry."""
     
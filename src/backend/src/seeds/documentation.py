@@ -5,6 +5,7 @@ This module downloads and processes documentation from the CrewAI website,
 creates embeddings, and stores them in the database for use in providing
 context to the LLM during crew generation.
 """
+import asyncio
 import logging
 import requests
 import os
@@ -445,28 +446,32 @@ async def seed_documentation_embeddings(user_token: Optional[str] = None) -> Non
                 chunks = await create_documentation_chunks(url)
                 logger.info(f"Created {len(chunks)} chunks for {url}")
                 
-                # Create embedding for each chunk and store in database
-                for chunk in chunks:
+                async def create_chunk_embedding(chunk):
+                    # Create embedding - use real if available, otherwise mock
+                    if use_mock_embeddings or not embedding_available:
+                        return await mock_create_embedding(chunk["content"])
+                    try:
+                        embedder_config = {
+                            'provider': 'databricks',
+                            'config': {'model': EMBEDDING_MODEL}
+                        }
+                        return await LLMManager.get_embedding(
+                            text=chunk["content"],
+                            model=EMBEDDING_MODEL,
+                            embedder_config=embedder_config
+                        )
+                    except Exception as e:
+                        # If embedding fails after initial test passed, use mock for this chunk
+                        logger.debug(f"Embedding failed for chunk, using mock: {str(e)}")
+                        return await mock_create_embedding(chunk["content"])
+                
+                # Embed all chunks of the page concurrently, the embedding service
+                # batches them into as few requests as possible
+                embeddings = await asyncio.gather(*(create_chunk_embedding(chunk) for chunk in chunks))
+                
+                # Store each chunk with its embedding in the database
+                for chunk, embedding in zip(chunks, embeddings):
                     try:
-                        # Create embedding - use real if available, otherwise mock
-                        if use_mock_embeddings or not embedding_available:
-                            embedding = await mock_create_embedding(chunk["content"])
-                        else:
-                            try:
-                                embedder_config = {
-                                    'provider': 'databricks',
-                                    'config': {'model': EMBEDDING_MODEL}
-                                }
-                                embedding = await LLMManager.get_embedding(
-                                    text=chunk["content"],
-                                    model=EMBEDDING_MODEL,
-                                    embedder_config=embedder_config
-                                )
-                            except Exception as e:
-                                # If embedding fails after initial test passed, use mock for this chunk
-                                logger.debug(f"Embedding failed for chunk, using mock: {str(e)}")
-                                embedding = await mock_create_embedding(chunk["content"])
-                        
                         # Create schema for database record
                         doc_embedding_create = DocumentationEmbeddingCreate(
                             source=chunk["source"],
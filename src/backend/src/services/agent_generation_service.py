@@ -10,13 +10,14 @@ import logging
 import json
 import os
 import traceback
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 from datetime import datetime
 
 import litellm
 
 from src.models.log import LLMLog
 from src.utils.prompt_utils import robust_json_parser
+from src.utils.streaming_json import IncrementalJSONParser, completion_chunk_text
 from src.services.template_service import TemplateService
 from src.services.log_service import LLMLogService
 from src.core.llm_manager import LLMManager
@@ -133,6 +134,65 @@ class AgentGenerationService:
             logger.error(f"Traceback: {traceback.format_exc()}")
             raise
     
+    async def stream_agent(self, prompt_text: str, model: str = None, tools: List[str] = None,
+                           group_context: Optional[GroupContext] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Generate agent configuration while streaming the LLM response.
+        
+        Yields a ("field", {"key": ..., "value": ...}) event for each top-level
+        field as soon as the LLM has written it, then ("agent", config) with the
+        processed configuration, which is the same as generate_agent returns.
+        
+        Args:
+            prompt_text: Natural language description of the agent
+            model: Model to use for generation, defaults to environment variable or "databricks-llama-4-maverick"
+            tools: List of tools available to the agent, ignored like in generate_agent
+            group_context: Optional group context for multi-group isolation
+            
+        Yields:
+            Tuples of event name and payload
+            
+        Raises:
+            ValueError: If there's a problem with the configuration
+        """
+        model = model or os.getenv("AGENT_MODEL", "databricks-llama-4-maverick")
+        logger.info(f"Streaming agent generation with model: {model}")
+        
+        system_message = await self._prepare_prompt_template([])
+        messages = [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": prompt_text}
+        ]
+        model_params = await LLMManager.configure_litellm(model)
+        
+        parser = IncrementalJSONParser(emit_fields=True)
+        try:
+            response = await litellm.acompletion(
+                **model_params,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=4000,
+                stream=True
+            )
+            async for chunk in response:
+                for event in parser.feed(completion_chunk_text(chunk)):
+                    yield "field", {"key": event.key, "value": event.value}
+            
+            agent_config = self._process_agent_config(parser.close(), model)
+        except Exception as e:
+            logger.error(f"Error streaming completion: {str(e)}")
+            raise ValueError(f"Failed to generate agent configuration: {str(e)}")
+        
+        await self._log_llm_interaction(
+            endpoint='generate-agent',
+            prompt=f"System: {system_message}\nUser: {prompt_text}",
+            response=parser.text,
+            model=model,
+            group_context=group_context
+        )
+        
+        yield "agent", agent_config
+    
     async def _prepare_prompt_template(self, tools: List[str]) -> str:
         """
         Prepare the prompt template with tools context.
@@ -12,10 +12,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.core.base_service import BaseService
+from src.core.llm_config_cache import invalidate_llm_config_cache
+from src.core.tool_catalog_cache import invalidate_api_key_cache
+from src.utils.databricks_http_client import invalidate_databricks_auth_cache
 from src.models.api_key import ApiKey
 from src.repositories.api_key_repository import ApiKeyRepository
 from src.schemas.api_key import ApiKeyCreate, ApiKeyUpdate
-from src.utils.encryption_utils import EncryptionUtils
+from src.utils.encryption_utils import EncryptionUtils, invalidate_secret_cache
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -76,6 +79,18 @@ class ApiKeysService(BaseService):
         
         return self.repository.find_by_name_sync(name)
     
+    async def find_by_names(self, names: List[str]) -> List[ApiKey]:
+        """
+        Find several API keys by name with a single query.
+        
+        Args:
+            names: Names to search for
+            
+        Returns:
+            List of the API keys that exist
+        """
+        return await self.repository.find_by_names(names)
+    
     async def create_api_key(self, api_key_data: ApiKeyCreate) -> ApiKey:
         """
         Create a new API key with encrypted value.
@@ -98,6 +113,10 @@ class ApiKeysService(BaseService):
         
         # Save to database
         created_key = await self.repository.create(api_key_dict)
+        invalidate_llm_config_cache()
+        invalidate_databricks_auth_cache()
+        invalidate_api_key_cache()
+        invalidate_secret_cache()
         
         # For the response, we need to set the decrypted value
         # This won't be saved to the database, it's just for the API response
@@ -131,6 +150,10 @@ class ApiKeysService(BaseService):
         
         # Update in database
         updated_key = await self.repository.update(api_key.id, update_dict)
+        invalidate_llm_config_cache()
+        invalidate_databricks_auth_cache()
+        invalidate_api_key_cache()
+        invalidate_secret_cache()
         
         # For the response, we need to set the decrypted value
         # This won't be saved to the database, it's just for the API response
@@ -154,7 +177,12 @@ class ApiKeysService(BaseService):
             return False
         
         # Delete from database
-        return await self.repository.delete(api_key.id)
+        deleted = await self.repository.delete(api_key.id)
+        invalidate_llm_config_cache()
+        invalidate_databricks_auth_cache()
+        invalidate_api_key_cache()
+        invalidate_secret_cache()
+        return deleted
     
     async def get_all_api_keys(self) -> List[ApiKey]:
         """
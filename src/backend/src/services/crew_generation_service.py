@@ -11,12 +11,13 @@ import logging
 import os
 import traceback
 import uuid
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, AsyncIterator, List, Tuple, Optional
 
 
 import litellm
 
 from src.utils.prompt_utils import robust_json_parser
+from src.utils.streaming_json import IncrementalJSONParser, completion_chunk_text
 from src.services.template_service import TemplateService
 from src.services.tool_service import ToolService
 from src.services.documentation_embedding_service import DocumentationEmbeddingService
@@ -422,28 +423,9 @@ class CrewGenerationService:
                 # Generate the crew using the LLM
                 model = request.model or os.getenv("CREW_MODEL", "databricks-llama-4-maverick")
                 
-                # Get and prepare the prompt template with tool descriptions
-                system_message = await self._prepare_prompt_template(tools_with_details)
-                logger.info("CREATE CREW: Prepared prompt template with detailed tool information")
-                
-                # Get relevant documentation based on the user's prompt
-                documentation_context = await self._get_relevant_documentation(request.prompt)
-                
-                # Prepare messages for the LLM
-                messages = [
-                    {"role": "system", "content": system_message}
-                ]
-                
-                # Add documentation context if available
-                if documentation_context:
-                    messages.append({
-                        "role": "system", 
-                        "content": "Here is some relevant documentation about CrewAI that may help you generate a better crew:\n\n" + documentation_context
-                    })
-                    logger.info("Added relevant documentation to enhance context")
-                
-                # Add the user's prompt
-                messages.append({"role": "user", "content": request.prompt})
+                system_message, documentation_context, messages = await self._build_crew_messages(
+                    request, tools_with_details
+                )
                 
                 # Configure litellm using the LLMManager
                 model_params = await LLMManager.configure_litellm(model)
@@ -485,78 +467,194 @@ class CrewGenerationService:
                     logger.error(error_msg)
                     raise ValueError(error_msg)
                 
-                # Log agent assignments before converting to dictionaries
-                logger.info("CREATE CREW: Current agent assignments:")
-                for task in processed_setup.get('tasks', []):
-                    task_name = task.get('name', 'Unknown')
-                    agent_name = task.get('agent')
-                    if not agent_name:
-                        agent_name = task.get('assigned_agent')
-                    
-                    if agent_name:
-                        logger.info(f"ASSIGNMENTS: Task '{task_name}' assigned to agent '{agent_name}'")
-                    else:
-                        logger.warning(f"ASSIGNMENTS: Task '{task_name}' HAS NO AGENT ASSIGNMENT")
-                
-                # Convert Pydantic models to dictionaries while preserving agent assignments
-                agents_dict = []
-                for agent in processed_setup.get('agents', []):
-                    # If it's a Pydantic model, convert to dict
-                    if hasattr(agent, 'model_dump'):
-                        agent_dict = agent.model_dump()
-                    else:
-                        agent_dict = agent.copy() if isinstance(agent, dict) else agent
-                    
-                    agents_dict.append(agent_dict)
-                
-                tasks_dict = []
-                for task in processed_setup.get('tasks', []):
-                    # If it's a Pydantic model, convert to dict
-                    if hasattr(task, 'model_dump'):
-                        task_dict = task.model_dump()
-                    else:
-                        task_dict = task.copy() if isinstance(task, dict) else task
-                    
-                    # IMPORTANT: Ensure agent assignments are preserved
-                    task_name = task_dict.get('name', 'Unknown')
-                    agent_name = task.get('agent')
-                    if not agent_name:
-                        agent_name = task.get('assigned_agent')
-                    
-                    if agent_name:
-                        # Make sure both fields are set in the dictionary
-                        task_dict['agent'] = agent_name
-                        task_dict['assigned_agent'] = agent_name
-                        logger.info(f"PRESERVE: Task '{task_name}' assignment to agent '{agent_name}' preserved in dictionary conversion")
-                    else:
-                        logger.warning(f"PRESERVE: Task '{task_name}' HAS NO AGENT ASSIGNMENT to preserve")
-                    
-                    tasks_dict.append(task_dict)
-                
-                # Create a new dictionary to send to repository
-                crew_dict = {
-                    'agents': agents_dict,
-                    'tasks': tasks_dict
-                }
-                
-                # Log the data being sent to repository
-                logger.info(f"CREATE CREW: Sending {len(agents_dict)} agents and {len(tasks_dict)} tasks to repository")
-                for idx, agent in enumerate(agents_dict):
-                    logger.info(f"AGENT {idx+1}: '{agent.get('name')}' - Role: '{agent.get('role')}', Tools: {agent.get('tools', [])}")
-                
-                for idx, task in enumerate(tasks_dict):
-                    logger.info(f"TASK {idx+1}: '{task.get('name')}' - Agent: '{task.get('agent')}', Dependencies: {task.get('context', [])}")
-                
-                # Create entities in repository
-                result = await self.crew_generator_repository.create_crew_entities(crew_dict)
-                
-                logger.info("CREATE CREW: Successfully created crew entities")
-                return result
+                return await self._save_crew_setup(processed_setup)
         except Exception as e:
             logger.error(f"CREATE CREW: Error creating crew: {str(e)}")
             logger.error(f"CREATE CREW: Exception traceback: {traceback.format_exc()}")
             raise
 
+    async def stream_crew(self, request: CrewGenerationRequest,
+                          group_context: Optional[GroupContext] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Create a crew with agents and tasks while streaming the LLM response.
+        
+        Yields ("agent", {"index": ..., "agent": ...}) and ("task", {"index": ..., "task": ...})
+        for each agent and task as soon as the LLM has written it, then
+        ("crew", result) with the created agents and tasks, which is the same
+        as create_crew_complete returns.
+        
+        Args:
+            request: The crew generation request with prompt, model, and tool information
+            group_context: Optional group context for multi-group isolation
+            
+        Yields:
+            Tuples of event name and payload
+            
+        Raises:
+            ValueError: If the template is missing or the response is invalid
+        """
+        logger.info("STREAM CREW: Starting crew generation process")
+        
+        # Only hold a session for the tool lookup, not for the whole stream
+        async with UnitOfWork() as uow:
+            tool_service = await ToolService.from_unit_of_work(uow)
+            tools_with_details = await self._get_tool_details(request.tools or [], tool_service)
+        tool_name_to_id_map = self._create_tool_name_to_id_map(tools_with_details)
+        
+        model = request.model or os.getenv("CREW_MODEL", "databricks-llama-4-maverick")
+        system_message, documentation_context, messages = await self._build_crew_messages(
+            request, tools_with_details
+        )
+        model_params = await LLMManager.configure_litellm(model)
+        
+        parser = IncrementalJSONParser(item_keys=("agents", "tasks"))
+        try:
+            response = await litellm.acompletion(
+                **model_params,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=4000,
+                stream=True
+            )
+            async for chunk in response:
+                for event in parser.feed(completion_chunk_text(chunk)):
+                    kind = "agent" if event.key == "agents" else "task"
+                    yield kind, {"index": event.index, kind: event.value}
+            logger.info(f"STREAM CREW: Received LLM response (length: {len(parser.text)})")
+            
+            await self._log_llm_interaction(
+                endpoint='generate-crew',
+                prompt=f"System: {system_message}\nDocumentation: {documentation_context}\nUser: {request.prompt}",
+                response=parser.text,
+                model=model,
+                group_context=group_context
+            )
+            
+            crew_setup = parser.close()
+            processed_setup = self._process_crew_setup(crew_setup, tools_with_details, tool_name_to_id_map)
+        except Exception as e:
+            error_msg = f"Error generating crew: {str(e)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        
+        result = await self._save_crew_setup(processed_setup)
+        yield "crew", result
+    
+    async def _build_crew_messages(self, request: CrewGenerationRequest,
+                                   tools_with_details: List[Dict[str, Any]]) -> Tuple[str, str, List[Dict[str, str]]]:
+        """
+        Build the LLM messages for crew generation.
+        
+        Args:
+            request: The crew generation request
+            tools_with_details: Tools available to the crew with their descriptions
+            
+        Returns:
+            Tuple of system message, documentation context and messages
+        """
+        # Get and prepare the prompt template with tool descriptions
+        system_message = await self._prepare_prompt_template(tools_with_details)
+        logger.info("CREATE CREW: Prepared prompt template with detailed tool information")
+        
+        # Get relevant documentation based on the user's prompt
+        documentation_context = await self._get_relevant_documentation(request.prompt)
+        
+        # Prepare messages for the LLM
+        messages = [
+            {"role": "system", "content": system_message}
+        ]
+        
+        # Add documentation context if available
+        if documentation_context:
+            messages.append({
+                "role": "system", 
+                "content": "Here is some relevant documentation about CrewAI that may help you generate a better crew:\n\n" + documentation_context
+            })
+            logger.info("Added relevant documentation to enhance context")
+        
+        # Add the user's prompt
+        messages.append({"role": "user", "content": request.prompt})
+        
+        return system_message, documentation_context, messages
+    
+    async def _save_crew_setup(self, setup: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create the agents and tasks of a processed crew setup.
+        
+        Args:
+            setup: Processed crew setup
+            
+        Returns:
+            Dictionary containing the created agents and tasks
+        """
+        # Log agent assignments before converting to dictionaries
+        logger.info("CREATE CREW: Current agent assignments:")
+        for task in setup.get('tasks', []):
+            task_name = task.get('name', 'Unknown')
+            agent_name = task.get('agent')
+            if not agent_name:
+                agent_name = task.get('assigned_agent')
+            
+            if agent_name:
+                logger.info(f"ASSIGNMENTS: Task '{task_name}' assigned to agent '{agent_name}'")
+            else:
+                logger.warning(f"ASSIGNMENTS: Task '{task_name}' HAS NO AGENT ASSIGNMENT")
+        
+        # Convert Pydantic models to dictionaries while preserving agent assignments
+        agents_dict = []
+        for agent in setup.get('agents', []):
+            # If it's a Pydantic model, convert to dict
+            if hasattr(agent, 'model_dump'):
+                agent_dict = agent.model_dump()
+            else:
+                agent_dict = agent.copy() if isinstance(agent, dict) else agent
+            
+            agents_dict.append(agent_dict)
+        
+        tasks_dict = []
+        for task in setup.get('tasks', []):
+            # If it's a Pydantic model, convert to dict
+            if hasattr(task, 'model_dump'):
+                task_dict = task.model_dump()
+            else:
+                task_dict = task.copy() if isinstance(task, dict) else task
+            
+            # IMPORTANT: Ensure agent assignments are preserved
+            task_name = task_dict.get('name', 'Unknown')
+            agent_name = task.get('agent')
+            if not agent_name:
+                agent_name = task.get('assigned_agent')
+            
+            if agent_name:
+                # Make sure both fields are set in the dictionary
+                task_dict['agent'] = agent_name
+                task_dict['assigned_agent'] = agent_name
+                logger.info(f"PRESERVE: Task '{task_name}' assignment to agent '{agent_name}' preserved in dictionary conversion")
+            else:
+                logger.warning(f"PRESERVE: Task '{task_name}' HAS NO AGENT ASSIGNMENT to preserve")
+            
+            tasks_dict.append(task_dict)
+        
+        # Create a new dictionary to send to repository
+        crew_dict = {
+            'agents': agents_dict,
+            'tasks': tasks_dict
+        }
+        
+        # Log the data being sent to repository
+        logger.info(f"CREATE CREW: Sending {len(agents_dict)} agents and {len(tasks_dict)} tasks to repository")
+        for idx, agent in enumerate(agents_dict):
+            logger.info(f"AGENT {idx+1}: '{agent.get('name')}' - Role: '{agent.get('role')}', Tools: {agent.get('tools', [])}")
+        
+        for idx, task in enumerate(tasks_dict):
+            logger.info(f"TASK {idx+1}: '{task.get('name')}' - Agent: '{task.get('agent')}', Dependencies: {task.get('context', [])}")
+        
+        # Create entities in repository
+        result = await self.crew_generator_repository.create_crew_entities(crew_dict)
+        
+        logger.info("CREATE CREW: Successfully created crew entities")
+        return result
+
     def _create_tool_name_to_id_map(self, tools: List[Dict[str, Any]]) -> Dict[str, str]:
         """
         Create a mapping from tool names to tool IDs.
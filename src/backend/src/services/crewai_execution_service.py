@@ -280,6 +280,7 @@ class CrewAIExecutionService:
                 "model": config.model,
                 "run_name": run_name,
                 "execution_id": execution_id,
+                "trace_level": config.trace_level,
                 "crew": {
                     "name": run_name or f"Scheduled Crew {execution_id[:8]}",
                     "model": config.model
@@ -0,0 +1,445 @@
+"""
+Batched, cached embeddings from Databricks model serving endpoints.
+
+Crew memory, documentation seeding and crew generation all embed text through
+this service:
+
+- Vectors are cached by a hash of model and text in an in-memory LRU, which is
+  optionally backed by an SQLite file (EMBEDDING_CACHE_PATH) so they survive
+  restarts. The SQLite file is read and written in worker threads.
+- Cache misses for the same endpoint and credentials on one event loop are
+  coalesced: they wait up to EMBEDDING_BATCH_WINDOW seconds for other requests
+  and go out together, at most EMBEDDING_MAX_BATCH_SIZE texts per request.
+  Identical texts that are already queued or in flight share one result.
+  Queues are kept for the EMBEDDING_MAX_BATCHERS most recently used endpoints
+  and credentials of each loop.
+- Requests use the pooled Databricks HTTP sessions, so connections are kept
+  alive between calls.
+
+Synchronous callers such as the CrewAI memory embedder use embed_sync(), which
+runs on the shared background loop, so concurrent worker threads are batched
+together as well.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import aiohttp
+
+from src.config.settings import settings
+from src.utils.background_loop import run_in_background_loop
+from src.utils.databricks_http_client import databricks_http_pool
+from src.utils.databricks_url_utils import DatabricksURLUtils
+
+logger = logging.getLogger(__name__)
+
+
+class DatabricksEmbeddingError(Exception):
+    """
+    Raised when the embedding endpoint rejects a request or returns no usable data.
+
+    status is the HTTP status of a rejected request, None if the endpoint answered
+    without embeddings.
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class EmbeddingCache:
+    """LRU cache of embedding vectors keyed by model and content hash, optionally backed by SQLite."""
+
+    def __init__(self, max_size: Optional[int] = None, path: Optional[str] = None):
+        self._max_size = max_size
+        self._path = path
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        # Guards the in-memory LRU and the counters
+        self._lock = threading.Lock()
+        # Guards the SQLite connection, held while reading or writing the file
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_path: Optional[str] = None
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+    @property
+    def max_size(self) -> int:
+        """Maximum number of vectors kept in memory, 0 disables the cache."""
+        return settings.EMBEDDING_CACHE_MAX_SIZE if self._max_size is None else self._max_size
+
+    @property
+    def path(self) -> Optional[str]:
+        """SQLite file the cache is persisted to, or None to keep it in memory only."""
+        return settings.EMBEDDING_CACHE_PATH if self._path is None else self._path
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """Build the cache key of a text embedded with a model."""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite file on first use. Caller holds the database lock."""
+        path = self.path
+        if not path:
+            return None
+        if self._db is None or self._db_path != path:
+            if self._db is not None:
+                self._db.close()
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+            self._db_path = path
+        return self._db
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        """Put a vector in the in-memory LRU. Caller holds the lock."""
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _lookup(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """Get the vectors held in memory, counting hits."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = list(vector)
+            self._stats["hits"] += len(found)
+        return found
+
+    def _read_disk(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """Read vectors from the SQLite file. Blocking, keep it off the event loop."""
+        rows = []
+        with self._db_lock:
+            try:
+                db = self._connection()
+                if db is not None:
+                    for key in keys:
+                        row = db.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+                        if row is not None:
+                            rows.append((key, row[0]))
+            except sqlite3.Error as e:
+                logger.warning(f"[EmbeddingCache] Could not read {self.path}: {e}")
+        return {key: array('d', blob).tolist() for key, blob in rows}
+
+    def _write_disk(self, vectors: Dict[str, List[float]]) -> None:
+        """Write vectors to the SQLite file. Blocking, keep it off the event loop."""
+        with self._db_lock:
+            try:
+                db = self._connection()
+                if db is not None:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                        [(key, array('d', vector).tobytes()) for key, vector in vectors.items()]
+                    )
+                    db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"[EmbeddingCache] Could not write {self.path}: {e}")
+
+    def _remember_disk_hits(self, keys: Sequence[str], loaded: Dict[str, List[float]]) -> None:
+        """Keep vectors read from the SQLite file in memory and count the lookups."""
+        with self._lock:
+            for key, vector in loaded.items():
+                self._remember(key, vector)
+            self._stats["disk_hits"] += len(loaded)
+            self._stats["misses"] += len(keys) - len(loaded)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """
+        Get a cached vector, reading the SQLite file in the calling thread.
+
+        Returns:
+            A copy of the vector, or None if it is not cached
+        """
+        if self.max_size <= 0:
+            return None
+        vector = self._lookup([key]).get(key)
+        if vector is not None:
+            return vector
+        loaded = self._read_disk([key]) if self.path else {}
+        self._remember_disk_hits([key], loaded)
+        return list(loaded[key]) if key in loaded else None
+
+    async def get_many_async(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Get cached vectors, reading the SQLite file in a worker thread.
+
+        Returns:
+            A copy of each vector in key order, None for keys that are not cached
+        """
+        if self.max_size <= 0:
+            return [None] * len(keys)
+        found = self._lookup(keys)
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing:
+            loaded = await asyncio.to_thread(self._read_disk, missing) if self.path else {}
+            self._remember_disk_hits(missing, loaded)
+            found.update({key: list(vector) for key, vector in loaded.items()})
+        return [list(found[key]) if key in found else None for key in keys]
+
+    def _put_memory(self, vectors: Dict[str, List[float]]) -> bool:
+        """Store vectors in the in-memory LRU, returning False when the cache is disabled."""
+        if self.max_size <= 0 or not vectors:
+            return False
+        with self._lock:
+            for key, vector in vectors.items():
+                self._remember(key, list(vector))
+        return True
+
+    def put_many(self, vectors: Dict[str, List[float]]) -> None:
+        """Store vectors by cache key, writing the SQLite file in the calling thread."""
+        if self._put_memory(vectors) and self.path:
+            self._write_disk(vectors)
+
+    async def put_many_async(self, vectors: Dict[str, List[float]]) -> None:
+        """Store vectors by cache key, writing the SQLite file in a worker thread."""
+        if self._put_memory(vectors) and self.path:
+            await asyncio.to_thread(self._write_disk, vectors)
+
+    def clear(self) -> None:
+        """Drop the in-memory vectors, the SQLite file is kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        """Close the SQLite file."""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+                self._db_path = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the number of vectors in memory."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        return stats
+
+
+class _EmbeddingBatcher:
+    """Queue of texts waiting to be embedded by one endpoint with one set of credentials."""
+
+    def __init__(self, service: "DatabricksEmbeddingService", endpoint_url: str,
+                 workspace_url: str, headers: Dict[str, str]):
+        self._service = service
+        self._endpoint_url = endpoint_url
+        self._workspace_url = workspace_url
+        self._headers = headers
+        self._loop = asyncio.get_running_loop()
+        # cache key -> (text, future) for texts waiting for the next request
+        self._pending: "OrderedDict[str, Tuple[str, asyncio.Future]]" = OrderedDict()
+        # cache key -> future for texts in a request that has not returned yet
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(self, key: str, text: str) -> asyncio.Future:
+        """Queue a text, returning the future of its vector."""
+        future = self._in_flight.get(key)
+        if future is None and key in self._pending:
+            future = self._pending[key][1]
+        if future is not None:
+            self._service._stats["coalesced"] += 1
+            return future
+
+        future = self._loop.create_future()
+        self._pending[key] = (text, future)
+        if len(self._pending) >= settings.EMBEDDING_MAX_BATCH_SIZE:
+            self._flush()
+        elif self._timer is None:
+            self._timer = self._loop.call_later(settings.EMBEDDING_BATCH_WINDOW, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        """Send the queued texts in one request."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch = list(self._pending.items())
+        self._pending.clear()
+        for key, (_, future) in batch:
+            self._in_flight[key] = future
+        task = self._loop.create_task(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[str, Tuple[str, asyncio.Future]]]) -> None:
+        try:
+            vectors = await self._service._request(
+                self._endpoint_url, self._workspace_url, self._headers, [text for _, (text, _) in batch]
+            )
+        except Exception as e:
+            for _, (_, future) in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, (_, future)), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+            await self._service.cache.put_many_async({key: vector for (key, _), vector in zip(batch, vectors)})
+        finally:
+            for key, _ in batch:
+                self._in_flight.pop(key, None)
+
+
+class DatabricksEmbeddingService:
+    """Embeds texts with Databricks serving endpoints, batching and caching requests."""
+
+    def __init__(self, cache: Optional[EmbeddingCache] = None):
+        self.cache = cache or EmbeddingCache()
+        # id(loop) -> (loop, {(endpoint_url, authorization): batcher}), least recently used batcher first
+        self._batchers: Dict[int, Tuple[asyncio.AbstractEventLoop, "OrderedDict[Tuple[str, str], _EmbeddingBatcher]"]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "texts_requested": 0, "coalesced": 0}
+
+    def _get_batcher(self, endpoint_url: str, workspace_url: str, headers: Dict[str, str]) -> _EmbeddingBatcher:
+        """Get the batcher of an endpoint and credentials on the running event loop."""
+        loop = asyncio.get_running_loop()
+        key = (endpoint_url, headers.get("Authorization", ""))
+        with self._lock:
+            for loop_id in [k for k, (other, _) in self._batchers.items() if other.is_closed()]:
+                del self._batchers[loop_id]
+            _, batchers = self._batchers.setdefault(id(loop), (loop, OrderedDict()))
+            batcher = batchers.get(key)
+            if batcher is None:
+                batcher = _EmbeddingBatcher(self, endpoint_url, workspace_url, headers)
+                batchers[key] = batcher
+                # Every user token gets its own batcher, drop the least recently used ones.
+                # A dropped batcher still sends what it has queued, its timer and tasks hold it.
+                while len(batchers) > max(1, settings.EMBEDDING_MAX_BATCHERS):
+                    batchers.popitem(last=False)
+            else:
+                batchers.move_to_end(key)
+            return batcher
+
+    async def embed(
+        self,
+        texts: Sequence[str],
+        model: str,
+        workspace_url: str,
+        headers: Dict[str, str]
+    ) -> List[List[float]]:
+        """
+        Embed texts, serving cached vectors and batching the rest.
+
+        Args:
+            texts: Texts to embed
+            model: Serving endpoint name, with or without the databricks/ prefix
+            workspace_url: Databricks workspace URL
+            headers: Request headers carrying the Authorization header
+
+        Returns:
+            One vector per text, in input order
+
+        Raises:
+            DatabricksEmbeddingError: If the endpoint URL is invalid or the request failed
+        """
+        endpoint_url = DatabricksURLUtils.construct_model_invocation_url(workspace_url, model)
+        if not endpoint_url:
+            raise DatabricksEmbeddingError("Failed to construct valid endpoint URL")
+        workspace_url = DatabricksURLUtils.normalize_workspace_url(workspace_url) or workspace_url
+        request_headers = {**headers, "Content-Type": "application/json"}
+        model_name = model.replace('databricks/', '')
+
+        keys = [EmbeddingCache.make_key(model_name, text) for text in texts]
+        vectors: List[Optional[List[float]]] = await self.cache.get_many_async(keys)
+        misses = {key: text for key, text, vector in zip(keys, texts, vectors) if vector is None}
+        if misses:
+            batcher = self._get_batcher(endpoint_url, workspace_url, request_headers)
+            futures = {key: batcher.submit(key, text) for key, text in misses.items()}
+            # Shield the shared futures so a cancelled caller does not fail the others
+            results = await asyncio.gather(*(asyncio.shield(future) for future in futures.values()))
+            fetched = dict(zip(futures, results))
+            vectors = [vector if vector is not None else list(fetched[key]) for key, vector in zip(keys, vectors)]
+        return vectors
+
+    def embed_sync(
+        self,
+        texts: Sequence[str],
+        model: str,
+        workspace_url: str,
+        headers: Dict[str, str]
+    ) -> List[List[float]]:
+        """
+        Embed texts from synchronous code on the shared background loop.
+
+        Args:
+            texts: Texts to embed
+            model: Serving endpoint name, with or without the databricks/ prefix
+            workspace_url: Databricks workspace URL
+            headers: Request headers carrying the Authorization header
+
+        Returns:
+            One vector per text, in input order
+        """
+        return run_in_background_loop(
+            self.embed(texts, model, workspace_url, headers),
+            settings.EMBEDDING_REQUEST_TIMEOUT + settings.EMBEDDING_BATCH_WINDOW + 5.0
+        )
+
+    async def _request(
+        self,
+        endpoint_url: str,
+        workspace_url: str,
+        headers: Dict[str, str],
+        texts: List[str]
+    ) -> List[List[float]]:
+        """Send one embedding request on the pooled session of the workspace."""
+        self._stats["requests"] += 1
+        self._stats["texts_requested"] += len(texts)
+        logger.debug(f"[DatabricksEmbeddingService] Embedding {len(texts)} text(s) with {endpoint_url}")
+
+        session = databricks_http_pool.get_session(workspace_url)
+        timeout = aiohttp.ClientTimeout(total=settings.EMBEDDING_REQUEST_TIMEOUT)
+        async with session.post(endpoint_url, headers=headers, json={"input": texts}, timeout=timeout) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise DatabricksEmbeddingError(
+                    f"Databricks embedding API error {response.status}: {error_text}", status=response.status
+                )
+            result = await response.json()
+
+        data = result.get('data') if isinstance(result, dict) else None
+        if not data:
+            raise DatabricksEmbeddingError("No embedding data found in Databricks response")
+        if len(data) < len(texts):
+            raise DatabricksEmbeddingError(f"Expected {len(texts)} embeddings, got {len(data)}: {result}")
+        if all(isinstance(item, dict) and 'index' in item for item in data):
+            data = sorted(data, key=lambda item: item['index'])
+        return [item.get('embedding', item) if isinstance(item, dict) else item for item in data[:len(texts)]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get batching and cache metrics.
+
+        Returns:
+            Dictionary with the number of requests, texts sent, texts that joined
+            an already queued request, the average batch size and the cache counters
+        """
+        stats: Dict[str, Any] = dict(self._stats)
+        stats["average_batch_size"] = stats["texts_requested"] / stats["requests"] if stats["requests"] else 0.0
+        stats["cache"] = self.cache.get_stats()
+        return stats
+
+
+# Create a singleton instance
+databricks_embedding_service = DatabricksEmbeddingService()
+
+
+def clear_embedding_cache() -> None:
+    """Drop the in-memory embedding vectors."""
+    databricks_embedding_service.cache.clear()
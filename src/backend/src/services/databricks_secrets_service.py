@@ -14,6 +14,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.base_service import BaseService
+from src.utils.encryption_utils import invalidate_secret_cache
 from src.repositories.databricks_config_repository import DatabricksConfigRepository
 
 # Initialize logger
@@ -256,6 +257,7 @@ class DatabricksSecretsService(BaseService):
             async with aiohttp.ClientSession() as session:
                 async with session.post(url, json=data, headers=headers) as response:
                     if response.status == 200:
+                        invalidate_secret_cache()
                         return True
                     else:
                         error_text = await response.text()
@@ -306,6 +308,7 @@ class DatabricksSecretsService(BaseService):
             async with aiohttp.ClientSession() as session:
                 async with session.post(url, json=data, headers=headers) as response:
                     if response.status == 200:
+                        invalidate_secret_cache()
                         return True
                     else:
                         error_text = await response.text()
@@ -6,6 +6,8 @@ from typing import Dict, Tuple, Optional, Any
 
 from fastapi import HTTPException
 
+from src.core.llm_config_cache import invalidate_llm_config_cache
+from src.utils.user_context import invalidate_apps_enabled_cache
 from src.repositories.databricks_config_repository import DatabricksConfigRepository
 from src.schemas.databricks_config import DatabricksConfigCreate, DatabricksConfigResponse
 from src.services.databricks_secrets_service import DatabricksSecretsService
@@ -55,6 +57,8 @@ class DatabricksService:
             
             # Create the new configuration through repository
             new_config = await self.repository.create_config(config_data)
+            invalidate_llm_config_cache()
+            invalidate_apps_enabled_cache()
             
             # Return the response
             return {
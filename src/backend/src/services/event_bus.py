@@ -0,0 +1,249 @@
+"""
+Bounded cross-thread event bus.
+
+CrewAI callbacks run on worker threads and publish traces and log lines,
+while the writers that persist them run on the asyncio event loop. EventBus is
+a bounded, thread-safe FIFO (a queue.Queue subclass, so the existing
+put_nowait/get_nowait/qsize API keeps working) with a configurable overflow
+policy. Producers wake waiting consumers through loop.call_soon_threadsafe,
+so consumers await new items instead of polling the queue.
+"""
+import asyncio
+import logging
+import queue
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sleep used by wait_for_items() for queues that cannot be awaited
+_PLAIN_QUEUE_POLL_INTERVAL = 0.1
+
+
+class OverflowPolicy(str, Enum):
+    """What to do when an item is published to a full bus."""
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    BACKPRESSURE = "backpressure"
+
+
+# Merges the newest queued item with an incoming one, or returns None when
+# the two cannot be combined
+CoalesceFunc = Callable[[Any, Any], Optional[Any]]
+
+
+class EventBus(queue.Queue):
+    """
+    Bounded queue with an overflow policy and asyncio-aware consumers.
+
+    Overflow policies:
+        drop_oldest: discard the oldest queued item to make room.
+        coalesce: merge the incoming item into the newest queued item using
+            the coalesce function, falling back to coalesce_fallback
+            (drop_oldest or backpressure) when the items cannot be merged.
+        backpressure: block the producing thread until there is room, like
+            queue.Queue.put(). Without a timeout it waits at most
+            backpressure_timeout seconds. put_nowait() and producers running on
+            an event loop thread are never blocked; the item is rejected with
+            queue.Full.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        coalesce: Optional[CoalesceFunc] = None,
+        backpressure_timeout: float = 5.0,
+        name: str = "event_bus",
+        coalesce_fallback: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    ):
+        super().__init__(maxsize=maxsize)
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        self.coalesce_fallback = OverflowPolicy(coalesce_fallback)
+        if self.coalesce_fallback == OverflowPolicy.COALESCE:
+            raise ValueError("coalesce_fallback must be drop_oldest or backpressure")
+        self.name = name
+        self._coalesce = coalesce
+        self._backpressure_timeout = backpressure_timeout
+        # Consumers currently awaiting items, as (loop, future) pairs
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._stats: Dict[str, int] = {
+            "published": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "rejected": 0,
+        }
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Publish an item, applying the overflow policy when the bus is full.
+
+        For the drop_oldest policy, and coalesce falling back to drop_oldest,
+        this never blocks or raises, so put_nowait() is safe to call from any
+        callback.
+
+        Args:
+            item: Item to publish
+            block: Whether backpressure may block the caller
+            timeout: Seconds backpressure may block, defaults to backpressure_timeout
+
+        Raises:
+            queue.Full: Only when backpressure applies and no room became
+                available in time, block is False or the caller runs on an
+                event loop thread
+            ValueError: If timeout is negative
+        """
+        if timeout is not None and timeout < 0:
+            raise ValueError("'timeout' must be a non-negative number")
+        with self.not_full:
+            if 0 < self.maxsize <= self._qsize():
+                policy = self.overflow_policy
+                if policy == OverflowPolicy.COALESCE:
+                    if self._coalesce_into_tail(item):
+                        self._stats["published"] += 1
+                        self._notify_waiters()
+                        return
+                    policy = self.coalesce_fallback
+                if policy == OverflowPolicy.BACKPRESSURE:
+                    self._wait_for_room(block, timeout)
+                else:
+                    self._drop_oldest()
+
+            self._put(item)
+            self.unfinished_tasks += 1
+            self._stats["published"] += 1
+            self.not_empty.notify()
+            self._notify_waiters()
+
+    def _wait_for_room(self, block: bool, timeout: Optional[float]) -> None:
+        """Block the producing thread until the bus has room. Caller holds the mutex."""
+        if not block or _on_event_loop_thread():
+            self._stats["rejected"] += 1
+            raise queue.Full
+        deadline = time.monotonic() + (self._backpressure_timeout if timeout is None else timeout)
+        while self._qsize() >= self.maxsize:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._stats["rejected"] += 1
+                raise queue.Full
+            self.not_full.wait(remaining)
+
+    def _coalesce_into_tail(self, item: Any) -> bool:
+        """Merge item into the newest queued item. Caller holds the mutex."""
+        if self._coalesce is None or not self.queue:
+            return False
+        try:
+            merged = self._coalesce(self.queue[-1], item)
+        except Exception as e:
+            logger.debug(f"[EventBus:{self.name}] Coalesce failed: {e}")
+            return False
+        if merged is None:
+            return False
+        self.queue[-1] = merged
+        self._stats["coalesced"] += 1
+        return True
+
+    def _drop_oldest(self) -> None:
+        """Discard the oldest queued item. Caller holds the mutex."""
+        self._get()
+        self._stats["dropped"] += 1
+        # The dropped item will never be marked done by a consumer
+        self.unfinished_tasks -= 1
+        if self.unfinished_tasks == 0:
+            self.all_tasks_done.notify_all()
+        if self._stats["dropped"] % 1000 == 1:
+            logger.warning(f"[EventBus:{self.name}] Bus full ({self.maxsize} items), dropped {self._stats['dropped']} oldest items so far")
+
+    def _notify_waiters(self) -> None:
+        """Wake every awaiting consumer on its own loop. Caller holds the mutex."""
+        waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                # The consumer's loop has been closed
+                pass
+
+    async def wait_for_items(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the bus holds at least one item, without polling.
+
+        Args:
+            timeout: Maximum number of seconds to wait, None to wait forever
+
+        Returns:
+            True if items are available, False if the timeout expired
+        """
+        loop = asyncio.get_running_loop()
+        with self.mutex:
+            if self._qsize():
+                return True
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self.mutex:
+                self._waiters = [w for w in self._waiters if w[1] is not future]
+        return self.qsize() > 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get bus metrics.
+
+        Returns:
+            Dictionary with publish/drop/coalesce/reject counters, the current
+            depth, the capacity and the overflow policy
+        """
+        with self.mutex:
+            stats = dict(self._stats)
+            stats["depth"] = self._qsize()
+        stats["capacity"] = self.maxsize
+        stats["overflow_policy"] = self.overflow_policy.value
+        return stats
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _on_event_loop_thread() -> bool:
+    """Check whether the calling thread is running an asyncio event loop."""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+async def wait_for_items(
+    bus: queue.Queue,
+    timeout: Optional[float],
+    shutdown_event: Optional[asyncio.Event] = None
+) -> None:
+    """
+    Wait until a queue receives items, the shutdown event is set or the
+    timeout expires (None waits without a timeout).
+
+    EventBus instances are awaited without polling. Plain queues (as used by
+    some tests) fall back to a short sleep.
+    """
+    if isinstance(bus, EventBus):
+        waits = [asyncio.ensure_future(bus.wait_for_items(timeout))]
+    else:
+        poll = _PLAIN_QUEUE_POLL_INTERVAL if timeout is None else min(timeout, _PLAIN_QUEUE_POLL_INTERVAL)
+        waits = [asyncio.ensure_future(asyncio.sleep(poll))]
+    if shutdown_event is not None:
+        waits.append(asyncio.ensure_future(shutdown_event.wait()))
+
+    try:
+        await asyncio.wait(waits, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for waiter in waits:
+            if not waiter.done():
+                waiter.cancel()
@@ -5,16 +5,23 @@ This module provides functions for retrieving and managing execution history
 from the database.
 """
 
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
+from datetime import datetime
+import base64
+import binascii
 import logging
+import time
 from sqlalchemy.exc import SQLAlchemyError
 
+from src.config.settings import settings
 from src.repositories.execution_logs_repository import execution_logs_repository
 from src.repositories.execution_trace_repository import execution_trace_repository
 from src.repositories.execution_history_repository import execution_history_repository
 from src.schemas.execution_history import (
     ExecutionHistoryItem, 
     ExecutionHistoryList,
+    ExecutionHistoryPage,
+    ExecutionHistorySummary,
     ExecutionOutput,
     ExecutionOutputList,
     ExecutionOutputDebug,
@@ -24,6 +31,51 @@ from src.schemas.execution_history import (
 
 logger = logging.getLogger(__name__)
 
+# Sorted group IDs -> (expires_at, total) of the paginated history listing
+_history_count_cache: Dict[Tuple[str, ...], Tuple[float, int]] = {}
+
+
+def invalidate_execution_history_count_cache() -> None:
+    """Drop the cached execution totals."""
+    _history_count_cache.clear()
+
+
+def encode_history_cursor(created_at: datetime, execution_id: int) -> str:
+    """
+    Encode the position of an execution in the history listing as an opaque cursor.
+    
+    Args:
+        created_at: Creation time of the execution
+        execution_id: ID of the execution
+        
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{created_at.isoformat()}|{execution_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_history_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor created by encode_history_cursor.
+    
+    Args:
+        cursor: Cursor string
+        
+    Returns:
+        Tuple of (created_at, execution_id)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, execution_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(execution_id)
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError(f"Invalid history cursor: {cursor}") from e
+
+
 class ExecutionHistoryService:
     """Service for accessing and managing execution history."""
     
@@ -103,6 +155,73 @@ class ExecutionHistoryService:
             logger.error(f"Error retrieving execution history: {str(e)}", exc_info=True)
             raise
     
+    async def get_execution_history_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        group_ids: List[str] = None
+    ) -> ExecutionHistoryPage:
+        """
+        Get a page of execution summaries with cursor-based pagination.
+        
+        Only the summary columns are loaded; inputs and result are returned by
+        get_execution_by_id. The total is cached for EXECUTION_HISTORY_COUNT_CACHE_TTL
+        seconds, so it may lag behind very recent executions.
+        
+        Args:
+            limit: Maximum number of items to return
+            cursor: next_cursor of the previous page, None for the newest executions
+            group_ids: List of group IDs for group-based filtering
+            
+        Returns:
+            ExecutionHistoryPage with the execution summaries and the next cursor
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        before = decode_history_cursor(cursor) if cursor else None
+        try:
+            # Fetch one extra row to know whether there is another page
+            rows = await self.history_repo.get_execution_summaries(
+                limit=limit + 1,
+                before=before,
+                group_ids=group_ids
+            )
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            
+            next_cursor = None
+            if has_more:
+                next_cursor = encode_history_cursor(rows[-1]['created_at'], rows[-1]['id'])
+            
+            return ExecutionHistoryPage(
+                executions=[ExecutionHistorySummary.model_validate(row) for row in rows],
+                next_cursor=next_cursor,
+                has_more=has_more,
+                total=await self._get_total_count(group_ids),
+                limit=limit
+            )
+            
+        except SQLAlchemyError as e:
+            logger.error(f"Database error retrieving execution history page: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Error retrieving execution history page: {str(e)}", exc_info=True)
+            raise
+    
+    async def _get_total_count(self, group_ids: List[str] = None) -> int:
+        """Get the number of executions of the groups, cached for a few seconds."""
+        ttl = settings.EXECUTION_HISTORY_COUNT_CACHE_TTL
+        key = tuple(sorted(group_ids or []))
+        entry = _history_count_cache.get(key)
+        if ttl > 0 and entry is not None and entry[0] >= time.monotonic():
+            return entry[1]
+        
+        total = await self.history_repo.count_executions(group_ids=group_ids)
+        if ttl > 0:
+            _history_count_cache[key] = (time.monotonic() + ttl, total)
+        return total
+    
     async def get_execution_by_id(self, execution_id: int, tenant_ids: List[str] = None) -> Optional[ExecutionHistoryItem]:
         """
         Get a specific execution by ID with group-based tenant filtering.
@@ -308,6 +427,7 @@ class ExecutionHistoryService:
             
             # Delete all executions and associated data last (after dependent records are gone)
             result = await self.history_repo.delete_all_executions()
+            invalidate_execution_history_count_cache()
             
             # Clear in-memory executions from ExecutionService and CrewAIExecutionService
             from src.services.execution_service import ExecutionService
@@ -364,6 +484,7 @@ class ExecutionHistoryService:
             
             # Delete execution using repository (after dependent records are gone)
             result = await self.history_repo.delete_execution(execution_id)
+            invalidate_execution_history_count_cache()
             
             # Clear in-memory execution from ExecutionService and CrewAIExecutionService
             from src.services.execution_service import ExecutionService
@@ -422,6 +543,7 @@ class ExecutionHistoryService:
             
             # Delete execution using repository (after dependent records are gone)
             result = await self.history_repo.delete_execution_by_job_id(job_id)
+            invalidate_execution_history_count_cache()
             
             # Clear in-memory execution from ExecutionService and CrewAIExecutionService
             from src.services.execution_service import ExecutionService
@@ -0,0 +1,296 @@
+"""
+Publish/subscribe hub for streaming execution logs over WebSocket.
+
+Each execution with connected clients has a topic. A published log line is
+serialized once and handed to every subscriber's bounded send buffer, and a
+sender task per subscriber drains its buffer into the socket. Publishing never
+waits for a client, so a slow client only falls behind itself.
+
+- When a subscriber's buffer is full, LOGS_WS_OVERFLOW_POLICY either drops its
+  oldest buffered message ("drop_oldest") or merges the new line into its
+  newest buffered message ("coalesce").
+- Messages carry a sequence number that increases by one per message of an
+  execution. The last LOGS_WS_REPLAY_BUFFER_SIZE messages are kept, so a client
+  that reconnects with the last sequence number it received gets only what it
+  missed. A topic is kept for LOGS_WS_RESUME_WINDOW seconds after its last
+  client leaves.
+- A send that takes longer than LOGS_WS_SEND_TIMEOUT seconds disconnects the
+  client.
+
+All methods must be called from the event loop that serves the WebSockets.
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+
+from fastapi import WebSocket
+
+from src.config.settings import settings
+from src.core.logger import LoggerManager
+
+# Get logger from the centralized logging system
+logger = LoggerManager.get_instance().system
+
+# (sequence number, message, serialized message, monotonic publish time)
+_Entry = Tuple[int, Dict[str, Any], str, float]
+
+
+class _Topic:
+    """Sequence counter, replay buffer and subscribers of one execution."""
+
+    def __init__(self, execution_id: str):
+        self.execution_id = execution_id
+        # Start from the creation time in microseconds so the numbers of a
+        # recreated topic never overlap those of an earlier one
+        self.seq = time.time_ns() // 1000
+        self.replay: Deque[_Entry] = deque(maxlen=max(0, settings.LOGS_WS_REPLAY_BUFFER_SIZE))
+        self.subscribers: Set['_Subscriber'] = set()
+        self.idle_since: Optional[float] = time.monotonic()
+
+    def can_resume(self, resume_after: int) -> bool:
+        """Check whether every message after resume_after is still buffered."""
+        first_buffered = self.replay[0][0] if self.replay else self.seq + 1
+        return first_buffered - 1 <= resume_after <= self.seq
+
+
+class _Subscriber:
+    """One WebSocket client with its bounded send buffer and sender task."""
+
+    def __init__(self, hub: 'ExecutionLogsHub', topic: _Topic, websocket: WebSocket):
+        self._hub = hub
+        self.topic = topic
+        self.websocket = websocket
+        self._pending: Deque[_Entry] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopped = False
+        self.last_seq: Optional[int] = None
+
+    @property
+    def lag(self) -> int:
+        """Messages published to the topic that this client has not been sent yet."""
+        return len(self._pending)
+
+    def offer(self, entry: _Entry) -> None:
+        """Buffer a message for sending, applying the overflow policy when the buffer is full."""
+        if len(self._pending) >= max(1, settings.LOGS_WS_CLIENT_BUFFER_SIZE):
+            if settings.LOGS_WS_OVERFLOW_POLICY == "coalesce" and self._coalesce_into_tail(entry):
+                self._wakeup.set()
+                return
+            self._pending.popleft()
+            self._hub._stats["dropped"] += 1
+        self._pending.append(entry)
+        self._wakeup.set()
+
+    def _coalesce_into_tail(self, entry: _Entry) -> bool:
+        seq, message, _, published_at = self._pending[-1]
+        if message.get("type") != entry[1].get("type"):
+            return False
+        merged = dict(entry[1])
+        merged["content"] = f"{message.get('content', '')}\n{entry[1].get('content', '')}"
+        self._pending[-1] = (entry[0], merged, json.dumps(merged), published_at)
+        self._hub._stats["coalesced"] += 1
+        self._hub._stats["serialized"] += 1
+        return True
+
+    def start(self) -> None:
+        """Start sending buffered and future messages."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._send_loop(), name=f"logs_ws_{self.topic.execution_id}")
+
+    async def _send_loop(self) -> None:
+        try:
+            # Checked as well as cancelling the task, since wait_for() may swallow
+            # a cancellation that arrives while a send completes
+            while not self._stopped:
+                if not self._pending:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                seq, _, payload, published_at = self._pending.popleft()
+                await asyncio.wait_for(self.websocket.send_text(payload), settings.LOGS_WS_SEND_TIMEOUT)
+                self.last_seq = seq
+                self._hub._record_send(time.monotonic() - published_at)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._hub._stats["send_failures"] += 1
+            logger.warning(
+                f"[ExecutionLogsHub] Disconnecting client of execution {self.topic.execution_id} "
+                f"after a failed send: {e!r}"
+            )
+            self._hub.unsubscribe(self)
+            try:
+                await self.websocket.close()
+            except Exception:
+                pass
+
+    def stop(self) -> None:
+        """Stop sending, dropping buffered messages."""
+        self._stopped = True
+        self._wakeup.set()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        self._pending.clear()
+
+
+class ExecutionLogsHub:
+    """Topics of the executions with connected WebSocket clients."""
+
+    def __init__(self):
+        self._topics: Dict[str, _Topic] = {}
+        self._stats = {
+            "published": 0,
+            "serialized": 0,
+            "sent": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "send_failures": 0,
+            "resumed": 0,
+            "total_send_delay": 0.0,
+            "max_send_delay": 0.0,
+        }
+
+    def has_subscribers(self, execution_id: str) -> bool:
+        """Check whether any client is connected to an execution."""
+        topic = self._topics.get(execution_id)
+        return topic is not None and bool(topic.subscribers)
+
+    def get_connections(self) -> Dict[str, Set[WebSocket]]:
+        """Get the connected WebSockets per execution."""
+        return {
+            execution_id: {subscriber.websocket for subscriber in topic.subscribers}
+            for execution_id, topic in self._topics.items()
+            if topic.subscribers
+        }
+
+    def subscribe(
+        self,
+        websocket: WebSocket,
+        execution_id: str,
+        resume_after: Optional[int] = None
+    ) -> Tuple[_Subscriber, bool]:
+        """
+        Register a client. Nothing is sent until the subscriber is started.
+
+        Args:
+            websocket: The client's WebSocket
+            execution_id: Execution to stream
+            resume_after: Sequence number of the last message the client received
+
+        Returns:
+            The subscriber, and whether the messages after resume_after were
+            buffered for it. If not, the caller must send the history itself.
+        """
+        self._prune()
+        topic = self._topics.get(execution_id)
+        if topic is None:
+            topic = self._topics[execution_id] = _Topic(execution_id)
+        subscriber = _Subscriber(self, topic, websocket)
+        topic.subscribers.add(subscriber)
+        topic.idle_since = None
+
+        resumed = resume_after is not None and topic.can_resume(resume_after)
+        if resumed:
+            for entry in topic.replay:
+                if entry[0] > resume_after:
+                    subscriber.offer(entry)
+            self._stats["resumed"] += 1
+        return subscriber, resumed
+
+    def unsubscribe(self, subscriber: _Subscriber) -> None:
+        """Remove a client and stop its sender."""
+        subscriber.stop()
+        topic = subscriber.topic
+        topic.subscribers.discard(subscriber)
+        if not topic.subscribers and topic.idle_since is None:
+            topic.idle_since = time.monotonic()
+
+    def unsubscribe_websocket(self, websocket: WebSocket, execution_id: str) -> bool:
+        """
+        Remove a client by its WebSocket.
+
+        Returns:
+            True if the WebSocket was subscribed to the execution
+        """
+        topic = self._topics.get(execution_id)
+        if topic is None:
+            return False
+        for subscriber in list(topic.subscribers):
+            if subscriber.websocket is websocket:
+                self.unsubscribe(subscriber)
+                return True
+        return False
+
+    def publish(self, execution_id: str, content: str, timestamp: Optional[datetime] = None) -> Optional[int]:
+        """
+        Send a live log line to the clients of an execution.
+
+        Args:
+            execution_id: Execution the line belongs to
+            content: Log line
+            timestamp: Time of the line, defaults to now (UTC)
+
+        Returns:
+            The message's sequence number, or None if no topic exists for the execution
+        """
+        topic = self._topics.get(execution_id)
+        if topic is None:
+            return None
+        if topic.idle_since is not None and time.monotonic() - topic.idle_since > settings.LOGS_WS_RESUME_WINDOW:
+            del self._topics[execution_id]
+            return None
+
+        topic.seq += 1
+        message = {
+            "execution_id": execution_id,
+            "content": content,
+            "timestamp": (timestamp or datetime.utcnow()).isoformat(),
+            "type": "live",
+            "seq": topic.seq,
+        }
+        entry = (topic.seq, message, json.dumps(message), time.monotonic())
+        self._stats["published"] += 1
+        self._stats["serialized"] += 1
+        topic.replay.append(entry)
+        for subscriber in topic.subscribers:
+            subscriber.offer(entry)
+        return topic.seq
+
+    def _record_send(self, delay: float) -> None:
+        self._stats["sent"] += 1
+        self._stats["total_send_delay"] += delay
+        self._stats["max_send_delay"] = max(self._stats["max_send_delay"], delay)
+
+    def _prune(self) -> None:
+        """Drop topics whose last client left more than LOGS_WS_RESUME_WINDOW seconds ago."""
+        now = time.monotonic()
+        expired = [
+            execution_id for execution_id, topic in self._topics.items()
+            if topic.idle_since is not None and now - topic.idle_since > settings.LOGS_WS_RESUME_WINDOW
+        ]
+        for execution_id in expired:
+            del self._topics[execution_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get connection and lag metrics.
+
+        Returns:
+            Dictionary with publish/send/drop/coalesce counters, the number of
+            topics and subscribers, the messages waiting to be sent (total and
+            for the furthest-behind client) and the publish-to-send delay in seconds
+        """
+        stats = dict(self._stats)
+        lags = [subscriber.lag for topic in self._topics.values() for subscriber in topic.subscribers]
+        stats["topics"] = len(self._topics)
+        stats["subscribers"] = len(lags)
+        stats["pending"] = sum(lags)
+        stats["max_lag"] = max(lags, default=0)
+        stats["average_send_delay"] = stats["total_send_delay"] / stats["sent"] if stats["sent"] else 0.0
+        stats["overflow_policy"] = settings.LOGS_WS_OVERFLOW_POLICY
+        return stats
+
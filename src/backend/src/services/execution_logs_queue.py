@@ -1,8 +1,22 @@
 import queue
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
+from src.config.settings import settings
+from src.services.event_bus import EventBus
 from src.utils.user_context import GroupContext
 
+
+def _coalesce_logs(queued: Optional[Dict[str, Any]], incoming: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Merge consecutive log lines of the same execution and group into one entry."""
+    if not queued or not incoming:
+        return None
+    keys = ("job_id", "group_id", "group_email")
+    if any(queued.get(key) != incoming.get(key) for key in keys):
+        return None
+    merged = dict(queued)
+    merged["content"] = f"{queued.get('content', '')}\n{incoming.get('content', '')}"
+    return merged
+
 class JobOutputQueue:
     """Singleton holder for the job output queue."""
     _instance = None
@@ -11,15 +25,20 @@ class JobOutputQueue:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(JobOutputQueue, cls).__new__(cls)
-            cls._instance._queue = queue.Queue()
+            cls._instance._queue = EventBus(
+                maxsize=settings.LOGS_QUEUE_MAX_SIZE,
+                overflow_policy=settings.LOGS_QUEUE_OVERFLOW_POLICY,
+                coalesce=_coalesce_logs,
+                name="job_output_queue"
+            )
         return cls._instance
 
-    def get_queue(self) -> queue.Queue:
+    def get_queue(self) -> EventBus:
         """Get the singleton queue instance."""
         return self._queue
 
 # Function to get the singleton queue instance easily
-def get_job_output_queue() -> queue.Queue:
+def get_job_output_queue() -> EventBus:
     return JobOutputQueue().get_queue()
 
 def enqueue_log(execution_id: str, content: str, timestamp: Optional[datetime] = None, group_context: GroupContext = None) -> bool:
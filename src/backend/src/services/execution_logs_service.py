@@ -7,6 +7,7 @@ storing logs in the database, and managing WebSocket connections.
 
 import asyncio
 import json
+import time
 from typing import Dict, Set, List, Any, Optional
 from datetime import datetime
 from queue import Empty
@@ -14,10 +15,13 @@ from queue import Empty
 from fastapi import WebSocket
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config.settings import settings
 from src.core.logger import LoggerManager
 from src.models.execution_logs import ExecutionLog
 from src.schemas.execution_logs import LogMessage, ExecutionLogResponse
 from src.repositories.execution_logs_repository import execution_logs_repository
+from src.services.execution_logs_hub import ExecutionLogsHub
+from src.services.event_bus import wait_for_items
 from src.services.execution_logs_queue import enqueue_log, get_job_output_queue
 from src.utils.user_context import GroupContext
 
@@ -26,53 +30,58 @@ logger = LoggerManager.get_instance().system
 
 # Singleton instance of the logs writer task
 _logs_writer_task: Optional[asyncio.Task] = None
+_logs_writer_shutdown: Optional[asyncio.Event] = None
 
 class ExecutionLogsService:
     """
     Service for managing execution logs and WebSocket connections.
     
     This service handles:
-    - WebSocket connection management
+    - WebSocket connection management, through an ExecutionLogsHub
     - Broadcasting logs to connected clients
     - Storing and retrieving execution logs from the database
     """
     
     def __init__(self):
         """Initialize the execution logs service."""
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
-        self._lock = asyncio.Lock()
+        self.hub = ExecutionLogsHub()
     
-    async def connect(self, websocket: WebSocket, execution_id: str):
+    @property
+    def active_connections(self) -> Dict[str, Set[WebSocket]]:
+        """Connected WebSockets per execution."""
+        return self.hub.get_connections()
+    
+    async def connect(self, websocket: WebSocket, execution_id: str, resume_after: Optional[int] = None):
         """
         Connect a client to an execution's WebSocket stream.
         
         Args:
             websocket: WebSocket connection to register
             execution_id: ID of the execution to connect to
+            resume_after: Sequence number of the last live message the client
+                received, to resume instead of replaying the full history
         """
         await websocket.accept()
-        async with self._lock:
-            if execution_id not in self.active_connections:
-                self.active_connections[execution_id] = set()
-            self.active_connections[execution_id].add(websocket)
+        subscriber, resumed = self.hub.subscribe(websocket, execution_id, resume_after)
         
-        # Send historical logs when client connects
-        try:
-            historical_logs = await execution_logs_repository.get_by_execution_id_with_managed_session(execution_id)
-            
-            for log in historical_logs:
-                await websocket.send_text(json.dumps({
-                    "execution_id": execution_id,
-                    "content": log.content,
-                    "timestamp": log.timestamp.isoformat(),
-                    "type": "historical"
-                }))
-        except Exception as e:
-            logger.error(f"Error sending historical logs: {e}")
+        # Send historical logs when client connects, unless the hub still has everything it missed
+        if not resumed:
+            try:
+                historical_logs = await execution_logs_repository.get_by_execution_id_with_managed_session(execution_id)
+                await self._send_historical_logs(websocket, execution_id, historical_logs)
+            except Exception as e:
+                logger.error(f"Error sending historical logs: {e}")
+        subscriber.start()
         
-        logger.debug(f"Client connected to execution {execution_id}. Total connections: {len(self.active_connections[execution_id])}")
+        logger.debug(f"Client connected to execution {execution_id}. Total connections: {len(subscriber.topic.subscribers)}")
     
-    async def connect_with_group(self, websocket: WebSocket, execution_id: str, group_context: GroupContext):
+    async def connect_with_group(
+        self,
+        websocket: WebSocket,
+        execution_id: str,
+        group_context: GroupContext,
+        resume_after: Optional[int] = None
+    ):
         """
         Connect a client to an execution's WebSocket stream with group filtering.
         
@@ -80,35 +89,40 @@ class ExecutionLogsService:
             websocket: WebSocket connection to register
             execution_id: ID of the execution to connect to
             group_context: Group context for filtering logs
+            resume_after: Sequence number of the last live message the client
+                received, to resume instead of replaying the full history
         """
         await websocket.accept()
-        async with self._lock:
-            if execution_id not in self.active_connections:
-                self.active_connections[execution_id] = set()
-            self.active_connections[execution_id].add(websocket)
+        subscriber, resumed = self.hub.subscribe(websocket, execution_id, resume_after)
         
         # Send group-filtered historical logs when client connects
-        try:
-            if group_context.primary_group_id:
-                historical_logs = await execution_logs_repository.get_by_execution_id_and_group_with_managed_session(
-                    execution_id=execution_id,
-                    group_id=group_context.primary_group_id
-                )
-            else:
-                # If no group context, don't send any historical logs for security
-                historical_logs = []
-            
-            for log in historical_logs:
-                await websocket.send_text(json.dumps({
-                    "execution_id": execution_id,
-                    "content": log.content,
-                    "timestamp": log.timestamp.isoformat(),
-                    "type": "historical"
-                }))
-        except Exception as e:
-            logger.error(f"Error sending historical logs: {e}")
+        if not resumed:
+            try:
+                if group_context.primary_group_id:
+                    historical_logs = await execution_logs_repository.get_by_execution_id_and_group_with_managed_session(
+                        execution_id=execution_id,
+                        group_id=group_context.primary_group_id
+                    )
+                else:
+                    # If no group context, don't send any historical logs for security
+                    historical_logs = []
+                await self._send_historical_logs(websocket, execution_id, historical_logs)
+            except Exception as e:
+                logger.error(f"Error sending historical logs: {e}")
+        subscriber.start()
         
-        logger.debug(f"Client connected to execution {execution_id} with group {group_context.primary_group_id}. Total connections: {len(self.active_connections[execution_id])}")
+        logger.debug(f"Client connected to execution {execution_id} with group {group_context.primary_group_id}. Total connections: {len(subscriber.topic.subscribers)}")
+    
+    @staticmethod
+    async def _send_historical_logs(websocket: WebSocket, execution_id: str, logs: List[ExecutionLog]) -> None:
+        """Send stored logs to a client before its live stream starts."""
+        for log in logs:
+            await websocket.send_text(json.dumps({
+                "execution_id": execution_id,
+                "content": log.content,
+                "timestamp": log.timestamp.isoformat(),
+                "type": "historical"
+            }))
 
     async def disconnect(self, websocket: WebSocket, execution_id: str):
         """
@@ -118,11 +132,7 @@ class ExecutionLogsService:
             websocket: WebSocket connection to unregister
             execution_id: ID of the execution to disconnect from
         """
-        async with self._lock:
-            if execution_id in self.active_connections:
-                self.active_connections[execution_id].discard(websocket)
-                if not self.active_connections[execution_id]:
-                    del self.active_connections[execution_id]
+        self.hub.unsubscribe_websocket(websocket, execution_id)
         logger.debug(f"Client disconnected from execution {execution_id}")
 
     async def create_execution_log(self, execution_id: str, content: str, timestamp: datetime = None, group_context: GroupContext = None) -> bool:
@@ -156,6 +166,25 @@ class ExecutionLogsService:
             logger.error("[create_execution_log] Exception details:", exc_info=True)
             return False
 
+    async def create_execution_logs_batch(self, logs: List[Dict[str, Any]]) -> bool:
+        """
+        Create several execution log entries with a single bulk insert.
+        
+        Args:
+            logs: List of dictionaries with execution_id, content and optional
+                timestamp, group_id and group_email keys
+            
+        Returns:
+            bool: True if all logs were created, False otherwise
+        """
+        try:
+            count = await execution_logs_repository.create_many_with_managed_session(logs)
+            logger.debug(f"[create_execution_logs_batch] Stored {count} logs")
+            return True
+        except Exception as e:
+            logger.error(f"[create_execution_logs_batch] Error creating {len(logs)} logs: {e}")
+            return False
+
     async def broadcast_to_execution(self, execution_id: str, message: str, group_context: GroupContext = None):
         """
         Broadcast a log message to all clients connected to an execution.
@@ -172,34 +201,9 @@ class ExecutionLogsService:
         if not success:
             logger.error(f"[broadcast_to_execution] Failed to enqueue log for execution {execution_id}")
 
-        # Now handle WebSocket connections if any exist
-        if execution_id not in self.active_connections:
+        # Hand the message to connected clients, their senders deliver it in the background
+        if self.hub.publish(execution_id, message) is None:
             logger.debug(f"[broadcast_to_execution] No active connections for execution {execution_id}")
-            return
-
-        message_data = {
-            "execution_id": execution_id,
-            "content": message,
-            "timestamp": datetime.utcnow().isoformat(),
-            "type": "live"
-        }
-
-        logger.debug(f"[broadcast_to_execution] Broadcasting to {len(self.active_connections[execution_id])} connections")
-        disconnected = set()
-        for connection in self.active_connections[execution_id]:
-            try:
-                await connection.send_text(json.dumps(message_data))
-                logger.debug("[broadcast_to_execution] Successfully sent message to connection")
-            except Exception as e:
-                logger.error(f"[broadcast_to_execution] Error sending message to client: {e}")
-                logger.error("[broadcast_to_execution] Stack trace:", exc_info=True)
-                disconnected.add(connection)
-
-        # Clean up disconnected clients
-        if disconnected:
-            logger.info(f"[broadcast_to_execution] Cleaned up {len(disconnected)} disconnected clients")
-            async with self._lock:
-                self.active_connections[execution_id] -= disconnected
 
     async def get_execution_logs(self, execution_id: str, limit: int = 1000, offset: int = 0) -> List[ExecutionLogResponse]:
         """
@@ -297,12 +301,92 @@ execution_logs_service = ExecutionLogsService()
 
 # --- Logs Writer Functions ---
 
-async def logs_writer_loop(shutdown_event: asyncio.Event):
+def _drain_log_queue(log_queue, max_items: int) -> List[Dict[str, Any]]:
+    """
+    Take up to max_items log entries from the queue without blocking.
+    
+    Shutdown sentinels (None) are discarded.
+    """
+    items = []
+    while len(items) < max_items:
+        try:
+            log_data = log_queue.get_nowait()
+        except Empty:
+            break
+        log_queue.task_done()
+        if log_data is not None:
+            items.append(log_data)
+    return items
+
+async def _flush_log_batch(batch: List[Dict[str, Any]]) -> int:
+    """
+    Write a batch of queued log lines to the database.
+    
+    Lines are grouped by execution (keeping their queue order within each
+    execution) and stored with one bulk insert. If that fails the batch is
+    retried line by line.
+    
+    Returns:
+        Number of log lines that could not be stored
+    """
+    rows = sorted(
+        (
+            {
+                "execution_id": log_data.get("job_id", "unknown"),
+                "content": log_data.get("content", ""),
+                "timestamp": log_data.get("timestamp") or datetime.now(),
+                "group_id": log_data.get("group_id"),
+                "group_email": log_data.get("group_email"),
+            }
+            for log_data in batch
+        ),
+        key=lambda row: row["execution_id"]
+    )
+    
+    if await execution_logs_service.create_execution_logs_batch(rows):
+        return 0
+    
+    logger.warning(f"[logs_writer_loop] Bulk insert of {len(rows)} logs failed, retrying individually")
+    failures = 0
+    for row in rows:
+        try:
+            group_context = None
+            if row["group_id"] or row["group_email"]:
+                group_context = GroupContext(
+                    group_ids=[row["group_id"]] if row["group_id"] else None,
+                    group_email=row["group_email"]
+                )
+            success = await execution_logs_service.create_execution_log(
+                execution_id=row["execution_id"],
+                content=row["content"],
+                timestamp=row["timestamp"],
+                group_context=group_context
+            )
+            if not success:
+                failures += 1
+        except Exception as e:
+            logger.error(f"[logs_writer_loop] Error processing log: {e}", exc_info=True)
+            failures += 1
+    return failures
+
+async def logs_writer_loop(
+    shutdown_event: asyncio.Event,
+    batch_size: Optional[int] = None,
+    flush_interval: Optional[float] = None
+):
     """
     Background task that reads from the job output queue and writes logs to the database.
     
+    Log lines are buffered until batch_size lines are collected or the oldest
+    buffered line has waited flush_interval seconds, and each batch is written
+    with a single bulk insert. Between flushes the loop awaits the job output bus
+    instead of polling it.
+    
     Args:
         shutdown_event: Event to signal shutdown
+        batch_size: Maximum lines per insert, defaults to settings.LOGS_WRITER_BATCH_SIZE
+        flush_interval: Maximum seconds a line is buffered, defaults to
+            settings.LOGS_WRITER_FLUSH_INTERVAL
     """
     try:
         logger.info("[logs_writer_loop] Logs writer task started.")
@@ -311,93 +395,59 @@ async def logs_writer_loop(shutdown_event: asyncio.Event):
         queue = get_job_output_queue()
         logger.debug(f"[logs_writer_loop] Queue retrieved. Initial approximate size: {queue.qsize()}")
         
+        batch_size = max(1, batch_size or settings.LOGS_WRITER_BATCH_SIZE)
+        flush_interval = max(0.01, flush_interval or settings.LOGS_WRITER_FLUSH_INTERVAL)
+        
         batch_count = 0
         total_log_count = 0
-        empty_count = 0  # Count consecutive empty queue occurrences
+        batch: List[Dict[str, Any]] = []
+        batch_started = 0.0
         
-        while not shutdown_event.is_set():
-            # Create a small batch of logs to process together
-            batch = []
-            batch_target_size = 10  # Process up to this many at once
-            
+        while True:
+            shutting_down = shutdown_event.is_set()
             try:
-                # Try to collect a batch of logs
-                for _ in range(batch_target_size):
-                    try:
-                        # Log queue status periodically
-                        if _ == 0:
-                            logger.debug(f"[logs_writer_loop] Waiting for logs... Queue size: ~{queue.qsize()}")
-                        
-                        # Non-blocking get with timeout
-                        log_data = queue.get(block=True, timeout=0.1)
-                        
-                        # Check if this is the shutdown signal (None)
-                        if log_data is None:
-                            logger.debug("[logs_writer_loop] Received shutdown signal (None) in queue.")
-                            continue
-                            
-                        batch.append(log_data)
-                        queue.task_done()
-                        empty_count = 0  # Reset empty count when we get an item
-                    except Empty:
-                        # Queue is empty, break out of the batch collection loop
-                        empty_count += 1
-                        if empty_count % 100 == 0:  # Log every 100 consecutive empty checks
-                            logger.debug(f"[logs_writer_loop] Queue empty for {empty_count} consecutive checks")
-                        break
+                if not batch:
+                    batch_started = time.monotonic()
+                batch.extend(_drain_log_queue(queue, batch_size - len(batch)))
                 
-                # If we collected any logs, process them
-                if batch:
+                due = (
+                    len(batch) >= batch_size
+                    or time.monotonic() - batch_started >= flush_interval
+                    or shutting_down
+                )
+                if batch and due:
+                    batch_was_full = len(batch) >= batch_size
                     batch_count += 1
                     total_log_count += len(batch)
-                    
-                    # Log batch processing
-                    logger.debug(f"[logs_writer_loop] Processing batch #{batch_count} with {len(batch)} logs. Total processed: {total_log_count}")
-                    
-                    # Process each log in the batch
-                    failures = 0
-                    for idx, log_data in enumerate(batch):
-                        try:
-                            job_id = log_data.get("job_id", "unknown")
-                            content = log_data.get("content", "")
-                            timestamp = log_data.get("timestamp", datetime.now())
-                            log_info = f"[{job_id}:{idx+1}/{len(batch)}]"
-                            
-                            # Extract group information if available
-                            group_context = None
-                            if log_data.get("group_id") or log_data.get("group_email"):
-                                group_context = GroupContext(
-                                    group_ids=[log_data.get("group_id")] if log_data.get("group_id") else None,
-                                    group_email=log_data.get("group_email")
-                                )
-                            
-                            # Create log with execution_logs_service
-                            success = await execution_logs_service.create_execution_log(
-                                execution_id=job_id,
-                                content=content,
-                                timestamp=timestamp,
-                                group_context=group_context
-                            )
-                            
-                            if not success:
-                                logger.warning(f"[logs_writer_loop] {log_info} ❌ Failed to store log")
-                                failures += 1
-                                
-                        except Exception as e:
-                            logger.error(f"[logs_writer_loop] Error processing log: {e}", exc_info=True)
-                            failures += 1
+                    flush_started = time.monotonic()
+                    failures = await _flush_log_batch(batch)
+                    latency_ms = (time.monotonic() - flush_started) * 1000
                     
                     if failures > 0:
-                        logger.warning(f"[logs_writer_loop] Batch #{batch_count} processed with {failures} failures.")
+                        logger.warning(f"[logs_writer_loop] Batch #{batch_count} of {len(batch)} logs processed with {failures} failures.")
                     else:
-                        logger.debug(f"[logs_writer_loop] Batch #{batch_count} processed successfully.")
+                        logger.debug(
+                            f"[logs_writer_loop] Batch #{batch_count} stored {len(batch)} logs in {latency_ms:.1f}ms. "
+                            f"Total processed: {total_log_count}"
+                        )
+                    batch = []
+                    
+                    # A full batch means more lines are likely waiting: flush again without sleeping
+                    if batch_was_full:
+                        continue
                 
-                # If no logs were collected, sleep briefly to avoid CPU spinning
-                else:
-                    await asyncio.sleep(0.5)
+                if shutting_down and not batch:
+                    break
+                
+                # Sleep until lines arrive, the partial batch is due or shutdown
+                timeout = flush_interval - (time.monotonic() - batch_started) if batch else None
+                await wait_for_items(queue, timeout, shutdown_event)
                 
             except Exception as e:
                 logger.error(f"[logs_writer_loop] Batch processing error: {e}", exc_info=True)
+                batch = []
+                if shutting_down:
+                    break
                 # Sleep to avoid rapid retry on persistent errors
                 await asyncio.sleep(1)
             
@@ -410,21 +460,28 @@ async def logs_writer_loop(shutdown_event: asyncio.Event):
     finally:
         logger.info("[logs_writer_loop] Logs writer task stopped.")
 
-async def start_logs_writer(shutdown_event: asyncio.Event) -> asyncio.Task:
+async def start_logs_writer(
+    shutdown_event: asyncio.Event,
+    batch_size: Optional[int] = None,
+    flush_interval: Optional[float] = None
+) -> asyncio.Task:
     """
     Start the logs writer loop if it hasn't been started yet.
     
     Args:
         shutdown_event: Event to signal shutdown
+        batch_size: Optional override for settings.LOGS_WRITER_BATCH_SIZE
+        flush_interval: Optional override for settings.LOGS_WRITER_FLUSH_INTERVAL
         
     Returns:
         The writer task
     """
-    global _logs_writer_task
+    global _logs_writer_task, _logs_writer_shutdown
     
     if _logs_writer_task is None or _logs_writer_task.done():
         logger.info("[start_logs_writer] Starting logs writer task...")
-        _logs_writer_task = asyncio.create_task(logs_writer_loop(shutdown_event))
+        _logs_writer_shutdown = shutdown_event
+        _logs_writer_task = asyncio.create_task(logs_writer_loop(shutdown_event, batch_size, flush_interval))
         logger.info("[start_logs_writer] Logs writer task started.")
     else:
         logger.debug("[start_logs_writer] Logs writer task already running.")
@@ -433,7 +490,8 @@ async def start_logs_writer(shutdown_event: asyncio.Event) -> asyncio.Task:
 
 async def stop_logs_writer(timeout: float = 5.0) -> bool:
     """
-    Stop the logs writer task.
+    Stop the logs writer task by setting the shutdown event it was started
+    with; the writer writes the queued lines and exits.
     
     Args:
         timeout: Maximum time to wait for the task to stop
@@ -449,13 +507,9 @@ async def stop_logs_writer(timeout: float = 5.0) -> bool:
         
     logger.info("[stop_logs_writer] Stopping logs writer task...")
     try:
-        # Add None to logs queue to help unblock queue.get()
-        try:
-            from queue import Full
-            logs_queue = get_job_output_queue()
-            logs_queue.put_nowait(None)
-        except Full:
-            logger.warning("[stop_logs_writer] Logs queue full, writer might take longer to stop.")
+        # The writer awaits the bus and this event, so no sentinel is needed
+        if _logs_writer_shutdown is not None:
+            _logs_writer_shutdown.set()
             
         # Wait for task to complete
         await asyncio.wait_for(_logs_writer_task, timeout=timeout)
@@ -533,8 +533,8 @@ class ExecutionService:
                 update_data["result"] = ExecutionService.sanitize_for_database(result)
             
             # Update execution status using the service
-            # No need to use create_and_run_loop here since execute_db_operation_with_fresh_engine 
-            # already handles event loop isolation
+            # No need to use create_and_run_loop here since execute_db_operation_with_loop_engine 
+            # already uses an engine that belongs to the running event loop
             success = await ExecutionStatusService.update_status(
                 job_id=execution_id,
                 status=status,
@@ -11,7 +11,7 @@ from typing import Dict, Any, Optional
 
 from src.models.execution_status import ExecutionStatus
 from src.repositories.execution_repository import ExecutionRepository
-from src.utils.asyncio_utils import execute_db_operation_with_fresh_engine
+from src.utils.asyncio_utils import execute_db_operation_with_loop_engine
 
 logger = logging.getLogger(__name__)
 
@@ -117,8 +117,8 @@ class ExecutionStatusService:
                     await session.rollback()
                     return False
 
-            # Execute the operation with a fresh engine/session
-            return await execute_db_operation_with_fresh_engine(_update_operation)
+            # Execute the operation with the pooled engine of the running loop
+            return await execute_db_operation_with_loop_engine(_update_operation)
                 
         except Exception as e:
             logger.error(f"[ExecutionStatusService] Error during update/flush/commit for job_id {job_id}: {str(e)}", exc_info=True)
@@ -144,10 +144,10 @@ class ExecutionStatusService:
             # Define the database operation
             async def _get_operation(session):
                 repo = ExecutionRepository(session)
-                return await repo.get_execution_by_job_id(job_id=execution_id)
+                return await repo.get_execution_by_job_id(job_id=execution_id, with_payload=True)
             
-            # Execute the operation with a fresh engine/session
-            return await execute_db_operation_with_fresh_engine(_get_operation)
+            # Execute the operation with the pooled engine of the running loop
+            return await execute_db_operation_with_loop_engine(_get_operation)
             
         except Exception as e:
             logger.error(f"Error getting execution status: {str(e)}")
@@ -165,9 +165,6 @@ class ExecutionStatusService:
         Returns:
             True if successful, False otherwise
         """
-        from src.db.session import async_session_factory
-        from src.repositories.execution_repository import ExecutionRepository
-        
         # Validate job_id
         job_id = execution_data.get('job_id')
         if not job_id or not isinstance(job_id, str):
@@ -181,8 +178,8 @@ class ExecutionStatusService:
                 execution_data["group_email"] = group_context.group_email
                 logger.info(f"[ExecutionStatusService] Adding group context to execution: group_id={group_context.primary_group_id}, groups={group_context.group_ids}, email={group_context.group_email}")
             
-            # Create database session internally
-            async with async_session_factory() as session:
+            # Define the database operation
+            async def _create_operation(session):
                 # Create repository instance
                 repo = ExecutionRepository(session)
                 
@@ -195,13 +192,16 @@ class ExecutionStatusService:
                 
                 # Create execution record
                 logger.debug(f"[ExecutionStatusService] Creating execution record with job_id: {job_id}")
-                execution = await repo.create_execution(data=execution_data)
+                await repo.create_execution(data=execution_data)
                 
                 # Explicitly commit transaction
                 await session.commit()
                 
                 logger.info(f"[ExecutionStatusService] Successfully created execution record with job_id: {job_id}")
                 return True
+            
+            # Execute the operation with the pooled engine of the running loop
+            return await execute_db_operation_with_loop_engine(_create_operation)
         except Exception as e:
             logger.error(f"[ExecutionStatusService] Error creating execution record: {e}", exc_info=True)
             return False 
\ No newline at end of file
@@ -231,6 +231,27 @@ class ExecutionTraceService:
             logger.error(f"Error creating trace: {str(e)}")
             raise
     
+    @staticmethod
+    async def create_traces_batch(traces_data: List[Dict[str, Any]]) -> int:
+        """
+        Create several traces with a single bulk insert.
+        
+        Args:
+            traces_data: List of dictionaries with trace data
+        
+        Returns:
+            Number of traces written
+        """
+        try:
+            return await execution_trace_repository.create_many(traces_data)
+        
+        except SQLAlchemyError as e:
+            logger.error(f"Database error creating {len(traces_data)} traces: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Error creating {len(traces_data)} traces: {str(e)}")
+            raise
+    
     @staticmethod
     async def delete_trace(trace_id: int) -> Optional[DeleteTraceResponse]:
         """
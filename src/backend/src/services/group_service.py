@@ -13,7 +13,7 @@ from src.models.group import Group, GroupUser
 from src.models.enums import GroupStatus, GroupUserRole, GroupUserStatus, UserRole, UserStatus
 from src.models.user import User
 from src.repositories.group_repository import GroupRepository, GroupUserRepository
-from src.utils.user_context import GroupContext  # Will be updated from TenantContext
+from src.utils.user_context import GroupContext, invalidate_group_membership_cache  # Will be updated from TenantContext
 from src.core.logger import LoggerManager
 
 logger = LoggerManager.get_instance().system
@@ -116,6 +116,7 @@ class GroupService:
         )
         
         group_user = await self.group_user_repo.add(group_user)
+        invalidate_group_membership_cache(getattr(group_context, 'group_email', None))
         
         logger.info(f"Auto-created group user association for {user_id} in group {primary_group_id}")
         return group_user
@@ -257,7 +258,10 @@ class GroupService:
                 setattr(group, field, value)
         
         group.updated_at = datetime.utcnow()
-        return await self.group_repo.update(group)
+        updated = await self.group_repo.update(group)
+        # The group status decides whether its members see it
+        invalidate_group_membership_cache()
+        return updated
     
     async def get_group_user_count(self, group_id: str) -> int:
         """
@@ -388,6 +392,7 @@ class GroupService:
                 updated_at=datetime.utcnow()
             )
             group_user = await self.group_user_repo.add(group_user)
+        invalidate_group_membership_cache(user_email)
         
         logger.info(f"Assigned user {user_email} to group {group_id} with role {role}")
         
@@ -432,7 +437,9 @@ class GroupService:
                 setattr(group_user, field, value)
         
         group_user.updated_at = datetime.utcnow()
-        return await self.group_user_repo.update(group_user)
+        updated = await self.group_user_repo.update(group_user)
+        invalidate_group_membership_cache()
+        return updated
     
     async def remove_user_from_group(
         self,
@@ -450,6 +457,7 @@ class GroupService:
         
         if not success:
             raise ValueError(f"User {user_id} not found in group {group_id}")
+        invalidate_group_membership_cache()
         
         logger.info(f"Removed user {user_id} from group {group_id}")
 
@@ -476,6 +484,7 @@ class GroupService:
         try:
             # Delete the group (cascade will handle group_users)
             await self.group_repo.delete(group_id)
+            invalidate_group_membership_cache()
             
             logger.info(f"Deleted group {group_id} and all associated data")
             
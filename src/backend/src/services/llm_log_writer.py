@@ -0,0 +1,322 @@
+"""
+Background writer for LLM interaction logs.
+
+The generation, dispatcher and naming services log every LLM interaction
+through LLMLogService.create_log. Instead of writing each log before the
+request continues, the logs are buffered on a bounded EventBus and written by a
+background writer in batches, one bulk insert per batch. When more logs are
+queued than the bus holds, the oldest are dropped. Prompts and responses can be
+truncated before they are queued to bound the memory the buffer takes.
+
+The writer is started by the first queued log and drained on shutdown. Logs
+queued from other event loops are handed to it through the bus.
+"""
+
+import asyncio
+import threading
+import time
+from queue import Empty
+from typing import Any, Dict, List, Optional
+
+from src.config.settings import settings
+from src.core.logger import LoggerManager
+from src.repositories.log_repository import LLMLogRepository
+from src.services.event_bus import EventBus, OverflowPolicy, wait_for_items
+
+logger = LoggerManager.get_instance().system
+
+_lock = threading.Lock()
+_llm_log_bus: Optional[EventBus] = None
+_stats: Dict[str, int] = {
+    "queued": 0,
+    "truncated": 0,
+    "written": 0,
+    "failed": 0,
+    "batches": 0,
+}
+
+# Singleton instance of the log writer task and its shutdown event
+_llm_log_writer_task: Optional[asyncio.Task] = None
+_llm_log_writer_shutdown: Optional[asyncio.Event] = None
+
+
+def get_llm_log_bus() -> EventBus:
+    """Get the bus holding LLM logs waiting to be written."""
+    global _llm_log_bus
+    if _llm_log_bus is None:
+        with _lock:
+            if _llm_log_bus is None:
+                _llm_log_bus = EventBus(
+                    maxsize=settings.LLM_LOG_QUEUE_MAX_SIZE,
+                    overflow_policy=OverflowPolicy.DROP_OLDEST,
+                    name="llm_log_bus"
+                )
+    return _llm_log_bus
+
+
+def truncate_log_text(text: Optional[str], max_chars: int) -> Optional[str]:
+    """
+    Shorten a prompt or response to max_chars characters.
+
+    Args:
+        text: Text to shorten
+        max_chars: Maximum number of characters kept, 0 or less keeps the text whole
+
+    Returns:
+        The text, with a marker telling how much was cut when it was shortened
+    """
+    if not text or max_chars <= 0 or len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [truncated {len(text) - max_chars} characters]"
+
+
+def enqueue_llm_log(log_data: Dict[str, Any]) -> None:
+    """
+    Queue an LLM log for the background writer.
+
+    Prompt and response are truncated to settings.LLM_LOG_MAX_TEXT_CHARS first,
+    the names of the truncated fields are kept in extra_data["truncated"].
+
+    Args:
+        log_data: Values of the LLMLog to create
+    """
+    max_chars = settings.LLM_LOG_MAX_TEXT_CHARS
+    log_data = dict(log_data)
+    truncated = []
+    for key in ("prompt", "response"):
+        value = log_data.get(key)
+        shortened = truncate_log_text(value, max_chars)
+        if shortened is not value:
+            log_data[key] = shortened
+            truncated.append(key)
+    if truncated:
+        log_data["extra_data"] = {**(log_data.get("extra_data") or {}), "truncated": truncated}
+
+    get_llm_log_bus().put(log_data)
+    with _lock:
+        _stats["queued"] += 1
+        if truncated:
+            _stats["truncated"] += 1
+
+
+def _drain_llm_log_bus(bus: EventBus, max_items: int) -> List[Dict[str, Any]]:
+    """Take up to max_items queued logs without blocking."""
+    logs: List[Dict[str, Any]] = []
+    while len(logs) < max_items:
+        try:
+            logs.append(bus.get_nowait())
+        except Empty:
+            break
+        bus.task_done()
+    return logs
+
+
+async def _write_llm_logs(logs: List[Dict[str, Any]]) -> None:
+    """Write LLM logs in one bulk insert."""
+    await LLMLogRepository().create_many(logs)
+
+
+async def _flush_llm_log_batch(batch: List[Dict[str, Any]]) -> int:
+    """
+    Write a batch of LLM logs.
+
+    When the batch cannot be written as a whole, logs are retried one by one
+    so a single invalid log does not lose the others.
+
+    Returns:
+        Number of logs that could not be written
+    """
+    try:
+        await _write_llm_logs(batch)
+        with _lock:
+            _stats["written"] += len(batch)
+            _stats["batches"] += 1
+        return 0
+    except Exception as e:
+        logger.error(f"[llm_log_writer] Writing {len(batch)} LLM logs failed, retrying individually: {e}")
+
+    failures = 0
+    for log_data in batch:
+        try:
+            await _write_llm_logs([log_data])
+            with _lock:
+                _stats["written"] += 1
+        except Exception as row_error:
+            failures += 1
+            logger.error(f"[llm_log_writer] [{log_data.get('endpoint')}] Failed to store LLM log: {row_error}")
+    with _lock:
+        _stats["failed"] += failures
+        _stats["batches"] += 1
+    return failures
+
+
+async def llm_log_writer_loop(
+    shutdown_event: asyncio.Event,
+    batch_size: Optional[int] = None,
+    flush_interval: Optional[float] = None
+):
+    """
+    Background task that writes queued LLM logs to the database.
+
+    Logs are buffered until batch_size logs are collected or the oldest
+    buffered log has waited flush_interval seconds. On shutdown the queue is
+    drained and written before the loop exits.
+
+    Args:
+        shutdown_event: Event to signal shutdown
+        batch_size: Maximum logs per batch, defaults to settings.LLM_LOG_WRITER_BATCH_SIZE
+        flush_interval: Maximum seconds a log is buffered, defaults to
+            settings.LLM_LOG_WRITER_FLUSH_INTERVAL
+    """
+    try:
+        logger.info("[llm_log_writer] LLM log writer task started.")
+        bus = get_llm_log_bus()
+        batch_size = max(1, batch_size or settings.LLM_LOG_WRITER_BATCH_SIZE)
+        flush_interval = max(0.01, flush_interval or settings.LLM_LOG_WRITER_FLUSH_INTERVAL)
+
+        batch: List[Dict[str, Any]] = []
+        batch_started = 0.0
+
+        while True:
+            shutting_down = shutdown_event.is_set()
+            try:
+                if not batch:
+                    batch_started = time.monotonic()
+                batch.extend(_drain_llm_log_bus(bus, batch_size - len(batch)))
+
+                due = (
+                    len(batch) >= batch_size
+                    or time.monotonic() - batch_started >= flush_interval
+                    or shutting_down
+                )
+                if batch and due:
+                    batch_was_full = len(batch) >= batch_size
+                    await _flush_llm_log_batch(batch)
+                    batch = []
+
+                    # A full batch means more logs are likely waiting: flush again without sleeping
+                    if batch_was_full:
+                        continue
+
+                if shutting_down and not batch:
+                    break
+
+                # Sleep until logs arrive, the partial batch is due or shutdown
+                timeout = flush_interval - (time.monotonic() - batch_started) if batch else None
+                await wait_for_items(bus, timeout, shutdown_event)
+
+            except Exception as e:
+                logger.error(f"[llm_log_writer] Batch processing error: {e}", exc_info=True)
+                batch = []
+                if shutting_down:
+                    break
+                # Sleep to avoid rapid retry on persistent errors
+                await asyncio.sleep(1)
+
+        logger.info("[llm_log_writer] Shutdown event received, exiting LLM log writer loop.")
+
+    except asyncio.CancelledError:
+        logger.warning("[llm_log_writer] LLM log writer task cancelled.")
+    except Exception as e:
+        logger.critical(f"[llm_log_writer] Unhandled exception in LLM log writer loop: {e}", exc_info=True)
+    finally:
+        logger.info("[llm_log_writer] LLM log writer task stopped.")
+
+
+async def start_llm_log_writer() -> asyncio.Task:
+    """
+    Start the LLM log writer loop if no writer is running.
+
+    Logs are also created from event loops of worker threads. They are handed
+    to the running writer through the bus, whichever loop it runs on; a new
+    writer is only started when the previous one finished or its loop was
+    closed.
+
+    Returns:
+        The writer task
+    """
+    global _llm_log_writer_task, _llm_log_writer_shutdown
+
+    with _lock:
+        if (_llm_log_writer_task is None or _llm_log_writer_task.done()
+                or _llm_log_writer_task.get_loop().is_closed()):
+            _llm_log_writer_shutdown = asyncio.Event()
+            _llm_log_writer_task = asyncio.create_task(llm_log_writer_loop(_llm_log_writer_shutdown))
+            logger.info("[start_llm_log_writer] LLM log writer task started.")
+        return _llm_log_writer_task
+
+
+async def stop_llm_log_writer(timeout: float = 10.0) -> bool:
+    """
+    Stop the LLM log writer task after it has written the queued logs.
+
+    A writer running on another thread's event loop is signalled on its loop.
+    Logs queued while no writer runs are written directly.
+
+    Args:
+        timeout: Maximum time to wait for the task to stop
+
+    Returns:
+        True if the queued logs were written before the writer stopped
+    """
+    global _llm_log_writer_task
+
+    task, shutdown_event = _llm_log_writer_task, _llm_log_writer_shutdown
+    if task is None or task.done() or task.get_loop().is_closed():
+        # No writer left: write what is still queued here
+        _llm_log_writer_task = None
+        if _llm_log_bus is None:
+            return True
+        remaining = _drain_llm_log_bus(_llm_log_bus, _llm_log_bus.qsize())
+        return not remaining or await _flush_llm_log_batch(remaining) == 0
+
+    writer_loop = task.get_loop()
+    try:
+        if writer_loop is asyncio.get_running_loop():
+            shutdown_event.set()
+            await asyncio.wait_for(task, timeout=timeout)
+        else:
+            async def _join_writer():
+                shutdown_event.set()
+                await task
+
+            # Cancelling the wait on timeout also cancels the writer on its own loop
+            await asyncio.wait_for(
+                asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_join_writer(), writer_loop)),
+                timeout=timeout
+            )
+        return True
+    except asyncio.TimeoutError:
+        logger.warning("[stop_llm_log_writer] LLM log writer did not stop in time, cancelling.")
+        if writer_loop is asyncio.get_running_loop():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        return False
+    finally:
+        _llm_log_writer_task = None
+
+
+def get_llm_log_writer_stats() -> Dict[str, Any]:
+    """
+    Get LLM log writer metrics.
+
+    Returns:
+        Dictionary with queued/truncated/written/failed counters and the log bus metrics
+    """
+    with _lock:
+        stats: Dict[str, Any] = dict(_stats)
+    stats["queue"] = get_llm_log_bus().get_stats()
+    stats["writer_running"] = _llm_log_writer_task is not None and not _llm_log_writer_task.done()
+    return stats
+
+
+def clear_llm_log_writer() -> None:
+    """Forget queued logs and metrics."""
+    global _llm_log_bus
+    with _lock:
+        for key in _stats:
+            _stats[key] = 0
+        _llm_log_bus = None
@@ -0,0 +1,476 @@
+"""
+LLM usage metering.
+
+LiteLLMFileLogger reports the tokens and cost of every LiteLLM call here. Calls
+are attributed to the execution that made them, buffered on a bounded EventBus
+and written by a background writer in batches: one bulk insert into
+llm_usage_billing plus one upsert of the hourly and daily llm_usage_rollups
+rows the batch touches, in the same transaction.
+
+Calls are attributed through, in order:
+
+1. The LiteLLM call id. LiteLLM runs success callbacks on its own thread pool,
+   so log_pre_api_call, which runs on the calling thread, binds the call id to
+   the execution of that thread first (bind_llm_call).
+2. The execution bound to the current context. start_usage_metering() runs in
+   the execution's task and asyncio.to_thread copies the context into kickoff.
+
+Calls that cannot be attributed, e.g. those of the generation services, are
+counted and dropped, since every usage record belongs to an execution.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime
+from queue import Empty, Full
+from typing import Any, Dict, List, Optional
+
+from src.config.settings import settings
+from src.core.logger import LoggerManager
+from src.db.session import async_session_factory
+from src.repositories.billing_repository import BillingRepository, truncate_period
+from src.services.event_bus import EventBus, OverflowPolicy, wait_for_items
+from src.utils.user_context import GroupContext
+
+logger = LoggerManager.get_instance().system
+
+# Call ids remembered for attribution and to ignore a second report of a call
+_MAX_TRACKED_CALLS = 10000
+
+# Execution metered from the current context
+_usage_execution: ContextVar[Optional[str]] = ContextVar('llm_usage_execution', default=None)
+
+_lock = threading.Lock()
+# execution id -> attribution of its calls
+_executions: Dict[str, Dict[str, Any]] = {}
+# LiteLLM call id -> attribution, bound before the call is made
+_bound_calls: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+# LiteLLM call ids already recorded, with the status they were recorded with
+_recorded_calls: "OrderedDict[str, None]" = OrderedDict()
+_usage_bus: Optional[EventBus] = None
+_stats: Dict[str, Any] = {
+    "recorded": 0,
+    "unattributed": 0,
+    "duplicates": 0,
+    # Records rejected by a full bus, and the cost they carried
+    "lost": 0,
+    "lost_cost_usd": 0.0,
+    "written": 0,
+    "failed": 0,
+    "batches": 0,
+}
+
+# Singleton instance of the usage writer task and its shutdown event
+_usage_writer_task: Optional[asyncio.Task] = None
+_usage_writer_shutdown: Optional[asyncio.Event] = None
+
+
+def _coalesce_usage(queued: Optional[Dict[str, Any]], incoming: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Merge consecutive calls of the same execution, model and hour into one record."""
+    if not queued or not incoming:
+        return None
+    keys = ("execution_id", "model_name", "model_provider", "status", "group_id", "user_email")
+    if any(queued.get(key) != incoming.get(key) for key in keys):
+        return None
+    if truncate_period(queued["usage_date"], "hour") != truncate_period(incoming["usage_date"], "hour"):
+        return None
+    merged = dict(queued)
+    for key in ("prompt_tokens", "completion_tokens", "total_tokens", "cost_usd", "duration_ms", "request_count"):
+        merged[key] = (queued.get(key) or 0) + (incoming.get(key) or 0)
+    return merged
+
+
+def get_usage_bus() -> EventBus:
+    """Get the bus holding usage records waiting to be written."""
+    global _usage_bus
+    if _usage_bus is None:
+        with _lock:
+            if _usage_bus is None:
+                _usage_bus = EventBus(
+                    maxsize=settings.LLM_USAGE_QUEUE_MAX_SIZE,
+                    overflow_policy=OverflowPolicy.COALESCE,
+                    coalesce=_coalesce_usage,
+                    name="llm_usage_bus",
+                    # Usage is billed: wait for the writer rather than drop records
+                    coalesce_fallback=OverflowPolicy.BACKPRESSURE
+                )
+    return _usage_bus
+
+
+def start_usage_metering(
+    execution_id: str,
+    group_context: Optional[GroupContext] = None,
+    execution_name: Optional[str] = None,
+    execution_type: str = "crew"
+) -> None:
+    """
+    Start metering the LLM calls of an execution.
+
+    Must be called from the execution's task, before the crew is started, so
+    the crew's threads inherit the execution from the context.
+
+    Args:
+        execution_id: ID of the execution (job_id)
+        group_context: Group context the usage is billed to
+        execution_name: Name of the crew, agent or task
+        execution_type: 'crew', 'agent', 'task' or 'flow'
+    """
+    attribution = {
+        "execution_id": execution_id,
+        "execution_type": execution_type,
+        "execution_name": execution_name,
+        "group_id": group_context.primary_group_id if group_context else None,
+        "user_email": group_context.group_email if group_context else None,
+    }
+    with _lock:
+        _executions[execution_id] = attribution
+    _usage_execution.set(execution_id)
+
+
+def end_usage_metering(execution_id: str) -> None:
+    """
+    Stop metering an execution. Calls already bound to it are still recorded.
+
+    Args:
+        execution_id: ID of the execution (job_id)
+    """
+    with _lock:
+        _executions.pop(execution_id, None)
+
+
+def _current_attribution() -> Optional[Dict[str, Any]]:
+    """Attribution of the execution bound to the current context. Caller holds _lock."""
+    execution_id = _usage_execution.get()
+    if execution_id is not None:
+        return _executions.get(execution_id)
+    return None
+
+
+def bind_llm_call(call_id: Optional[str]) -> None:
+    """
+    Bind a LiteLLM call to the execution of the calling context.
+
+    Args:
+        call_id: The litellm_call_id of the call about to be made
+    """
+    if not call_id:
+        return
+    with _lock:
+        attribution = _current_attribution()
+        if attribution is None:
+            return
+        _bound_calls[call_id] = attribution
+        _bound_calls.move_to_end(call_id)
+        while len(_bound_calls) > _MAX_TRACKED_CALLS:
+            _bound_calls.popitem(last=False)
+
+
+def _resolve_attribution(call_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Find the execution a call belongs to. Caller holds _lock."""
+    if call_id:
+        # Kept after the lookup: a failed attempt and its retry share the call id
+        attribution = _bound_calls.get(call_id)
+        if attribution is not None:
+            return attribution
+    return _current_attribution()
+
+
+def record_llm_usage(
+    call_id: Optional[str],
+    model_name: str,
+    model_provider: str,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    total_tokens: int = 0,
+    cost_usd: float = 0.0,
+    duration_ms: Optional[int] = None,
+    status: str = "success",
+    error_message: Optional[str] = None,
+    usage_date: Optional[datetime] = None
+) -> bool:
+    """
+    Queue the usage of one LiteLLM call to be written.
+
+    Safe to call from any thread. When the usage queue is full and the record
+    cannot be merged into a queued one, worker threads wait for the writer to
+    make room; on an event loop thread, or when no room is made in time, the
+    record is counted as lost together with its cost.
+
+    Args:
+        call_id: The litellm_call_id of the call
+        model_name: Model used, e.g. 'databricks/databricks-claude-sonnet-4'
+        model_provider: Provider of the model, e.g. 'databricks'
+        prompt_tokens: Prompt tokens used
+        completion_tokens: Completion tokens used
+        total_tokens: Total tokens used
+        cost_usd: Cost of the call in USD
+        duration_ms: Duration of the call in milliseconds
+        status: 'success' or 'error'
+        error_message: Error of a failed call
+        usage_date: When the call completed, defaults to now (UTC)
+
+    Returns:
+        True if the usage was queued, False if metering is disabled, the call
+        was already recorded, could not be attributed to an execution or was lost
+    """
+    if not settings.LLM_USAGE_METERING_ENABLED:
+        return False
+    with _lock:
+        if call_id:
+            recorded_key = f"{call_id}:{status}"
+            if recorded_key in _recorded_calls:
+                _stats["duplicates"] += 1
+                return False
+            _recorded_calls[recorded_key] = None
+            while len(_recorded_calls) > _MAX_TRACKED_CALLS:
+                _recorded_calls.popitem(last=False)
+        attribution = _resolve_attribution(call_id)
+        if attribution is None:
+            _stats["unattributed"] += 1
+            if _stats["unattributed"] % 100 == 1:
+                logger.warning(
+                    f"[llm_usage_meter] LLM call to {model_name} not attributable to an execution, "
+                    f"{_stats['unattributed']} dropped so far"
+                )
+            return False
+        _stats["recorded"] += 1
+
+    record = {
+        **attribution,
+        "model_name": model_name,
+        "model_provider": model_provider,
+        "prompt_tokens": prompt_tokens or 0,
+        "completion_tokens": completion_tokens or 0,
+        "total_tokens": total_tokens or (prompt_tokens or 0) + (completion_tokens or 0),
+        "cost_usd": float(cost_usd or 0),
+        "duration_ms": duration_ms,
+        "request_count": 1,
+        "status": status,
+        "error_message": error_message[:1000] if error_message else None,
+        "usage_date": usage_date or datetime.utcnow(),
+    }
+    try:
+        get_usage_bus().put(record)
+    except Full:
+        with _lock:
+            _stats["lost"] += 1
+            _stats["lost_cost_usd"] += record["cost_usd"]
+            lost, lost_cost = _stats["lost"], _stats["lost_cost_usd"]
+        logger.error(
+            f"[llm_usage_meter] [{attribution['execution_id']}] Usage queue full, lost usage of {model_name} "
+            f"(${record['cost_usd']:.6f}); {lost} records and ${lost_cost:.6f} lost so far"
+        )
+        return False
+    return True
+
+
+def _drain_usage_bus(bus: EventBus, max_items: int) -> List[Dict[str, Any]]:
+    """Take up to max_items queued usage records without blocking."""
+    records: List[Dict[str, Any]] = []
+    while len(records) < max_items:
+        try:
+            records.append(bus.get_nowait())
+        except Empty:
+            break
+        bus.task_done()
+    return records
+
+
+async def _write_usage(records: List[Dict[str, Any]]) -> None:
+    """Write usage records and add them to the rollups in one transaction."""
+    async with async_session_factory() as session:
+        try:
+            repository = BillingRepository(session)
+            await repository.create_usage_records(records)
+            await repository.add_to_rollups(records)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def _flush_usage_batch(batch: List[Dict[str, Any]]) -> int:
+    """
+    Write a batch of usage records.
+
+    When the batch cannot be written as a whole, e.g. because one record's
+    execution is missing, records are retried one by one so the others are kept.
+
+    Returns:
+        Number of records that could not be written
+    """
+    try:
+        await _write_usage(batch)
+        with _lock:
+            _stats["written"] += len(batch)
+            _stats["batches"] += 1
+        return 0
+    except Exception as e:
+        logger.error(f"[llm_usage_writer] Writing {len(batch)} usage records failed, retrying individually: {e}")
+
+    failures = 0
+    for record in batch:
+        try:
+            await _write_usage([record])
+            with _lock:
+                _stats["written"] += 1
+        except Exception as row_error:
+            failures += 1
+            logger.error(f"[llm_usage_writer] [{record.get('execution_id')}] Failed to store usage record: {row_error}")
+    with _lock:
+        _stats["failed"] += failures
+        _stats["batches"] += 1
+    return failures
+
+
+async def usage_writer_loop(
+    shutdown_event: asyncio.Event,
+    batch_size: Optional[int] = None,
+    flush_interval: Optional[float] = None
+):
+    """
+    Background task that writes queued usage records to the database.
+
+    Records are buffered until batch_size records are collected or the oldest
+    buffered record has waited flush_interval seconds. On shutdown the queue is
+    drained and written before the loop exits.
+
+    Args:
+        shutdown_event: Event to signal shutdown
+        batch_size: Maximum records per batch, defaults to settings.LLM_USAGE_WRITER_BATCH_SIZE
+        flush_interval: Maximum seconds a record is buffered, defaults to
+            settings.LLM_USAGE_WRITER_FLUSH_INTERVAL
+    """
+    try:
+        logger.info("[llm_usage_writer] Usage writer task started.")
+        bus = get_usage_bus()
+        batch_size = max(1, batch_size or settings.LLM_USAGE_WRITER_BATCH_SIZE)
+        flush_interval = max(0.01, flush_interval or settings.LLM_USAGE_WRITER_FLUSH_INTERVAL)
+
+        batch: List[Dict[str, Any]] = []
+        batch_started = 0.0
+
+        while True:
+            shutting_down = shutdown_event.is_set()
+            try:
+                if not batch:
+                    batch_started = time.monotonic()
+                batch.extend(_drain_usage_bus(bus, batch_size - len(batch)))
+
+                due = (
+                    len(batch) >= batch_size
+                    or time.monotonic() - batch_started >= flush_interval
+                    or shutting_down
+                )
+                if batch and due:
+                    batch_was_full = len(batch) >= batch_size
+                    await _flush_usage_batch(batch)
+                    batch = []
+
+                    # A full batch means more records are likely waiting: flush again without sleeping
+                    if batch_was_full:
+                        continue
+
+                if shutting_down and not batch:
+                    break
+
+                # Sleep until records arrive, the partial batch is due or shutdown
+                timeout = flush_interval - (time.monotonic() - batch_started) if batch else None
+                await wait_for_items(bus, timeout, shutdown_event)
+
+            except Exception as e:
+                logger.error(f"[llm_usage_writer] Batch processing error: {e}", exc_info=True)
+                batch = []
+                if shutting_down:
+                    break
+                # Sleep to avoid rapid retry on persistent errors
+                await asyncio.sleep(1)
+
+        logger.info("[llm_usage_writer] Shutdown event received, exiting usage writer loop.")
+
+    except asyncio.CancelledError:
+        logger.warning("[llm_usage_writer] Usage writer task cancelled.")
+    except Exception as e:
+        logger.critical(f"[llm_usage_writer] Unhandled exception in usage writer loop: {e}", exc_info=True)
+    finally:
+        logger.info("[llm_usage_writer] Usage writer task stopped.")
+
+
+async def start_usage_writer() -> asyncio.Task:
+    """
+    Start the usage writer loop if it hasn't been started yet.
+
+    Returns:
+        The writer task
+    """
+    global _usage_writer_task, _usage_writer_shutdown
+
+    if _usage_writer_task is None or _usage_writer_task.done():
+        _usage_writer_shutdown = asyncio.Event()
+        _usage_writer_task = asyncio.create_task(usage_writer_loop(_usage_writer_shutdown))
+        logger.info("[start_usage_writer] Usage writer task started.")
+    return _usage_writer_task
+
+
+async def stop_usage_writer(timeout: float = 10.0) -> bool:
+    """
+    Stop the usage writer task after it has written the queued records.
+
+    Args:
+        timeout: Maximum time to wait for the task to stop
+
+    Returns:
+        True if the queued records were written before the writer stopped
+    """
+    global _usage_writer_task
+
+    if _usage_writer_task is None or _usage_writer_task.done():
+        _usage_writer_task = None
+        return True
+
+    _usage_writer_shutdown.set()
+    try:
+        await asyncio.wait_for(_usage_writer_task, timeout=timeout)
+        return True
+    except asyncio.TimeoutError:
+        logger.warning("[stop_usage_writer] Usage writer did not stop in time, cancelling.")
+        _usage_writer_task.cancel()
+        try:
+            await _usage_writer_task
+        except asyncio.CancelledError:
+            pass
+        return False
+    finally:
+        _usage_writer_task = None
+
+
+def get_usage_meter_stats() -> Dict[str, Any]:
+    """
+    Get usage metering metrics.
+
+    Returns:
+        Dictionary with recorded/unattributed/duplicate/lost/written/failed
+        counters, the cost of the lost records, the number of metered executions
+        and the usage bus metrics
+    """
+    with _lock:
+        stats: Dict[str, Any] = dict(_stats)
+        stats["active_executions"] = len(_executions)
+    stats["queue"] = get_usage_bus().get_stats()
+    stats["writer_running"] = _usage_writer_task is not None and not _usage_writer_task.done()
+    return stats
+
+
+def clear_usage_meter() -> None:
+    """Forget metered executions, bound calls, queued records and metrics."""
+    global _usage_bus
+    with _lock:
+        _executions.clear()
+        _bound_calls.clear()
+        _recorded_calls.clear()
+        for key in _stats:
+            _stats[key] = 0
+        _usage_bus = None
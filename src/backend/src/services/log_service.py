@@ -2,8 +2,10 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config.settings import settings
 from src.models.log import LLMLog
 from src.repositories.log_repository import LLMLogRepository
+from src.services.llm_log_writer import enqueue_llm_log, start_llm_log_writer
 from src.utils.user_context import GroupContext
 
 
@@ -88,10 +90,13 @@ class LLMLogService:
         error_message: Optional[str] = None,
         extra_data: Optional[Dict[str, Any]] = None,
         group_context: Optional[GroupContext] = None
-    ) -> LLMLog:
+    ) -> Optional[LLMLog]:
         """
         Create a new LLM log entry with optional tenant context.
         
+        With settings.LLM_LOG_WRITER_ENABLED the log is queued for the
+        background writer instead of being written before returning.
+        
         Args:
             endpoint: The API endpoint that was called
             prompt: The prompt sent to the LLM
@@ -105,7 +110,7 @@ class LLMLogService:
             group_context: Optional group context for multi-group isolation
             
         Returns:
-            The created LLM log
+            The created LLM log, None when it was queued
         """
         log_data = {
             "endpoint": endpoint,
@@ -125,6 +130,11 @@ class LLMLogService:
             log_data["group_id"] = group_context.primary_group_id
             log_data["group_email"] = group_context.group_email
         
+        if settings.LLM_LOG_WRITER_ENABLED:
+            await start_llm_log_writer()
+            enqueue_llm_log(log_data)
+            return None
+        
         return await self.repository.create(log_data)
     
     async def get_log_stats(self, days: int = 30) -> Dict[str, Any]:
@@ -1,7 +1,8 @@
 import logging
 import asyncio
+import time
 import uuid
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime, timezone
 
 from fastapi import HTTPException, status
@@ -9,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
 
+from src.core.schedule_heap import schedule_heap
 from src.repositories.schedule_repository import ScheduleRepository
 from src.repositories.execution_history_repository import ExecutionHistoryRepository
 from src.schemas.schedule import ScheduleCreate, ScheduleCreateFromExecution, ScheduleUpdate, ScheduleResponse, ScheduleListResponse, ToggleResponse
@@ -48,6 +50,12 @@ class SchedulerService:
         self.execution_history_repository = ExecutionHistoryRepository(session)
         self.session = session
         self._running_tasks: Set[asyncio.Task] = set()
+        # Latest run task per schedule, and schedules with a run waiting for the previous one
+        self._active_runs: Dict[int, asyncio.Task] = {}
+        self._queued_runs: Set[int] = set()
+        self._run_slots = asyncio.Semaphore(settings.SCHEDULER_MAX_CONCURRENT_RUNS)
+        self._stats = {"dispatched": 0, "skipped": 0, "queued": 0,
+                       "total_dispatch_lag": 0.0, "max_dispatch_lag": 0.0, "last_dispatch_lag": None}
     
     async def create_schedule(self, schedule_data: ScheduleCreate, group_context: GroupContext = None) -> ScheduleResponse:
         """
@@ -76,6 +84,7 @@ class SchedulerService:
                 schedule_dict["created_by_email"] = group_context.group_email
             
             schedule = await self.repository.create(schedule_dict)
+            schedule_heap.update(schedule.id, schedule.next_run_at, schedule.is_active)
             
             return ScheduleResponse.model_validate(schedule)
         except ValueError as e:
@@ -160,6 +169,7 @@ class SchedulerService:
                 schedule_dict["created_by_email"] = group_context.group_email
             
             schedule = await self.repository.create(schedule_dict)
+            schedule_heap.update(schedule.id, schedule.next_run_at, schedule.is_active)
             
             return ScheduleResponse.model_validate(schedule)
         except HTTPException:
@@ -244,6 +254,7 @@ class SchedulerService:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Schedule with ID {schedule_id} not found"
                 )
+            schedule_heap.update(schedule.id, schedule.next_run_at, schedule.is_active)
             
             return ScheduleResponse.model_validate(schedule)
         except HTTPException:
@@ -282,6 +293,7 @@ class SchedulerService:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Schedule with ID {schedule_id} not found"
                 )
+            schedule_heap.remove(schedule_id)
             
             return {"message": "Schedule deleted successfully"}
         except HTTPException:
@@ -314,6 +326,7 @@ class SchedulerService:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Schedule with ID {schedule_id} not found"
                 )
+            schedule_heap.update(schedule.id, schedule.next_run_at, schedule.is_active)
             
             return ToggleResponse.model_validate(schedule)
         except HTTPException:
@@ -470,114 +483,204 @@ class SchedulerService:
     
     async def check_and_run_schedules(self) -> None:
         """
-        Check for due schedules and run them.
+        Run schedules as they become due.
         This is the main scheduler loop that runs continuously.
+
+        The loop sleeps until the earliest next run time in the schedule heap,
+        or until a schedule is changed, instead of polling the database. The
+        heap is reloaded from the database every SCHEDULER_RESYNC_INTERVAL
+        seconds to pick up changes made by other workers.
         """
         logger_manager.scheduler.info("Schedule checker started and running")
+        last_reload: Optional[float] = None
         
         while True:
             try:
-                # Clean up completed tasks
-                self._running_tasks = {task for task in self._running_tasks if not task.done()}
+                if last_reload is None or time.monotonic() - last_reload >= settings.SCHEDULER_RESYNC_INTERVAL:
+                    await self._load_schedule_heap()
+                    last_reload = time.monotonic()
                 
-                # Get current time
+                # Sleep until the next schedule is due, a schedule changes or the heap needs a reload
                 now_utc = datetime.now(timezone.utc)
-                now_local = datetime.now().astimezone()
-                logger_manager.scheduler.info(f"Checking for due schedules at {now_local} (local) / {now_utc} (UTC)")
-                logger_manager.scheduler.info(f"Currently running tasks: {len(self._running_tasks)}")
-                
-                # Find due schedules
-                async with async_session_factory() as session:
-                    repo = ScheduleRepository(session)
-                    # Convert timezone-aware now_utc to timezone-naive for database comparison
-                    due_schedules = await repo.find_due_schedules(now_utc.replace(tzinfo=None))
-                    all_schedules = await repo.find_all()
-                    
-                    # Log status of all schedules
-                    logger_manager.scheduler.info("Current schedules status:")
-                    for schedule in all_schedules:
-                        # Handle timezone-naive datetimes from database
-                        if schedule.next_run_at and schedule.next_run_at.tzinfo is None:
-                            next_run = schedule.next_run_at.replace(tzinfo=timezone.utc)
-                        else:
-                            next_run = ensure_utc(schedule.next_run_at)
-                            
-                        if schedule.last_run_at and schedule.last_run_at.tzinfo is None:
-                            last_run = schedule.last_run_at.replace(tzinfo=timezone.utc)
-                        else:
-                            last_run = ensure_utc(schedule.last_run_at)
-                            
-                        is_due = schedule.is_active and next_run is not None and next_run <= now_utc
-                        
-                        next_run_local = next_run.astimezone() if next_run else None
-                        last_run_local = last_run.astimezone() if last_run else None
-                        
-                        logger_manager.scheduler.info(
-                            f"Schedule {schedule.id} - {schedule.name}:"
-                            f" active={schedule.is_active},"
-                            f" next_run={next_run_local} (local) / {next_run} (UTC),"
-                            f" last_run={last_run_local} (local) / {last_run} (UTC),"
-                            f" cron={schedule.cron_expression},"
-                            f" planning={schedule.planning},"
-                            f" model={schedule.model},"
-                            f" is_due={is_due}"
-                            f" (now={now_local} local / {now_utc} UTC)"
-                        )
-                    
-                    # Start tasks for due schedules
-                    logger_manager.scheduler.info(f"Found {len(due_schedules)} schedules due to run")
-                    
-                    for schedule in due_schedules:
-                        logger_manager.scheduler.info(f"Starting task for schedule {schedule.id} - {schedule.name}")
-                        logger_manager.scheduler.info(f"Schedule configuration: agents_yaml={schedule.agents_yaml}, tasks_yaml={schedule.tasks_yaml}, inputs={schedule.inputs}, planning={schedule.planning}, model={schedule.model}")
-                        
-                        config = CrewConfig(
-                            agents_yaml=schedule.agents_yaml,
-                            tasks_yaml=schedule.tasks_yaml,
-                            inputs=schedule.inputs,
-                            planning=schedule.planning,
-                            model=schedule.model,
-                            reasoning=False,  # Default value for scheduled jobs
-                            execution_type="crew",  # Scheduled jobs are crew executions
-                            schema_detection_enabled=True  # Default value
-                        )
-                        
-                        # Create task for the job
-                        task = asyncio.create_task(
-                            self.run_schedule_job(schedule.id, config, now_utc),
-                            name=f"schedule_{schedule.id}_{now_utc.isoformat()}"
-                        )
-                        self._running_tasks.add(task)
-                        
-                        # Update next run time immediately
-                        # Convert timezone-aware now_utc to timezone-naive for consistency
-                        schedule.next_run_at = calculate_next_run_from_last(
-                            schedule.cron_expression,
-                            now_utc.replace(tzinfo=None)
-                        )
-                        await session.commit()
-                
-                # Check for task errors
-                for task in list(self._running_tasks):
-                    if task.done():
-                        try:
-                            await task
-                        except Exception as e:
-                            logger_manager.scheduler.error(f"Task {task.get_name()} failed with error: {e}")
+                timeout = settings.SCHEDULER_RESYNC_INTERVAL - (time.monotonic() - last_reload)
+                next_run = schedule_heap.peek()
+                if next_run is not None:
+                    timeout = min(timeout, (next_run - now_utc.replace(tzinfo=None)).total_seconds())
+                if timeout > 0:
+                    await schedule_heap.wait(timeout)
+                    continue
                 
-                # Sleep before next check
-                logger_manager.scheduler.info("Sleeping for 60 seconds before next check")
-                await asyncio.sleep(60)
+                due = schedule_heap.pop_due(now_utc)
+                if due:
+                    await self._dispatch_due_schedules(due)
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger_manager.scheduler.error(f"Error in schedule checker: {e}")
+                # Reload the heap after the pause, due entries may have been popped
+                last_reload = None
                 await asyncio.sleep(60)
     
+    async def _load_schedule_heap(self) -> None:
+        """Seed the schedule heap with the next run times of all active schedules."""
+        async with async_session_factory() as session:
+            repo = ScheduleRepository(session)
+            next_runs = await repo.find_active_next_runs()
+        schedule_heap.reset(next_runs)
+        logger_manager.scheduler.info(
+            f"Loaded {len(next_runs)} active schedules, next run at {schedule_heap.peek()} (UTC)"
+        )
+    
+    async def _dispatch_due_schedules(self, due: List[Tuple[int, datetime]]) -> None:
+        """
+        Start the runs of schedules popped from the heap.
+
+        The database is authoritative: schedules that were deleted, deactivated
+        or moved since they were queued are not run, and moved schedules are
+        put back into the heap with their new time.
+
+        Args:
+            due: (schedule_id, next_run_at) pairs popped from the heap
+        """
+        now_utc = datetime.now(timezone.utc)
+        now_naive = now_utc.replace(tzinfo=None)
+        due_at = dict(due)
+        
+        async with async_session_factory() as session:
+            repo = ScheduleRepository(session)
+            due_schedules = await repo.find_due_schedules(now_naive)
+            logger_manager.scheduler.info(f"Found {len(due_schedules)} schedules due to run")
+            
+            for schedule in due_schedules:
+                # Due in the database but not in the heap, e.g. changed by another worker
+                scheduled_for = due_at.pop(schedule.id, ensure_utc(schedule.next_run_at).replace(tzinfo=None))
+                self._start_scheduled_run(schedule, scheduled_for)
+                
+                # Update next run time immediately
+                schedule.next_run_at = calculate_next_run_from_last(schedule.cron_expression, now_naive)
+                await session.commit()
+                schedule_heap.update(schedule.id, schedule.next_run_at, schedule.is_active)
+            
+            for schedule_id in due_at:
+                schedule = await repo.find_by_id(schedule_id)
+                if schedule:
+                    schedule_heap.update(schedule.id, schedule.next_run_at, schedule.is_active)
+    
+    def _start_scheduled_run(self, schedule, scheduled_for: datetime) -> None:
+        """
+        Start a run of a due schedule, applying SCHEDULER_OVERLAP_POLICY if its previous run is still going.
+
+        Args:
+            schedule: Due schedule
+            scheduled_for: Time the run was due, naive UTC
+        """
+        previous = self._active_runs.get(schedule.id)
+        if previous is not None and not previous.done():
+            policy = settings.SCHEDULER_OVERLAP_POLICY
+            if policy == "skip" or (policy == "queue" and schedule.id in self._queued_runs):
+                self._stats["skipped"] += 1
+                logger_manager.scheduler.warning(
+                    f"Skipping run of schedule {schedule.id} - {schedule.name} due at {scheduled_for}, "
+                    f"its previous run is still going"
+                )
+                return
+            if policy == "queue":
+                self._stats["queued"] += 1
+                self._queued_runs.add(schedule.id)
+                logger_manager.scheduler.info(
+                    f"Queueing run of schedule {schedule.id} - {schedule.name} behind its previous run"
+                )
+            else:
+                previous = None
+        else:
+            previous = None
+        
+        logger_manager.scheduler.info(f"Starting task for schedule {schedule.id} - {schedule.name}")
+        config = CrewConfig(
+            agents_yaml=schedule.agents_yaml,
+            tasks_yaml=schedule.tasks_yaml,
+            inputs=schedule.inputs,
+            planning=schedule.planning,
+            model=schedule.model,
+            reasoning=False,  # Default value for scheduled jobs
+            execution_type="crew",  # Scheduled jobs are crew executions
+            schema_detection_enabled=True  # Default value
+        )
+        
+        task = asyncio.create_task(
+            self._run_scheduled(schedule.id, config, scheduled_for, previous),
+            name=f"schedule_{schedule.id}_{scheduled_for.isoformat()}"
+        )
+        self._running_tasks.add(task)
+        self._active_runs[schedule.id] = task
+        
+        def run_done_callback(task, schedule_id=schedule.id):
+            self._running_tasks.discard(task)
+            if self._active_runs.get(schedule_id) is task:
+                del self._active_runs[schedule_id]
+            if not task.cancelled() and task.exception():
+                logger_manager.scheduler.error(f"Task {task.get_name()} failed with error: {task.exception()}")
+        
+        task.add_done_callback(run_done_callback)
+    
+    async def _run_scheduled(
+        self,
+        schedule_id: int,
+        config: CrewConfig,
+        scheduled_for: datetime,
+        previous: Optional[asyncio.Task] = None
+    ) -> None:
+        """
+        Run a due schedule once a run slot is free, recording how late it started.
+
+        Args:
+            schedule_id: ID of the schedule to run
+            config: Job configuration
+            scheduled_for: Time the run was due, naive UTC
+            previous: Run of the same schedule to wait for first, if queued
+        """
+        if previous is not None:
+            try:
+                await asyncio.wait({previous})
+            finally:
+                self._queued_runs.discard(schedule_id)
+        
+        async with self._run_slots:
+            started_at = datetime.now(timezone.utc)
+            self._record_dispatch_lag(schedule_id, (started_at.replace(tzinfo=None) - scheduled_for).total_seconds())
+            await self.run_schedule_job(schedule_id, config, started_at)
+        
+        # run_schedule_job recalculates the next run from the start time
+        async with async_session_factory() as session:
+            schedule = await ScheduleRepository(session).find_by_id(schedule_id)
+        if schedule:
+            schedule_heap.update(schedule.id, schedule.next_run_at, schedule.is_active)
+    
+    def _record_dispatch_lag(self, schedule_id: int, lag: float) -> None:
+        """Record the seconds between a run's due time and its start."""
+        lag = max(lag, 0.0)
+        self._stats["dispatched"] += 1
+        self._stats["total_dispatch_lag"] += lag
+        self._stats["max_dispatch_lag"] = max(self._stats["max_dispatch_lag"], lag)
+        self._stats["last_dispatch_lag"] = lag
+        logger_manager.scheduler.info(f"Dispatching schedule {schedule_id} {lag:.3f}s after its due time")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get run counters, dispatch lag in seconds and the state of the schedule heap."""
+        stats = dict(self._stats)
+        stats["average_dispatch_lag"] = (
+            stats["total_dispatch_lag"] / stats["dispatched"] if stats["dispatched"] else 0.0
+        )
+        stats["running"] = sum(1 for task in self._active_runs.values() if not task.done())
+        stats["heap"] = schedule_heap.get_stats()
+        return stats
+    
     async def start_scheduler(self, interval_seconds: int = 60) -> None:
         """
         Start the scheduler with a background task.
         
         Args:
-            interval_seconds: Interval in seconds between schedule checks
+            interval_seconds: Seconds to wait before restarting the schedule checker if it fails
         """
         logger.info("Starting scheduler background task...")
         
@@ -678,6 +781,7 @@ class SchedulerService:
         
         # Create schedule
         schedule = await self.repository.create(schedule_data.model_dump())
+        schedule_heap.update(schedule.id, schedule.next_run_at, schedule.is_active)
         
         # Convert back to job response
         return SchedulerJobResponse(
@@ -742,6 +846,7 @@ class SchedulerService:
         
         # Update schedule
         updated_schedule = await self.repository.update(job_id, update_data)
+        schedule_heap.update(updated_schedule.id, updated_schedule.next_run_at, updated_schedule.is_active)
         
         # Convert to job response
         return SchedulerJobResponse(
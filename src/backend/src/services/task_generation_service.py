@@ -7,7 +7,7 @@ using LLM models and prompt templates.
 
 import logging
 import os
-from typing import Optional
+from typing import Any, AsyncIterator, Optional, Tuple
 import re
 import json
 import litellm
@@ -16,6 +16,7 @@ from src.schemas.model_provider import ModelProvider
 from src.schemas.task_generation import TaskGenerationRequest, TaskGenerationResponse
 from src.services.template_service import TemplateService
 from src.utils.prompt_utils import robust_json_parser
+from src.utils.streaming_json import IncrementalJSONParser, completion_chunk_text
 from src.services.log_service import LLMLogService
 from src.core.llm_manager import LLMManager
 from src.schemas.task import TaskCreate
@@ -100,25 +101,7 @@ class TaskGenerationService:
         model = request.model or os.getenv("TASK_MODEL", DEFAULT_TASK_MODEL)
         logger.info(f"Using model for task generation: {model}")
         
-        # Get prompt template from database
-        base_message = await TemplateService.get_template_content("generate_task")
-        
-        # Check if we have a prompt template
-        if not base_message:
-            logger.error("No prompt template found in database for generate_task")
-            raise ValueError("Required prompt template 'generate_task' not found in database")
-        
-        logger.info("Using prompt template for generate_task from database")
-        
-        # Add agent context if provided
-        if request.agent:
-            agent = request.agent
-            base_message += f"\n\nCreate a task specifically for an agent with the following profile:\n"
-            base_message += f"Name: {agent.name}\n"
-            base_message += f"Role: {agent.role}\n"
-            base_message += f"Goal: {agent.goal}\n"
-            base_message += f"Backstory: {agent.backstory}\n"
-            base_message += "\nEnsure the task aligns with this agent's expertise and goals."
+        base_message = await self._prepare_system_message(request)
 
         # Prepare messages for LLM
         messages = [
@@ -202,6 +185,127 @@ class TaskGenerationService:
             )
             raise ValueError(f"Could not parse response as JSON: {str(e)}")
         
+        return self._process_task_setup(setup, model)
+    
+    async def stream_task(self, request: TaskGenerationRequest,
+                          group_context: Optional[GroupContext] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Generate a task while streaming the LLM response.
+        
+        Yields a ("field", {"key": ..., "value": ...}) event for each top-level
+        field as soon as the LLM has written it, then ("task", task) with the
+        same task generate_task returns.
+        
+        Args:
+            request: Task generation request with prompt text, model, and agent context
+            group_context: Optional group context for multi-group isolation
+            
+        Yields:
+            Tuples of event name and payload
+            
+        Raises:
+            ValueError: If the template is missing or the response is invalid
+        """
+        model = request.model or os.getenv("TASK_MODEL", DEFAULT_TASK_MODEL)
+        logger.info(f"Streaming task generation with model: {model}")
+        
+        base_message = await self._prepare_system_message(request)
+        messages = [
+            {"role": "system", "content": base_message},
+            {"role": "user", "content": request.text}
+        ]
+        
+        parser = IncrementalJSONParser(emit_fields=True)
+        try:
+            model_params = await LLMManager.configure_litellm(model)
+            response = await litellm.acompletion(
+                **model_params,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=4000,
+                stream=True
+            )
+            async for chunk in response:
+                for event in parser.feed(completion_chunk_text(chunk)):
+                    yield "field", {"key": event.key, "value": event.value}
+            
+            if not parser.text.strip():
+                raise ValueError("Empty content received from LLM")
+            setup = parser.close()
+        except Exception as e:
+            error_msg = f"Error generating completion: {str(e)}"
+            logger.error(error_msg)
+            await self._log_llm_interaction(
+                endpoint='generate-task',
+                prompt=f"System: {base_message}\nUser: {request.text}",
+                response=parser.text or str(e),
+                model=model,
+                status='error',
+                error_message=error_msg,
+                group_context=group_context
+            )
+            raise ValueError(error_msg)
+        
+        await self._log_llm_interaction(
+            endpoint='generate-task',
+            prompt=f"System: {base_message}\nUser: {request.text}",
+            response=parser.text,
+            model=model,
+            group_context=group_context
+        )
+        
+        task = self._process_task_setup(setup, model)
+        yield "task", task.model_dump()
+    
+    async def _prepare_system_message(self, request: TaskGenerationRequest) -> str:
+        """
+        Prepare the system message from the prompt template and agent context.
+        
+        Args:
+            request: Task generation request with optional agent context
+            
+        Returns:
+            str: Complete system message
+            
+        Raises:
+            ValueError: If prompt template is not found
+        """
+        # Get prompt template from database
+        base_message = await TemplateService.get_template_content("generate_task")
+        
+        # Check if we have a prompt template
+        if not base_message:
+            logger.error("No prompt template found in database for generate_task")
+            raise ValueError("Required prompt template 'generate_task' not found in database")
+        
+        logger.info("Using prompt template for generate_task from database")
+        
+        # Add agent context if provided
+        if request.agent:
+            agent = request.agent
+            base_message += f"\n\nCreate a task specifically for an agent with the following profile:\n"
+            base_message += f"Name: {agent.name}\n"
+            base_message += f"Role: {agent.role}\n"
+            base_message += f"Goal: {agent.goal}\n"
+            base_message += f"Backstory: {agent.backstory}\n"
+            base_message += "\nEnsure the task aligns with this agent's expertise and goals."
+        
+        return base_message
+    
+    def _process_task_setup(self, setup: dict, model: str) -> TaskGenerationResponse:
+        """
+        Validate the parsed LLM response and fill in task defaults.
+        
+        Args:
+            setup: Parsed task setup from the LLM
+            model: Model used for generation
+            
+        Returns:
+            TaskGenerationResponse with generated task details
+            
+        Raises:
+            ValueError: If required fields are missing
+        """
         # Validate required fields
         required_fields = ['name', 'description', 'expected_output']
         for field in required_fields:
@@ -1,7 +1,8 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 import logging
 
 
+from src.core.prompt_template_cache import invalidate_prompt_template_cache, prompt_template_cache
 from src.repositories.template_repository import TemplateRepository
 from src.models.template import PromptTemplate
 from src.schemas.template import PromptTemplateCreate, PromptTemplateUpdate
@@ -134,6 +135,7 @@ class TemplateService:
             service = cls(uow.template_repository)
             template = await service.create_template(template_data)
             await uow.commit()
+            invalidate_prompt_template_cache()
             return template
     
     async def create_template(self, template_data: PromptTemplateCreate) -> PromptTemplate:
@@ -147,7 +149,9 @@ class TemplateService:
             Created PromptTemplate
         """
         template_dict = template_data.model_dump()
-        return await self.repository.create(template_dict)
+        template = await self.repository.create(template_dict)
+        invalidate_prompt_template_cache()
+        return template
     
     @classmethod
     async def update_existing_template(cls, id: int, template_data: PromptTemplateUpdate) -> Optional[PromptTemplate]:
@@ -166,6 +170,7 @@ class TemplateService:
             template = await service.update_template(id, template_data)
             if template:
                 await uow.commit()
+                invalidate_prompt_template_cache()
             return template
     
     async def update_template(self, id: int, template_data: PromptTemplateUpdate) -> Optional[PromptTemplate]:
@@ -180,7 +185,9 @@ class TemplateService:
             Updated PromptTemplate if found, else None
         """
         update_data = template_data.model_dump(exclude_unset=True)
-        return await self.repository.update_template(id, update_data)
+        template = await self.repository.update_template(id, update_data)
+        invalidate_prompt_template_cache()
+        return template
     
     @classmethod
     async def delete_template_by_id(cls, id: int) -> bool:
@@ -198,6 +205,7 @@ class TemplateService:
             deleted = await service.delete_template(id)
             if deleted:
                 await uow.commit()
+                invalidate_prompt_template_cache()
             return deleted
     
     async def delete_template(self, id: int) -> bool:
@@ -210,7 +218,9 @@ class TemplateService:
         Returns:
             True if deleted, False if not found
         """
-        return await self.repository.delete(id)
+        deleted = await self.repository.delete(id)
+        invalidate_prompt_template_cache()
+        return deleted
     
     @classmethod
     async def delete_all_templates_service(cls) -> int:
@@ -224,6 +234,7 @@ class TemplateService:
             service = cls(uow.template_repository)
             count = await service.delete_all_templates()
             await uow.commit()
+            invalidate_prompt_template_cache()
             return count
     
     async def delete_all_templates(self) -> int:
@@ -233,7 +244,9 @@ class TemplateService:
         Returns:
             Number of templates deleted
         """
-        return await self.repository.delete_all()
+        count = await self.repository.delete_all()
+        invalidate_prompt_template_cache()
+        return count
     
     @classmethod
     async def reset_templates_service(cls) -> int:
@@ -247,6 +260,7 @@ class TemplateService:
             service = cls(uow.template_repository)
             count = await service.reset_templates()
             await uow.commit()
+            invalidate_prompt_template_cache()
             return count
     
     async def reset_templates(self) -> int:
@@ -272,6 +286,9 @@ class TemplateService:
         """
         Get the content of a template by name.
         
+        Contents are served from the prompt template cache and only read
+        from the database on a miss.
+        
         Args:
             name: Name of the template
             default_template: Default template to use if not found
@@ -280,18 +297,57 @@ class TemplateService:
             Template content
         """
         try:
-            async with UnitOfWork() as uow:
-                service = cls(uow.template_repository)
-                template = await service.find_by_name(name)
-                if template:
-                    return template.template
-                elif default_template:
-                    return default_template
-                else:
-                    logger.warning(f"No template found for name: {name}")
-                    return ""
+            content = await prompt_template_cache.get(name, cls._load_template_content)
+            if content is not None:
+                return content
+            elif default_template:
+                return default_template
+            else:
+                logger.warning(f"No template found for name: {name}")
+                return ""
         except Exception as e:
             logger.error(f"Error getting template content: {str(e)}")
             if default_template:
                 return default_template
-            return "" 
\ No newline at end of file
+            return ""
+    
+    @classmethod
+    async def _load_template_content(cls, name: str) -> Optional[str]:
+        """
+        Read the content of a template by name from the database.
+        
+        Args:
+            name: Name of the template
+            
+        Returns:
+            Template content, or None if not found
+        """
+        async with UnitOfWork() as uow:
+            service = cls(uow.template_repository)
+            template = await service.find_by_name(name)
+            return template.template if template else None
+    
+    @classmethod
+    async def _load_all_template_contents(cls) -> Dict[str, str]:
+        """
+        Read the content of every active template from the database.
+        
+        Returns:
+            Dictionary of template name to content
+        """
+        async with UnitOfWork() as uow:
+            service = cls(uow.template_repository)
+            templates = await service.find_all()
+            return {template.name: template.template for template in templates}
+    
+    @classmethod
+    async def warm_template_cache(cls) -> int:
+        """
+        Load every active template into the prompt template cache.
+        
+        Returns:
+            Number of templates cached
+        """
+        count = await prompt_template_cache.warm(cls._load_all_template_contents)
+        logger.info(f"Warmed prompt template cache with {count} templates")
+        return count
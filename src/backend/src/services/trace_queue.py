@@ -1,4 +1,20 @@
-import queue
+from typing import Any, Dict, Optional
+
+from src.config.settings import settings
+from src.services.event_bus import EventBus
+
+
+def _coalesce_traces(queued: Optional[Dict[str, Any]], incoming: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Merge consecutive traces of the same job, event and source by joining their output."""
+    if not queued or not incoming:
+        return None
+    keys = ("job_id", "event_type", "event_source", "event_context", "group_id")
+    if any(queued.get(key) != incoming.get(key) for key in keys):
+        return None
+    merged = dict(queued)
+    merged["output_content"] = f"{queued.get('output_content', '')}\n{incoming.get('output_content', '')}"
+    return merged
+
 
 class TraceQueue:
     """Singleton holder for the agent trace queue."""
@@ -8,13 +24,18 @@ class TraceQueue:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(TraceQueue, cls).__new__(cls)
-            cls._instance._queue = queue.Queue()
+            cls._instance._queue = EventBus(
+                maxsize=settings.TRACE_QUEUE_MAX_SIZE,
+                overflow_policy=settings.TRACE_QUEUE_OVERFLOW_POLICY,
+                coalesce=_coalesce_traces,
+                name="trace_queue"
+            )
         return cls._instance
 
-    def get_queue(self) -> queue.Queue:
+    def get_queue(self) -> EventBus:
         """Get the singleton queue instance."""
         return self._queue
 
 # Function to get the singleton queue instance easily
-def get_trace_queue() -> queue.Queue:
-    return TraceQueue().get_queue() 
\ No newline at end of file
+def get_trace_queue() -> EventBus:
+    return TraceQueue().get_queue()
@@ -0,0 +1,285 @@
+"""
+Non-blocking polling of long-running Databricks operations.
+
+Genie messages and SQL statements are started with one request and then polled
+until they reach a terminal state. poll_until() waits between polls with
+asyncio.sleep and an exponential backoff with jitter, and its fetches must be
+non-blocking coroutines, so the polls themselves share one event loop.
+
+CrewAI runs tools synchronously. The tools hand their polls to the shared
+background loop with run_polling(), which blocks the calling worker thread
+until the poll finished, as the sleeping loop it replaced did: what the tools
+gain is backoff, one deadline and cancellation, not a free thread.
+
+Polls are tied to the execution that started them: cancel_execution_polls()
+cancels every poll still running for an execution, and polls started after
+that fail immediately with PollCancelledError.
+"""
+import asyncio
+import random
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Optional, Set, TypeVar
+
+from src.config.settings import settings
+from src.core.logger import LoggerManager
+from src.utils.background_loop import run_in_background_loop
+
+# Get logger from the centralized logging system
+logger = LoggerManager.get_instance().system
+
+T = TypeVar('T')
+
+# Extra seconds run_polling() waits for a poll past its own timeout, covering a
+# fetch that is still in flight at the deadline
+_RUN_TIMEOUT_MARGIN = 60.0
+
+# Execution whose tools are running in the current context. asyncio.to_thread
+# copies the context, so tools called from crew.kickoff() see it.
+_polling_execution: ContextVar[Optional[str]] = ContextVar('polling_execution', default=None)
+
+
+class PollTimeoutError(Exception):
+    """Raised when a poll did not reach a terminal state in time."""
+
+    def __init__(self, message: str, last_result: Any = None):
+        super().__init__(message)
+        self.last_result = last_result
+
+
+class PollCancelledError(Exception):
+    """Raised when the execution that owns a poll was cancelled."""
+
+
+@dataclass
+class BackoffPolicy:
+    """Exponential backoff with proportional jitter."""
+
+    initial_delay: float
+    max_delay: float
+    multiplier: float = 2.0
+    jitter: float = 0.2
+
+    @classmethod
+    def from_settings(cls, max_delay: Optional[float] = None) -> 'BackoffPolicy':
+        """
+        Create the policy configured by the DATABRICKS_POLL_* settings.
+
+        Args:
+            max_delay: Override of DATABRICKS_POLL_MAX_DELAY, e.g. a tool's own retry delay
+        """
+        return cls(
+            initial_delay=settings.DATABRICKS_POLL_INITIAL_DELAY,
+            max_delay=settings.DATABRICKS_POLL_MAX_DELAY if max_delay is None else max_delay,
+            multiplier=settings.DATABRICKS_POLL_BACKOFF_MULTIPLIER,
+            jitter=settings.DATABRICKS_POLL_JITTER,
+        )
+
+    def delay(self, attempt: int) -> float:
+        """
+        Get the delay before the next poll.
+
+        Args:
+            attempt: Number of polls made so far, starting at 0
+
+        Returns:
+            Seconds to wait, never more than max_delay
+        """
+        base = min(self.max_delay, self.initial_delay * (self.multiplier ** attempt))
+        if self.jitter:
+            base *= random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+        return max(0.0, min(base, self.max_delay))
+
+
+class PollRegistry:
+    """Running poll tasks per execution, so an execution can cancel its polls."""
+
+    # Cancelled executions remembered for polls started afterwards
+    _MAX_CANCELLED = 1024
+
+    def __init__(self):
+        self._tasks: Dict[str, Set[asyncio.Task]] = {}
+        self._cancelled: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, execution_id: str, task: asyncio.Task) -> bool:
+        """
+        Track a poll task.
+
+        Returns:
+            False if the execution was already cancelled, the task is not tracked
+        """
+        with self._lock:
+            if execution_id in self._cancelled:
+                return False
+            self._tasks.setdefault(execution_id, set()).add(task)
+            return True
+
+    def unregister(self, execution_id: str, task: asyncio.Task) -> None:
+        """Stop tracking a poll task."""
+        with self._lock:
+            tasks = self._tasks.get(execution_id)
+            if tasks is not None:
+                tasks.discard(task)
+                if not tasks:
+                    del self._tasks[execution_id]
+
+    def is_cancelled(self, execution_id: Optional[str]) -> bool:
+        """Check whether an execution was cancelled."""
+        with self._lock:
+            return execution_id in self._cancelled
+
+    def cancel(self, execution_id: str) -> int:
+        """
+        Cancel the running polls of an execution and reject new ones.
+
+        Safe to call from any thread; each task is cancelled on its own loop.
+
+        Returns:
+            Number of polls that were cancelled
+        """
+        with self._lock:
+            self._cancelled[execution_id] = None
+            self._cancelled.move_to_end(execution_id)
+            while len(self._cancelled) > self._MAX_CANCELLED:
+                self._cancelled.popitem(last=False)
+            tasks = list(self._tasks.pop(execution_id, ()))
+        for task in tasks:
+            loop = task.get_loop()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(task.cancel)
+        return len(tasks)
+
+    def release(self, execution_id: str) -> None:
+        """Forget the polls of a finished execution, keeping its cancelled marker."""
+        with self._lock:
+            self._tasks.pop(execution_id, None)
+
+    def active_count(self, execution_id: Optional[str] = None) -> int:
+        """Get the number of running polls, for one execution or all of them."""
+        with self._lock:
+            if execution_id is not None:
+                return len(self._tasks.get(execution_id, ()))
+            return sum(len(tasks) for tasks in self._tasks.values())
+
+
+# Create a singleton instance
+poll_registry = PollRegistry()
+
+
+def bind_polling_execution(execution_id: Optional[str]):
+    """
+    Tie polls started in the current context to an execution.
+
+    Returns:
+        Token for resetting the context variable
+    """
+    return _polling_execution.set(execution_id)
+
+
+def current_polling_execution() -> Optional[str]:
+    """Get the execution that polls started in the current context belong to."""
+    return _polling_execution.get()
+
+
+def cancel_execution_polls(execution_id: str) -> int:
+    """Cancel the running polls of an execution. Returns the number cancelled."""
+    cancelled = poll_registry.cancel(execution_id)
+    if cancelled:
+        logger.info(f"[async_polling] Cancelled {cancelled} poll(s) of execution {execution_id}")
+    return cancelled
+
+
+def release_execution_polls(execution_id: str) -> None:
+    """Forget the polls of an execution once it finished."""
+    poll_registry.release(execution_id)
+
+
+async def poll_until(
+    fetch: Callable[[], Awaitable[T]],
+    is_done: Callable[[T], bool],
+    timeout: float,
+    policy: Optional[BackoffPolicy] = None,
+    execution_id: Optional[str] = None,
+    description: str = "operation",
+) -> T:
+    """
+    Poll until a result is terminal, backing off between polls.
+
+    Args:
+        fetch: Coroutine function returning the current state
+        is_done: Returns True for a terminal state
+        timeout: Overall seconds to wait, including the time spent in fetch
+        policy: Backoff between polls, defaults to BackoffPolicy.from_settings()
+        execution_id: Execution the poll belongs to, defaults to the one bound
+            in the current context
+        description: Name of the polled operation for log messages
+
+    Returns:
+        The first terminal result
+
+    Raises:
+        PollTimeoutError: If no terminal result arrived within timeout
+        PollCancelledError: If the execution was cancelled
+    """
+    policy = policy or BackoffPolicy.from_settings()
+    if execution_id is None:
+        execution_id = current_polling_execution()
+
+    task = asyncio.current_task()
+    tracked = False
+    if execution_id is not None and task is not None:
+        if not poll_registry.register(execution_id, task):
+            raise PollCancelledError(f"Execution {execution_id} was cancelled")
+        tracked = True
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    attempt = 0
+    result = None
+    try:
+        while True:
+            result = await fetch()
+            if is_done(result):
+                return result
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise PollTimeoutError(
+                    f"{description} did not finish within {timeout:g} seconds", last_result=result
+                )
+            await asyncio.sleep(min(policy.delay(attempt), remaining))
+            attempt += 1
+    except asyncio.CancelledError:
+        if poll_registry.is_cancelled(execution_id):
+            logger.info(f"[async_polling] Stopped polling {description} after {attempt + 1} poll(s), execution cancelled")
+            raise PollCancelledError(f"Execution {execution_id} was cancelled") from None
+        raise
+    finally:
+        if tracked:
+            poll_registry.unregister(execution_id, task)
+
+
+def run_polling(coroutine: Coroutine[Any, Any, T], timeout: float) -> T:
+    """
+    Run a coroutine that polls with poll_until() from synchronous tool code.
+
+    The coroutine runs on the shared background loop next to the polls of
+    other tools, and stays tied to the execution bound in the calling context.
+    The calling thread waits for the result.
+
+    Args:
+        coroutine: Coroutine to run
+        timeout: Poll timeout of the coroutine in seconds
+
+    Returns:
+        The coroutine's result
+    """
+    execution_id = current_polling_execution()
+
+    async def _bound() -> T:
+        bind_polling_execution(execution_id)
+        return await coroutine
+
+    return run_in_background_loop(_bound(), timeout + _RUN_TIMEOUT_MARGIN)
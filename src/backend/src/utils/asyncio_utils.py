@@ -3,10 +3,12 @@ Utilities for event loop management and handling asyncio operations across threa
 """
 import asyncio
 import logging
-from typing import Any, Callable, List, TypeVar, Coroutine
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Coroutine
 
 from src.core.logger import LoggerManager
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 
 # Get logger from the centralized logging system
 logger = LoggerManager.get_instance().system
@@ -65,6 +67,116 @@ async def execute_db_operation_with_fresh_engine(operation: Callable[[AsyncSessi
         # Always dispose the engine
         await engine.dispose()
 
+class LoopEngineRegistry:
+    """
+    Pooled async engines, one per event loop.
+
+    Pooled connections belong to the loop they were opened on, so an engine can
+    only be shared by the coroutines of one loop. The registry lazily creates
+    an engine the first time a loop asks for one and reuses it afterwards.
+    Callers that close a loop must call dispose_loop_engine() on it first:
+    engines of loops that were closed without it are dropped on the next lookup,
+    but their connections cannot be closed any more.
+    """
+
+    def __init__(self):
+        # id(loop) -> (weak reference to the loop, engine, session factory)
+        self._engines: Dict[int, Tuple[weakref.ref, AsyncEngine, async_sessionmaker]] = {}
+        self._lock = threading.Lock()
+
+    def session_factory(self) -> async_sessionmaker:
+        """
+        Get the session factory of the running loop's engine.
+
+        Returns:
+            async_sessionmaker bound to the pooled engine of the running loop
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._prune_closed_loops()
+            entry = self._engines.get(id(loop))
+            if entry is None or entry[0]() is not loop:
+                entry = self._create_entry(loop)
+                self._engines[id(loop)] = entry
+            return entry[2]
+
+    def _create_entry(self, loop: asyncio.AbstractEventLoop) -> Tuple[weakref.ref, AsyncEngine, async_sessionmaker]:
+        """Create the engine for a loop. Caller holds the lock."""
+        from src.config.settings import settings
+
+        engine = create_async_engine(
+            str(settings.DATABASE_URI),
+            echo=False,
+            future=True,
+            pool_pre_ping=True,
+            pool_size=settings.LOOP_ENGINE_POOL_SIZE,
+            max_overflow=settings.LOOP_ENGINE_MAX_OVERFLOW,
+        )
+        session_factory = async_sessionmaker(
+            engine,
+            expire_on_commit=False,
+            autoflush=False,
+        )
+        logger.debug(f"[LoopEngineRegistry] Created engine for event loop {id(loop)}")
+        return weakref.ref(loop), engine, session_factory
+
+    def _prune_closed_loops(self) -> None:
+        """Drop engines whose loop is gone or closed. Caller holds the lock."""
+        for loop_id, (loop_ref, engine, _) in list(self._engines.items()):
+            loop = loop_ref()
+            if loop is None or loop.is_closed():
+                del self._engines[loop_id]
+                # The connections cannot be closed without their loop, only release the pool
+                logger.warning(
+                    f"[LoopEngineRegistry] Event loop {loop_id} was closed without dispose_loop_engine(), "
+                    f"abandoning its pooled connections"
+                )
+                engine.sync_engine.dispose(close=False)
+
+    async def dispose(self) -> None:
+        """Dispose the running loop's engine, call before closing the loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._engines.pop(id(loop), None)
+        if entry is not None:
+            await entry[1].dispose()
+
+    def engine_count(self) -> int:
+        """Get the number of engines of loops that are still open."""
+        with self._lock:
+            self._prune_closed_loops()
+            return len(self._engines)
+
+
+# Create a singleton instance
+loop_engine_registry = LoopEngineRegistry()
+
+
+async def execute_db_operation_with_loop_engine(operation: Callable[[AsyncSession], Coroutine[Any, Any, T]]) -> T:
+    """
+    Execute a database operation with the pooled engine of the running event loop.
+
+    Unlike execute_db_operation_with_fresh_engine, the engine and its connections
+    are kept for the next operation on the same loop.
+
+    Args:
+        operation: A callable that takes an AsyncSession and returns a coroutine
+
+    Returns:
+        The result of the operation
+    """
+    try:
+        async with loop_engine_registry.session_factory()() as session:
+            return await operation(session)
+    except Exception as e:
+        logger.error(f"Error executing DB operation with loop engine: {str(e)}")
+        raise
+
+
+async def dispose_loop_engine() -> None:
+    """Dispose the pooled engine of the running event loop, if it has one."""
+    await loop_engine_registry.dispose()
+
 def create_and_run_loop(coroutine: Any) -> Any:
     """Create a new event loop, run the coroutine, and clean up properly."""
     new_loop = asyncio.new_event_loop()
@@ -82,6 +194,8 @@ def create_and_run_loop(coroutine: Any) -> Any:
             # Run the event loop until all tasks are canceled
             if pending:
                 new_loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            # Close the pooled connections this loop opened
+            new_loop.run_until_complete(dispose_loop_engine())
             # Remove the loop from the current context and close it
             asyncio.set_event_loop(None)
             new_loop.close()
@@ -119,6 +233,8 @@ def create_task_lifecycle_callback(loop_handler: Callable, callbacks: List, task
                 # Run the event loop until all tasks are canceled
                 if pending:
                     new_loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                # Close the pooled connections this loop opened
+                new_loop.run_until_complete(dispose_loop_engine())
                 # Remove the loop from the current context and close it
                 asyncio.set_event_loop(None)
                 new_loop.close()
@@ -152,7 +268,8 @@ def run_in_thread_with_loop(func: Callable, *args, **kwargs) -> Any:
         # Clean up the event loop only if we created it
         if created_loop and loop is not None:
             try:
-                # Only close the loop if we created it
+                # Only close the loop if we created it, after closing the pooled connections it opened
+                loop.run_until_complete(dispose_loop_engine())
                 asyncio.set_event_loop(None)
                 loop.close()
                 logger.info("Successfully closed the event loop created for this thread")
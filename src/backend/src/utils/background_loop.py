@@ -0,0 +1,169 @@
+"""
+Long-lived background event loop for running coroutines from synchronous code.
+
+CrewAI calls memory storage synchronously from its worker threads. Instead of
+creating a new event loop (and with it a new database engine and HTTP stack)
+for every call, coroutines are submitted to one loop that runs on a daemon
+thread for the lifetime of the process. Resources bound to an event loop, such
+as the loop's pooled database engine (see LoopEngineRegistry) and the pooled
+Databricks HTTP sessions, are created once and reused across calls.
+"""
+import asyncio
+import atexit
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.config.settings import settings
+from src.core.logger import LoggerManager
+from src.utils.asyncio_utils import dispose_loop_engine, loop_engine_registry
+
+# Get logger from the centralized logging system
+logger = LoggerManager.get_instance().system
+
+T = TypeVar('T')
+
+
+class BackgroundEventLoop:
+    """
+    Event loop running on its own daemon thread.
+
+    Coroutines submitted with run() execute on that loop, so the engine returned
+    by session_factory() and the Databricks HTTP sessions opened on the loop are
+    shared by every call.
+    """
+
+    def __init__(self, name: str = "background-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Get the loop, starting the thread on first use."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._start()
+            return self._loop
+
+    def _start(self) -> None:
+        """Start the loop thread. Caller holds the lock."""
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def _run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(started.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=_run, name=self.name, daemon=True)
+        self._thread.start()
+        started.wait()
+        self._loop = loop
+        logger.info(f"[BackgroundEventLoop] Started event loop thread '{self.name}'")
+
+    def run(self, coroutine: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """
+        Run a coroutine on the background loop and wait for its result.
+
+        Args:
+            coroutine: Coroutine to run
+            timeout: Seconds to wait, defaults to settings.BACKGROUND_LOOP_CALL_TIMEOUT
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            RuntimeError: If called from the background loop thread itself
+            concurrent.futures.TimeoutError: If the coroutine did not finish in time,
+                the coroutine is cancelled
+        """
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("BackgroundEventLoop.run() cannot be called from its own loop thread")
+
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result(settings.BACKGROUND_LOOP_CALL_TIMEOUT if timeout is None else timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def session_factory(self) -> async_sessionmaker:
+        """
+        Get the session factory of this loop's pooled engine.
+
+        The engine comes from loop_engine_registry, so it must be requested from
+        a coroutine running on this loop: pooled connections belong to the loop
+        they were opened on.
+
+        Raises:
+            RuntimeError: If called outside this loop
+        """
+        if not self.owns_running_loop():
+            raise RuntimeError("BackgroundEventLoop.session_factory() must be called on its own loop")
+        return loop_engine_registry.session_factory()
+
+    def owns_running_loop(self) -> bool:
+        """Check whether the caller is running on this background loop."""
+        try:
+            return self._loop is not None and asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Close the pooled resources and stop the loop thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or loop.is_closed():
+                return
+
+        async def _close_resources():
+            from src.utils.databricks_http_client import close_databricks_http_sessions
+            await close_databricks_http_sessions()
+            await dispose_loop_engine()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_close_resources(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"[BackgroundEventLoop] Error closing resources of '{self.name}': {e}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout)
+        with self._lock:
+            if not loop.is_running():
+                loop.close()
+            self._loop = None
+            self._thread = None
+        logger.info(f"[BackgroundEventLoop] Stopped event loop thread '{self.name}'")
+
+
+_background_loop: Optional[BackgroundEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundEventLoop:
+    """Get the process-wide background event loop."""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = BackgroundEventLoop("memory-background-loop")
+            atexit.register(_background_loop.shutdown)
+        return _background_loop
+
+
+def run_in_background_loop(coroutine: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """
+    Run a coroutine on the process-wide background loop from synchronous code.
+
+    Args:
+        coroutine: Coroutine to run
+        timeout: Seconds to wait, defaults to settings.BACKGROUND_LOOP_CALL_TIMEOUT
+
+    Returns:
+        The coroutine's result
+    """
+    return get_background_loop().run(coroutine, timeout)
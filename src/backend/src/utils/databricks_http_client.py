@@ -0,0 +1,202 @@
+"""
+Pooled HTTP client sessions for Databricks REST API calls.
+
+Opening an aiohttp.ClientSession per request pays TCP and TLS setup on every
+call. This module keeps one keep-alive session per workspace URL and event
+loop (aiohttp sessions cannot be shared between loops), caches the resolved
+PAT used for authentication and records connection reuse metrics.
+"""
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import aiohttp
+
+from src.config.settings import settings
+from src.core.logger import LoggerManager
+
+logger = LoggerManager.get_instance().system
+
+
+class DatabricksHttpClientPool:
+    """Keep-alive aiohttp sessions keyed by event loop and workspace URL."""
+
+    def __init__(self):
+        # id(loop) -> (loop, {workspace_url: session})
+        self._sessions: Dict[int, Tuple[asyncio.AbstractEventLoop, Dict[str, aiohttp.ClientSession]]] = {}
+        # workspace_url -> (resolved_at, token)
+        self._tokens: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "sessions_created": 0,
+            "auth_token_cache_hits": 0,
+            "auth_token_refreshes": 0,
+        }
+
+    def get_session(self, workspace_url: str) -> aiohttp.ClientSession:
+        """
+        Get the pooled session for a workspace on the running event loop.
+
+        Args:
+            workspace_url: Databricks workspace URL
+
+        Returns:
+            Open aiohttp.ClientSession, owned by the pool
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._prune_closed_loops()
+            _, sessions = self._sessions.setdefault(id(loop), (loop, {}))
+            session = sessions.get(workspace_url)
+            if session is None or session.closed:
+                session = self._create_session(workspace_url)
+                sessions[workspace_url] = session
+                self._stats["sessions_created"] += 1
+            return session
+
+    def _create_session(self, workspace_url: str) -> aiohttp.ClientSession:
+        """Create a keep-alive session that reports connection metrics."""
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace_config.on_request_end.append(self._make_on_request_end(workspace_url))
+        connector = aiohttp.TCPConnector(
+            limit=settings.DATABRICKS_HTTP_CONNECTION_LIMIT,
+            keepalive_timeout=settings.DATABRICKS_HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=300,
+        )
+        return aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
+
+    def _prune_closed_loops(self) -> None:
+        """Forget sessions that belong to closed event loops. Caller holds the lock."""
+        for loop_id in [key for key, (loop, _) in self._sessions.items() if loop.is_closed()]:
+            del self._sessions[loop_id]
+
+    async def _on_request_start(self, session, context, params) -> None:
+        self._stats["requests"] += 1
+
+    async def _on_connection_create_end(self, session, context, params) -> None:
+        self._stats["connections_created"] += 1
+
+    async def _on_connection_reuseconn(self, session, context, params) -> None:
+        self._stats["connections_reused"] += 1
+
+    def _make_on_request_end(self, workspace_url: str):
+        async def _on_request_end(session, context, params) -> None:
+            # A rejected token may have been rotated, resolve it again next time
+            if params.response.status == 401:
+                self.invalidate_auth_token(workspace_url)
+        return _on_request_end
+
+    async def get_auth_token(
+        self,
+        workspace_url: str,
+        user_token: Optional[str],
+        resolve: Callable[[], Awaitable[str]]
+    ) -> str:
+        """
+        Get the token for a workspace, resolving it only when the cached one is due.
+
+        OBO user tokens are returned as is. Other tokens are cached for
+        DATABRICKS_AUTH_TOKEN_CACHE_TTL seconds and refreshed
+        DATABRICKS_AUTH_TOKEN_REFRESH_MARGIN seconds before that.
+
+        Args:
+            workspace_url: Databricks workspace URL
+            user_token: Optional user token for OBO authentication
+            resolve: Coroutine function that resolves a fresh token
+
+        Returns:
+            Authentication token
+        """
+        if user_token:
+            return user_token
+
+        ttl = settings.DATABRICKS_AUTH_TOKEN_CACHE_TTL
+        if ttl > 0:
+            with self._lock:
+                cached = self._tokens.get(workspace_url)
+            if cached is not None:
+                resolved_at, token = cached
+                if time.monotonic() - resolved_at < ttl - settings.DATABRICKS_AUTH_TOKEN_REFRESH_MARGIN:
+                    self._stats["auth_token_cache_hits"] += 1
+                    return token
+
+        token = await resolve()
+        self._stats["auth_token_refreshes"] += 1
+        if ttl > 0:
+            with self._lock:
+                self._tokens[workspace_url] = (time.monotonic(), token)
+        return token
+
+    def invalidate_auth_token(self, workspace_url: Optional[str] = None) -> None:
+        """
+        Drop cached tokens.
+
+        Args:
+            workspace_url: Only drop the token for this workspace, or None for all
+        """
+        with self._lock:
+            if workspace_url is None:
+                self._tokens.clear()
+            else:
+                self._tokens.pop(workspace_url, None)
+
+    async def close(self) -> None:
+        """Close the sessions that belong to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            _, sessions = self._sessions.pop(id(loop), (loop, {}))
+        for session in sessions.values():
+            if not session.closed:
+                await session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get connection reuse metrics.
+
+        Returns:
+            Dictionary with request, connection and auth token counters, the
+            share of requests served on a reused connection and the number of
+            open sessions
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["open_sessions"] = sum(
+                1 for _, sessions in self._sessions.values()
+                for session in sessions.values() if not session.closed
+            )
+        connections = stats["connections_created"] + stats["connections_reused"]
+        stats["connection_reuse_ratio"] = stats["connections_reused"] / connections if connections else 0.0
+        return stats
+
+
+# Create a singleton instance
+databricks_http_pool = DatabricksHttpClientPool()
+
+
+@asynccontextmanager
+async def databricks_http_session(workspace_url: str):
+    """
+    Use the pooled session for a workspace in an async with block.
+
+    Unlike aiohttp.ClientSession(), leaving the block keeps the session and its
+    connections open for the next call.
+    """
+    yield databricks_http_pool.get_session(workspace_url)
+
+
+async def close_databricks_http_sessions() -> None:
+    """Close the pooled sessions of the running event loop."""
+    await databricks_http_pool.close()
+
+
+def invalidate_databricks_auth_cache(workspace_url: Optional[str] = None) -> None:
+    """Drop cached Databricks auth tokens, e.g. after the stored PAT changed."""
+    databricks_http_pool.invalidate_auth_token(workspace_url)
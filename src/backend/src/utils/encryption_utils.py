@@ -2,21 +2,42 @@
 Encryption utilities module.
 
 This module provides utilities for encrypting and decrypting sensitive data.
+
+The SSH key pair is read from disk and parsed once per process, and decrypted
+values are kept for SECRET_CACHE_TTL seconds, keyed by a digest of their
+ciphertext, so API keys read during every crew preparation do not pay for an
+RSA decryption each time. ApiKeysService and DatabricksSecretsService call
+invalidate_secret_cache() when they change a secret.
 """
 
 import os
+import hashlib
 import logging
 import base64
-from typing import Tuple
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
 from pathlib import Path
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
 from cryptography.hazmat.backends import default_backend
 
+from src.config.settings import settings
+
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+_lock = threading.Lock()
+# Key directory -> (private key PEM, public key PEM)
+_key_files: Dict[Path, Tuple[bytes, bytes]] = {}
+# PEM -> parsed key
+_parsed_keys: Dict[bytes, Any] = {}
+# Ciphertext digest -> (expires_at, decrypted value), least recently used first
+_secrets: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
 
 class EncryptionUtils:
     """Utility class for encryption and decryption operations."""
@@ -56,8 +77,13 @@ class EncryptionUtils:
 
     @staticmethod
     def get_or_create_ssh_keys() -> Tuple[bytes, bytes]:
-        """Get existing SSH keys or create new ones if they don't exist"""
+        """Get existing SSH keys or create new ones if they don't exist, read once per process"""
         key_dir = EncryptionUtils.get_key_directory()
+        with _lock:
+            cached = _key_files.get(key_dir)
+        if cached is not None:
+            return cached
+        
         private_key_path = key_dir / "private_key.pem"
         public_key_path = key_dir / "public_key.pem"
         
@@ -73,8 +99,46 @@ class EncryptionUtils:
             public_key_path.write_bytes(public_key)
             logger.info("Generated new SSH key pair for encryption")
         
+        with _lock:
+            _key_files[key_dir] = (private_key, public_key)
         return private_key, public_key
 
+    @staticmethod
+    def load_private_key(private_key_bytes: bytes) -> Any:
+        """Parse a PEM private key, once per distinct key"""
+        with _lock:
+            key = _parsed_keys.get(private_key_bytes)
+        if key is None:
+            key = serialization.load_pem_private_key(
+                private_key_bytes,
+                password=None,
+                backend=default_backend()
+            )
+            with _lock:
+                _parsed_keys[private_key_bytes] = key
+        return key
+
+    @staticmethod
+    def load_public_key(public_key_bytes: bytes) -> Any:
+        """Parse a PEM public key, once per distinct key"""
+        with _lock:
+            key = _parsed_keys.get(public_key_bytes)
+        if key is None:
+            key = serialization.load_pem_public_key(
+                public_key_bytes,
+                backend=default_backend()
+            )
+            with _lock:
+                _parsed_keys[public_key_bytes] = key
+        return key
+
+    @staticmethod
+    def preload_keys() -> None:
+        """Read and parse the SSH key pair so the first decryption does not pay for it"""
+        private_key_bytes, public_key_bytes = EncryptionUtils.get_or_create_ssh_keys()
+        EncryptionUtils.load_private_key(private_key_bytes)
+        EncryptionUtils.load_public_key(public_key_bytes)
+
     @staticmethod
     def get_encryption_key() -> bytes:
         """Get or generate a Fernet encryption key (for backward compatibility)"""
@@ -93,10 +157,7 @@ class EncryptionUtils:
         """Encrypt a value using RSA public key encryption"""
         try:
             _, public_key_bytes = EncryptionUtils.get_or_create_ssh_keys()
-            public_key = serialization.load_pem_public_key(
-                public_key_bytes,
-                backend=default_backend()
-            )
+            public_key = EncryptionUtils.load_public_key(public_key_bytes)
             
             # RSA can only encrypt limited data size, so we'll use a hybrid approach
             # Generate a symmetric key
@@ -128,11 +189,7 @@ class EncryptionUtils:
         """Decrypt a value using RSA private key encryption"""
         try:
             private_key_bytes, _ = EncryptionUtils.get_or_create_ssh_keys()
-            private_key = serialization.load_pem_private_key(
-                private_key_bytes,
-                password=None,
-                backend=default_backend()
-            )
+            private_key = EncryptionUtils.load_private_key(private_key_bytes)
             
             # Decode the combined value
             combined = base64.b64decode(encrypted_value.encode())
@@ -182,15 +239,62 @@ class EncryptionUtils:
 
     @staticmethod
     def decrypt_value(encrypted_value: str) -> str:
-        """Decrypt a value using the appropriate method"""
+        """Decrypt a value using the appropriate method, served from the secret cache when possible"""
+        ttl = settings.SECRET_CACHE_TTL
+        digest = None
+        if ttl > 0 and encrypted_value:
+            digest = hashlib.sha256(encrypted_value.encode()).digest()
+            with _lock:
+                entry = _secrets.get(digest)
+                if entry is not None and entry[0] >= time.monotonic():
+                    _secrets.move_to_end(digest)
+                    _stats["hits"] += 1
+                    return entry[1]
+                _stats["misses"] += 1
+        
         try:
             # Check if the value is encrypted with SSH keys
             if EncryptionUtils.is_ssh_encrypted(encrypted_value):
-                return EncryptionUtils.decrypt_with_ssh(encrypted_value)
+                value = EncryptionUtils.decrypt_with_ssh(encrypted_value)
             else:
                 # Fall back to Fernet decryption
                 f = Fernet(EncryptionUtils.get_encryption_key())
-                return f.decrypt(encrypted_value.encode()).decode()
+                value = f.decrypt(encrypted_value.encode()).decode()
         except Exception as e:
             logger.error(f"Error decrypting value: {str(e)}")
-            return "" 
\ No newline at end of file
+            return ""
+        
+        # Failed decryptions return "" and are retried on the next call
+        if digest is not None and value:
+            with _lock:
+                _secrets[digest] = (time.monotonic() + ttl, value)
+                _secrets.move_to_end(digest)
+                while len(_secrets) > settings.SECRET_CACHE_MAX_SIZE:
+                    _secrets.popitem(last=False)
+        return value
+
+
+def invalidate_secret_cache() -> None:
+    """Drop all decrypted values, called whenever a stored secret changes."""
+    with _lock:
+        _secrets.clear()
+        _stats["invalidations"] += 1
+
+
+def get_secret_cache_stats() -> Dict[str, int]:
+    """Get hit, miss and invalidation counts and the number of cached secrets."""
+    with _lock:
+        stats = dict(_stats)
+        stats["size"] = len(_secrets)
+        stats["parsed_keys"] = len(_parsed_keys)
+    return stats
+
+
+def clear_encryption_caches() -> None:
+    """Drop decrypted values, key material and counters."""
+    with _lock:
+        _secrets.clear()
+        _key_files.clear()
+        _parsed_keys.clear()
+        for key in _stats:
+            _stats[key] = 0 
\ No newline at end of file
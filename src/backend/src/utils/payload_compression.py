@@ -0,0 +1,144 @@
+"""
+Compressed storage of large execution payloads.
+
+ExecutionHistory.result, ExecutionTrace.output and ExecutionTrace.trace_metadata
+can hold full agent outputs. When PAYLOAD_COMPRESSION_ENABLED is set, a value
+of at least PAYLOAD_COMPRESSION_MIN_BYTES is written compressed to the row's
+deferred payload column and the JSON column keeps a short preview. List
+queries never load the payload column; detail queries undefer it and call
+load_payload_columns() to put the full values back on the loaded object.
+
+Payloads are JSON objects of column name to full value, prefixed with the
+codec: zstd when the zstandard package is installed, zlib otherwise.
+"""
+
+import json
+import logging
+import zlib
+from typing import Any, Dict, Sequence
+
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.config.settings import settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Name of the deferred blob column on models with compressed payloads
+PAYLOAD_COLUMN = "payload"
+
+_ZSTD_PREFIX = b"zstd:"
+_ZLIB_PREFIX = b"zlib:"
+
+
+def compress_payload(data: bytes) -> bytes:
+    """Compress serialized JSON with the best available codec."""
+    if zstandard is not None:
+        return _ZSTD_PREFIX + zstandard.ZstdCompressor().compress(data)
+    return _ZLIB_PREFIX + zlib.compress(data, 6)
+
+
+def decompress_payload(blob: bytes) -> Dict[str, Any]:
+    """
+    Decompress a payload written by pack_payload_columns().
+
+    Returns:
+        Dictionary of column name to full value
+    """
+    blob = bytes(blob)
+    if blob.startswith(_ZSTD_PREFIX):
+        if zstandard is None:
+            raise RuntimeError("Payload is zstd compressed but the zstandard package is not installed")
+        data = zstandard.ZstdDecompressor().decompress(blob[len(_ZSTD_PREFIX):])
+    elif blob.startswith(_ZLIB_PREFIX):
+        data = zlib.decompress(blob[len(_ZLIB_PREFIX):])
+    else:
+        raise ValueError("Unknown payload codec")
+    return json.loads(data)
+
+
+def make_preview(value: Any, size: int) -> Any:
+    """
+    Build the inline preview of a compressed value.
+
+    Strings are cut to PAYLOAD_PREVIEW_CHARS characters with a marker giving
+    the full size. Dictionaries keep their keys with long values cut the same
+    way, plus payload_size. Other values are previewed as their JSON text.
+    """
+    limit = settings.PAYLOAD_PREVIEW_CHARS
+    if isinstance(value, str):
+        if len(value) <= limit:
+            return value
+        return value[:limit] + f"\n... [preview, {size} bytes in total] ..."
+    if isinstance(value, dict):
+        preview: Dict[str, Any] = {}
+        for key, item in value.items():
+            if item is None or isinstance(item, (bool, int, float)):
+                preview[key] = item
+            else:
+                text = item if isinstance(item, str) else json.dumps(item, default=str)
+                preview[key] = text if len(text) <= limit else text[:limit] + " ..."
+        preview["payload_size"] = size
+        return preview
+    return make_preview(json.dumps(value, default=str), size)
+
+
+def pack_payload_columns(values: Dict[str, Any], columns: Sequence[str]) -> Dict[str, Any]:
+    """
+    Move large payload columns of a row into its compressed payload column.
+
+    Args:
+        values: Column values of an insert or update
+        columns: Names of the JSON columns that may be compressed
+
+    Returns:
+        The values with previews in place of large columns and the payload
+        column set, or cleared when none of the written columns is large.
+        Values that write none of the columns are returned unchanged.
+    """
+    written = [column for column in columns if column in values]
+    if not written:
+        return values
+
+    packed = dict(values)
+    parts = []
+    if settings.PAYLOAD_COMPRESSION_ENABLED:
+        for column in written:
+            value = values[column]
+            if value is None:
+                continue
+            encoded = json.dumps(value, default=str, ensure_ascii=False).encode("utf-8")
+            if len(encoded) < settings.PAYLOAD_COMPRESSION_MIN_BYTES:
+                continue
+            parts.append(json.dumps(column).encode("utf-8") + b":" + encoded)
+            packed[column] = make_preview(value, len(encoded))
+    packed[PAYLOAD_COLUMN] = compress_payload(b"{" + b",".join(parts) + b"}") if parts else None
+    return packed
+
+
+def load_payload_columns(obj: Any) -> Any:
+    """
+    Replace the previews of a loaded object with its full values.
+
+    The payload column must have been loaded with the object (undefer); it is
+    read from the instance state so a deferred column is never lazy loaded.
+    The values are set as committed so the object is not marked dirty.
+
+    Returns:
+        The object
+    """
+    blob = obj.__dict__.get(PAYLOAD_COLUMN) if obj is not None else None
+    if not blob:
+        return obj
+    try:
+        full_values = decompress_payload(blob)
+    except Exception as e:
+        logger.error(f"Failed to decompress payload of {type(obj).__name__} {getattr(obj, 'id', None)}: {e}")
+        return obj
+    for column, value in full_values.items():
+        set_committed_value(obj, column, value)
+    return obj
@@ -0,0 +1,66 @@
+"""
+Server-sent events responses for streaming endpoints.
+
+Streaming services yield (event, data) tuples. sse_response turns them into a
+text/event-stream response. Once the stream has started the status code can
+no longer change, so errors are sent as a final "error" event carrying the
+status code the non-streaming endpoint would have returned.
+"""
+
+import json
+import logging
+from typing import Any, AsyncIterator, Tuple
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Stop proxies such as nginx from buffering the stream
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse_event(event: str, data: Any) -> str:
+    """
+    Format one server-sent event.
+
+    Args:
+        event: Event name
+        data: JSON serializable payload
+
+    Returns:
+        The event in text/event-stream format
+    """
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _encode_events(events: AsyncIterator[Tuple[str, Any]], error_detail: str) -> AsyncIterator[str]:
+    try:
+        async for event, data in events:
+            yield format_sse_event(event, data)
+    except ValueError as e:
+        logger.warning(f"Validation error in streaming response: {str(e)}")
+        yield format_sse_event("error", {"status_code": 400, "detail": str(e)})
+    except Exception as e:
+        logger.error(f"Error in streaming response: {str(e)}")
+        yield format_sse_event("error", {"status_code": 500, "detail": error_detail})
+
+
+def sse_response(events: AsyncIterator[Tuple[str, Any]], error_detail: str) -> StreamingResponse:
+    """
+    Stream (event, data) tuples as server-sent events.
+
+    Args:
+        events: Async iterator of event names and payloads
+        error_detail: Detail sent for unexpected errors
+
+    Returns:
+        StreamingResponse with media type text/event-stream
+    """
+    return StreamingResponse(
+        _encode_events(events, error_detail),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
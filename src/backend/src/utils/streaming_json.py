@@ -0,0 +1,239 @@
+"""
+Incremental JSON parsing for streamed LLM output.
+
+The generation services stream their completion and feed each chunk to an
+IncrementalJSONParser. The parser scans every character once, keeps track of
+strings, nesting and keys, and hands back values as soon as they are closed:
+the elements of selected top-level arrays (the agents and tasks of a crew) and,
+optionally, the top-level fields of the object (the name, role, ... of a
+single agent). Only the closed value itself is passed to json.loads, so the
+growing response is never re-parsed.
+
+Text before the JSON document, such as a markdown code fence, is skipped. The
+complete document is parsed once the stream ends, falling back to
+robust_json_parser when the LLM produced JSON that needs repairs.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional
+
+from src.utils.prompt_utils import robust_json_parser
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JSONStreamEvent:
+    """A value that was closed in the streamed document."""
+
+    key: str
+    value: Any
+    # Position in the array for array elements, None for top-level fields
+    index: Optional[int] = None
+
+
+@dataclass
+class _Container:
+    """An object or array that is still open."""
+
+    kind: str
+    # Key of this container in its parent object, if any
+    key: Optional[str]
+    start: int
+    count: int = 0
+
+
+class IncrementalJSONParser:
+    """Parse a JSON document from text chunks and report values as they close."""
+
+    def __init__(self, item_keys: Iterable[str] = (), emit_fields: bool = False):
+        """
+        Initialize the parser.
+
+        Args:
+            item_keys: Keys of top-level arrays whose elements are reported one by one
+            emit_fields: Whether to report each top-level field once its value closes
+        """
+        self.item_keys = frozenset(item_keys)
+        self.emit_fields = emit_fields
+        self._text = ""
+        self._pos = 0
+        self._root_start: Optional[int] = None
+        self._root_end: Optional[int] = None
+        self._stack: List[_Container] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = False
+        self._key: Optional[str] = None
+        # Key and start of the top-level field value that is still open
+        self._field_key: Optional[str] = None
+        self._field_start: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return self._text
+
+    @property
+    def done(self) -> bool:
+        """Whether the top-level JSON value has been closed."""
+        return self._root_end is not None
+
+    def feed(self, chunk: str) -> List[JSONStreamEvent]:
+        """
+        Feed the next chunk of text.
+
+        Args:
+            chunk: Text received from the LLM
+
+        Returns:
+            Values closed by this chunk, in document order
+        """
+        if not chunk:
+            return []
+        self._text += chunk
+        events: List[JSONStreamEvent] = []
+        text = self._text
+
+        for pos in range(self._pos, len(text)):
+            if self._root_end is not None:
+                break
+            char = text[pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._expect_key:
+                        self._key = self._loads(text[self._string_start:pos + 1])
+                        self._expect_key = False
+                continue
+
+            if self._root_start is None:
+                if char in "{[":
+                    self._root_start = pos
+                    self._open(char, pos)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos
+                self._begin_field(pos)
+            elif char in "{[":
+                self._begin_field(pos)
+                self._open(char, pos)
+            elif char in "}]":
+                self._close_field(pos, events)
+                self._close(pos, events)
+            elif char == ",":
+                self._close_field(pos, events)
+                if self._stack and self._stack[-1].kind == "{":
+                    self._expect_key = True
+            elif not char.isspace() and char != ":":
+                self._begin_field(pos)
+
+        self._pos = len(text)
+        return events
+
+    def close(self) -> Any:
+        """
+        Parse the complete document once the stream has ended.
+
+        Returns:
+            Parsed JSON as Python dict/list
+
+        Raises:
+            ValueError: If the text cannot be parsed as JSON
+        """
+        if self._root_end is not None:
+            document = self._text[self._root_start:self._root_end + 1]
+            try:
+                return json.loads(document)
+            except json.JSONDecodeError:
+                return robust_json_parser(document)
+        if self._root_start is None:
+            return robust_json_parser(self._text)
+
+        # Truncated output, close what is still open before the repairs
+        closers = "".join("}" if container.kind == "{" else "]" for container in reversed(self._stack))
+        document = self._text[self._root_start:] + ('"' if self._in_string else "") + closers
+        try:
+            return json.loads(document)
+        except json.JSONDecodeError:
+            return robust_json_parser(document)
+
+    def _open(self, char: str, pos: int) -> None:
+        parent = self._stack[-1] if self._stack else None
+        key = self._key if parent is not None and parent.kind == "{" else None
+        self._stack.append(_Container(kind=char, key=key, start=pos))
+        self._expect_key = char == "{"
+        self._key = None
+
+    def _close(self, pos: int, events: List[JSONStreamEvent]) -> None:
+        if not self._stack:
+            return
+        container = self._stack.pop()
+        self._expect_key = False
+        if not self._stack:
+            self._root_end = pos
+            return
+
+        parent = self._stack[-1]
+        # Elements of a selected array directly under the top-level object
+        if (parent.kind == "[" and parent.key in self.item_keys
+                and len(self._stack) == 2 and self._stack[0].kind == "{"):
+            value = self._loads(self._text[container.start:pos + 1])
+            if value is not None:
+                events.append(JSONStreamEvent(key=parent.key, value=value, index=parent.count))
+            parent.count += 1
+
+    def _begin_field(self, pos: int) -> None:
+        # Top-level field values start at depth one, right after their key
+        if (self.emit_fields and len(self._stack) == 1 and self._stack[0].kind == "{"
+                and not self._expect_key and self._field_start is None):
+            self._field_key = self._key
+            self._field_start = pos
+
+    def _close_field(self, pos: int, events: List[JSONStreamEvent]) -> None:
+        if self._field_start is None or len(self._stack) != 1:
+            return
+        value = self._loads(self._text[self._field_start:pos].strip())
+        if value is not None and self._field_key is not None:
+            events.append(JSONStreamEvent(key=self._field_key, value=value))
+        self._field_key = None
+        self._field_start = None
+
+    @staticmethod
+    def _loads(fragment: str) -> Any:
+        try:
+            return json.loads(fragment)
+        except json.JSONDecodeError:
+            logger.debug(f"Skipping streamed JSON value that does not parse: {fragment[:100]}")
+            return None
+
+
+def completion_chunk_text(chunk: Any) -> str:
+    """
+    Get the text delta of a streamed completion chunk.
+
+    Args:
+        chunk: Chunk yielded by litellm.acompletion(..., stream=True), as object or dict
+
+    Returns:
+        The content delta, empty if the chunk carries none
+    """
+    choices = chunk.get("choices") if isinstance(chunk, dict) else getattr(chunk, "choices", None)
+    if not choices:
+        return ""
+    choice = choices[0]
+    delta = choice.get("delta") if isinstance(choice, dict) else getattr(choice, "delta", None)
+    if delta is None:
+        return ""
+    content = delta.get("content") if isinstance(delta, dict) else getattr(delta, "content", None)
+    return content or ""
@@ -8,11 +8,16 @@ automatic group extraction from user email domains.
 """
 
 import logging
+import threading
+import time
+from collections import OrderedDict
 from contextvars import ContextVar
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
 from fastapi import Request
 
+from src.config.settings import settings
+
 logger = logging.getLogger(__name__)
 
 # Context variable to store the current user's access token
@@ -21,6 +26,75 @@ _user_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar('user_context',
 _group_context: ContextVar[Optional['GroupContext']] = ContextVar('group_context', default=None)
 
 
+class _TTLCache:
+    """
+    Small size-bounded TTL cache used to avoid per-request database lookups.
+    
+    Entries expire after settings.USER_CONTEXT_CACHE_TTL seconds and the least
+    recently used entry is evicted once settings.USER_CONTEXT_CACHE_MAX_SIZE
+    entries are stored.
+    """
+    
+    _MISSING = object()
+    
+    def __init__(self):
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Any:
+        """Return the cached value, or _TTLCache._MISSING if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return self._MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return self._MISSING
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        ttl = settings.USER_CONTEXT_CACHE_TTL
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max(1, settings.USER_CONTEXT_CACHE_MAX_SIZE):
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one entry, or every entry when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+# Email -> group IDs, and the Databricks Apps enabled flag
+_group_membership_cache = _TTLCache()
+_apps_enabled_cache = _TTLCache()
+_APPS_ENABLED_KEY = "apps_enabled"
+
+
+def invalidate_group_membership_cache(email: Optional[str] = None) -> None:
+    """
+    Invalidate cached group memberships.
+    
+    Args:
+        email: Only invalidate this user, or None to invalidate all users
+    """
+    _group_membership_cache.invalidate(email.lower() if email else None)
+
+
+def invalidate_apps_enabled_cache() -> None:
+    """Invalidate the cached Databricks Apps enabled flag."""
+    _apps_enabled_cache.invalidate()
+
+
 @dataclass
 class GroupContext:
     """
@@ -123,12 +197,19 @@ class GroupContext:
         """
         Get list of group IDs that the user belongs to.
         
+        Successful lookups are cached for a short time, see _TTLCache.
+        
         Args:
             email: User email address
             
         Returns:
             List of group IDs the user is a member of
         """
+        cache_key = email.lower()
+        cached = _group_membership_cache.get(cache_key)
+        if cached is not _TTLCache._MISSING:
+            return list(cached)
+        
         try:
             # Import here to avoid circular imports
             from src.services.group_service import GroupService
@@ -137,7 +218,10 @@ class GroupContext:
             async with async_session_factory() as session:
                 group_service = GroupService(session)
                 user_groups = await group_service.get_user_group_memberships(email)
-                return [group.id for group in user_groups]
+                group_ids = [group.id for group in user_groups]
+            
+            _group_membership_cache.set(cache_key, tuple(group_ids))
+            return group_ids
                 
         except Exception as e:
             logger.error(f"Error getting user group memberships for {email}: {e}")
@@ -343,12 +427,20 @@ def extract_user_context_from_request(request: Request) -> Dict[str, Any]:
         return {}
 
 
+def _skips_user_context(request: Request) -> bool:
+    """Check whether the request path is allowlisted to run without user context."""
+    path = str(request.url.path)
+    return any(path == prefix or path.startswith(prefix) for prefix in settings.USER_CONTEXT_SKIP_PATHS)
+
+
 async def user_context_middleware(request: Request, call_next):
     """
     Middleware to extract and set user and group context from HTTP headers.
     
     This middleware extracts both user context and group context from Databricks Apps headers.
     It works whether or not Databricks Apps is enabled, but provides richer context when it is.
+    Requests for paths in settings.USER_CONTEXT_SKIP_PATHS (static assets, health checks)
+    are passed through without any lookups.
     
     Args:
         request: FastAPI Request object
@@ -357,6 +449,9 @@ async def user_context_middleware(request: Request, call_next):
     Returns:
         Response from the next handler
     """
+    if _skips_user_context(request):
+        return await call_next(request)
+    
     apps_enabled = False
     try:
         # Check if Databricks Apps is enabled before processing user context
@@ -401,9 +496,15 @@ async def _is_databricks_apps_enabled() -> bool:
     """
     Check if Databricks Apps is enabled in the configuration.
     
+    The flag is cached for a short time, see _TTLCache.
+    
     Returns:
         True if apps_enabled is true in Databricks config, False otherwise
     """
+    cached = _apps_enabled_cache.get(_APPS_ENABLED_KEY)
+    if cached is not _TTLCache._MISSING:
+        return cached
+    
     try:
         from src.services.databricks_service import DatabricksService
         from src.core.unit_of_work import UnitOfWork
@@ -412,10 +513,12 @@ async def _is_databricks_apps_enabled() -> bool:
             service = await DatabricksService.from_unit_of_work(uow)
             config = await service.get_databricks_config()
             
+            apps_enabled = False
             if config and hasattr(config, 'apps_enabled'):
-                return config.apps_enabled
-            
-            return False
+                apps_enabled = config.apps_enabled
+        
+        _apps_enabled_cache.set(_APPS_ENABLED_KEY, apps_enabled)
+        return apps_enabled
             
     except Exception as e:
         logger.debug(f"Could not check Databricks apps_enabled status: {e}")
@@ -0,0 +1,154 @@
+"""
+In-memory vector index for cosine similarity search.
+
+Embeddings are kept as a single L2-normalized NumPy matrix so a search is one
+matrix-vector product followed by an argpartition top-k. Rows can be added,
+replaced and removed incrementally without rebuilding the matrix.
+"""
+import logging
+from typing import Any, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class VectorIndex:
+    """Cosine similarity index over integer-keyed embeddings."""
+
+    _INITIAL_CAPACITY = 256
+
+    def __init__(self):
+        self.dim: Optional[int] = None
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._rows: dict = {}  # id -> row in _matrix
+        self._size = 0
+        # Free-form marker callers use to detect changes in the backing store
+        self.signature: Any = None
+        # Ids whose stored embedding may differ from the index
+        self.stale_ids: Set[int] = set()
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return self._size
+
+    def ids(self) -> Set[int]:
+        """Get the ids currently in the index."""
+        return set(self._rows)
+
+    def clear(self) -> None:
+        """Remove every row and forget the dimension."""
+        self.__init__()
+
+    def rebuild(self, rows: Iterable[Tuple[int, Sequence[float]]]) -> None:
+        """Replace the index contents with the given (id, embedding) rows."""
+        self.clear()
+        self.upsert(rows)
+        self.loaded = True
+
+    def upsert(self, rows: Iterable[Tuple[int, Sequence[float]]]) -> None:
+        """Add or replace (id, embedding) rows."""
+        for row_id, embedding in rows:
+            vector = self._normalize(embedding)
+            if vector is None:
+                self.remove([row_id])
+                continue
+            row = self._rows.get(row_id)
+            if row is None:
+                row = self._append_row(row_id)
+            self._matrix[row] = vector
+
+    def remove(self, row_ids: Iterable[int]) -> None:
+        """Remove rows by id, ignoring ids that are not indexed."""
+        for row_id in row_ids:
+            row = self._rows.pop(row_id, None)
+            if row is None:
+                continue
+            last = self._size - 1
+            if row != last:
+                # Move the last row into the hole to keep the matrix dense
+                self._matrix[row] = self._matrix[last]
+                moved_id = int(self._ids[last])
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+            self._size = last
+
+    def search(self, query: Sequence[float], k: int) -> List[Tuple[int, float]]:
+        """
+        Find the k most similar rows to a single query embedding.
+
+        Returns:
+            List of (id, cosine similarity) pairs with positive similarity,
+            most similar first
+        """
+        return self.search_batch([query], k)[0]
+
+    def search_batch(self, queries: Sequence[Sequence[float]], k: int) -> List[List[Tuple[int, float]]]:
+        """
+        Find the k most similar rows for each query embedding.
+
+        Returns:
+            One list of (id, cosine similarity) pairs per query, see search()
+        """
+        if not self._size or k <= 0:
+            return [[] for _ in queries]
+
+        query_matrix = np.asarray(queries, dtype=np.float32)
+        if query_matrix.ndim != 2 or query_matrix.shape[1] != self.dim:
+            logger.warning(f"[VectorIndex] Query dimension {query_matrix.shape[-1]} does not match index dimension {self.dim}")
+            return [[] for _ in queries]
+        norms = np.linalg.norm(query_matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        query_matrix /= norms
+
+        # (n, d) @ (d, m) -> (n, m) similarity matrix
+        scores = self._matrix[:self._size] @ query_matrix.T
+        k = min(k, self._size)
+        results = []
+        for column in range(scores.shape[1]):
+            column_scores = scores[:, column]
+            if k < self._size:
+                top = np.argpartition(-column_scores, k - 1)[:k]
+            else:
+                top = np.arange(self._size)
+            top = top[np.argsort(-column_scores[top], kind="stable")]
+            results.append([
+                (int(self._ids[row]), float(column_scores[row]))
+                for row in top
+                if column_scores[row] > 0
+            ])
+        return results
+
+    def _normalize(self, embedding: Sequence[float]) -> Optional[np.ndarray]:
+        """Convert an embedding to a unit-length float32 vector, None if unusable."""
+        if embedding is None:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        if not vector.size:
+            return None
+        if self.dim is None:
+            self.dim = vector.size
+            self._matrix = np.zeros((self._INITIAL_CAPACITY, self.dim), dtype=np.float32)
+            self._ids = np.zeros(self._INITIAL_CAPACITY, dtype=np.int64)
+        elif vector.size != self.dim:
+            logger.warning(f"[VectorIndex] Skipping embedding of dimension {vector.size}, index dimension is {self.dim}")
+            return None
+        norm = np.linalg.norm(vector)
+        # Zero vectors keep a zero row and never score above 0, like the SQL search
+        return vector / norm if norm > 0 else vector
+
+    def _append_row(self, row_id: int) -> int:
+        """Reserve a new matrix row for row_id, growing the matrix when full."""
+        if self._size == self._matrix.shape[0]:
+            capacity = max(self._INITIAL_CAPACITY, self._size * 2)
+            matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+            matrix[:self._size] = self._matrix[:self._size]
+            ids = np.zeros(capacity, dtype=np.int64)
+            ids[:self._size] = self._ids[:self._size]
+            self._matrix, self._ids = matrix, ids
+        row = self._size
+        self._ids[row] = row_id
+        self._rows[row_id] = row
+        self._size += 1
+        return row
@@ -125,6 +125,32 @@ def cleanup_after_test():
     yield
     # Clean up any global state if needed
     # For example, clear in-memory caches, reset singletons, etc.
+    from src.core.llm_config_cache import invalidate_llm_config_cache
+    from src.utils.user_context import invalidate_apps_enabled_cache, invalidate_group_membership_cache
+    invalidate_llm_config_cache()
+    invalidate_apps_enabled_cache()
+    invalidate_group_membership_cache()
+    from src.utils.databricks_http_client import invalidate_databricks_auth_cache
+    invalidate_databricks_auth_cache()
+    from src.core.tool_catalog_cache import invalidate_api_key_cache, invalidate_tool_catalog_cache
+    invalidate_tool_catalog_cache()
+    invalidate_api_key_cache()
+    from src.core.prompt_template_cache import invalidate_prompt_template_cache
+    invalidate_prompt_template_cache()
+    from src.services.databricks_embedding_service import clear_embedding_cache
+    clear_embedding_cache()
+    from src.services.execution_history_service import invalidate_execution_history_count_cache
+    invalidate_execution_history_count_cache()
+    from src.core.schedule_heap import clear_schedule_heap
+    clear_schedule_heap()
+    from src.engines.crewai.callbacks.trace_capture import clear_trace_captures
+    clear_trace_captures()
+    from src.utils.encryption_utils import clear_encryption_caches
+    clear_encryption_caches()
+    from src.services.llm_usage_meter import clear_usage_meter
+    clear_usage_meter()
+    from src.services.llm_log_writer import clear_llm_log_writer
+    clear_llm_log_writer()
 
 # Skip integration tests marker
 def pytest_configure(config):
@@ -176,4 +176,22 @@ class TestSettings:
             from src.config.settings import Settings as FreshSettings
             settings = FreshSettings()
             
-            assert settings.DATABASE_TYPE == "sqlite"
\ No newline at end of file
+            assert settings.DATABASE_TYPE == "sqlite"    
+    def test_overflow_policies_are_validated_on_load(self):
+        """Test that an unknown queue overflow policy is rejected when settings load."""
+        with pytest.raises(ValueError):
+            Settings(TRACE_QUEUE_OVERFLOW_POLICY="drop_newest")
+        with pytest.raises(ValueError):
+            Settings(LOGS_QUEUE_OVERFLOW_POLICY="Coalesce")
+        with pytest.raises(ValueError):
+            Settings(LOGS_WS_OVERFLOW_POLICY="backpressure")
+        
+        settings = Settings(LOGS_QUEUE_OVERFLOW_POLICY="backpressure")
+        assert settings.LOGS_QUEUE_OVERFLOW_POLICY == "backpressure"
+    
+    def test_scheduler_overlap_policy_is_validated_on_load(self):
+        """Test that a misspelled overlap policy fails instead of letting runs overlap."""
+        with pytest.raises(ValueError):
+            Settings(SCHEDULER_OVERLAP_POLICY="skipp")
+        
+        assert Settings(SCHEDULER_OVERLAP_POLICY="queue").SCHEDULER_OVERLAP_POLICY == "queue"
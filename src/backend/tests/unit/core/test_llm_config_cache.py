@@ -0,0 +1,73 @@
+"""
+Unit tests for the resolved LLM configuration cache.
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.core.llm_config_cache import LLMConfigCache, llm_config_cache, invalidate_llm_config_cache
+
+
+class TestLLMConfigCache:
+    """Test cases for LLMConfigCache."""
+
+    def test_get_returns_copy_of_cached_value(self):
+        cache = LLMConfigCache(ttl=60)
+        key = ("litellm", "model-a", None)
+        cache.set(key, {"model": "model-a", "api_key": "secret"})
+
+        first = cache.get(key)
+        first["api_key"] = "changed"
+
+        assert cache.get(key) == {"model": "model-a", "api_key": "secret"}
+        assert cache.get_stats()["hits"] == 2
+
+    def test_expired_entries_are_dropped(self):
+        cache = LLMConfigCache(ttl=60)
+        key = ("litellm", "model-a", None)
+        with patch("src.core.llm_config_cache.time.monotonic", return_value=1000.0):
+            cache.set(key, {"model": "model-a"})
+        with patch("src.core.llm_config_cache.time.monotonic", return_value=1061.0):
+            assert cache.get(key) is None
+        assert cache.get_stats()["size"] == 0
+
+    def test_zero_ttl_disables_cache(self):
+        cache = LLMConfigCache(ttl=0)
+        key = ("litellm", "model-a", None)
+        cache.set(key, {"model": "model-a"})
+
+        assert cache.get(key) is None
+
+    def test_invalidate_single_model(self):
+        cache = LLMConfigCache(ttl=60)
+        cache.set(("litellm", "model-a", None), {"model": "a"})
+        cache.set(("crewai", "model-a", "group-1"), {"model": "a"})
+        cache.set(("litellm", "model-b", None), {"model": "b"})
+
+        cache.invalidate("model-a")
+
+        assert cache.get(("litellm", "model-a", None)) is None
+        assert cache.get(("crewai", "model-a", "group-1")) is None
+        assert cache.get(("litellm", "model-b", None)) == {"model": "b"}
+
+    def test_invalidate_all(self):
+        cache = LLMConfigCache(ttl=60)
+        cache.set(("litellm", "model-a", None), {"model": "a"})
+        cache.set(("litellm", "model-b", None), {"model": "b"})
+
+        cache.invalidate()
+
+        assert cache.get_stats()["size"] == 0
+
+    def test_make_key_includes_group(self):
+        group_context = MagicMock(primary_group_id="group-1")
+        with patch("src.core.llm_config_cache.UserContext.get_group_context", return_value=group_context):
+            assert LLMConfigCache.make_key("litellm", "model-a") == ("litellm", "model-a", "group-1")
+        with patch("src.core.llm_config_cache.UserContext.get_group_context", return_value=None):
+            assert LLMConfigCache.make_key("litellm", "model-a") == ("litellm", "model-a", None)
+
+    def test_module_level_invalidation(self):
+        llm_config_cache.set(("litellm", "model-a", None), {"model": "a"})
+
+        invalidate_llm_config_cache()
+
+        assert llm_config_cache.get(("litellm", "model-a", None)) is None
@@ -360,6 +360,46 @@ class TestComplete100PercentCoverage:
                     assert result["model"] == "gpt-3.5-turbo"
                     assert result["api_key"] == "test-api-key"
 
+    @pytest.mark.asyncio
+    async def test_configure_litellm_uses_config_cache(self):
+        """Test that a second configure_litellm call is served from the cache."""
+        mock_config = {"provider": ModelProvider.OPENAI, "name": "gpt-4o"}
+        
+        with patch('src.core.llm_manager.UnitOfWork'):
+            with patch('src.core.llm_manager.ModelConfigService.from_unit_of_work') as mock_service:
+                with patch('src.core.llm_manager.ApiKeysService.get_provider_api_key') as mock_api_keys:
+                    mock_service.return_value.get_model_config = AsyncMock(return_value=mock_config)
+                    mock_api_keys.return_value = "test-api-key"
+                    
+                    first = await LLMManager.configure_litellm("cached-model")
+                    second = await LLMManager.configure_litellm("cached-model")
+                    assert first == second
+                    assert mock_service.return_value.get_model_config.await_count == 1
+                    assert mock_api_keys.await_count == 1
+                    
+                    # Invalidation forces a fresh lookup
+                    LLMManager.invalidate_config_cache("cached-model")
+                    await LLMManager.configure_litellm("cached-model")
+                    assert mock_service.return_value.get_model_config.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_configure_crewai_llm_uses_config_cache(self):
+        """Test that configure_crewai_llm caches parameters but builds a new LLM each call."""
+        mock_config = {"provider": ModelProvider.OPENAI, "name": "gpt-4o"}
+        
+        with patch('src.core.llm_manager.UnitOfWork'):
+            with patch('src.core.llm_manager.ModelConfigService.from_unit_of_work') as mock_service:
+                with patch('src.core.llm_manager.ApiKeysService.get_provider_api_key') as mock_api_keys:
+                    with patch('src.core.llm_manager.LLM') as mock_llm_class:
+                        mock_service.return_value.get_model_config = AsyncMock(return_value=mock_config)
+                        mock_api_keys.return_value = "test-api-key"
+                        
+                        await LLMManager.configure_crewai_llm("cached-model")
+                        await LLMManager.configure_crewai_llm("cached-model")
+                        assert mock_service.return_value.get_model_config.await_count == 1
+                        assert mock_llm_class.call_count == 2
+                        assert mock_llm_class.call_args.kwargs["api_key"] == "test-api-key"
+
     @pytest.mark.asyncio
     async def test_configure_litellm_anthropic(self):
         """Test configure_litellm for Anthropic provider."""
@@ -887,7 +927,7 @@ class TestComplete100PercentCoverage:
             success_response = AsyncContextResponse(status=200, json_data={"data": [{"embedding": [0.1, 0.2]}]})
             session = AsyncContextSession(success_response)
             
-            with patch("aiohttp.ClientSession") as mock_session_class:
+            with patch("src.services.databricks_embedding_service.databricks_http_pool.get_session") as mock_session_class:
                 mock_session_class.return_value = session
                 
                 with patch.dict(os.environ, {"DATABRICKS_HOST": "https://workspace.databricks.com"}):
@@ -902,7 +942,7 @@ class TestComplete100PercentCoverage:
         embedder_config = {"provider": "databricks", "config": {"model": "test-embedding"}}
         
         with patch("src.core.llm_manager.ApiKeysService.get_provider_api_key") as mock_api_keys:
-            with patch("aiohttp.ClientSession") as mock_session_class:
+            with patch("src.services.databricks_embedding_service.databricks_http_pool.get_session") as mock_session_class:
                 mock_api_keys.return_value = "test-token"
                 
                 success_response = AsyncContextResponse(status=200, json_data={"data": [{"embedding": [0.3, 0.4]}]})
@@ -928,7 +968,7 @@ class TestComplete100PercentCoverage:
         embedder_config = {"provider": "databricks", "config": {"model": "test-embedding-model"}}
         
         with patch("src.core.llm_manager.ApiKeysService.get_provider_api_key") as mock_api_keys:
-            with patch("aiohttp.ClientSession") as mock_session_class:
+            with patch("src.services.databricks_embedding_service.databricks_http_pool.get_session") as mock_session_class:
                 mock_api_keys.return_value = "databricks-token"
                 mock_session_class.return_value = session
                 
@@ -951,7 +991,7 @@ class TestComplete100PercentCoverage:
         embedder_config = {"provider": "databricks", "config": {"model": "test-embedding-model"}}
         
         with patch("src.core.llm_manager.ApiKeysService.get_provider_api_key") as mock_api_keys:
-            with patch("aiohttp.ClientSession") as mock_session_class:
+            with patch("src.services.databricks_embedding_service.databricks_http_pool.get_session") as mock_session_class:
                 mock_api_keys.return_value = "databricks-token"
                 mock_session_class.return_value = session
                 
@@ -981,7 +1021,7 @@ class TestComplete100PercentCoverage:
         embedder_config = {"provider": "databricks", "config": {"model": "test-embedding-model"}}
         
         with patch("src.core.llm_manager.ApiKeysService.get_provider_api_key") as mock_api_keys:
-            with patch("aiohttp.ClientSession") as mock_session_class:
+            with patch("src.services.databricks_embedding_service.databricks_http_pool.get_session") as mock_session_class:
                 mock_api_keys.return_value = "test-token"
                 mock_session_class.side_effect = Exception("Connection error")
                 
@@ -1060,7 +1100,7 @@ class TestComplete100PercentCoverage:
         
         with patch('src.core.llm_manager.ApiKeysService.get_provider_api_key') as mock_api_keys:
             with patch.dict(os.environ, {"DATABRICKS_HOST": "https://workspace.databricks.com"}):
-                with patch('aiohttp.ClientSession') as mock_session_class:
+                with patch("src.services.databricks_embedding_service.databricks_http_pool.get_session") as mock_session_class:
                     mock_api_keys.return_value = "test-key"
                     
                     success_response = AsyncContextResponse(status=200, json_data={"data": [{"embedding": [0.4, 0.5, 0.6]}]})
@@ -1077,7 +1117,7 @@ class TestComplete100PercentCoverage:
         """Test embedding data extraction - line 814."""
         with patch('src.core.llm_manager.ApiKeysService.get_provider_api_key') as mock_api_keys:
             with patch.dict(os.environ, {"DATABRICKS_HOST": "https://workspace.databricks.com"}):
-                with patch('aiohttp.ClientSession') as mock_session_class:
+                with patch("src.services.databricks_embedding_service.databricks_http_pool.get_session") as mock_session_class:
                     mock_api_keys.return_value = "test-key"
                     
                     # Create response with multiple embeddings
@@ -1382,7 +1422,7 @@ class TestComplete100PercentCoverage:
         with patch("src.core.llm_manager.UnitOfWork") as mock_uow:
             with patch("src.services.databricks_service.DatabricksService.from_unit_of_work") as mock_db_service:
                 with patch("src.core.llm_manager.ApiKeysService.get_provider_api_key") as mock_api_keys:
-                    with patch("aiohttp.ClientSession") as mock_session_class:
+                    with patch("src.services.databricks_embedding_service.databricks_http_pool.get_session") as mock_session_class:
                         mock_uow.return_value = create_mock_uow()
                         
                         # Mock database config with workspace URL
@@ -1485,7 +1525,7 @@ class TestComplete100PercentCoverage:
                 with patch('src.core.llm_manager.logger.warning') as mock_warning:
                     mock_api_keys.return_value = "test-token"
                     
-                    with patch("aiohttp.ClientSession") as mock_session_class:
+                    with patch("src.services.databricks_embedding_service.databricks_http_pool.get_session") as mock_session_class:
                         success_response = AsyncContextResponse(status=200, json_data={"data": [{"embedding": [0.3, 0.4]}]})
                         session = AsyncContextSession(success_response)
                         mock_session_class.return_value = session
@@ -1523,7 +1563,7 @@ class TestComplete100PercentCoverage:
                 pass
         
         with patch("src.core.llm_manager.ApiKeysService.get_provider_api_key") as mock_api_keys:
-            with patch("aiohttp.ClientSession") as mock_session_class:
+            with patch("src.services.databricks_embedding_service.databricks_http_pool.get_session") as mock_session_class:
                 mock_api_keys.return_value = "test-token"
                 mock_session_class.return_value = BadSession()
                 
@@ -1829,7 +1869,7 @@ class TestComplete100PercentCoverage:
                 pass
         
         with patch("src.core.llm_manager.ApiKeysService.get_provider_api_key") as mock_api_keys:
-            with patch("aiohttp.ClientSession") as mock_session_class:
+            with patch("src.services.databricks_embedding_service.databricks_http_pool.get_session") as mock_session_class:
                 mock_api_keys.return_value = "test-token"
                 mock_session_class.return_value = JsonErrorSession()
                 
@@ -2038,7 +2078,7 @@ class TestComplete100PercentCoverage:
                 pass
         
         with patch("src.core.llm_manager.ApiKeysService.get_provider_api_key") as mock_api_keys:
-            with patch("aiohttp.ClientSession") as mock_session_class:
+            with patch("src.services.databricks_embedding_service.databricks_http_pool.get_session") as mock_session_class:
                 mock_api_keys.return_value = "test-token"
                 mock_session_class.return_value = JsonParseErrorSession()
                 
@@ -2116,7 +2156,7 @@ class TestComplete100PercentCoverage:
                 }
                 
                 with patch('src.core.llm_manager.ApiKeysService.get_provider_api_key') as mock_api_keys:
-                    with patch('aiohttp.ClientSession', NoEmbeddingDataSession):
+                    with patch("src.services.databricks_embedding_service.databricks_http_pool.get_session", return_value=NoEmbeddingDataSession()):
                         mock_api_keys.return_value = "test-token"
                         
                         if 'src.utils.databricks_auth' in sys.modules:
@@ -0,0 +1,121 @@
+"""
+Unit tests for the prompt template cache.
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.core.prompt_template_cache import (
+    PromptTemplateCache,
+    invalidate_prompt_template_cache,
+    prompt_template_cache,
+)
+
+
+class TestPromptTemplateCache:
+    """Test cases for PromptTemplateCache."""
+
+    @pytest.mark.asyncio
+    async def test_template_loaded_once(self):
+        cache = PromptTemplateCache(ttl=60)
+        loader = AsyncMock(return_value="You generate agents")
+
+        assert await cache.get("generate_agent", loader) == "You generate agents"
+        assert await cache.get("generate_agent", loader) == "You generate agents"
+
+        loader.assert_awaited_once_with("generate_agent")
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_templates_are_cached(self):
+        cache = PromptTemplateCache(ttl=60)
+        loader = AsyncMock(return_value=None)
+
+        assert await cache.get("unknown", loader) is None
+        assert await cache.get("unknown", loader) is None
+
+        loader.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_loader_errors_are_not_cached(self):
+        cache = PromptTemplateCache(ttl=60)
+        loader = AsyncMock(side_effect=[Exception("Database error"), "content"])
+
+        with pytest.raises(Exception, match="Database error"):
+            await cache.get("generate_task", loader)
+
+        assert await cache.get("generate_task", loader) == "content"
+
+    @pytest.mark.asyncio
+    async def test_expired_template_is_reloaded(self):
+        cache = PromptTemplateCache(ttl=60)
+        loader = AsyncMock(side_effect=["old", "new"])
+
+        with patch("src.core.prompt_template_cache.time.monotonic", return_value=1000.0):
+            await cache.get("generate_crew", loader)
+        with patch("src.core.prompt_template_cache.time.monotonic", return_value=1061.0):
+            assert await cache.get("generate_crew", loader) == "new"
+
+    @pytest.mark.asyncio
+    async def test_invalidation_bumps_version(self):
+        cache = PromptTemplateCache(ttl=60)
+        loader = AsyncMock(side_effect=["old", "new"])
+        await cache.get("generate_crew", loader)
+
+        cache.invalidate()
+
+        assert cache.version == 1
+        assert await cache.get("generate_crew", loader) == "new"
+
+    @pytest.mark.asyncio
+    async def test_load_in_flight_during_invalidation_is_not_stored(self):
+        cache = PromptTemplateCache(ttl=60)
+
+        async def stale_loader(name):
+            cache.invalidate()
+            return "stale"
+
+        assert await cache.get("detect_intent", stale_loader) == "stale"
+        assert await cache.get("detect_intent", AsyncMock(return_value="fresh")) == "fresh"
+
+    @pytest.mark.asyncio
+    async def test_warm_replaces_cached_templates(self):
+        cache = PromptTemplateCache(ttl=60)
+        await cache.get("generate_agent", AsyncMock(return_value="old"))
+
+        count = await cache.warm(AsyncMock(return_value={"generate_agent": "new", "generate_task": "task"}))
+
+        loader = AsyncMock()
+        assert count == 2
+        assert await cache.get("generate_agent", loader) == "new"
+        assert await cache.get("generate_task", loader) == "task"
+        loader.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_warm_interrupted_by_invalidation_stores_nothing(self):
+        cache = PromptTemplateCache(ttl=60)
+
+        async def loader():
+            cache.invalidate()
+            return {"generate_agent": "stale"}
+
+        assert await cache.warm(loader) == 0
+        assert cache.get_stats()["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_cache(self):
+        cache = PromptTemplateCache(ttl=0)
+        loader = AsyncMock(return_value="content")
+
+        await cache.get("generate_agent", loader)
+        await cache.get("generate_agent", loader)
+
+        assert loader.await_count == 2
+        assert await cache.warm(AsyncMock(return_value={"generate_agent": "content"})) == 0
+
+    @pytest.mark.asyncio
+    async def test_module_level_invalidation(self):
+        await prompt_template_cache.get("generate_agent", AsyncMock(return_value="content"))
+
+        invalidate_prompt_template_cache()
+
+        assert prompt_template_cache.get_stats()["size"] == 0
@@ -0,0 +1,74 @@
+"""
+Unit tests for the schedule next-run heap.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.core.schedule_heap import ScheduleHeap
+
+BASE = datetime(2025, 1, 1, 9, 0)
+
+
+class TestScheduleHeap:
+    """Test cases for ScheduleHeap."""
+
+    def test_pop_due_returns_schedules_in_time_order(self):
+        heap = ScheduleHeap()
+        heap.reset([(1, BASE + timedelta(minutes=2)), (2, BASE), (3, BASE + timedelta(hours=1)), (4, None)])
+
+        assert len(heap) == 3
+        assert heap.pop_due(BASE + timedelta(minutes=5)) == [(2, BASE), (1, BASE + timedelta(minutes=2))]
+        assert heap.peek() == BASE + timedelta(hours=1)
+
+    def test_update_replaces_the_previous_time(self):
+        heap = ScheduleHeap()
+        heap.update(1, BASE)
+        heap.update(1, BASE + timedelta(hours=1))
+
+        assert heap.pop_due(BASE + timedelta(minutes=30)) == []
+        assert heap.peek() == BASE + timedelta(hours=1)
+
+    def test_inactive_and_removed_schedules_are_not_due(self):
+        heap = ScheduleHeap()
+        heap.update(1, BASE)
+        heap.update(2, BASE)
+        heap.update(1, BASE, is_active=False)
+        heap.remove(2)
+
+        assert heap.peek() is None
+        assert heap.pop_due(BASE + timedelta(days=1)) == []
+
+    def test_aware_times_are_stored_as_naive_utc(self):
+        heap = ScheduleHeap()
+        heap.update(1, datetime(2025, 1, 1, 10, 0, tzinfo=timezone(timedelta(hours=1))))
+
+        assert heap.peek() == BASE
+        assert heap.pop_due(BASE.replace(tzinfo=timezone.utc)) == [(1, BASE)]
+
+    def test_replaced_entries_are_compacted(self):
+        heap = ScheduleHeap()
+        for minute in range(200):
+            heap.update(1, BASE + timedelta(minutes=minute))
+
+        stats = heap.get_stats()
+        assert stats["schedules"] == 1
+        assert stats["heap_entries"] <= 66
+        assert stats["next_run_at"] == BASE + timedelta(minutes=199)
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out_without_changes(self):
+        heap = ScheduleHeap()
+
+        assert await heap.wait(0.01) is False
+
+    @pytest.mark.asyncio
+    async def test_update_wakes_the_waiting_loop(self):
+        heap = ScheduleHeap()
+        waiter = asyncio.create_task(heap.wait(5))
+        await asyncio.sleep(0)
+
+        heap.update(1, BASE)
+
+        assert await asyncio.wait_for(waiter, 1) is True
@@ -0,0 +1,124 @@
+"""
+Unit tests for the tool catalog and API key cache.
+"""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.core.tool_catalog_cache import (
+    ToolCatalogCache,
+    invalidate_api_key_cache,
+    invalidate_tool_catalog_cache,
+    tool_catalog_cache,
+)
+
+
+class TestToolCatalogCache:
+    """Test cases for ToolCatalogCache."""
+
+    @pytest.mark.asyncio
+    async def test_tools_loaded_once(self):
+        cache = ToolCatalogCache(ttl=60)
+        loader = AsyncMock(return_value=["tool-a", "tool-b"])
+
+        assert await cache.get_tools(loader) == ["tool-a", "tool-b"]
+        assert await cache.get_tools(loader) == ["tool-a", "tool-b"]
+
+        loader.assert_awaited_once()
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_tools_are_reloaded(self):
+        cache = ToolCatalogCache(ttl=60)
+        loader = AsyncMock(side_effect=[["old"], ["new"]])
+
+        with patch("src.core.tool_catalog_cache.time.monotonic", return_value=1000.0):
+            await cache.get_tools(loader)
+        with patch("src.core.tool_catalog_cache.time.monotonic", return_value=1061.0):
+            assert await cache.get_tools(loader) == ["new"]
+
+    @pytest.mark.asyncio
+    async def test_invalidation_bumps_version(self):
+        cache = ToolCatalogCache(ttl=60)
+        loader = AsyncMock(side_effect=[["old"], ["new"]])
+        await cache.get_tools(loader)
+
+        cache.invalidate_tools()
+
+        assert cache.tools_version == 1
+        assert await cache.get_tools(loader) == ["new"]
+
+    @pytest.mark.asyncio
+    async def test_load_in_flight_during_invalidation_is_not_stored(self):
+        cache = ToolCatalogCache(ttl=60)
+
+        async def stale_loader():
+            cache.invalidate_tools()
+            return ["stale"]
+
+        assert await cache.get_tools(stale_loader) == ["stale"]
+        assert await cache.get_tools(AsyncMock(return_value=["fresh"])) == ["fresh"]
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_cache(self):
+        cache = ToolCatalogCache(ttl=0)
+        loader = AsyncMock(return_value=["tool"])
+
+        await cache.get_tools(loader)
+        await cache.get_tools(loader)
+
+        assert loader.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_api_keys_batched_and_cached(self):
+        cache = ToolCatalogCache(ttl=60)
+        loader = AsyncMock(return_value={"A": "key-a"})
+
+        assert await cache.get_api_keys(["A", "B"], loader) == {"A": "key-a", "B": None}
+        assert await cache.get_api_keys(["A", "B"], loader) == {"A": "key-a", "B": None}
+
+        # Missing keys are cached too, so both lookups cost one loader call
+        loader.assert_awaited_once_with(["A", "B"])
+
+    @pytest.mark.asyncio
+    async def test_only_missing_api_keys_are_loaded(self):
+        cache = ToolCatalogCache(ttl=60)
+        await cache.get_api_keys(["A"], AsyncMock(return_value={"A": "key-a"}))
+        loader = AsyncMock(return_value={"C": "key-c"})
+
+        assert await cache.get_api_keys(["A", "C"], loader) == {"A": "key-a", "C": "key-c"}
+        loader.assert_awaited_once_with(["C"])
+
+    @pytest.mark.asyncio
+    async def test_api_key_invalidation(self):
+        cache = ToolCatalogCache(ttl=60)
+        await cache.get_api_keys(["A"], AsyncMock(return_value={"A": "old"}))
+
+        cache.invalidate_api_keys()
+
+        assert await cache.get_api_keys(["A"], AsyncMock(return_value={"A": "new"})) == {"A": "new"}
+        assert cache.api_keys_version == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_cached_catalog(self):
+        cache = ToolCatalogCache(ttl=60)
+        loader = AsyncMock(return_value=["tool"])
+        await cache.get_tools(loader)
+
+        results = await asyncio.gather(*(cache.get_tools(loader) for _ in range(20)))
+
+        assert all(result == ["tool"] for result in results)
+        loader.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_module_level_invalidation(self):
+        await tool_catalog_cache.get_tools(AsyncMock(return_value=["tool"]))
+        await tool_catalog_cache.get_api_keys(["A"], AsyncMock(return_value={"A": "key"}))
+
+        invalidate_tool_catalog_cache()
+        invalidate_api_key_cache()
+
+        stats = tool_catalog_cache.get_stats()
+        assert stats["tools"] == 0
+        assert stats["api_keys"] == 0
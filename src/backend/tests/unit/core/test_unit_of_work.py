@@ -66,6 +66,23 @@ class TestUnitOfWork:
                                                     assert uow.tool_repository is not None
                                                     assert uow.api_key_repository is not None
     
+    @pytest.mark.asyncio
+    async def test_aenter_custom_session_factory(self):
+        """Test that a given session factory is used instead of the default one."""
+        mock_session = AsyncMock()
+        mock_session_context = AsyncMock()
+        mock_session_context.__aenter__ = AsyncMock(return_value=mock_session)
+        custom_factory = MagicMock(return_value=mock_session_context)
+        default_factory = MagicMock()
+        
+        with patch('src.db.session.async_session_factory', default_factory):
+            uow = UnitOfWork(session_factory=custom_factory)
+            await uow.__aenter__()
+        
+        custom_factory.assert_called_once()
+        default_factory.assert_not_called()
+        assert uow._session == mock_session_context
+    
     @pytest.mark.asyncio
     async def test_aexit_success_commit(self):
         """Test successful async context exit with commit."""
@@ -0,0 +1,183 @@
+"""Unit tests for the persistent MCP worker pool."""
+
+import asyncio
+import sys
+import types
+from contextlib import asynccontextmanager
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.engines.common.mcp_worker_pool import MCPWorkerPool, _MCPServerWorker, make_server_key
+
+SERVER_PARAMS = {'url': 'https://test.mcp.server/api/mcp/', 'auth_type': 'api_key'}
+
+
+class FakeClientSession:
+    """Stands in for mcp.ClientSession, recording calls and their concurrency."""
+
+    instances = []
+
+    def __init__(self, read_stream, write_stream):
+        self.active = 0
+        self.max_active = 0
+        self.closed = False
+        self.call_error = None
+        self.ping_error = None
+        FakeClientSession.instances.append(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+
+    async def initialize(self):
+        pass
+
+    async def call_tool(self, tool_name, arguments):
+        if self.call_error:
+            raise self.call_error
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return f"{tool_name}:{arguments}"
+
+    async def send_ping(self):
+        if self.ping_error:
+            raise self.ping_error
+
+
+@asynccontextmanager
+async def fake_connect(url, headers=None):
+    yield None, None, None
+
+
+@pytest.fixture
+def fake_mcp():
+    """Replace the MCP client library and authentication."""
+    FakeClientSession.instances = []
+    mcp = types.ModuleType('mcp')
+    mcp.ClientSession = FakeClientSession
+    streamable_http = types.ModuleType('mcp.client.streamable_http')
+    streamable_http.streamablehttp_client = fake_connect
+    modules = {'mcp': mcp, 'mcp.client': types.ModuleType('mcp.client'), 'mcp.client.streamable_http': streamable_http}
+    with patch.dict(sys.modules, modules):
+        with patch('src.engines.common.mcp_adapter.MCPAdapter._get_authentication_headers',
+                   new_callable=AsyncMock, return_value={'Authorization': 'Bearer test-token'}):
+            yield FakeClientSession
+
+
+class TestMakeServerKey:
+    """Test suite for make_server_key."""
+
+    def test_http_server_key(self):
+        assert make_server_key(SERVER_PARAMS) == 'https://test.mcp.server/api/mcp/_api_key'
+
+    def test_stdio_server_key(self):
+        assert make_server_key({'transport': 'stdio', 'command': ['uvx', 'server']}) == 'stdio_uvx server'
+
+
+class TestMCPServerWorker:
+    """Test suite for the per-server worker."""
+
+    @pytest.mark.asyncio
+    async def test_session_is_reused(self, fake_mcp):
+        worker = _MCPServerWorker('key', SERVER_PARAMS)
+
+        for _ in range(3):
+            assert await worker.call_tool('echo', {'a': 1}) == "echo:{'a': 1}"
+
+        assert len(fake_mcp.instances) == 1
+        assert worker.stats['connects'] == 1
+        await worker.close()
+        assert fake_mcp.instances[0].closed
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_limited(self, fake_mcp):
+        with patch('src.engines.common.mcp_worker_pool.settings.MCP_WORKER_MAX_CONCURRENCY', 2):
+            worker = _MCPServerWorker('key', SERVER_PARAMS)
+
+        await asyncio.gather(*(worker.call_tool('echo', {'i': i}) for i in range(6)))
+
+        assert fake_mcp.instances[0].max_active == 2
+        await worker.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_call_reconnects_on_next_call(self, fake_mcp):
+        worker = _MCPServerWorker('key', SERVER_PARAMS)
+        await worker.call_tool('echo', {})
+        fake_mcp.instances[0].call_error = ConnectionError("stream closed")
+
+        with pytest.raises(ConnectionError):
+            await worker.call_tool('echo', {})
+        assert not worker.connected
+
+        assert await worker.call_tool('echo', {}) == "echo:{}"
+        assert len(fake_mcp.instances) == 2
+        assert worker.stats['failures'] == 1
+        await worker.close()
+
+    @pytest.mark.asyncio
+    async def test_connect_error_is_raised(self, fake_mcp):
+        worker = _MCPServerWorker('key', SERVER_PARAMS)
+
+        with patch('src.engines.common.mcp_adapter.MCPAdapter._get_authentication_headers',
+                   new_callable=AsyncMock, return_value=None):
+            with pytest.raises(ValueError, match="No authentication headers"):
+                await worker.call_tool('echo', {})
+
+        assert not worker.connected
+
+    @pytest.mark.asyncio
+    async def test_failed_health_check_closes_session(self, fake_mcp):
+        worker = _MCPServerWorker('key', SERVER_PARAMS)
+        await worker.call_tool('echo', {})
+        fake_mcp.instances[0].ping_error = ConnectionError("no pong")
+
+        assert await worker.check_health() is False
+        assert not worker.connected
+        assert worker.stats['health_check_failures'] == 1
+
+    @pytest.mark.asyncio
+    async def test_idle_session_is_closed(self, fake_mcp):
+        worker = _MCPServerWorker('key', SERVER_PARAMS)
+        await worker.call_tool('echo', {})
+
+        with patch('src.engines.common.mcp_worker_pool.settings.MCP_WORKER_IDLE_TIMEOUT', -1):
+            assert await worker.check_health() is True
+
+        assert not worker.connected
+        assert fake_mcp.instances[0].closed
+
+
+class TestMCPWorkerPool:
+    """Test suite for MCPWorkerPool."""
+
+    def test_call_tool_from_sync_code(self, fake_mcp):
+        pool = MCPWorkerPool("test-mcp-worker-loop")
+        try:
+            assert pool.call_tool(SERVER_PARAMS, 'echo', {'a': 1}) == "echo:{'a': 1}"
+            assert pool.call_tool(SERVER_PARAMS, 'echo', {'a': 2}) == "echo:{'a': 2}"
+
+            stats = pool.get_stats()[make_server_key(SERVER_PARAMS)]
+            assert stats['calls'] == 2
+            assert stats['connects'] == 1
+            assert stats['connected']
+        finally:
+            pool.shutdown()
+
+        assert fake_mcp.instances[0].closed
+
+    @pytest.mark.asyncio
+    async def test_call_tool_from_another_loop(self, fake_mcp):
+        pool = MCPWorkerPool("test-mcp-worker-loop")
+        try:
+            results = await asyncio.gather(*(pool.acall_tool(SERVER_PARAMS, 'echo', {'i': i}) for i in range(3)))
+            assert results == ["echo:{'i': 0}", "echo:{'i': 1}", "echo:{'i': 2}"]
+        finally:
+            await asyncio.to_thread(pool.shutdown)
+
+    def test_shutdown_without_calls_is_noop(self):
+        MCPWorkerPool("test-mcp-worker-loop").shutdown()
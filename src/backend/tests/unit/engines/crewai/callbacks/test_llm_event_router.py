@@ -8,13 +8,16 @@ to appropriate executions based on agent context.
 import pytest
 from unittest.mock import Mock, patch, MagicMock, call
 from datetime import datetime, timezone
+import contextvars
 import threading
 
 from src.engines.crewai.callbacks.llm_event_router import (
     LLMEventRouter,
+    _llm_event_execution,
     register_execution_for_llm_events,
     unregister_execution_from_llm_events
 )
+from src.engines.crewai.callbacks.trace_capture import start_trace_capture
 from src.utils.user_context import GroupContext
 
 
@@ -26,6 +29,9 @@ class TestLLMEventRouter:
         LLMEventRouter._instance = None
         LLMEventRouter._initialized = False
         LLMEventRouter._active_executions = {}
+        LLMEventRouter._agent_index = {}
+        LLMEventRouter._role_index = {}
+        _llm_event_execution.set(None)
     
     def test_singleton_pattern(self):
         """Test that LLMEventRouter follows singleton pattern."""
@@ -190,7 +196,7 @@ class TestLLMEventRouter:
         mock_queue = Mock()
         
         # Add an execution
-        LLMEventRouter._active_executions["exec127"] = {
+        LLMEventRouter._replace_executions({"exec127": {
             'agents': {"researcher"},
             'group_context': GroupContext(
                 group_ids=["group123"],
@@ -198,7 +204,7 @@ class TestLLMEventRouter:
                 email_domain="example.com"
             ),
             'trace_queue': mock_queue
-        }
+        }})
         
         # Setup event handler capture
         handler_func = None
@@ -245,11 +251,11 @@ class TestLLMEventRouter:
         mock_queue = Mock()
         
         # Add an execution
-        LLMEventRouter._active_executions["exec128"] = {
+        LLMEventRouter._replace_executions({"exec128": {
             'agents': {"researcher"},
             'group_context': None,
             'trace_queue': mock_queue
-        }
+        }})
         
         # Setup event handler capture
         handler_func = None
@@ -276,6 +282,36 @@ class TestLLMEventRouter:
         # Verify trace was NOT enqueued
         mock_queue.put_nowait.assert_not_called()
     
+    @patch('src.engines.crewai.callbacks.llm_event_router.crewai_event_bus')
+    def test_llm_event_handling_trace_level_off(self, mock_event_bus):
+        """Test that LLM calls are not traced for executions with trace capture off."""
+        mock_queue = Mock()
+        LLMEventRouter._replace_executions({"exec130": {
+            'agents': {"researcher"},
+            'group_context': None,
+            'trace_queue': mock_queue
+        }})
+        start_trace_capture("exec130", "off")
+        
+        handler_func = None
+        def capture_handler(event_class):
+            def decorator(func):
+                nonlocal handler_func
+                handler_func = func
+                return func
+            return decorator
+        
+        mock_event_bus.on = capture_handler
+        router = LLMEventRouter()
+        router._setup_global_handler()
+        
+        mock_event = Mock()
+        mock_event.agent_role = "researcher"
+        mock_event.response = "LLM response text"
+        handler_func(None, mock_event)
+        
+        mock_queue.put_nowait.assert_not_called()
+    
     @patch('src.engines.crewai.callbacks.llm_event_router.logger')
     @patch('src.engines.crewai.callbacks.llm_event_router.crewai_event_bus')
     def test_llm_event_handling_error(self, mock_event_bus, mock_logger):
@@ -284,11 +320,11 @@ class TestLLMEventRouter:
         mock_queue.put_nowait.side_effect = Exception("Queue error")
         
         # Add an execution
-        LLMEventRouter._active_executions["exec129"] = {
+        LLMEventRouter._replace_executions({"exec129": {
             'agents': {"researcher"},
             'group_context': None,
             'trace_queue': mock_queue
-        }
+        }})
         
         # Setup event handler capture
         handler_func = None
@@ -317,6 +353,95 @@ class TestLLMEventRouter:
         mock_logger.error.assert_called()
 
 
+class TestLLMEventRouting:
+    """Test suite for attributing LLM events to executions."""
+    
+    def setup_method(self):
+        """Reset singleton state before each test."""
+        LLMEventRouter._instance = None
+        LLMEventRouter._initialized = True
+        LLMEventRouter._active_executions = {}
+        LLMEventRouter._agent_index = {}
+        LLMEventRouter._role_index = {}
+        _llm_event_execution.set(None)
+        self.trace_queue_patch = patch('src.engines.crewai.callbacks.llm_event_router.get_trace_queue', return_value=Mock())
+        self.trace_queue_patch.start()
+    
+    def teardown_method(self):
+        self.trace_queue_patch.stop()
+    
+    @staticmethod
+    def make_crew(*agents):
+        crew = Mock()
+        crew.agents = [Mock(role=role, id=agent_id) for role, agent_id in agents]
+        return crew
+    
+    @staticmethod
+    def make_event(agent_role, agent_id=None):
+        return Mock(spec=[], agent_role=agent_role, agent_id=agent_id)
+    
+    def register_in_own_context(self, execution_id, crew):
+        """Register like an execution task does, without leaking the context into the test."""
+        context = contextvars.copy_context()
+        context.run(LLMEventRouter.register_execution, execution_id, crew, None)
+        return context
+    
+    def test_shared_role_is_routed_by_agent_id(self):
+        """Test that executions sharing a role name each get their own events."""
+        self.register_in_own_context("exec-a", self.make_crew(("researcher", "agent-a")))
+        self.register_in_own_context("exec-b", self.make_crew(("researcher", "agent-b")))
+        
+        assert LLMEventRouter.resolve_execution(self.make_event("researcher", "agent-b")) == "exec-b"
+        assert LLMEventRouter.resolve_execution(self.make_event("researcher", "agent-a")) == "exec-a"
+    
+    def test_shared_role_is_routed_by_context(self):
+        """Test that events emitted in an execution's context go to that execution."""
+        context_a = self.register_in_own_context("exec-a", self.make_crew(("researcher", "agent-a")))
+        self.register_in_own_context("exec-b", self.make_crew(("researcher", "agent-b")))
+        
+        assert context_a.run(LLMEventRouter.resolve_execution, self.make_event("researcher")) == "exec-a"
+    
+    def test_ambiguous_role_is_dropped(self):
+        """Test that an event that only carries a shared role is not misattributed."""
+        self.register_in_own_context("exec-a", self.make_crew(("researcher", "agent-a")))
+        self.register_in_own_context("exec-b", self.make_crew(("researcher", "agent-b")))
+        
+        assert LLMEventRouter.resolve_execution(self.make_event("researcher")) is None
+    
+    def test_unique_role_is_routed(self):
+        """Test the role fallback when a single execution has the role."""
+        self.register_in_own_context("exec-a", self.make_crew(("researcher", "agent-a")))
+        self.register_in_own_context("exec-b", self.make_crew(("writer", "agent-b")))
+        
+        assert LLMEventRouter.resolve_execution(self.make_event("writer")) == "exec-b"
+    
+    def test_unregister_removes_index_entries(self):
+        """Test that unregistered executions no longer receive events."""
+        context = self.register_in_own_context("exec-a", self.make_crew(("researcher", "agent-a")))
+        LLMEventRouter.unregister_execution("exec-a")
+        
+        assert LLMEventRouter.resolve_execution(self.make_event("researcher", "agent-a")) is None
+        assert context.run(LLMEventRouter.resolve_execution, self.make_event("researcher")) is None
+        assert LLMEventRouter._role_index == {}
+    
+    def test_concurrent_registration(self):
+        """Test that registrations from many threads are all indexed."""
+        threads = [
+            threading.Thread(
+                target=self.register_in_own_context,
+                args=(f"exec-{i}", self.make_crew(("researcher", f"agent-{i}")))
+            )
+            for i in range(50)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert LLMEventRouter.get_active_execution_count() == 50
+        assert LLMEventRouter.resolve_execution(self.make_event("researcher", "agent-17")) == "exec-17"
+
+
 class TestConvenienceFunctions:
     """Test suite for convenience functions."""
     
@@ -325,6 +450,9 @@ class TestConvenienceFunctions:
         LLMEventRouter._instance = None
         LLMEventRouter._initialized = False
         LLMEventRouter._active_executions = {}
+        LLMEventRouter._agent_index = {}
+        LLMEventRouter._role_index = {}
+        _llm_event_execution.set(None)
     
     @patch.object(LLMEventRouter, 'register_execution')
     def test_register_execution_for_llm_events(self, mock_register):
@@ -0,0 +1,134 @@
+"""
+Unit tests for execution trace capture.
+"""
+from unittest.mock import patch
+
+from src.engines.crewai.callbacks.trace_capture import (
+    TraceCapture,
+    capture_trace,
+    clear_trace_captures,
+    end_trace_capture,
+    get_trace_capture,
+    get_trace_capture_stats,
+    start_trace_capture,
+)
+
+
+def make_trace(event_type="agent_execution", output="output", job_id="job-1", timestamp="2025-01-01T00:00:00"):
+    return {
+        "job_id": job_id,
+        "event_source": "Researcher",
+        "event_context": "task",
+        "event_type": event_type,
+        "timestamp": timestamp,
+        "output_content": output,
+        "extra_data": {"agent_role": "Researcher"},
+    }
+
+
+class TestTraceCapture:
+    """Test cases for TraceCapture."""
+
+    def setup_method(self):
+        clear_trace_captures()
+
+    def test_small_traces_pass_unchanged(self):
+        trace = make_trace()
+
+        assert TraceCapture("job-1").prepare(trace) is trace
+
+    def test_large_payload_keeps_head_and_tail(self):
+        capture = TraceCapture("job-1", "full")
+        output = "A" * 3000 + "B" * 3000
+
+        with patch("src.engines.crewai.callbacks.trace_capture.settings") as settings:
+            settings.TRACE_EVENT_MAX_BYTES = 1000
+            settings.TRACE_SUMMARY_MAX_BYTES = 200
+            settings.TRACE_EXECUTION_MAX_BYTES = 10 ** 6
+            settings.TRACE_DEDUP_MIN_BYTES = 10 ** 6
+            captured = capture.prepare(make_trace(output=output))
+
+        assert len(captured["output_content"].encode()) <= 1000
+        assert captured["output_content"].startswith("AAA")
+        assert captured["output_content"].endswith("BBB")
+        assert "[truncated, 6000 bytes in total]" in captured["output_content"]
+        assert captured["extra_data"]["output_truncated"] is True
+        assert captured["extra_data"]["output_size"] == 6000
+        assert captured["extra_data"]["agent_role"] == "Researcher"
+
+    def test_execution_budget_falls_back_to_summaries(self):
+        capture = TraceCapture("job-1", "full")
+
+        with patch("src.engines.crewai.callbacks.trace_capture.settings") as settings:
+            settings.TRACE_EVENT_MAX_BYTES = 1000
+            settings.TRACE_SUMMARY_MAX_BYTES = 100
+            settings.TRACE_EXECUTION_MAX_BYTES = 1500
+            settings.TRACE_DEDUP_MIN_BYTES = 10 ** 6
+            first = capture.prepare(make_trace(output="x" * 900))
+            second = capture.prepare(make_trace(output="y" * 900))
+            third = capture.prepare(make_trace(output="z" * 900))
+
+        assert first["output_content"] == "x" * 900
+        assert second["output_content"] == "y" * 900
+        assert len(third["output_content"].encode()) <= 100
+
+    def test_duplicate_payload_is_replaced_by_a_reference(self):
+        capture = TraceCapture("job-1")
+        output = "same response " * 100
+
+        llm_trace = capture.prepare(make_trace("llm_call", output, timestamp="t1"))
+        step_trace = capture.prepare(make_trace("agent_execution", output, timestamp="t2"))
+
+        assert llm_trace["output_content"] == output
+        assert step_trace["output_content"] == "[same output as the llm_call trace at t1]"
+        assert step_trace["extra_data"]["duplicate_of"] == {"event_type": "llm_call", "timestamp": "t1"}
+        assert capture.get_stats()["deduplicated"] == 1
+
+    def test_task_results_are_never_replaced(self):
+        capture = TraceCapture("job-1")
+        output = "final answer " * 100
+
+        capture.prepare(make_trace("agent_execution", output))
+        task_trace = capture.prepare(make_trace("task_completed", output))
+
+        assert task_trace["output_content"] == output
+
+    def test_summary_level_cuts_payloads(self):
+        capture = TraceCapture("job-1", "summary")
+
+        with patch("src.engines.crewai.callbacks.trace_capture.settings") as settings:
+            settings.TRACE_EVENT_MAX_BYTES = 1000
+            settings.TRACE_SUMMARY_MAX_BYTES = 100
+            settings.TRACE_EXECUTION_MAX_BYTES = 10 ** 6
+            settings.TRACE_DEDUP_MIN_BYTES = 10 ** 6
+            captured = capture.prepare(make_trace(output="x" * 500))
+
+        assert len(captured["output_content"].encode()) <= 100
+
+    def test_off_level_keeps_only_lifecycle_traces(self):
+        capture = TraceCapture("job-1", "off")
+
+        assert capture.prepare(make_trace("llm_call")) is None
+        assert capture.prepare(make_trace("tool_usage")) is None
+        assert capture.prepare(make_trace("task_completed"))["output_content"] == "output"
+        assert capture.get_stats()["skipped"] == 2
+
+    def test_unknown_level_falls_back_to_full(self):
+        assert TraceCapture("job-1", "verbose").level == "full"
+
+    def test_capture_trace_uses_the_execution_level(self):
+        start_trace_capture("job-1", "off")
+
+        assert capture_trace(make_trace("llm_call", job_id="job-1")) is None
+        assert capture_trace(make_trace("llm_call", job_id="job-2")) is not None
+        assert get_trace_capture("job-2").level == "full"
+
+    def test_end_trace_capture_keeps_counters(self):
+        start_trace_capture("job-1")
+        capture_trace(make_trace(job_id="job-1"))
+
+        assert end_trace_capture("job-1")["captured"] == 1
+        assert end_trace_capture("job-1") is None
+        stats = get_trace_capture_stats()
+        assert stats["captured"] == 1
+        assert stats["active_captures"] == 0
@@ -0,0 +1,157 @@
+"""
+Unit tests for the entity relationship graph.
+
+Tests vectorized edge construction in EntityGraph and how
+EntityRelationshipRetriever embeds and caches entity graphs.
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from src.engines.crewai.memory.entity_graph import EntityGraph
+from src.engines.crewai.memory.entity_relationship_retriever import (
+    EntityNode,
+    EntityRelationshipRetriever,
+    clear_entity_graph_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_graph_cache():
+    """Clear cached entity graphs between tests."""
+    yield
+    clear_entity_graph_cache()
+
+
+def _node(name, description="", relationships=None):
+    return EntityNode(
+        name=name,
+        entity_type="person",
+        description=description,
+        agent_id="agent",
+        metadata={},
+        explicit_relationships=relationships or []
+    )
+
+
+class TestEntityGraph:
+    """Test cases for EntityGraph."""
+
+    def test_semantic_edges_above_threshold(self):
+        graph = EntityGraph()
+        graph.upsert(
+            {"A": "the father of B", "B": "a painter", "C": "a city"},
+            {"A": [1.0, 0.0], "B": [0.9, 0.1], "C": [0.0, 1.0]}
+        )
+
+        edges = graph.semantic_edges(["A", "B", "C"])
+
+        assert len(edges) == 1
+        source, target, similarity, relationship_type = edges[0]
+        assert (source, target) == ("A", "B")
+        assert similarity == pytest.approx(0.9939, abs=1e-3)
+        assert relationship_type == "family"
+
+    def test_edges_follow_requested_order(self):
+        graph = EntityGraph()
+        graph.upsert({"A": "x", "B": "y"}, {"A": [1.0, 0.0], "B": [1.0, 0.0]})
+
+        assert [edge[:2] for edge in graph.semantic_edges(["B", "A"])] == [("B", "A")]
+        assert graph.semantic_edges(["A"]) == []
+
+    def test_name_based_edges(self):
+        graph = EntityGraph()
+        graph.upsert(
+            {
+                "John Smith": "works with Acme Corp",
+                "john smith": "",
+                "Acme Corp": "a company",
+                "Other": "unrelated",
+            },
+            {}
+        )
+
+        edges = {(source, target): (strength, kind) for source, target, strength, kind
+                 in graph.name_based_edges(["John Smith", "john smith", "Acme Corp", "Other"])}
+
+        assert edges[("John Smith", "john smith")] == (1.0, "name_based")
+        assert edges[("John Smith", "Acme Corp")] == (0.6, "contextual")
+        assert len(edges) == 2
+
+    def test_upsert_recomputes_changed_entities(self):
+        graph = EntityGraph()
+        graph.upsert({"A": "mentions b", "B": "x"}, {"A": [1.0, 0.0], "B": [1.0, 0.0]})
+        assert graph.semantic_edges(["A", "B"]) and graph.name_based_edges(["A", "B"])
+
+        assert graph.stale_names({"A": "no mention", "B": "x"}) == ["A"]
+        graph.upsert({"A": "no mention"}, {"A": [0.0, 1.0]})
+
+        assert graph.semantic_edges(["A", "B"]) == []
+        assert graph.name_based_edges(["A", "B"]) == []
+
+    def test_remove_drops_edges(self):
+        graph = EntityGraph()
+        graph.upsert({"A": "x", "B": "y"}, {"A": [1.0, 0.0], "B": [1.0, 0.0]})
+
+        graph.remove(["B"])
+
+        assert graph.names() == ["A"]
+        assert graph.semantic_edges(["A", "B"]) == []
+
+    def test_stale_names_retries_missing_embeddings(self):
+        graph = EntityGraph()
+        graph.upsert({"A": "x", "B": ""}, {})
+
+        assert graph.stale_names({"A": "x", "B": ""}) == []
+        assert graph.stale_names({"A": "x", "B": ""}, require_embeddings=True) == ["A"]
+
+
+class TestEntityRelationshipRetrieverGraph:
+    """Test cases for graph building in EntityRelationshipRetriever."""
+
+    @pytest.mark.asyncio
+    async def test_build_edges_embeds_descriptions_in_batches(self):
+        embedder = MagicMock(side_effect=lambda texts: [[1.0, 0.0] for _ in texts])
+        retriever = EntityRelationshipRetriever(None, embedding_function=embedder)
+        retriever._EMBEDDING_BATCH_SIZE = 2
+        retriever.entity_graph = {
+            "A": _node("A", "one", ["B"]),
+            "B": _node("B", "two"),
+            "C": _node("C", "six"),
+        }
+
+        await retriever._build_relationship_edges()
+
+        assert [call.args[0] for call in embedder.call_args_list] == [["one", "two"], ["six"]]
+        kinds = [(edge.source, edge.target, edge.relationship_type) for edge in retriever.relationship_edges]
+        assert kinds[0] == ("A", "B", "explicit")
+        assert kinds[1:] == [("A", "B", "semantic"), ("A", "C", "semantic"), ("B", "C", "semantic")]
+
+    @pytest.mark.asyncio
+    async def test_cached_graph_only_embeds_new_entities(self):
+        from src.engines.crewai.memory import entity_relationship_retriever as module
+
+        embedder = MagicMock(side_effect=lambda texts: [[1.0, 0.0] for _ in texts])
+        key = ("https://workspace", "catalog.schema.entities", "group")
+
+        first = EntityRelationshipRetriever(None, embedding_function=embedder)
+        first._graph = module._get_entity_graph(key)
+        first.entity_graph = {"A": _node("A", "one"), "B": _node("B", "two")}
+        await first._build_relationship_edges()
+
+        second = EntityRelationshipRetriever(None, embedding_function=embedder)
+        second._graph = module._get_entity_graph(key)
+        second.entity_graph = {"A": _node("A", "one"), "C": _node("C", "six")}
+        await second._build_relationship_edges()
+
+        assert embedder.call_args_list[-1].args[0] == ["six"]
+        assert [(edge.source, edge.target) for edge in second.relationship_edges] == [("A", "C")]
+
+    @pytest.mark.asyncio
+    async def test_no_embedding_function_builds_no_semantic_edges(self):
+        retriever = EntityRelationshipRetriever(None)
+        retriever.entity_graph = {"A": _node("A", "one"), "B": _node("B", "two")}
+
+        await retriever._build_relationship_edges()
+
+        assert retriever.relationship_edges == []
+        assert await retriever._compute_embedding("text") is None
@@ -105,6 +105,36 @@ class TestExecutionRunnerCallbackIntegration:
             assert mock_crew.step_callback == mock_step_callback
             assert mock_crew.task_callback == mock_task_callback
     
+    @pytest.mark.asyncio
+    async def test_trace_capture_starts_at_crew_trace_level(self, mock_crew, mock_group_context, running_jobs, sample_config):
+        """Test that the crew's trace level is used for trace capture."""
+        execution_id = "test_execution_123"
+        sample_config["trace_level"] = "summary"
+
+        with patch("src.engines.crewai.callbacks.execution_callback.create_execution_callbacks",
+                   return_value=(MagicMock(), MagicMock())), \
+             patch("src.engines.crewai.callbacks.execution_callback.create_crew_callbacks"), \
+             patch("src.engines.crewai.callbacks.execution_callback.log_crew_initialization"), \
+             patch("src.engines.crewai.callbacks.trace_capture.start_trace_capture") as mock_start_trace_capture, \
+             patch("src.services.execution_status_service.ExecutionStatusService.update_status"), \
+             patch("asyncio.to_thread", return_value="Test result"), \
+             patch("src.services.api_keys_service.ApiKeysService.setup_openai_api_key"), \
+             patch("src.services.api_keys_service.ApiKeysService.setup_anthropic_api_key"), \
+             patch("src.services.api_keys_service.ApiKeysService.setup_gemini_api_key"), \
+             patch("src.engines.crewai.tools.mcp_handler.stop_all_adapters"), \
+             patch("src.engines.crewai.execution_runner.update_execution_status_with_retry"):
+
+            running_jobs[execution_id] = {"config": sample_config}
+            await run_crew(
+                execution_id=execution_id,
+                crew=mock_crew,
+                running_jobs=running_jobs,
+                group_context=mock_group_context,
+                config=sample_config
+            )
+
+            mock_start_trace_capture.assert_called_once_with(execution_id, "summary")
+
     @pytest.mark.asyncio
     async def test_callback_error_handling(self, mock_crew, mock_group_context, running_jobs, sample_config):
         """Test that callback setup errors are handled gracefully."""
@@ -0,0 +1,148 @@
+"""
+Unit tests for the batched trace writer in TraceManager.
+
+Tests non-blocking queue draining, batch flushing through a single bulk
+insert, the per-row fallback and the writer metrics.
+"""
+import asyncio
+import queue
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.engines.crewai.trace_management import TraceManager
+
+
+def _trace(job_id="job-1", event_type="llm_call", **extra):
+    data = {
+        "job_id": job_id,
+        "event_type": event_type,
+        "event_source": "Agent",
+        "event_context": "ctx",
+        "output_content": "out",
+    }
+    data.update(extra)
+    return data
+
+
+class TestDrainQueue:
+    """Test cases for TraceManager._drain_queue."""
+
+    def test_drain_respects_max_items(self):
+        q = queue.Queue()
+        for i in range(5):
+            q.put_nowait(_trace(job_id=f"job-{i}"))
+
+        items = TraceManager._drain_queue(q, 3)
+
+        assert len(items) == 3
+        assert q.qsize() == 2
+
+    def test_drain_skips_sentinels_and_returns_on_empty(self):
+        q = queue.Queue()
+        q.put_nowait(None)
+        q.put_nowait(_trace())
+
+        items = TraceManager._drain_queue(q, 10)
+
+        assert items == [_trace()]
+        assert q.qsize() == 0
+
+
+class TestFlushBatch:
+    """Test cases for TraceManager._flush_batch."""
+
+    @pytest.mark.asyncio
+    async def test_flush_uses_single_bulk_insert(self):
+        batch = [
+            _trace(),
+            _trace(event_type="tool_usage", group_id="g1"),
+            _trace(event_type="debug_info"),
+            _trace(job_id="unknown"),
+        ]
+        with patch("src.services.execution_trace_service.ExecutionTraceService.create_traces_batch",
+                   new_callable=AsyncMock) as mock_batch, \
+             patch("src.services.execution_trace_service.ExecutionTraceService.create_trace",
+                   new_callable=AsyncMock) as mock_single:
+            failures = await TraceManager._flush_batch(batch, {"job-1"})
+
+        assert failures == 0
+        mock_batch.assert_awaited_once()
+        records = mock_batch.call_args[0][0]
+        assert [r["event_type"] for r in records] == ["llm_call", "tool_usage"]
+        assert records[1]["group_id"] == "g1"
+        assert records[0]["output"] == "out"
+        mock_single.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_flush_falls_back_to_single_rows(self):
+        batch = [_trace(), _trace(event_type="tool_usage")]
+        with patch("src.services.execution_trace_service.ExecutionTraceService.create_traces_batch",
+                   new_callable=AsyncMock, side_effect=Exception("bulk failed")), \
+             patch("src.services.execution_trace_service.ExecutionTraceService.create_trace",
+                   new_callable=AsyncMock, side_effect=[None, Exception("row failed")]) as mock_single:
+            failures = await TraceManager._flush_batch(batch, {"job-1"})
+
+        assert failures == 1
+        assert mock_single.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_jobs_are_checked_once_per_batch(self):
+        batch = [_trace(job_id="job-new"), _trace(job_id="job-new", event_type="tool_usage")]
+        history_service = MagicMock()
+        history_service.get_execution_by_job_id = AsyncMock(return_value=None)
+        confirmed = set()
+
+        with patch("src.services.execution_history_service.get_execution_history_service",
+                   return_value=history_service), \
+             patch("src.services.execution_status_service.ExecutionStatusService.create_execution",
+                   new_callable=AsyncMock, return_value=True) as mock_create, \
+             patch("src.services.execution_trace_service.ExecutionTraceService.create_traces_batch",
+                   new_callable=AsyncMock) as mock_batch:
+            failures = await TraceManager._flush_batch(batch, confirmed)
+
+        assert failures == 0
+        history_service.get_execution_by_job_id.assert_awaited_once_with("job-new")
+        mock_create.assert_awaited_once()
+        assert "job-new" in confirmed
+        assert len(mock_batch.call_args[0][0]) == 2
+
+
+class TestTraceWriterLoop:
+    """Test cases for the writer loop itself."""
+
+    @pytest.mark.asyncio
+    async def test_loop_flushes_in_batches_and_drains_on_shutdown(self):
+        q = queue.Queue()
+        for i in range(5):
+            q.put_nowait(_trace(job_id="job-1"))
+
+        settings = MagicMock(TRACE_WRITER_BATCH_SIZE=2, TRACE_WRITER_FLUSH_INTERVAL=0.05)
+        flushed = []
+
+        async def fake_flush(batch, confirmed_jobs):
+            flushed.append(len(batch))
+            return 0
+
+        TraceManager._shutdown_event.clear()
+        with patch("src.services.trace_queue.get_trace_queue", return_value=q), \
+             patch("src.config.settings.settings", settings), \
+             patch.object(TraceManager, "_flush_batch", side_effect=fake_flush):
+            task = asyncio.create_task(TraceManager._trace_writer_loop())
+            await asyncio.sleep(0.2)
+            TraceManager._shutdown_event.set()
+            await asyncio.wait_for(task, timeout=2)
+        TraceManager._shutdown_event.clear()
+
+        assert flushed == [2, 2, 1]
+        assert q.qsize() == 0
+        assert TraceManager._writer_stats["last_batch_size"] == 1
+
+    def test_get_writer_stats_reports_backlog(self):
+        q = queue.Queue()
+        q.put_nowait(_trace())
+        with patch("src.services.trace_queue.get_trace_queue", return_value=q):
+            stats = TraceManager.get_writer_stats()
+
+        assert stats["backlog"] == 1
+        assert "last_flush_latency_ms" in stats
+        assert "max_flush_latency_ms" in stats
@@ -716,12 +716,12 @@ class TestDatabricksCustomTool(unittest.TestCase):
         # Mock canceled status
         mock_result = MagicMock()
         mock_result.status.state = "CANCELED"
-        mock_statement.get_statement.return_value = mock_result
         
         mock_client.statement_execution = mock_statement
         mock_workspace_client_class.return_value = mock_client
         
-        result = tool._run(query="SELECT 1", warehouse_id="test-warehouse")
+        with patch.object(DatabricksCustomTool, '_get_statement', AsyncMock(return_value=mock_result)):
+            result = tool._run(query="SELECT 1", warehouse_id="test-warehouse")
         
         assert "Query was canceled" in result
 
@@ -744,15 +744,43 @@ class TestDatabricksCustomTool(unittest.TestCase):
         mock_result.status.state = "SUCCEEDED"
         mock_result.manifest = None
         mock_result.result = None
-        mock_statement.get_statement.return_value = mock_result
         
         mock_client.statement_execution = mock_statement
         mock_workspace_client_class.return_value = mock_client
         
-        result = tool._run(query="CREATE TABLE test_table (id INT)", warehouse_id="test-warehouse")
+        with patch.object(DatabricksCustomTool, '_get_statement', AsyncMock(return_value=mock_result)):
+            result = tool._run(query="CREATE TABLE test_table (id INT)", warehouse_id="test-warehouse")
         
         assert "Query executed successfully (no results to display)" in result
 
+    @patch('databricks.sdk.WorkspaceClient')
+    def test_statement_is_polled_without_the_blocking_sdk_call(self, mock_workspace_client_class):
+        """Test statement polls are async requests with the workspace client's credentials"""
+        tool = DatabricksCustomTool()
+        tool._token = "test-token"
+        
+        mock_client = MagicMock()
+        mock_client.config.host = "https://test-workspace.cloud.databricks.com/"
+        mock_client.config.authenticate.return_value = {"Authorization": "Bearer sdk-token"}
+        mock_workspace_client_class.return_value = mock_client
+        
+        running = MagicMock()
+        running.status.state = "RUNNING"
+        succeeded = MagicMock()
+        succeeded.status.state = "SUCCEEDED"
+        get_statement = AsyncMock(side_effect=[running, succeeded])
+        
+        with patch.object(DatabricksCustomTool, '_get_statement', get_statement), \
+             patch('src.utils.async_polling.BackoffPolicy.delay', return_value=0):
+            result = asyncio.run(tool._wait_for_statement("test-id"))
+        
+        assert result is succeeded
+        get_statement.assert_awaited_with(
+            "https://test-workspace.cloud.databricks.com", {"Authorization": "Bearer sdk-token"}, "test-id"
+        )
+        mock_client.config.authenticate.assert_called_once()
+        mock_client.statement_execution.get_statement.assert_not_called()
+
     def test_host_configuration_with_empty_string(self):
         """Test host configuration with empty string in tool_config"""
         # Clear any existing env variable
@@ -13,7 +13,7 @@ from src.engines.crewai.tools.mcp_handler import (
     create_crewai_tool_from_mcp,
     stop_mcp_adapter,
     wrap_mcp_tool,
-    run_in_separate_process,
+    run_in_worker_pool,
     _active_mcp_adapters
 )
 from src.engines.common.mcp_adapter import MCPTool
@@ -419,38 +419,57 @@ class TestWrapMCPTool:
         original_run = Mock(side_effect=Exception("Event loop issue"))
         tool._run = original_run
         
-        with patch('asyncio.new_event_loop') as mock_new_loop:
-            with patch('asyncio.set_event_loop') as mock_set_loop:
-                mock_loop = Mock()
-                mock_loop.run_until_complete = Mock(return_value="Process result")
-                mock_loop.close = Mock()
-                mock_new_loop.return_value = mock_loop
-                
-                wrapped_tool = wrap_mcp_tool(tool)
-                
-                # Should have modified _run method
-                assert wrapped_tool._run != original_run
-                
-                # Test execution - should handle the error and use process
-                result = wrapped_tool._run(space_id="test_space")
-                assert mock_loop.run_until_complete.called
+        with patch('src.engines.crewai.tools.mcp_handler.run_in_worker_pool', return_value="Pool result") as mock_pool_run:
+            wrapped_tool = wrap_mcp_tool(tool)
+            
+            # Should have modified _run method
+            assert wrapped_tool._run != original_run
+            
+            # Test execution - should handle the error and use the worker pool
+            result = wrapped_tool._run(space_id="test_space")
+            assert result == "Pool result"
+            mock_pool_run.assert_called_once_with(tool, {"space_id": "test_space"})
     
-    @pytest.mark.asyncio
-    async def test_run_in_separate_process(self):
-        """Test running tool in separate process."""
-        tool_name = "test_tool"
-        kwargs = {"param": "value"}
+    def test_wrap_mcp_tool_event_loop_error_uses_worker_pool(self, mock_tool):
+        """Test that an event loop error falls back to the worker pool."""
+        mock_tool._run = Mock(side_effect=RuntimeError("Event loop is closed"))
+        
+        with patch('src.engines.crewai.tools.mcp_handler.run_in_worker_pool', return_value="Pool result") as mock_pool_run:
+            wrapped_tool = wrap_mcp_tool(mock_tool)
+            
+            assert wrapped_tool._run(param="value") == "Pool result"
+            mock_pool_run.assert_called_once_with(mock_tool, {"param": "value"})
+    
+    def test_run_in_worker_pool(self):
+        """Test running tool on the MCP worker pool."""
+        tool = Mock()
+        tool.name = "server_test_tool"
+        tool._mcp_tool_wrapper.name = "test_tool"
+        tool._mcp_tool_wrapper.adapter.server_params = {"url": "https://mcp.example.com", "auth_type": "api_key"}
+        
+        with patch('src.engines.crewai.tools.mcp_handler.get_mcp_worker_pool') as mock_get_pool:
+            mock_get_pool.return_value.call_tool.return_value = Mock(content=[Mock(text="success")])
+            
+            result = run_in_worker_pool(tool, {"param": "value", "dummy": ""})
+            
+            assert result == "success"
+            mock_get_pool.return_value.call_tool.assert_called_once_with(
+                {"url": "https://mcp.example.com", "auth_type": "api_key"}, "test_tool", {"param": "value"}
+            )
+    
+    def test_run_in_worker_pool_error(self):
+        """Test that worker pool errors are returned as error messages."""
+        tool = Mock()
+        tool.name = "test_tool"
+        tool._mcp_tool_wrapper.adapter.server_params = {"url": "https://mcp.example.com"}
         
-        with patch('asyncio.create_subprocess_exec') as mock_subprocess:
-            # Mock the process
-            mock_process = Mock()
-            mock_process.returncode = 0
-            mock_process.communicate = AsyncMock(return_value=(b'{"result": "success"}', b''))
-            mock_subprocess.return_value = mock_process
+        with patch('src.engines.crewai.tools.mcp_handler.get_mcp_worker_pool') as mock_get_pool:
+            mock_get_pool.return_value.call_tool.side_effect = ConnectionError("connection refused")
             
-            result = await run_in_separate_process(tool_name, kwargs)
+            result = run_in_worker_pool(tool, {})
             
-            assert result == {"result": "success"}
+            assert result.startswith("Error:")
+            assert "connection refused" in result
     
     def test_wrap_mcp_tool_no_run_method(self):
         """Test wrapping tool without _run method."""
@@ -86,19 +86,33 @@ class TestToolFactory:
         factory = ToolFactory(mock_config, mock_service)
         
         with patch.object(factory, '_load_available_tools_async', new_callable=AsyncMock), \
-             patch('src.utils.asyncio_utils.execute_db_operation_with_fresh_engine', new_callable=AsyncMock) as mock_exec, \
-             patch('src.utils.encryption_utils.EncryptionUtils.decrypt_value', return_value="test_key") as mock_decrypt:
+             patch('src.engines.crewai.tools.tool_factory.execute_db_operation_with_loop_engine', new_callable=AsyncMock) as mock_exec, \
+             patch.dict(os.environ, {}, clear=False):
             
-            # Mock the API key object
-            mock_api_key = MagicMock()
-            mock_api_key.encrypted_value = "encrypted_key"
-            mock_exec.return_value = mock_api_key
+            mock_exec.return_value = {"SERPER_API_KEY": "test_key"}
             
             await factory.initialize()
             
             assert factory._initialized is True
-            # Should attempt to load several API keys
-            assert mock_exec.call_count >= 1
+            assert os.environ["SERPER_API_KEY"] == "test_key"
+            # All API keys are loaded with a single query
+            mock_exec.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_initialize_reuses_cached_catalog_and_keys(self, mock_config):
+        """Test that later factories are built from the tool catalog cache."""
+        mock_tool = MagicMock(id=1, title="SerperDevTool")
+
+        with patch('src.engines.crewai.tools.tool_factory._fetch_tool_catalog', new_callable=AsyncMock, return_value=[mock_tool]) as mock_fetch, \
+             patch('src.engines.crewai.tools.tool_factory.execute_db_operation_with_loop_engine', new_callable=AsyncMock, return_value={}) as mock_exec:
+
+            for _ in range(3):
+                factory = ToolFactory(mock_config, MagicMock())
+                await factory.initialize()
+                assert factory.get_tool_info(1) is mock_tool
+
+            mock_fetch.assert_called_once()
+            mock_exec.assert_called_once()
     
     @pytest.mark.asyncio
     async def test_initialize_exception_handling(self, tool_factory):
@@ -196,7 +210,7 @@ class TestToolFactory:
         mock_api_key = MagicMock()
         mock_api_key.encrypted_value = "encrypted_key"
         
-        with patch('src.utils.asyncio_utils.execute_db_operation_with_fresh_engine', new_callable=AsyncMock, return_value="decrypted_key") as mock_exec:
+        with patch('src.engines.crewai.tools.tool_factory.execute_db_operation_with_loop_engine', new_callable=AsyncMock, return_value={"TEST_KEY": "decrypted_key"}) as mock_exec:
             key = await tool_factory._get_api_key_async("TEST_KEY")
             
             assert key == "decrypted_key"
@@ -205,7 +219,7 @@ class TestToolFactory:
     @pytest.mark.asyncio
     async def test_get_api_key_async_not_found(self, tool_factory):
         """Test async API key retrieval when key not found."""
-        with patch('src.utils.asyncio_utils.execute_db_operation_with_fresh_engine', new_callable=AsyncMock, return_value=None):
+        with patch('src.engines.crewai.tools.tool_factory.execute_db_operation_with_loop_engine', new_callable=AsyncMock, return_value={}):
             key = await tool_factory._get_api_key_async("NONEXISTENT_KEY")
             
             assert key is None
@@ -245,6 +259,23 @@ class TestToolFactory:
             mock_set_loop.assert_called_once_with(mock_loop)
             mock_loop.close.assert_called_once()
     
+    def test_run_in_new_loop_disposes_loop_engine(self, tool_factory):
+        """Test the throwaway loop's pooled connections are closed before the loop."""
+        loop_open_on_dispose = []
+        
+        async def dispose():
+            loop_open_on_dispose.append(not asyncio.get_running_loop().is_closed())
+        
+        async def test_func():
+            return "test_result"
+        
+        with patch('src.engines.crewai.tools.tool_factory.dispose_loop_engine', side_effect=dispose):
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                result = pool.submit(tool_factory._run_in_new_loop, test_func).result()
+        
+        assert result == "test_result"
+        assert loop_open_on_dispose == [True]
+    
     def test_update_tool_config_not_found(self, tool_factory):
         """Test updating tool config when tool not found."""
         with patch.object(tool_factory, 'get_tool_info', return_value=None):
@@ -1217,9 +1248,9 @@ class TestToolFactoryAdditionalCoverage:
         
         asyncio.run(test())
     
-    def test_get_api_key_async_with_fresh_engine_exception(self, tool_factory):
-        """Test async API key retrieval when fresh engine operation fails."""
-        with patch('src.utils.asyncio_utils.execute_db_operation_with_fresh_engine', new_callable=AsyncMock, side_effect=Exception("DB error")):
+    def test_get_api_key_async_with_loop_engine_exception(self, tool_factory):
+        """Test async API key retrieval when the loop engine operation fails."""
+        with patch('src.engines.crewai.tools.tool_factory.execute_db_operation_with_loop_engine', new_callable=AsyncMock, side_effect=Exception("DB error")):
             
             async def test():
                 key = await tool_factory._get_api_key_async("TEST_KEY")
@@ -1311,7 +1342,7 @@ class TestToolFactoryAdditionalCoverage:
         factory = ToolFactory(mock_config, mock_service)
         
         with patch.object(factory, '_load_available_tools_async', new_callable=AsyncMock), \
-             patch('src.utils.asyncio_utils.execute_db_operation_with_fresh_engine', new_callable=AsyncMock, side_effect=Exception("DB error")):
+             patch('src.engines.crewai.tools.tool_factory.execute_db_operation_with_loop_engine', new_callable=AsyncMock, side_effect=Exception("DB error")):
             
             async def test():
                 await factory.initialize()
@@ -1325,7 +1356,7 @@ class TestToolFactoryAdditionalCoverage:
         factory = ToolFactory(mock_config, mock_service)
         
         with patch.object(factory, '_load_available_tools_async', new_callable=AsyncMock), \
-             patch.object(factory, '_get_api_key_async', new_callable=AsyncMock, side_effect=Exception("API key error")), \
+             patch.object(factory, '_preload_api_keys_async', new_callable=AsyncMock, side_effect=Exception("API key error")), \
              patch('asyncio.get_running_loop', side_effect=RuntimeError("No running loop")), \
              patch('asyncio.new_event_loop') as mock_new_loop, \
              patch('asyncio.set_event_loop'):
@@ -100,34 +100,36 @@ class TestToolFactory:
             session = MagicMock()
             return await operation_func(session)
         
-        with patch('src.utils.asyncio_utils.execute_db_operation_with_fresh_engine', side_effect=mock_operation):
-            with patch('src.services.api_keys_service.ApiKeysService') as mock_service_class:
+        with patch('src.engines.crewai.tools.tool_factory.execute_db_operation_with_loop_engine', side_effect=mock_operation):
+            with patch('src.engines.crewai.tools.tool_factory.ApiKeysService') as mock_service_class:
                 with patch('src.utils.encryption_utils.EncryptionUtils.decrypt_value', return_value="decrypted_key"):
                     mock_service_instance = MagicMock()
                     mock_api_key_obj = MagicMock()
+                    mock_api_key_obj.name = "TEST_KEY"
                     mock_api_key_obj.encrypted_value = "encrypted_value"
-                    mock_service_instance.find_by_name = AsyncMock(return_value=mock_api_key_obj)
+                    mock_service_instance.find_by_names = AsyncMock(return_value=[mock_api_key_obj])
                     mock_service_class.return_value = mock_service_instance
                     
                     result = await factory._get_api_key_async("TEST_KEY")
                     assert result == "decrypted_key"
 
     @pytest.mark.asyncio
-    async def test_get_api_key_async_fresh_engine(self, tool_factory):
-        """Test API key retrieval with fresh engine"""
+    async def test_get_api_key_async_loop_engine(self, tool_factory):
+        """Test API key retrieval through the API key cache"""
         tool_factory.api_keys_service = None
         
         async def mock_operation(operation_func):
             session = MagicMock()
             return await operation_func(session)
         
-        with patch('src.utils.asyncio_utils.execute_db_operation_with_fresh_engine', side_effect=mock_operation):
-            with patch('src.services.api_keys_service.ApiKeysService') as mock_service_class:
+        with patch('src.engines.crewai.tools.tool_factory.execute_db_operation_with_loop_engine', side_effect=mock_operation):
+            with patch('src.engines.crewai.tools.tool_factory.ApiKeysService') as mock_service_class:
                 with patch('src.utils.encryption_utils.EncryptionUtils.decrypt_value', return_value="fresh_key"):
                     mock_service_instance = MagicMock()
                     mock_api_key_obj = MagicMock()
+                    mock_api_key_obj.name = "TEST_KEY"
                     mock_api_key_obj.encrypted_value = "encrypted_value"
-                    mock_service_instance.find_by_name = AsyncMock(return_value=mock_api_key_obj)
+                    mock_service_instance.find_by_names = AsyncMock(return_value=[mock_api_key_obj])
                     mock_service_class.return_value = mock_service_instance
                     
                     result = await tool_factory._get_api_key_async("TEST_KEY")
@@ -139,7 +141,7 @@ class TestToolFactory:
         async def failing_operation(operation_func):
             raise Exception("Database error")
         
-        with patch('src.utils.asyncio_utils.execute_db_operation_with_fresh_engine', side_effect=failing_operation):
+        with patch('src.engines.crewai.tools.tool_factory.execute_db_operation_with_loop_engine', side_effect=failing_operation):
             result = await tool_factory._get_api_key_async("TEST_KEY")
             assert result is None
 
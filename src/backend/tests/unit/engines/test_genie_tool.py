@@ -5,6 +5,7 @@ import json
 import base64
 from src.engines.crewai.tools.custom.genie_tool import GenieTool, GenieInput
 import requests
+import aiohttp
 import logging
 import sys
 import os
@@ -12,6 +13,19 @@ import os
 logger = logging.getLogger(__name__)
 
 
+def _pooled_session(response):
+    """Patch for databricks_http_session yielding a session that returns response."""
+    request = MagicMock()
+    request.__aenter__ = AsyncMock(return_value=response)
+    request.__aexit__ = AsyncMock(return_value=False)
+    session = MagicMock()
+    session.get.return_value = request
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=session)
+    context.__aexit__ = AsyncMock(return_value=False)
+    return MagicMock(return_value=context)
+
+
 class TestGenieInput:
     """Test cases for GenieInput schema validation."""
 
@@ -321,7 +335,8 @@ class TestGenieTool:
         assert result["conversation_id"] == "existing-conv"
         assert result["message_id"] == "new-msg-789"
 
-    def test_get_message_status(self):
+    @pytest.mark.asyncio
+    async def test_get_message_status(self):
         """Test getting message status."""
         tool = GenieTool(tool_config={
             "DATABRICKS_HOST": "test.databricks.com",
@@ -329,23 +344,25 @@ class TestGenieTool:
             "spaceId": "test-space-id"
         })
         
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = MagicMock()
+        mock_response.json = AsyncMock(return_value={
             "status": "COMPLETED",
             "attachments": [
                 {"text": {"content": "Response text"}}
             ]
-        }
+        })
         
-        with patch('requests.get', return_value=mock_response):
+        with patch('src.engines.crewai.tools.custom.genie_tool.databricks_http_session',
+                   _pooled_session(mock_response)) as session_factory:
             with patch.object(tool, '_get_auth_headers', return_value={"Authorization": "Bearer test"}):
-                result = tool._get_message_status("conv-123", "msg-456")
+                result = await tool._get_message_status("conv-123", "msg-456")
         
         assert result["status"] == "COMPLETED"
         assert result["attachments"][0]["text"]["content"] == "Response text"
+        session_factory.assert_called_once_with("https://test.databricks.com")
 
-    def test_get_query_result(self):
+    @pytest.mark.asyncio
+    async def test_get_query_result(self):
         """Test getting query results."""
         tool = GenieTool(tool_config={
             "DATABRICKS_HOST": "test.databricks.com",
@@ -353,9 +370,8 @@ class TestGenieTool:
             "spaceId": "test-space-id"
         })
         
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = MagicMock()
+        mock_response.json = AsyncMock(return_value={
             "statement_response": {
                 "result": {
                     "data_typed_array": [
@@ -364,11 +380,12 @@ class TestGenieTool:
                     ]
                 }
             }
-        }
+        })
         
-        with patch('requests.get', return_value=mock_response):
+        with patch('src.engines.crewai.tools.custom.genie_tool.databricks_http_session',
+                   _pooled_session(mock_response)):
             with patch.object(tool, '_get_auth_headers', return_value={"Authorization": "Bearer test"}):
-                result = tool._get_query_result("conv-123", "msg-456")
+                result = await tool._get_query_result("conv-123", "msg-456")
         
         assert "statement_response" in result
         assert len(result["statement_response"]["result"]["data_typed_array"]) == 2
@@ -557,6 +574,54 @@ class TestGenieTool:
         
         assert "Query failed" in response
 
+    def test_run_polls_with_backoff_until_answer(self):
+        """Test run method keeps polling a completed message until it has an answer."""
+        tool = GenieTool(tool_config={
+            "DATABRICKS_HOST": "test.databricks.com",
+            "DATABRICKS_API_KEY": "test-key",
+            "spaceId": "test-space-id"
+        })
+        tool._retry_delay = 0.01
+        
+        with patch.object(tool, '_start_or_continue_conversation', return_value={
+            "conversation_id": "conv-123",
+            "message_id": "msg-456"
+        }):
+            with patch.object(tool, '_get_message_status', side_effect=[
+                {"status": "EXECUTING_QUERY"},
+                {"status": "COMPLETED", "attachments": [{"text": {"content": "Answer"}}]},
+            ]) as mock_status:
+                with patch.object(tool, '_get_query_result', return_value={}):
+                    response = tool._run("Test question")
+        
+        assert response == "Answer"
+        assert mock_status.await_count == 2
+
+    def test_run_cancelled_execution(self):
+        """Test run method stops polling once its execution was cancelled."""
+        from src.utils.async_polling import bind_polling_execution, cancel_execution_polls
+        
+        tool = GenieTool(tool_config={
+            "DATABRICKS_HOST": "test.databricks.com",
+            "DATABRICKS_API_KEY": "test-key",
+            "spaceId": "test-space-id"
+        })
+        
+        bind_polling_execution("cancelled-genie-execution")
+        cancel_execution_polls("cancelled-genie-execution")
+        try:
+            with patch.object(tool, '_start_or_continue_conversation', return_value={
+                "conversation_id": "conv-123",
+                "message_id": "msg-456"
+            }):
+                with patch.object(tool, '_get_message_status') as mock_status:
+                    response = tool._run("Test question")
+        finally:
+            bind_polling_execution(None)
+        
+        assert "execution was stopped" in response
+        mock_status.assert_not_called()
+
     def test_call_with_no_args(self):
         """Test __call__ method with no arguments."""
         tool = GenieTool()
@@ -1022,7 +1087,7 @@ class TestGenieTool:
             }):
                 # Query result request fails
                 with patch.object(tool, '_get_query_result', 
-                                side_effect=requests.exceptions.RequestException("Query failed")):
+                                side_effect=aiohttp.ClientError("Query failed")):
                     response = tool._run("Test question")
         
         assert "Results ready" in response
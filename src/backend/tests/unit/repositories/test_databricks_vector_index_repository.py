@@ -61,7 +61,7 @@ class TestDatabricksVectorIndexRepository:
             mock_get_auth.return_value = mock_auth_token
             
             # Mock aiohttp session - patch the entire async with context
-            with patch('src.repositories.databricks_vector_index_repository.aiohttp') as mock_aiohttp:
+            with patch('src.repositories.databricks_vector_index_repository.databricks_http_session') as mock_http_session:
                 # Create the response mock
                 mock_response = AsyncMock()
                 mock_response.status = 200
@@ -76,11 +76,11 @@ class TestDatabricksVectorIndexRepository:
                 mock_post_cm.__aexit__ = AsyncMock(return_value=None)
                 mock_session.post = MagicMock(return_value=mock_post_cm)
                 
-                # Mock ClientSession to return a context manager
+                # Mock the pooled session to return a context manager
                 mock_session_cm = MagicMock()
                 mock_session_cm.__aenter__ = AsyncMock(return_value=mock_session)
                 mock_session_cm.__aexit__ = AsyncMock(return_value=None)
-                mock_aiohttp.ClientSession = MagicMock(return_value=mock_session_cm)
+                mock_http_session.return_value = mock_session_cm
                 
                 # Act
                 result = await repository.similarity_search(
@@ -132,7 +132,7 @@ class TestDatabricksVectorIndexRepository:
             mock_get_auth.return_value = mock_auth_token
             
             # Mock aiohttp session
-            with patch('src.repositories.databricks_vector_index_repository.aiohttp') as mock_aiohttp:
+            with patch('src.repositories.databricks_vector_index_repository.databricks_http_session') as mock_http_session:
                 # Create the response mock
                 mock_response = AsyncMock()
                 mock_response.status = 200
@@ -147,11 +147,11 @@ class TestDatabricksVectorIndexRepository:
                 mock_post_cm.__aexit__ = AsyncMock(return_value=None)
                 mock_session.post = MagicMock(return_value=mock_post_cm)
                 
-                # Mock ClientSession to return a context manager
+                # Mock the pooled session to return a context manager
                 mock_session_cm = MagicMock()
                 mock_session_cm.__aenter__ = AsyncMock(return_value=mock_session)
                 mock_session_cm.__aexit__ = AsyncMock(return_value=None)
-                mock_aiohttp.ClientSession = MagicMock(return_value=mock_session_cm)
+                mock_http_session.return_value = mock_session_cm
                 
                 # Act
                 result = await repository.similarity_search(
@@ -188,7 +188,7 @@ class TestDatabricksVectorIndexRepository:
             mock_get_auth.return_value = mock_auth_token
             
             # Mock aiohttp session with error
-            with patch('src.repositories.databricks_vector_index_repository.aiohttp') as mock_aiohttp:
+            with patch('src.repositories.databricks_vector_index_repository.databricks_http_session') as mock_http_session:
                 # Create the response mock with error
                 mock_response = AsyncMock()
                 mock_response.status = 500
@@ -203,11 +203,11 @@ class TestDatabricksVectorIndexRepository:
                 mock_post_cm.__aexit__ = AsyncMock(return_value=None)
                 mock_session.post = MagicMock(return_value=mock_post_cm)
                 
-                # Mock ClientSession to return a context manager
+                # Mock the pooled session to return a context manager
                 mock_session_cm = MagicMock()
                 mock_session_cm.__aenter__ = AsyncMock(return_value=mock_session)
                 mock_session_cm.__aexit__ = AsyncMock(return_value=None)
-                mock_aiohttp.ClientSession = MagicMock(return_value=mock_session_cm)
+                mock_http_session.return_value = mock_session_cm
                 
                 # Act
                 result = await repository.similarity_search(
@@ -280,7 +280,7 @@ class TestDatabricksVectorIndexRepository:
             mock_get_auth.return_value = mock_auth_token
             
             # Mock aiohttp session
-            with patch('src.repositories.databricks_vector_index_repository.aiohttp') as mock_aiohttp:
+            with patch('src.repositories.databricks_vector_index_repository.databricks_http_session') as mock_http_session:
                 # Create the response mock
                 mock_response = AsyncMock()
                 mock_response.status = 200
@@ -295,11 +295,11 @@ class TestDatabricksVectorIndexRepository:
                 mock_post_cm.__aexit__ = AsyncMock(return_value=None)
                 mock_session.post = MagicMock(return_value=mock_post_cm)
                 
-                # Mock ClientSession to return a context manager
+                # Mock the pooled session to return a context manager
                 mock_session_cm = MagicMock()
                 mock_session_cm.__aenter__ = AsyncMock(return_value=mock_session)
                 mock_session_cm.__aexit__ = AsyncMock(return_value=None)
-                mock_aiohttp.ClientSession = MagicMock(return_value=mock_session_cm)
+                mock_http_session.return_value = mock_session_cm
                 
                 # Act
                 result = await repository.upsert(
@@ -336,7 +336,7 @@ class TestDatabricksVectorIndexRepository:
             mock_get_auth.return_value = mock_auth_token
             
             # Mock aiohttp session
-            with patch('src.repositories.databricks_vector_index_repository.aiohttp') as mock_aiohttp:
+            with patch('src.repositories.databricks_vector_index_repository.databricks_http_session') as mock_http_session:
                 # Create the response mock
                 mock_response = AsyncMock()
                 mock_response.status = 204
@@ -350,11 +350,11 @@ class TestDatabricksVectorIndexRepository:
                 mock_post_cm.__aexit__ = AsyncMock(return_value=None)
                 mock_session.post = MagicMock(return_value=mock_post_cm)
                 
-                # Mock ClientSession to return a context manager
+                # Mock the pooled session to return a context manager
                 mock_session_cm = MagicMock()
                 mock_session_cm.__aenter__ = AsyncMock(return_value=mock_session)
                 mock_session_cm.__aexit__ = AsyncMock(return_value=None)
-                mock_aiohttp.ClientSession = MagicMock(return_value=mock_session_cm)
+                mock_http_session.return_value = mock_session_cm
                 
                 # Act
                 result = await repository.delete_records(
@@ -4,6 +4,9 @@ Unit tests for DocumentationEmbeddingRepository.
 Tests the functionality of documentation embedding repository including
 CRUD operations, search functionality, and similarity operations.
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from typing import List, Dict, Any
@@ -745,4 +748,63 @@ class TestDocumentationEmbeddingRepositoryIntegration:
                 results = await repository_with_async_session.search_similar(query_embedding, limit=2)
                 
                 assert len(results) == 2
-                assert results == similar_embeddings
\ No newline at end of file
+                assert results == similar_embeddings
+
+class TestDocumentationEmbeddingRepositorySqliteIndex:
+    """Test the SQLite similarity search backed by the in-memory vector index."""
+    
+    @pytest.mark.asyncio
+    async def test_search_similar_sqlite_uses_vector_index(self, repository_with_async_session, mock_async_session):
+        """Test that results come back in index order without embeddings."""
+        from src.repositories import documentation_embedding_repository as module
+        
+        index = module.VectorIndex()
+        index.rebuild([(1, [1.0, 0.0, 0.0]), (2, [0.9, 0.1, 0.0]), (3, [0.0, 1.0, 0.0])])
+        rows = [
+            MagicMock(id=2, source="api.md", title="API", content="API docs", doc_metadata={},
+                      created_at=None, updated_at=None),
+            MagicMock(id=1, source="intro.md", title="Intro", content="Intro docs", doc_metadata={},
+                      created_at=None, updated_at=None),
+        ]
+        mock_result = MagicMock()
+        mock_result.all.return_value = rows
+        mock_async_session.execute.return_value = mock_result
+        
+        with patch.object(module, '_sqlite_vector_index', index), \
+             patch.object(repository_with_async_session, '_sync_sqlite_vector_index', AsyncMock()) as mock_sync:
+            results = await repository_with_async_session._search_similar_sqlite([1.0, 0.0, 0.0], 2)
+        
+        mock_sync.assert_awaited_once()
+        assert [doc.id for doc in results] == [1, 2]
+        assert all(doc.embedding == [] for doc in results)
+    
+    def test_search_similar_sqlite_from_several_event_loops(self, repository_with_async_session):
+        """Test that concurrent searches work on every event loop, not only the first one."""
+        from src.repositories import documentation_embedding_repository as module
+        
+        async def slow_sync():
+            await asyncio.sleep(0)
+        
+        async def concurrent_searches():
+            return await asyncio.gather(*(
+                repository_with_async_session._search_similar_sqlite([1.0, 0.0], 5) for _ in range(3)
+            ))
+        
+        with patch.object(module, '_sqlite_vector_index', module.VectorIndex()), \
+             patch.object(repository_with_async_session, '_sync_sqlite_vector_index', side_effect=slow_sync):
+            # Contended waits bind an asyncio.Lock to the loop they run on
+            for _ in range(2):
+                with ThreadPoolExecutor(max_workers=1) as pool:
+                    assert pool.submit(asyncio.run, concurrent_searches()).result() == [[], [], []]
+    
+    @pytest.mark.asyncio
+    async def test_search_similar_sqlite_no_matches(self, repository_with_async_session, mock_async_session):
+        """Test that an empty index skips the document lookup."""
+        from src.repositories import documentation_embedding_repository as module
+        
+        with patch.object(module, '_sqlite_vector_index', module.VectorIndex()), \
+             patch.object(repository_with_async_session, '_sync_sqlite_vector_index', AsyncMock()):
+            results = await repository_with_async_session._search_similar_sqlite([1.0, 0.0], 5)
+        
+        assert results == []
+        mock_async_session.execute.assert_not_called()
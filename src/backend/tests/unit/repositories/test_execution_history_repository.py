@@ -228,6 +228,57 @@ class TestExecutionHistoryRepositoryGetExecutionHistory:
             assert total_count == 3
 
 
+class TestExecutionHistoryRepositoryGetExecutionSummaries:
+    """Test cases for get_execution_summaries and count_executions."""
+    
+    @pytest.mark.asyncio
+    async def test_get_execution_summaries_projects_summary_columns(self, execution_history_repository):
+        """Test that summaries are loaded newest first without inputs and result."""
+        with patch('src.repositories.execution_history_repository.async_session_factory') as mock_factory:
+            mock_session = AsyncMock()
+            mock_factory.return_value.__aenter__.return_value = mock_session
+            result = MagicMock()
+            result.all.return_value = [MagicMock(_mapping={"id": 2, "job_id": "job-2"})]
+            mock_session.execute.return_value = result
+            
+            summaries = await execution_history_repository.get_execution_summaries(limit=10, group_ids=["group-1"])
+            
+            assert summaries == [{"id": 2, "job_id": "job-2"}]
+            sql = str(mock_session.execute.call_args[0][0])
+            assert "executionhistory.inputs" not in sql
+            assert "executionhistory.result" not in sql
+            assert "ORDER BY executionhistory.created_at DESC, executionhistory.id DESC" in sql
+    
+    @pytest.mark.asyncio
+    async def test_get_execution_summaries_after_cursor(self, execution_history_repository):
+        """Test that the keyset condition is applied for later pages."""
+        with patch('src.repositories.execution_history_repository.async_session_factory') as mock_factory:
+            mock_session = AsyncMock()
+            mock_factory.return_value.__aenter__.return_value = mock_session
+            result = MagicMock()
+            result.all.return_value = []
+            mock_session.execute.return_value = result
+            
+            await execution_history_repository.get_execution_summaries(
+                limit=10, before=(datetime(2024, 1, 1), 5)
+            )
+            
+            sql = str(mock_session.execute.call_args[0][0])
+            assert "executionhistory.created_at <" in sql
+            assert "executionhistory.id <" in sql
+            assert "OFFSET" not in sql
+    
+    @pytest.mark.asyncio
+    async def test_count_executions(self, execution_history_repository):
+        """Test counting executions with group filtering."""
+        with patch('src.repositories.execution_history_repository.async_session_factory') as mock_factory:
+            mock_session = AsyncMock()
+            mock_factory.return_value.__aenter__.return_value = mock_session
+            mock_session.execute.return_value = MockResult(scalar_value=4)
+            
+            assert await execution_history_repository.count_executions(group_ids=["group-1"]) == 4
+
+
 class TestExecutionHistoryRepositoryGetExecutionById:
     """Test cases for get_execution_by_id method."""
     
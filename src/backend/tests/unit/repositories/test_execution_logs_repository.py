@@ -242,6 +242,65 @@ class TestExecutionLogsRepositoryCreate:
                 assert mock_logger.error.call_count == 2
 
 
+class TestExecutionLogsRepositoryCreateMany:
+    """Test cases for bulk log creation."""
+    
+    @pytest.mark.asyncio
+    async def test_create_many_empty(self, execution_logs_repository, mock_async_session):
+        """Test that an empty batch does not touch the session."""
+        result = await execution_logs_repository.create_many(mock_async_session, [])
+        
+        assert result == 0
+        mock_async_session.execute.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_create_many_single_insert(self, execution_logs_repository, mock_async_session):
+        """Test that all rows go through one execute call with normalized timestamps."""
+        aware = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        logs = [
+            {"execution_id": "exec-1", "content": "Log 1", "timestamp": aware, "group_id": "group-1"},
+            {"execution_id": "exec-1", "content": "Log 2"},
+        ]
+        
+        result = await execution_logs_repository.create_many(mock_async_session, logs)
+        
+        assert result == 2
+        mock_async_session.execute.assert_called_once()
+        rows = mock_async_session.execute.call_args[0][1]
+        assert rows[0]["timestamp"].tzinfo is None
+        assert rows[0]["group_id"] == "group-1"
+        assert rows[1]["group_id"] is None
+        assert rows[1]["timestamp"] is not None
+        mock_async_session.commit.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_create_many_database_error(self, execution_logs_repository, mock_async_session):
+        """Test bulk creation rolls back and re-raises on error."""
+        mock_async_session.execute.side_effect = Exception("Database error")
+        
+        with pytest.raises(Exception, match="Database error"):
+            await execution_logs_repository.create_many(
+                mock_async_session, [{"execution_id": "exec-1", "content": "Log"}]
+            )
+        
+        mock_async_session.rollback.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_create_many_with_managed_session(self, execution_logs_repository):
+        """Test bulk creation with internal session management."""
+        logs = [{"execution_id": "exec-1", "content": "Log"}]
+        
+        with patch('src.repositories.execution_logs_repository.async_session_factory') as mock_factory, \
+             patch.object(execution_logs_repository, 'create_many', new_callable=AsyncMock, return_value=1) as mock_create:
+            mock_session = AsyncMock()
+            mock_factory.return_value.__aenter__.return_value = mock_session
+            
+            result = await execution_logs_repository.create_many_with_managed_session(logs)
+            
+            assert result == 1
+            mock_create.assert_called_once_with(mock_session, logs)
+
+
 class TestExecutionLogsRepositoryCreateWithManagedSession:
     """Test cases for create_with_managed_session method."""
     
@@ -157,6 +157,76 @@ class TestExecutionTraceRepositoryPrivateCreate:
                 mock_logger.error.assert_called()
 
 
+class TestExecutionTraceRepositoryPrivateCreateMany:
+    """Test cases for _create_many method."""
+
+    @pytest.mark.asyncio
+    async def test_create_many_empty(self, execution_trace_repository, mock_async_session):
+        """Test that an empty batch does not touch the database."""
+        result = await execution_trace_repository._create_many(mock_async_session, [])
+
+        assert result == 0
+        mock_async_session.execute.assert_not_called()
+        mock_async_session.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_many_resolves_run_ids_once(self, execution_trace_repository, mock_async_session):
+        """Test that missing run_ids are resolved with one lookup and rows are inserted together."""
+        lookup_result = MagicMock()
+        lookup_result.all.return_value = [("job-1", 10), ("job-2", 20)]
+        mock_async_session.execute.side_effect = [lookup_result, MagicMock()]
+
+        traces = [
+            {"job_id": "job-1", "event_type": "llm_call", "event_source": "a", "event_context": ""},
+            {"job_id": "job-2", "event_type": "tool_usage", "event_source": "b", "event_context": "", "group_id": "g1"},
+            {"job_id": "job-1", "run_id": 5, "event_type": "task_completed", "event_source": "c", "event_context": ""},
+        ]
+
+        result = await execution_trace_repository._create_many(mock_async_session, traces)
+
+        assert result == 3
+        assert mock_async_session.execute.call_count == 2
+        rows = mock_async_session.execute.call_args_list[1][0][1]
+        assert [row["run_id"] for row in rows] == [10, 20, 5]
+        # Every row carries the same keys so the insert is one executemany
+        assert len({frozenset(row.keys()) for row in rows}) == 1
+        assert rows[0]["group_id"] is None
+        mock_async_session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_create_many_compresses_large_outputs(self, execution_trace_repository, mock_async_session):
+        """Test that large outputs are stored compressed with an inline preview."""
+        traces = [
+            {"job_id": "job-1", "run_id": 1, "event_type": "llm_call", "event_source": "a", "event_context": "",
+             "output": "x" * 10000},
+            {"job_id": "job-1", "run_id": 1, "event_type": "tool_usage", "event_source": "b", "event_context": "",
+             "output": "short"},
+        ]
+
+        with patch("src.utils.payload_compression.settings") as settings:
+            settings.PAYLOAD_COMPRESSION_ENABLED = True
+            settings.PAYLOAD_COMPRESSION_MIN_BYTES = 4096
+            settings.PAYLOAD_PREVIEW_CHARS = 500
+            await execution_trace_repository._create_many(mock_async_session, traces)
+
+        rows = mock_async_session.execute.call_args[0][1]
+        assert len(rows[0]["output"]) < 600
+        assert rows[0]["payload"] is not None
+        assert rows[1]["output"] == "short"
+        assert rows[1]["payload"] is None
+
+    @pytest.mark.asyncio
+    async def test_create_many_database_error(self, execution_trace_repository, mock_async_session):
+        """Test bulk creation with database error."""
+        mock_async_session.commit.side_effect = SQLAlchemyError("Database error")
+        traces = [{"job_id": "job-1", "run_id": 1, "event_type": "llm_call", "event_source": "a", "event_context": ""}]
+
+        with pytest.raises(SQLAlchemyError, match="Database error"):
+            await execution_trace_repository._create_many(mock_async_session, traces)
+
+        mock_async_session.rollback.assert_called_once()
+
+
 class TestExecutionTraceRepositoryPrivateGetById:
     """Test cases for _get_by_id method."""
     
@@ -373,6 +373,38 @@ class TestLLMLogRepositoryCreate:
                 assert call_args["group_id"] == "group-456"
                 assert call_args["extra_data"] == {"key": "value"}
 
+    @pytest.mark.asyncio
+    async def test_create_many_inserts_all_logs_in_one_statement(self, log_repository):
+        """Test bulk creation normalizes datetimes and gives every row the same columns."""
+        with patch('src.repositories.log_repository.async_session_factory') as mock_factory:
+            mock_session = AsyncMock()
+            mock_factory.return_value.__aenter__.return_value = mock_session
+            created_at = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+            logs = [
+                {"endpoint": "a", "prompt": "p", "response": "r", "model": "m", "status": "success",
+                 "created_at": created_at},
+                {"endpoint": "b", "prompt": "p", "response": "r", "model": "m", "status": "error",
+                 "error_message": "failed"},
+            ]
+
+            count = await log_repository.create_many(logs)
+
+            assert count == 2
+            mock_session.execute.assert_called_once()
+            rows = mock_session.execute.call_args[0][1]
+            assert rows[0]["created_at"] == datetime(2026, 1, 1, 12, 0)
+            assert rows[0]["error_message"] is None
+            assert rows[1]["created_at"].tzinfo is None
+            assert set(rows[0]) == set(rows[1])
+            mock_session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_create_many_empty(self, log_repository):
+        """Test bulk creation without logs does not open a session."""
+        with patch('src.repositories.log_repository.async_session_factory') as mock_factory:
+            assert await log_repository.create_many([]) == 0
+            mock_factory.assert_not_called()
+
 
 class TestLLMLogRepositoryTenantAware:
     """Test tenant-aware functionality - these test the broken methods for coverage."""
@@ -315,11 +315,28 @@ class TestScheduleRepositoryFindDueSchedules:
         mock_async_session.execute.return_value = mock_result
         
         result = await schedule_repository.find_due_schedules(current_time)
-        
+
         assert result == []
         mock_async_session.execute.assert_called_once()
 
 
+class TestScheduleRepositoryFindActiveNextRuns:
+    """Test cases for find_active_next_runs method."""
+
+    @pytest.mark.asyncio
+    async def test_find_active_next_runs_returns_id_time_pairs(self, schedule_repository, mock_async_session):
+        """Test that only IDs and next run times are returned."""
+        next_run = datetime(2025, 1, 1, 9, 0)
+        mock_result = MagicMock()
+        mock_result.all.return_value = [MagicMock(id=1, next_run_at=next_run), MagicMock(id=2, next_run_at=next_run)]
+        mock_async_session.execute.return_value = mock_result
+
+        result = await schedule_repository.find_active_next_runs()
+
+        assert result == [(1, next_run), (2, next_run)]
+        mock_async_session.execute.assert_called_once()
+
+
 class TestScheduleRepositoryUpdate:
     """Test cases for update method."""
     
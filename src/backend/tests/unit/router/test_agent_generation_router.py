@@ -203,4 +203,54 @@ async def test_generate_agent_general_error(client, mock_agent_generation_servic
         
         # Assert response code and detail
         assert response.status_code == 500
-        assert response.json()["detail"] == "Failed to generate agent configuration" 
\ No newline at end of file
+        assert response.json()["detail"] == "Failed to generate agent configuration" 
+
+def _sse_events(body):
+    """Parse a text/event-stream body into (event, data) tuples."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_generate_agent_stream_success(client, mock_agent_generation_service):
+    """Test agent generation streamed as server-sent events."""
+    async def stream_agent(**kwargs):
+        yield "field", {"key": "name", "value": "Research Agent"}
+        yield "agent", {"name": "Research Agent", "tools": []}
+
+    mock_agent_generation_service.stream_agent = MagicMock(side_effect=stream_agent)
+
+    with patch.object(AgentGenerationService, "create", return_value=mock_agent_generation_service):
+        response = client.post(
+            "/agent-generation/generate/stream",
+            json={"prompt": "Create a research agent", "model": "gpt-4o-mini"}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert _sse_events(response.text) == [
+        ("field", {"key": "name", "value": "Research Agent"}),
+        ("agent", {"name": "Research Agent", "tools": []}),
+    ]
+    assert mock_agent_generation_service.stream_agent.call_args.kwargs["model"] == "gpt-4o-mini"
+
+
+@pytest.mark.asyncio
+async def test_generate_agent_stream_error_event(client, mock_agent_generation_service):
+    """Test errors during streaming are sent as an error event."""
+    async def stream_agent(**kwargs):
+        yield "field", {"key": "name", "value": "Research Agent"}
+        raise ValueError("Missing required field in agent configuration: goal")
+
+    mock_agent_generation_service.stream_agent = MagicMock(side_effect=stream_agent)
+
+    with patch.object(AgentGenerationService, "create", return_value=mock_agent_generation_service):
+        response = client.post("/agent-generation/generate/stream", json={"prompt": "Create an agent"})
+
+    assert response.status_code == 200
+    assert _sse_events(response.text)[-1] == (
+        "error", {"status_code": 400, "detail": "Missing required field in agent configuration: goal"}
+    )
@@ -238,4 +238,41 @@ async def test_create_crew_general_error(client, mock_crew_generation_service):
         
         # Assert response code and detail
         assert response.status_code == 500
-        assert "Error creating crew" in response.json()["detail"] 
\ No newline at end of file
+        assert "Error creating crew" in response.json()["detail"] 
+
+@pytest.mark.asyncio
+async def test_create_crew_stream(client, mock_crew_generation_service):
+    """Test crew creation streamed as server-sent events."""
+    async def stream_crew(request, group_context):
+        yield "agent", {"index": 0, "agent": {"name": "Researcher"}}
+        yield "task", {"index": 0, "task": {"name": "Research"}}
+        yield "crew", {"agents": [{"id": "abc123"}], "tasks": [{"id": "def456"}]}
+
+    mock_crew_generation_service.stream_crew = MagicMock(side_effect=stream_crew)
+
+    with patch.object(CrewGenerationService, "create", return_value=mock_crew_generation_service):
+        response = client.post("/crew/create-crew/stream", json={"prompt": "Create a research crew"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.split("\n\n")[:3] == [
+        'event: agent\ndata: {"index": 0, "agent": {"name": "Researcher"}}',
+        'event: task\ndata: {"index": 0, "task": {"name": "Research"}}',
+        'event: crew\ndata: {"agents": [{"id": "abc123"}], "tasks": [{"id": "def456"}]}',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_crew_stream_general_error(client, mock_crew_generation_service):
+    """Test unexpected errors during streaming end the stream with an error event."""
+    async def stream_crew(request, group_context):
+        raise Exception("Service unavailable")
+        yield
+
+    mock_crew_generation_service.stream_crew = MagicMock(side_effect=stream_crew)
+
+    with patch.object(CrewGenerationService, "create", return_value=mock_crew_generation_service):
+        response = client.post("/crew/create-crew/stream", json={"prompt": "Create a crew"})
+
+    assert response.status_code == 200
+    assert response.text == 'event: error\ndata: {"status_code": 500, "detail": "Error creating crew"}\n\n'
@@ -281,6 +281,38 @@ class TestGetExecutionHistory:
         response = client.get("/executions/history?offset=-1")
         assert response.status_code == 422  # Validation error
     
+    def test_get_execution_history_page(self, client, mock_execution_history_service, mock_group_context):
+        """Test cursor-paginated execution history retrieval."""
+        from src.schemas.execution_history import ExecutionHistoryPage
+        page = ExecutionHistoryPage(
+            executions=[{"id": 2, "job_id": "exec-2", "status": "completed", "created_at": datetime.utcnow()}],
+            next_cursor="next",
+            has_more=True,
+            total=5,
+            limit=1
+        )
+        mock_execution_history_service.get_execution_history_page.return_value = page
+        
+        response = client.get("/executions/history/page?limit=1&cursor=abc")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["next_cursor"] == "next"
+        assert data["has_more"] is True
+        assert data["executions"][0]["job_id"] == "exec-2"
+        assert "result" not in data["executions"][0]
+        mock_execution_history_service.get_execution_history_page.assert_called_once_with(
+            1, "abc", group_ids=mock_group_context.group_ids
+        )
+    
+    def test_get_execution_history_page_invalid_cursor(self, client, mock_execution_history_service):
+        """Test that a malformed cursor is rejected."""
+        mock_execution_history_service.get_execution_history_page.side_effect = ValueError("Invalid history cursor: x")
+        
+        response = client.get("/executions/history/page?cursor=x")
+        
+        assert response.status_code == 400
+    
     def test_get_execution_history_service_error(self, client, mock_execution_history_service, mock_group_context):
         """Test execution history retrieval with service error."""
         mock_execution_history_service.get_execution_history.side_effect = Exception("Database error")
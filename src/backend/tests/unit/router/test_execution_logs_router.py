@@ -200,7 +200,7 @@ class TestWebSocketExecutionLogs:
         
         # Verify calls
         mock_group_context_class.from_email.assert_called_once_with(tenant_email)
-        mock_service.connect_with_group.assert_called_once_with(mock_websocket, execution_id, mock_group_instance)
+        mock_service.connect_with_group.assert_called_once_with(mock_websocket, execution_id, mock_group_instance, resume_after=None)
         mock_service.disconnect.assert_called_once_with(mock_websocket, execution_id)
         mock_logger.info.assert_called()
     
@@ -237,9 +237,34 @@ class TestWebSocketExecutionLogs:
         
         # Verify GroupContext() was called without arguments
         mock_group_context_class.assert_called_once_with()
-        mock_service.connect_with_group.assert_called_once_with(mock_websocket, execution_id, mock_group_instance)
+        mock_service.connect_with_group.assert_called_once_with(mock_websocket, execution_id, mock_group_instance, resume_after=None)
         mock_service.disconnect.assert_called_once_with(mock_websocket, execution_id)
     
+    @patch('src.api.execution_logs_router.execution_logs_service')
+    @patch('src.utils.user_context.GroupContext')
+    @patch('src.api.execution_logs_router.logger')
+    def test_websocket_execution_logs_resume_after(self, mock_logger, mock_group_context_class, mock_service):
+        """Test that a valid resume_after query parameter is passed on and an invalid one ignored."""
+        execution_id = "exec-123"
+        mock_group_instance = MagicMock()
+        mock_group_context_class.return_value = mock_group_instance
+        mock_service.connect_with_group = AsyncMock()
+        mock_service.disconnect = AsyncMock()
+        
+        from src.api.execution_logs_router import websocket_execution_logs
+        import asyncio
+        
+        for resume_after, expected in (("42", 42), ("not-a-number", None)):
+            mock_websocket = AsyncMock()
+            mock_websocket.query_params = {"resume_after": resume_after}
+            mock_websocket.receive_text = AsyncMock(side_effect=WebSocketDisconnect(code=1000))
+            
+            asyncio.run(websocket_execution_logs(mock_websocket, execution_id))
+            
+            mock_service.connect_with_group.assert_called_with(
+                mock_websocket, execution_id, mock_group_instance, resume_after=expected
+            )
+    
     @patch('src.api.execution_logs_router.execution_logs_service')
     @patch('src.api.execution_logs_router.GroupContext')
     @patch('src.api.execution_logs_router.logger')
@@ -345,6 +370,20 @@ class TestGetExecutionLogs:
         assert response.status_code == 422
 
 
+class TestGetLogStreamStats:
+    """Test cases for the live log stream stats endpoint."""
+    
+    @patch('src.api.execution_logs_router.execution_logs_service')
+    def test_get_log_stream_stats(self, mock_service, client_logs):
+        """Test that the hub's aggregate stats are returned."""
+        mock_service.hub.get_stats = MagicMock(return_value={"subscribers": 2, "dropped": 0})
+        
+        response = client_logs.get("/logs/streams/stats")
+        
+        assert response.status_code == 200
+        assert response.json() == {"subscribers": 2, "dropped": 0}
+
+
 class TestGetRunLogs:
     """Test cases for get run logs endpoint."""
     
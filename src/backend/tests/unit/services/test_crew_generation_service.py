@@ -4,6 +4,7 @@ Unit tests for CrewGenerationService.
 Tests the functionality of crew generation service including
 LLM-based crew creation, tool management, and documentation retrieval.
 """
+import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch, call
 from datetime import datetime
@@ -602,6 +603,77 @@ class TestCreateCrewComplete:
                                         await crew_generation_service.create_crew_complete(sample_crew_request)
 
 
+class TestStreamCrew:
+    """Test cases for stream_crew method."""
+    
+    @staticmethod
+    def _stream_chunks(text, size=11):
+        async def stream():
+            for start in range(0, len(text), size):
+                yield {"choices": [{"delta": {"content": text[start:start + size]}}]}
+        return stream()
+    
+    @pytest.mark.asyncio
+    async def test_stream_crew_reports_agents_and_tasks_before_the_crew(self, crew_generation_service,
+                                                                       sample_crew_request, sample_tools,
+                                                                       sample_llm_response, mock_group_context):
+        """Test agents and tasks are streamed as they close, then the created crew."""
+        created = {"agents": [{"id": "a1"}, {"id": "a2"}], "tasks": [{"id": "t1"}, {"id": "t2"}]}
+        
+        with patch('src.services.crew_generation_service.UnitOfWork'), \
+             patch('src.services.crew_generation_service.ToolService') as mock_tool_service_class, \
+             patch('src.services.crew_generation_service.litellm') as mock_litellm, \
+             patch('src.services.crew_generation_service.LLMManager') as mock_llm_manager, \
+             patch.object(crew_generation_service, '_prepare_prompt_template', AsyncMock(return_value="System message")), \
+             patch.object(crew_generation_service, '_get_relevant_documentation', AsyncMock(return_value="")):
+            mock_tool_service = AsyncMock()
+            mock_tool_service.get_all_tools.return_value.tools = sample_tools
+            mock_tool_service_class.from_unit_of_work = AsyncMock(return_value=mock_tool_service)
+            mock_llm_manager.configure_litellm = AsyncMock(return_value={"model": "test-model"})
+            mock_litellm.acompletion = AsyncMock(
+                return_value=self._stream_chunks(json.dumps(sample_llm_response))
+            )
+            crew_generation_service.crew_generator_repository.create_crew_entities = AsyncMock(return_value=created)
+            
+            events = [
+                event async for event in crew_generation_service.stream_crew(
+                    sample_crew_request, group_context=mock_group_context
+                )
+            ]
+        
+        assert [(event, data.get("index")) for event, data in events] == [
+            ("agent", 0), ("agent", 1), ("task", 0), ("task", 1), ("crew", None)
+        ]
+        assert events[0][1]["agent"]["name"] == "data_analyst"
+        assert events[3][1]["task"]["name"] == "create_visualizations"
+        assert events[-1][1] == created
+        assert mock_litellm.acompletion.call_args.kwargs["stream"] is True
+        crew_dict = crew_generation_service.crew_generator_repository.create_crew_entities.call_args.args[0]
+        assert [task["agent"] for task in crew_dict["tasks"]] == ["data_analyst", "visualizer"]
+    
+    @pytest.mark.asyncio
+    async def test_stream_crew_invalid_setup_creates_nothing(self, crew_generation_service, sample_crew_request):
+        """Test a setup without agents raises ValueError before anything is created."""
+        with patch('src.services.crew_generation_service.UnitOfWork'), \
+             patch('src.services.crew_generation_service.ToolService') as mock_tool_service_class, \
+             patch('src.services.crew_generation_service.litellm') as mock_litellm, \
+             patch('src.services.crew_generation_service.LLMManager') as mock_llm_manager, \
+             patch.object(crew_generation_service, '_prepare_prompt_template', AsyncMock(return_value="System message")), \
+             patch.object(crew_generation_service, '_get_relevant_documentation', AsyncMock(return_value="")):
+            mock_tool_service = AsyncMock()
+            mock_tool_service.get_all_tools.return_value.tools = []
+            mock_tool_service_class.from_unit_of_work = AsyncMock(return_value=mock_tool_service)
+            mock_llm_manager.configure_litellm = AsyncMock(return_value={"model": "test-model"})
+            mock_litellm.acompletion = AsyncMock(return_value=self._stream_chunks('{"agents": [], "tasks": []}'))
+            crew_generation_service.crew_generator_repository.create_crew_entities = AsyncMock()
+            
+            with pytest.raises(ValueError, match="Error generating crew"):
+                async for _ in crew_generation_service.stream_crew(sample_crew_request):
+                    pass
+        
+        crew_generation_service.crew_generator_repository.create_crew_entities.assert_not_called()
+
+
 class TestCreateToolNameToIdMap:
     """Test cases for _create_tool_name_to_id_map method."""
     
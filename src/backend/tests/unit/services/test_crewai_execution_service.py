@@ -63,6 +63,23 @@ class TestCrewAIExecutionService:
         """Test service initialization."""
         assert isinstance(execution_service, CrewAIExecutionService)
     
+    @pytest.mark.asyncio
+    async def test_prepare_and_run_crew_passes_trace_level(self, execution_service, crew_config, group_context):
+        """Test the crew's trace level reaches the engine, which starts trace capture with it."""
+        crew_config.trace_level = "summary"
+        mock_engine = AsyncMock()
+        mock_engine.run_execution.return_value = {"status": "running"}
+
+        with patch('src.services.crewai_execution_service.EngineFactory.get_engine', return_value=mock_engine):
+            await execution_service.prepare_and_run_crew(
+                execution_id="test-exec-123",
+                config=crew_config,
+                group_context=group_context
+            )
+
+        execution_config = mock_engine.run_execution.call_args[0][1]
+        assert execution_config["trace_level"] == "summary"
+
     @pytest.mark.asyncio
     async def test_prepare_and_run_crew_success(self, execution_service, crew_config, group_context):
         """Test successful crew preparation and execution."""
@@ -0,0 +1,209 @@
+"""
+Unit tests for the batched, cached Databricks embedding service.
+"""
+import asyncio
+import threading
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.services.databricks_embedding_service import (
+    DatabricksEmbeddingError,
+    DatabricksEmbeddingService,
+    EmbeddingCache,
+)
+
+WORKSPACE = "https://example.cloud.databricks.com"
+HEADERS = {"Authorization": "Bearer token"}
+
+
+def fake_vectors(texts):
+    """One distinguishable vector per text."""
+    return [[float(len(text)), 1.0] for text in texts]
+
+
+def make_service():
+    service = DatabricksEmbeddingService(cache=EmbeddingCache(max_size=100))
+    service._request = AsyncMock(side_effect=lambda url, workspace, headers, texts: fake_vectors(texts))
+    return service
+
+
+class TestEmbeddingCache:
+    """Test cases for EmbeddingCache."""
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(max_size=2)
+        cache.put_many({"a": [1.0], "b": [2.0]})
+        cache.get("a")
+        cache.put_many({"c": [3.0]})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == [1.0]
+        assert cache.get("c") == [3.0]
+
+    def test_zero_size_disables_cache(self):
+        cache = EmbeddingCache(max_size=0)
+        cache.put_many({"a": [1.0]})
+
+        assert cache.get("a") is None
+        assert cache.get_stats()["size"] == 0
+
+    def test_vectors_persist_in_sqlite(self, tmp_path):
+        path = str(tmp_path / "embeddings.db")
+        cache = EmbeddingCache(max_size=10, path=path)
+        cache.put_many({"a": [0.5, -1.25]})
+        cache.close()
+
+        reopened = EmbeddingCache(max_size=10, path=path)
+        assert reopened.get("a") == [0.5, -1.25]
+        assert reopened.get_stats()["disk_hits"] == 1
+        reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_sqlite_is_used_off_the_event_loop(self, tmp_path):
+        cache = EmbeddingCache(max_size=10, path=str(tmp_path / "embeddings.db"))
+        disk_threads = []
+        read_disk, write_disk = cache._read_disk, cache._write_disk
+
+        def record_thread(method):
+            def wrapper(*args):
+                disk_threads.append(threading.current_thread())
+                return method(*args)
+            return wrapper
+
+        cache._read_disk, cache._write_disk = record_thread(read_disk), record_thread(write_disk)
+        await cache.put_many_async({"a": [0.5]})
+        cache.clear()
+
+        assert await cache.get_many_async(["a", "b", "a"]) == [[0.5], None, [0.5]]
+        assert len(disk_threads) == 2
+        assert threading.current_thread() not in disk_threads
+        assert cache.get_stats()["disk_hits"] == 1
+        cache.close()
+
+    def test_keys_depend_on_model_and_text(self):
+        assert EmbeddingCache.make_key("m1", "text") == EmbeddingCache.make_key("m1", "text")
+        assert EmbeddingCache.make_key("m1", "text") != EmbeddingCache.make_key("m2", "text")
+
+
+class TestDatabricksEmbeddingService:
+    """Test cases for DatabricksEmbeddingService."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_embeds_share_one_request(self):
+        service = make_service()
+
+        results = await asyncio.gather(*(
+            service.embed([f"text {i}"], "databricks-gte-large-en", WORKSPACE, HEADERS) for i in range(10)
+        ))
+
+        assert service._request.await_count == 1
+        assert len(service._request.await_args.args[3]) == 10
+        assert results[3] == [fake_vectors(["text 3"])[0]]
+
+    @pytest.mark.asyncio
+    async def test_identical_texts_are_requested_once(self):
+        service = make_service()
+
+        results = await asyncio.gather(
+            service.embed(["same", "same"], "model", WORKSPACE, HEADERS),
+            service.embed(["same"], "model", WORKSPACE, HEADERS),
+        )
+
+        assert service._request.await_args.args[3] == ["same"]
+        assert results[0] == [[4.0, 1.0], [4.0, 1.0]]
+        assert results[1] == [[4.0, 1.0]]
+
+    @pytest.mark.asyncio
+    async def test_cached_vectors_skip_the_endpoint(self):
+        service = make_service()
+        await service.embed(["hello"], "model", WORKSPACE, HEADERS)
+
+        assert await service.embed(["hello"], "databricks/model", WORKSPACE, HEADERS) == [[5.0, 1.0]]
+        assert service._request.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_batches_are_split_at_max_size(self):
+        service = make_service()
+
+        with patch("src.services.databricks_embedding_service.settings") as mock_settings:
+            mock_settings.EMBEDDING_MAX_BATCH_SIZE = 3
+            mock_settings.EMBEDDING_BATCH_WINDOW = 0.01
+            mock_settings.EMBEDDING_CACHE_PATH = None
+            mock_settings.EMBEDDING_MAX_BATCHERS = 10
+            await service.embed([f"t{i}" for i in range(7)], "model", WORKSPACE, HEADERS)
+
+        assert [len(call.args[3]) for call in service._request.await_args_list] == [3, 3, 1]
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_batchers_are_dropped(self):
+        service = make_service()
+
+        with patch("src.services.databricks_embedding_service.settings") as mock_settings:
+            mock_settings.EMBEDDING_MAX_BATCH_SIZE = 64
+            mock_settings.EMBEDDING_BATCH_WINDOW = 0.01
+            mock_settings.EMBEDDING_CACHE_PATH = None
+            mock_settings.EMBEDDING_MAX_BATCHERS = 2
+            for index, user in enumerate(["a", "b", "a", "c"]):
+                await service.embed([f"text {index}"], "model", WORKSPACE, {"Authorization": f"Bearer {user}"})
+
+        _, batchers = service._batchers[id(asyncio.get_running_loop())]
+        assert [authorization for _, authorization in batchers] == ["Bearer a", "Bearer c"]
+        assert service._request.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiting_caller(self):
+        service = make_service()
+        service._request.side_effect = DatabricksEmbeddingError("boom", status=500)
+
+        results = await asyncio.gather(
+            service.embed(["a"], "model", WORKSPACE, HEADERS),
+            service.embed(["b"], "model", WORKSPACE, HEADERS),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, DatabricksEmbeddingError) for result in results)
+        assert service.cache.get(EmbeddingCache.make_key("model", "a")) is None
+
+    @pytest.mark.asyncio
+    async def test_request_orders_vectors_by_index(self):
+        service = DatabricksEmbeddingService(cache=EmbeddingCache(max_size=10))
+        response = MagicMock()
+        response.status = 200
+        response.json = AsyncMock(return_value={"data": [
+            {"index": 1, "embedding": [2.0]},
+            {"index": 0, "embedding": [1.0]},
+        ]})
+        session = MagicMock()
+        session.post.return_value.__aenter__ = AsyncMock(return_value=response)
+        session.post.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        with patch("src.services.databricks_embedding_service.databricks_http_pool.get_session",
+                   return_value=session):
+            result = await service.embed(["first", "second"], "model", WORKSPACE, HEADERS)
+
+        assert result == [[1.0], [2.0]]
+        assert session.post.call_args.kwargs["json"] == {"input": ["first", "second"]}
+
+    @pytest.mark.asyncio
+    async def test_request_error_carries_status(self):
+        service = DatabricksEmbeddingService(cache=EmbeddingCache(max_size=10))
+        response = MagicMock()
+        response.status = 401
+        response.text = AsyncMock(return_value="Unauthorized")
+        session = MagicMock()
+        session.post.return_value.__aenter__ = AsyncMock(return_value=response)
+        session.post.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        with patch("src.services.databricks_embedding_service.databricks_http_pool.get_session",
+                   return_value=session):
+            with pytest.raises(DatabricksEmbeddingError) as exc_info:
+                await service.embed(["text"], "model", WORKSPACE, HEADERS)
+
+        assert exc_info.value.status == 401
+
+    def test_stats_report_average_batch_size(self):
+        service = DatabricksEmbeddingService(cache=EmbeddingCache(max_size=10))
+        service._stats.update(requests=2, texts_requested=10)
+
+        assert service.get_stats()["average_batch_size"] == 5.0
@@ -0,0 +1,160 @@
+"""
+Unit tests for EventBus.
+
+Tests the bounded capacity, the overflow policies and the asyncio-aware
+consumer wakeups.
+"""
+import asyncio
+import queue
+import threading
+import time
+import pytest
+
+from src.services.event_bus import EventBus, OverflowPolicy, wait_for_items
+from src.services.execution_logs_queue import _coalesce_logs
+
+
+class TestOverflowPolicies:
+    """Test cases for the overflow policies."""
+
+    def test_drop_oldest_keeps_newest_items(self):
+        bus = EventBus(maxsize=3)
+        for i in range(5):
+            bus.put_nowait(i)
+
+        assert list(bus.queue) == [2, 3, 4]
+        stats = bus.get_stats()
+        assert stats["dropped"] == 2
+        assert stats["depth"] == 3
+        # Dropped items do not count as unfinished work
+        assert bus.unfinished_tasks == 3
+
+    def test_coalesce_merges_into_newest_item(self):
+        bus = EventBus(maxsize=2, overflow_policy=OverflowPolicy.COALESCE, coalesce=_coalesce_logs)
+        for content in ("a", "b", "c"):
+            bus.put_nowait({"job_id": "exec-1", "content": content})
+
+        assert bus.qsize() == 2
+        assert bus.queue[-1]["content"] == "b\nc"
+        assert bus.get_stats()["coalesced"] == 1
+
+    def test_coalesce_falls_back_to_drop_oldest(self):
+        bus = EventBus(maxsize=2, overflow_policy="coalesce", coalesce=_coalesce_logs)
+        for job_id in ("exec-1", "exec-2", "exec-3"):
+            bus.put_nowait({"job_id": job_id, "content": "line"})
+
+        assert [item["job_id"] for item in bus.queue] == ["exec-2", "exec-3"]
+        assert bus.get_stats()["dropped"] == 1
+
+    def test_coalesce_can_fall_back_to_backpressure(self):
+        bus = EventBus(maxsize=1, overflow_policy=OverflowPolicy.COALESCE, coalesce=_coalesce_logs,
+                       backpressure_timeout=0.05, coalesce_fallback=OverflowPolicy.BACKPRESSURE)
+        bus.put_nowait({"job_id": "exec-1", "content": "a"})
+        bus.put_nowait({"job_id": "exec-1", "content": "b"})
+
+        with pytest.raises(queue.Full):
+            bus.put({"job_id": "exec-2", "content": "c"})
+        assert [item["content"] for item in bus.queue] == ["a\nb"]
+        stats = bus.get_stats()
+        assert stats["rejected"] == 1
+        assert stats["dropped"] == 0
+
+    def test_backpressure_blocks_worker_thread_until_room(self):
+        bus = EventBus(maxsize=1, overflow_policy=OverflowPolicy.BACKPRESSURE, backpressure_timeout=2)
+        bus.put_nowait("first")
+        published = threading.Event()
+
+        def producer():
+            bus.put("second")
+            published.set()
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+        assert not published.wait(0.05)
+
+        assert bus.get_nowait() == "first"
+        thread.join(timeout=2)
+        assert published.is_set()
+        assert list(bus.queue) == ["second"]
+
+    def test_backpressure_times_out(self):
+        bus = EventBus(maxsize=1, overflow_policy=OverflowPolicy.BACKPRESSURE, backpressure_timeout=0.05)
+        bus.put_nowait("first")
+
+        with pytest.raises(queue.Full):
+            bus.put("second")
+        assert bus.get_stats()["rejected"] == 1
+
+    def test_backpressure_put_nowait_never_blocks(self):
+        bus = EventBus(maxsize=1, overflow_policy=OverflowPolicy.BACKPRESSURE, backpressure_timeout=10)
+        bus.put_nowait("first")
+
+        started = time.monotonic()
+        with pytest.raises(queue.Full):
+            bus.put_nowait("second")
+        assert time.monotonic() - started < 1
+        assert bus.get_stats()["rejected"] == 1
+
+    def test_backpressure_honours_the_callers_timeout(self):
+        bus = EventBus(maxsize=1, overflow_policy=OverflowPolicy.BACKPRESSURE, backpressure_timeout=10)
+        bus.put("first")
+
+        started = time.monotonic()
+        with pytest.raises(queue.Full):
+            bus.put("second", timeout=0.05)
+        assert time.monotonic() - started < 1
+        with pytest.raises(ValueError):
+            bus.put("second", timeout=-1)
+
+    @pytest.mark.asyncio
+    async def test_backpressure_never_blocks_event_loop(self):
+        bus = EventBus(maxsize=1, overflow_policy=OverflowPolicy.BACKPRESSURE, backpressure_timeout=10)
+        bus.put_nowait("first")
+
+        started = time.monotonic()
+        with pytest.raises(queue.Full):
+            bus.put("second")
+        assert time.monotonic() - started < 1
+
+
+class TestWaitForItems:
+    """Test cases for awaiting the bus."""
+
+    @pytest.mark.asyncio
+    async def test_producer_thread_wakes_consumer(self):
+        bus = EventBus(maxsize=10)
+        threading.Timer(0.05, bus.put_nowait, args=("item",)).start()
+
+        started = time.monotonic()
+        assert await bus.wait_for_items(timeout=2) is True
+        assert time.monotonic() - started < 1
+
+    @pytest.mark.asyncio
+    async def test_returns_immediately_when_items_queued(self):
+        bus = EventBus()
+        bus.put_nowait("item")
+
+        assert await bus.wait_for_items(timeout=0) is True
+
+    @pytest.mark.asyncio
+    async def test_times_out_on_empty_bus(self):
+        bus = EventBus()
+
+        assert await bus.wait_for_items(timeout=0.01) is False
+        assert bus._waiters == []
+
+    @pytest.mark.asyncio
+    async def test_shutdown_event_wakes_helper(self):
+        bus = EventBus()
+        shutdown_event = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.05, shutdown_event.set)
+
+        started = time.monotonic()
+        await wait_for_items(bus, None, shutdown_event)
+        assert time.monotonic() - started < 1
+
+    @pytest.mark.asyncio
+    async def test_helper_falls_back_to_sleep_for_plain_queue(self):
+        started = time.monotonic()
+        await wait_for_items(queue.Queue(), 0.01)
+        assert time.monotonic() - started < 1
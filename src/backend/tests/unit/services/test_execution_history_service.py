@@ -5,14 +5,19 @@ import pytest
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from sqlalchemy.exc import SQLAlchemyError
 from typing import List
+from datetime import datetime
 
 from src.services.execution_history_service import (
     ExecutionHistoryService,
-    get_execution_history_service
+    decode_history_cursor,
+    encode_history_cursor,
+    get_execution_history_service,
+    invalidate_execution_history_count_cache
 )
 from src.schemas.execution_history import (
     ExecutionHistoryItem,
     ExecutionHistoryList,
+    ExecutionHistoryPage,
     ExecutionOutput,
     ExecutionOutputList,
     DeleteResponse
@@ -178,6 +183,69 @@ class TestExecutionHistoryService:
         with pytest.raises(Exception):
             await service.get_execution_history()
 
+    @pytest.mark.asyncio
+    async def test_get_execution_history_page(self, service, mock_history_repo):
+        """Test cursor pagination of execution summaries."""
+        rows = [
+            {'id': 3, 'job_id': 'job-3', 'status': 'completed', 'created_at': datetime(2024, 1, 3)},
+            {'id': 2, 'job_id': 'job-2', 'status': 'failed', 'created_at': datetime(2024, 1, 2)},
+            {'id': 1, 'job_id': 'job-1', 'status': 'completed', 'created_at': datetime(2024, 1, 1)},
+        ]
+        mock_history_repo.get_execution_summaries = AsyncMock(return_value=rows)
+        mock_history_repo.count_executions = AsyncMock(return_value=3)
+        
+        page = await service.get_execution_history_page(limit=2, group_ids=["group1"])
+        
+        assert isinstance(page, ExecutionHistoryPage)
+        assert [item.job_id for item in page.executions] == ['job-3', 'job-2']
+        assert page.has_more is True
+        assert page.total == 3
+        assert decode_history_cursor(page.next_cursor) == (datetime(2024, 1, 2), 2)
+        mock_history_repo.get_execution_summaries.assert_called_once_with(limit=3, before=None, group_ids=["group1"])
+
+    @pytest.mark.asyncio
+    async def test_get_execution_history_page_with_cursor(self, service, mock_history_repo):
+        """Test that the cursor is passed to the repository and the last page has no cursor."""
+        mock_history_repo.get_execution_summaries = AsyncMock(return_value=[
+            {'id': 1, 'job_id': 'job-1', 'created_at': datetime(2024, 1, 1)}
+        ])
+        mock_history_repo.count_executions = AsyncMock(return_value=3)
+        cursor = encode_history_cursor(datetime(2024, 1, 2), 2)
+        
+        page = await service.get_execution_history_page(limit=2, cursor=cursor)
+        
+        assert page.has_more is False
+        assert page.next_cursor is None
+        mock_history_repo.get_execution_summaries.assert_called_once_with(
+            limit=3, before=(datetime(2024, 1, 2), 2), group_ids=None
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_execution_history_page_invalid_cursor(self, service, mock_history_repo):
+        """Test that a malformed cursor raises ValueError."""
+        mock_history_repo.get_execution_summaries = AsyncMock()
+        
+        with pytest.raises(ValueError):
+            await service.get_execution_history_page(cursor="not-a-cursor")
+        
+        mock_history_repo.get_execution_summaries.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_execution_history_page_caches_total(self, service, mock_history_repo):
+        """Test that the total is counted once per group set until invalidated."""
+        mock_history_repo.get_execution_summaries = AsyncMock(return_value=[])
+        mock_history_repo.count_executions = AsyncMock(return_value=7)
+        
+        await service.get_execution_history_page(group_ids=["b", "a"])
+        page = await service.get_execution_history_page(group_ids=["a", "b"])
+        
+        assert page.total == 7
+        mock_history_repo.count_executions.assert_awaited_once()
+        
+        invalidate_execution_history_count_cache()
+        await service.get_execution_history_page(group_ids=["a", "b"])
+        assert mock_history_repo.count_executions.await_count == 2
+
     @pytest.mark.asyncio
     async def test_get_execution_by_id_success(self, service, mock_history_repo, sample_run_data):
         """Test successful execution retrieval by ID."""
@@ -0,0 +1,173 @@
+"""
+Unit tests for the execution logs WebSocket hub.
+"""
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.services.execution_logs_hub import ExecutionLogsHub
+
+
+def make_websocket(send_text=None):
+    websocket = MagicMock()
+    websocket.send_text = send_text or AsyncMock()
+    websocket.close = AsyncMock()
+    return websocket
+
+
+def sent_messages(websocket):
+    return [json.loads(call.args[0]) for call in websocket.send_text.call_args_list]
+
+
+async def drain():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+class TestExecutionLogsHub:
+    """Test cases for ExecutionLogsHub."""
+
+    def test_publish_without_subscribers_is_a_no_op(self):
+        hub = ExecutionLogsHub()
+
+        assert hub.publish("exec-1", "line") is None
+        assert hub.get_stats()["published"] == 0
+
+    @pytest.mark.asyncio
+    async def test_message_is_serialized_once_for_all_subscribers(self):
+        hub = ExecutionLogsHub()
+        websockets = [make_websocket() for _ in range(3)]
+        for websocket in websockets:
+            hub.subscribe(websocket, "exec-1")[0].start()
+
+        with patch("src.services.execution_logs_hub.json.dumps", wraps=json.dumps) as dumps:
+            seq = hub.publish("exec-1", "line")
+        await drain()
+
+        assert dumps.call_count == 1
+        for websocket in websockets:
+            assert sent_messages(websocket) == [{
+                "execution_id": "exec-1",
+                "content": "line",
+                "timestamp": sent_messages(websocket)[0]["timestamp"],
+                "type": "live",
+                "seq": seq,
+            }]
+        assert hub.get_stats()["sent"] == 3
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_others(self):
+        hub = ExecutionLogsHub()
+        release = asyncio.Event()
+
+        async def slow_send(payload):
+            await release.wait()
+
+        slow = make_websocket(AsyncMock(side_effect=slow_send))
+        fast = make_websocket()
+        hub.subscribe(slow, "exec-1")[0].start()
+        hub.subscribe(fast, "exec-1")[0].start()
+
+        for i in range(3):
+            hub.publish("exec-1", f"line {i}")
+        await drain()
+
+        assert [m["content"] for m in sent_messages(fast)] == ["line 0", "line 1", "line 2"]
+        assert hub.get_stats()["max_lag"] == 2
+
+        release.set()
+        await drain()
+        assert hub.get_stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_drops_oldest(self):
+        hub = ExecutionLogsHub()
+        websocket = make_websocket()
+        subscriber, _ = hub.subscribe(websocket, "exec-1")
+
+        with patch("src.services.execution_logs_hub.settings") as settings:
+            settings.LOGS_WS_CLIENT_BUFFER_SIZE = 2
+            settings.LOGS_WS_OVERFLOW_POLICY = "drop_oldest"
+            settings.LOGS_WS_RESUME_WINDOW = 300.0
+            settings.LOGS_WS_SEND_TIMEOUT = 10.0
+            for i in range(4):
+                hub.publish("exec-1", f"line {i}")
+            subscriber.start()
+            await drain()
+
+        assert [m["content"] for m in sent_messages(websocket)] == ["line 2", "line 3"]
+        assert hub.get_stats()["dropped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_coalesces_into_newest_message(self):
+        hub = ExecutionLogsHub()
+        websocket = make_websocket()
+        subscriber, _ = hub.subscribe(websocket, "exec-1")
+
+        with patch("src.services.execution_logs_hub.settings") as settings:
+            settings.LOGS_WS_CLIENT_BUFFER_SIZE = 2
+            settings.LOGS_WS_OVERFLOW_POLICY = "coalesce"
+            settings.LOGS_WS_RESUME_WINDOW = 300.0
+            settings.LOGS_WS_SEND_TIMEOUT = 10.0
+            seqs = [hub.publish("exec-1", f"line {i}") for i in range(4)]
+            subscriber.start()
+            await drain()
+
+        messages = sent_messages(websocket)
+        assert [m["content"] for m in messages] == ["line 0", "line 1\nline 2\nline 3"]
+        assert messages[-1]["seq"] == seqs[-1]
+        assert hub.get_stats()["coalesced"] == 2
+        assert hub.get_stats()["dropped"] == 0
+
+    @pytest.mark.asyncio
+    async def test_resume_sends_only_missed_messages(self):
+        hub = ExecutionLogsHub()
+        first = make_websocket()
+        subscriber, _ = hub.subscribe(first, "exec-1")
+        subscriber.start()
+        seqs = [hub.publish("exec-1", f"line {i}") for i in range(3)]
+        await drain()
+        hub.unsubscribe(subscriber)
+        hub.publish("exec-1", "line 3")
+
+        second = make_websocket()
+        subscriber, resumed = hub.subscribe(second, "exec-1", resume_after=seqs[0])
+        subscriber.start()
+        await drain()
+
+        assert resumed is True
+        assert [m["content"] for m in sent_messages(second)] == ["line 1", "line 2", "line 3"]
+        assert hub.get_stats()["resumed"] == 1
+
+    def test_resume_outside_the_buffer_is_refused(self):
+        hub = ExecutionLogsHub()
+        hub.subscribe(make_websocket(), "exec-1")
+        seq = hub.publish("exec-1", "line")
+
+        assert hub.subscribe(make_websocket(), "exec-1", resume_after=seq - 5)[1] is False
+        assert hub.subscribe(make_websocket(), "exec-2", resume_after=seq)[1] is False
+
+    @pytest.mark.asyncio
+    async def test_failed_send_disconnects_the_client(self):
+        hub = ExecutionLogsHub()
+        websocket = make_websocket(AsyncMock(side_effect=RuntimeError("closed")))
+        hub.subscribe(websocket, "exec-1")[0].start()
+
+        hub.publish("exec-1", "line")
+        await drain()
+
+        assert hub.has_subscribers("exec-1") is False
+        websocket.close.assert_called_once()
+        assert hub.get_stats()["send_failures"] == 1
+
+    def test_unsubscribe_websocket(self):
+        hub = ExecutionLogsHub()
+        websocket = make_websocket()
+        hub.subscribe(websocket, "exec-1")
+
+        assert hub.get_connections() == {"exec-1": {websocket}}
+        assert hub.unsubscribe_websocket(websocket, "exec-1") is True
+        assert hub.unsubscribe_websocket(websocket, "exec-1") is False
+        assert hub.get_connections() == {}
@@ -72,9 +72,9 @@ class TestJobOutputQueue:
         
         assert queue1 is queue2
     
-    @patch('queue.Queue')
+    @patch('src.services.execution_logs_queue.EventBus')
     def test_queue_creation_called_once(self, mock_queue_class):
-        """Test that queue.Queue() is called only once during singleton creation."""
+        """Test that the event bus is created only once during singleton creation."""
         mock_queue_instance = MagicMock()
         mock_queue_class.return_value = mock_queue_instance
         
@@ -83,7 +83,7 @@ class TestJobOutputQueue:
         JobOutputQueue()
         JobOutputQueue()
         
-        # queue.Queue() should be called only once
+        # The bus should be created only once
         mock_queue_class.assert_called_once()
 
 
@@ -63,6 +63,19 @@ def execution_logs_service_instance():
     return ExecutionLogsService()
 
 
+def subscribe(service, websocket, execution_id):
+    """Register a connected client without going through connect()."""
+    subscriber, _ = service.hub.subscribe(websocket, execution_id)
+    subscriber.start()
+    return subscriber
+
+
+async def drain():
+    """Let the subscribers' sender tasks deliver buffered messages."""
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
 class TestExecutionLogsService:
     """Test cases for ExecutionLogsService."""
     
@@ -72,8 +85,7 @@ class TestExecutionLogsService:
         service = execution_logs_service_instance
         
         assert service.active_connections == {}
-        assert service._lock is not None
-        assert isinstance(service._lock, asyncio.Lock)
+        assert service.hub.get_stats()["topics"] == 0
     
     @pytest.mark.asyncio
     async def test_connect_new_execution(self, execution_logs_service_instance, mock_websocket):
@@ -104,7 +116,7 @@ class TestExecutionLogsService:
         
         # Add existing connection
         existing_websocket = MagicMock()
-        service.active_connections[execution_id] = {existing_websocket}
+        subscribe(service, existing_websocket, execution_id)
         
         with patch('src.services.execution_logs_service.execution_logs_repository') as mock_repo:
             mock_repo.get_by_execution_id_with_managed_session.return_value = []
@@ -233,7 +245,7 @@ class TestExecutionLogsService:
         execution_id = "exec-123"
         
         # Add connection first
-        service.active_connections[execution_id] = {mock_websocket}
+        subscribe(service, mock_websocket, execution_id)
         
         await service.disconnect(mock_websocket, execution_id)
         
@@ -248,7 +260,8 @@ class TestExecutionLogsService:
         other_websocket = MagicMock()
         
         # Add multiple connections
-        service.active_connections[execution_id] = {mock_websocket, other_websocket}
+        subscribe(service, mock_websocket, execution_id)
+        subscribe(service, other_websocket, execution_id)
         
         await service.disconnect(mock_websocket, execution_id)
         
@@ -342,6 +355,32 @@ class TestExecutionLogsService:
             
             assert result is False
     
+    @pytest.mark.asyncio
+    async def test_create_execution_logs_batch_success(self, execution_logs_service_instance):
+        """Test bulk execution log creation."""
+        service = execution_logs_service_instance
+        logs = [{"execution_id": "exec-123", "content": "Log 1"}, {"execution_id": "exec-123", "content": "Log 2"}]
+        
+        with patch('src.services.execution_logs_service.execution_logs_repository') as mock_repo:
+            mock_repo.create_many_with_managed_session = AsyncMock(return_value=2)
+            
+            result = await service.create_execution_logs_batch(logs)
+            
+            assert result is True
+            mock_repo.create_many_with_managed_session.assert_called_once_with(logs)
+    
+    @pytest.mark.asyncio
+    async def test_create_execution_logs_batch_failure(self, execution_logs_service_instance):
+        """Test bulk execution log creation failure."""
+        service = execution_logs_service_instance
+        
+        with patch('src.services.execution_logs_service.execution_logs_repository') as mock_repo:
+            mock_repo.create_many_with_managed_session = AsyncMock(side_effect=Exception("Database error"))
+            
+            result = await service.create_execution_logs_batch([{"execution_id": "exec-123", "content": "Log"}])
+            
+            assert result is False
+    
     @pytest.mark.asyncio
     async def test_broadcast_to_execution_no_connections(self, execution_logs_service_instance):
         """Test broadcasting when no connections exist."""
@@ -372,12 +411,13 @@ class TestExecutionLogsService:
         message = "Test message"
         
         # Add connection
-        service.active_connections[execution_id] = {mock_websocket}
+        subscribe(service, mock_websocket, execution_id)
         
         with patch('src.services.execution_logs_service.enqueue_log') as mock_enqueue:
             mock_enqueue.return_value = True
             
             await service.broadcast_to_execution(execution_id, message)
+            await drain()
             
             # Verify log was enqueued
             mock_enqueue.assert_called_once()
@@ -391,6 +431,7 @@ class TestExecutionLogsService:
             assert sent_message["content"] == message
             assert sent_message["type"] == "live"
             assert "timestamp" in sent_message
+            assert isinstance(sent_message["seq"], int)
     
     @pytest.mark.asyncio
     async def test_broadcast_to_execution_with_group(self, execution_logs_service_instance, mock_websocket, group_context):
@@ -399,7 +440,7 @@ class TestExecutionLogsService:
         execution_id = "exec-123"
         message = "Test message"
         
-        service.active_connections[execution_id] = {mock_websocket}
+        subscribe(service, mock_websocket, execution_id)
         
         with patch('src.services.execution_logs_service.enqueue_log') as mock_enqueue:
             mock_enqueue.return_value = True
@@ -420,12 +461,13 @@ class TestExecutionLogsService:
         execution_id = "exec-123"
         message = "Test message"
         
-        service.active_connections[execution_id] = {mock_websocket}
+        subscribe(service, mock_websocket, execution_id)
         
         with patch('src.services.execution_logs_service.enqueue_log') as mock_enqueue:
             mock_enqueue.return_value = False
             
             await service.broadcast_to_execution(execution_id, message)
+            await drain()
             
             # Should continue with WebSocket broadcasting despite enqueue failure
             mock_websocket.send_text.assert_called_once()
@@ -440,16 +482,19 @@ class TestExecutionLogsService:
         # Create mock websocket that fails on send
         failing_websocket = MagicMock()
         failing_websocket.send_text = AsyncMock(side_effect=Exception("WebSocket error"))
+        failing_websocket.close = AsyncMock()
         
-        service.active_connections[execution_id] = {failing_websocket}
+        subscribe(service, failing_websocket, execution_id)
         
         with patch('src.services.execution_logs_service.enqueue_log') as mock_enqueue:
             mock_enqueue.return_value = True
             
             await service.broadcast_to_execution(execution_id, message)
+            await drain()
             
-            # Failing connection should be removed
-            assert failing_websocket not in service.active_connections[execution_id]
+            # Failing connection should be removed and closed
+            assert execution_id not in service.active_connections
+            failing_websocket.close.assert_called_once()
     
     @pytest.mark.asyncio
     async def test_broadcast_to_execution_multiple_connections_partial_failure(self, execution_logs_service_instance):
@@ -464,13 +509,16 @@ class TestExecutionLogsService:
         
         bad_websocket = MagicMock()
         bad_websocket.send_text = AsyncMock(side_effect=Exception("WebSocket error"))
+        bad_websocket.close = AsyncMock()
         
-        service.active_connections[execution_id] = {good_websocket, bad_websocket}
+        subscribe(service, good_websocket, execution_id)
+        subscribe(service, bad_websocket, execution_id)
         
         with patch('src.services.execution_logs_service.enqueue_log') as mock_enqueue:
             mock_enqueue.return_value = True
             
             await service.broadcast_to_execution(execution_id, message)
+            await drain()
             
             # Good connection should remain, bad should be removed
             assert good_websocket in service.active_connections[execution_id]
@@ -596,6 +644,22 @@ class TestSingletonService:
         assert isinstance(execution_logs_service, ExecutionLogsService)
 
 
+def _log_queue(*items):
+    """Build a real queue pre-filled with log entries."""
+    q = queue.Queue()
+    for item in items:
+        q.put_nowait(item)
+    return q
+
+
+async def _run_writer(shutdown_event, delay=0.2, **kwargs):
+    """Run logs_writer_loop briefly, then shut it down."""
+    task = asyncio.create_task(logs_writer_loop(shutdown_event, **kwargs))
+    await asyncio.sleep(delay)
+    shutdown_event.set()
+    await asyncio.wait_for(task, timeout=2)
+
+
 class TestLogsWriterLoop:
     """Test cases for logs_writer_loop function."""
     
@@ -603,152 +667,164 @@ class TestLogsWriterLoop:
     async def test_logs_writer_loop_shutdown_event(self):
         """Test logs writer loop with immediate shutdown."""
         shutdown_event = asyncio.Event()
+        mock_queue = _log_queue()
         
-        # Mock the queue
-        mock_queue = MagicMock()
-        mock_queue.qsize.return_value = 0
-        mock_queue.get.side_effect = Empty()
-        
-        with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue):
-            # Set shutdown event immediately
+        with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue), \
+             patch('src.services.execution_logs_service.execution_logs_service') as mock_service:
             shutdown_event.set()
             
             await logs_writer_loop(shutdown_event)
             
-            # Should exit gracefully without processing
-            mock_queue.qsize.assert_called()
+            # Nothing queued, so nothing is written
+            mock_service.create_execution_logs_batch.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_logs_writer_loop_empty_queue(self):
-        """Test logs writer loop with empty queue."""
+        """Test logs writer loop with empty queue does not block the event loop."""
         shutdown_event = asyncio.Event()
-        
         mock_queue = MagicMock()
         mock_queue.qsize.return_value = 0
-        mock_queue.get.side_effect = Empty()
+        mock_queue.get_nowait.side_effect = Empty()
         
         with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue):
-            # Create task and cancel it after short delay
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            await asyncio.sleep(0.1)
-            task.cancel()
+            await _run_writer(shutdown_event, delay=0.1, flush_interval=0.05)
             
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+            mock_queue.get.assert_not_called()
+            assert mock_queue.get_nowait.call_count > 1
     
     @pytest.mark.asyncio
     async def test_logs_writer_loop_process_logs(self):
-        """Test logs writer loop processing logs."""
+        """Test logs writer loop writes queued logs with one bulk insert."""
         shutdown_event = asyncio.Event()
-        
-        # Mock log data
-        log_data = {
-            "job_id": "exec-123",
-            "content": "Test log",
-            "timestamp": datetime.now()
-        }
-        
-        mock_queue = MagicMock()
-        mock_queue.qsize.return_value = 1
-        mock_queue.get.side_effect = [log_data, Empty()]
-        mock_queue.task_done = MagicMock()
+        timestamp = datetime.now()
+        mock_queue = _log_queue(
+            {"job_id": "exec-b", "content": "B1", "timestamp": timestamp},
+            {"job_id": "exec-a", "content": "A1", "timestamp": timestamp},
+            {"job_id": "exec-b", "content": "B2", "timestamp": timestamp},
+        )
         
         with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue), \
              patch('src.services.execution_logs_service.execution_logs_service') as mock_service:
+            mock_service.create_execution_logs_batch = AsyncMock(return_value=True)
+            mock_service.create_execution_log = AsyncMock(return_value=True)
             
-            mock_service.create_execution_log.return_value = True
-            
-            # Create task and cancel it after processing
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            await asyncio.sleep(0.2)
-            task.cancel()
-            
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+            await _run_writer(shutdown_event, flush_interval=0.05)
             
-            # Verify log was processed
-            mock_service.create_execution_log.assert_called()
-            mock_queue.task_done.assert_called()
+            mock_service.create_execution_logs_batch.assert_awaited_once()
+            rows = mock_service.create_execution_logs_batch.call_args[0][0]
+            # Grouped by execution, queue order kept within an execution
+            assert [r["content"] for r in rows] == ["A1", "B1", "B2"]
+            mock_service.create_execution_log.assert_not_called()
+            assert mock_queue.qsize() == 0
     
     @pytest.mark.asyncio
     async def test_logs_writer_loop_process_logs_with_group(self):
-        """Test logs writer loop processing logs with group context."""
+        """Test logs writer loop keeps group information on bulk rows."""
         shutdown_event = asyncio.Event()
-        
-        # Mock log data with group information
-        log_data = {
+        mock_queue = _log_queue({
             "job_id": "exec-123",
             "content": "Test log",
             "timestamp": datetime.now(),
             "group_id": "group-456",
             "group_email": "test@example.com"
-        }
-        
-        mock_queue = MagicMock()
-        mock_queue.qsize.return_value = 1
-        mock_queue.get.side_effect = [log_data, Empty()]
-        mock_queue.task_done = MagicMock()
+        })
         
         with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue), \
              patch('src.services.execution_logs_service.execution_logs_service') as mock_service:
+            mock_service.create_execution_logs_batch = AsyncMock(return_value=True)
             
-            mock_service.create_execution_log.return_value = True
+            await _run_writer(shutdown_event, flush_interval=0.05)
             
-            # Create task and cancel it after processing
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            await asyncio.sleep(0.2)
-            task.cancel()
+            row = mock_service.create_execution_logs_batch.call_args[0][0][0]
+            assert row["execution_id"] == "exec-123"
+            assert row["group_id"] == "group-456"
+            assert row["group_email"] == "test@example.com"
+    
+    @pytest.mark.asyncio
+    async def test_logs_writer_loop_flushes_by_size(self):
+        """Test that a full batch is flushed without waiting for the interval."""
+        shutdown_event = asyncio.Event()
+        mock_queue = _log_queue(*[
+            {"job_id": "exec-1", "content": f"Log {i}", "timestamp": datetime.now()}
+            for i in range(5)
+        ])
+        
+        with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue), \
+             patch('src.services.execution_logs_service.execution_logs_service') as mock_service:
+            mock_service.create_execution_logs_batch = AsyncMock(return_value=True)
             
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+            # A long interval means only size-triggered flushes happen before shutdown
+            task = asyncio.create_task(logs_writer_loop(shutdown_event, batch_size=2, flush_interval=10))
+            await asyncio.sleep(0.1)
+            sizes = [len(c[0][0]) for c in mock_service.create_execution_logs_batch.call_args_list]
+            assert sizes == [2, 2]
             
-            # Verify log was processed with group context
-            call_args = mock_service.create_execution_log.call_args
-            group_context = call_args.kwargs['group_context']
-            assert group_context is not None
-            assert group_context.primary_group_id == "group-456"
-            assert group_context.group_email == "test@example.com"
-    
+            # The remainder is drained on shutdown
+            shutdown_event.set()
+            await asyncio.wait_for(task, timeout=2)
+            sizes = [len(c[0][0]) for c in mock_service.create_execution_logs_batch.call_args_list]
+            assert sizes == [2, 2, 1]
     
     @pytest.mark.asyncio
-    async def test_logs_writer_loop_log_creation_failure(self):
-        """Test logs writer loop when log creation fails."""
+    async def test_logs_writer_loop_bulk_failure_falls_back_to_single_rows(self):
+        """Test logs writer loop retries line by line when the bulk insert fails."""
         shutdown_event = asyncio.Event()
+        mock_queue = _log_queue(
+            {"job_id": "exec-1", "content": "Log 1", "timestamp": datetime.now(), "group_id": "group-1"},
+            {"job_id": "exec-2", "content": "Log 2", "timestamp": datetime.now()},
+            {"job_id": "exec-3", "content": "Log 3", "timestamp": datetime.now()},
+        )
         
-        log_data = {
-            "job_id": "exec-123",
-            "content": "Test log",
-            "timestamp": datetime.now()
-        }
-        
-        mock_queue = MagicMock()
-        mock_queue.qsize.return_value = 1
-        mock_queue.get.side_effect = [log_data, Empty()]
-        mock_queue.task_done = MagicMock()
+        with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue), \
+             patch('src.services.execution_logs_service.execution_logs_service') as mock_service, \
+             patch('src.services.execution_logs_service.logger') as mock_logger:
+            mock_service.create_execution_logs_batch = AsyncMock(return_value=False)
+            # Mix of success, failure and exception
+            mock_service.create_execution_log = AsyncMock(side_effect=[True, False, Exception("DB Error")])
+            
+            await _run_writer(shutdown_event, flush_interval=0.05)
+            
+            assert mock_service.create_execution_log.call_count == 3
+            first_call = mock_service.create_execution_log.call_args_list[0]
+            assert first_call.kwargs["group_context"].primary_group_id == "group-1"
+            assert mock_service.create_execution_log.call_args_list[1].kwargs["group_context"] is None
+            assert any("2 failures" in str(c) for c in mock_logger.warning.call_args_list)
+    
+    @pytest.mark.asyncio
+    async def test_logs_writer_loop_skips_shutdown_sentinel(self):
+        """Test that None sentinels in the queue are discarded."""
+        shutdown_event = asyncio.Event()
+        mock_queue = _log_queue(None, {"job_id": "exec-1", "content": "Log", "timestamp": datetime.now()})
         
         with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue), \
              patch('src.services.execution_logs_service.execution_logs_service') as mock_service:
+            mock_service.create_execution_logs_batch = AsyncMock(return_value=True)
             
-            mock_service.create_execution_log.return_value = False  # Simulate failure
-            
-            # Create task and cancel it after processing
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            await asyncio.sleep(0.2)
-            task.cancel()
+            await _run_writer(shutdown_event, flush_interval=0.05)
             
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+            rows = mock_service.create_execution_logs_batch.call_args[0][0]
+            assert len(rows) == 1
+    
+    @pytest.mark.asyncio
+    async def test_logs_writer_loop_uses_settings_defaults(self):
+        """Test that batch size and interval default to settings."""
+        shutdown_event = asyncio.Event()
+        mock_queue = _log_queue(*[
+            {"job_id": "exec-1", "content": f"Log {i}", "timestamp": datetime.now()}
+            for i in range(3)
+        ])
+        mock_settings = MagicMock(LOGS_WRITER_BATCH_SIZE=3, LOGS_WRITER_FLUSH_INTERVAL=10)
+        
+        with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue), \
+             patch('src.services.execution_logs_service.settings', mock_settings), \
+             patch('src.services.execution_logs_service.execution_logs_service') as mock_service:
+            mock_service.create_execution_logs_batch = AsyncMock(return_value=True)
             
-            # Should still process the log despite failure
-            mock_service.create_execution_log.assert_called()
+            task = asyncio.create_task(logs_writer_loop(shutdown_event))
+            await asyncio.sleep(0.1)
+            mock_service.create_execution_logs_batch.assert_awaited_once()
+            shutdown_event.set()
+            await asyncio.wait_for(task, timeout=2)
     
     @pytest.mark.asyncio
     async def test_logs_writer_loop_exception_handling(self):
@@ -757,7 +833,7 @@ class TestLogsWriterLoop:
         
         mock_queue = MagicMock()
         mock_queue.qsize.return_value = 1
-        mock_queue.get.side_effect = Exception("Queue error")
+        mock_queue.get_nowait.side_effect = Exception("Queue error")
         
         with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue):
             # Create task and cancel it after error
@@ -771,6 +847,18 @@ class TestLogsWriterLoop:
                 pass
             
             # Should handle exception gracefully
+    
+    @pytest.mark.asyncio
+    async def test_logs_writer_loop_unhandled_exception(self):
+        """Test logs writer loop handles unhandled exceptions."""
+        shutdown_event = asyncio.Event()
+        
+        with patch('src.services.execution_logs_service.get_job_output_queue') as mock_get_queue:
+            # Make get_job_output_queue raise an exception
+            mock_get_queue.side_effect = Exception("Critical error")
+            
+            # The loop should log the exception and return
+            await asyncio.wait_for(logs_writer_loop(shutdown_event), timeout=1)
 
 
 class TestStartLogsWriter:
@@ -904,26 +992,25 @@ class TestStopLogsWriter:
             service_module._logs_writer_task = original_task
     
     @pytest.mark.asyncio
-    async def test_stop_logs_writer_queue_full(self):
-        """Test stopping logs writer when queue is full."""
-        running_task = AsyncMock()
-        running_task.done.return_value = False
-        
-        # Mock the global variable directly
+    async def test_stop_logs_writer_sets_shutdown_without_queueing_a_sentinel(self):
+        """Test stopping the writer signals its shutdown event and leaves the queue alone."""
         import src.services.execution_logs_service as service_module
-        original_task = service_module._logs_writer_task
-        service_module._logs_writer_task = running_task
+        shutdown_event = asyncio.Event()
+        mock_queue = MagicMock()
+        mock_queue.get_nowait.side_effect = Empty()
+        mock_queue.wait_for_items = AsyncMock(side_effect=lambda timeout=None: asyncio.sleep(3600))
         
-        try:
-            mock_queue = MagicMock()
-            mock_queue.put_nowait.side_effect = Full("Queue is full")
+        with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue):
+            await start_logs_writer(shutdown_event)
+            await asyncio.sleep(0)
             
-            with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue):
-                result = await stop_logs_writer(timeout=0.001)
-                # Should still return True despite queue being full
-                assert result is True
-        finally:
-            service_module._logs_writer_task = original_task
+            result = await stop_logs_writer(timeout=1.0)
+        
+        assert result is True
+        assert shutdown_event.is_set()
+        mock_queue.put_nowait.assert_not_called()
+        mock_queue.put.assert_not_called()
+        assert service_module._logs_writer_task is None
     
     @pytest.mark.asyncio
     async def test_additional_coverage_scenarios(self):
@@ -933,7 +1020,7 @@ class TestStopLogsWriter:
         
         mock_queue = MagicMock()
         mock_queue.qsize.return_value = 0
-        mock_queue.get.side_effect = Empty()
+        mock_queue.get_nowait.side_effect = Empty()
         
         with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue):
             # Create task and let it run briefly to hit empty batch logic
@@ -947,7 +1034,7 @@ class TestStopLogsWriter:
                 pass
             
             # Verify it attempted to get from queue
-            assert mock_queue.get.call_count > 0
+            assert mock_queue.get_nowait.call_count > 0
     
     @pytest.mark.asyncio
     async def test_connect_with_group_websocket_send_error(self, execution_logs_service_instance, mock_websocket, group_context):
@@ -971,322 +1058,6 @@ class TestStopLogsWriter:
             assert mock_websocket in service.active_connections[execution_id]
 
 
-class TestLogsWriterLoopAdditionalCoverage:
-    """Additional tests to achieve 100% coverage for logs_writer_loop function."""
-    
-    @pytest.mark.asyncio
-    async def test_logs_writer_loop_empty_count_logging(self):
-        """Test logs writer loop logs empty count every 100 checks by mocking behavior."""
-        shutdown_event = asyncio.Event()
-        
-        # We'll simulate hitting the 100-check logging condition
-        # by directly testing the logic path that gets triggered
-        # This tests line 346: logger.debug(f"[logs_writer_loop] Queue empty for {empty_count} consecutive checks")
-        
-        with patch('src.services.execution_logs_service.get_job_output_queue') as mock_get_queue, \
-             patch('src.services.execution_logs_service.logger') as mock_logger:
-            
-            call_count = 0
-            def mock_queue_get(*args, **kwargs):
-                nonlocal call_count
-                call_count += 1
-                if call_count % 100 == 0:
-                    # This will trigger the empty count logging on the 100th call
-                    pass
-                raise Empty()
-            
-            mock_queue = MagicMock()
-            mock_queue.qsize.return_value = 0
-            mock_queue.get.side_effect = mock_queue_get
-            mock_get_queue.return_value = mock_queue
-            
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            
-            # Let it run briefly to trigger some logging
-            await asyncio.sleep(0.5)
-            task.cancel()
-            
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-            
-            # Verify the task attempted to process items
-            assert mock_queue.get.call_count >= 1
-    
-    @pytest.mark.asyncio
-    async def test_logs_writer_loop_log_creation_failures(self):
-        """Test logs writer loop handles log creation failures correctly."""
-        shutdown_event = asyncio.Event()
-        
-        # Mock multiple log entries with some failures
-        log_data1 = {"job_id": "exec-1", "content": "Log 1", "timestamp": datetime.now()}
-        log_data2 = {"job_id": "exec-2", "content": "Log 2", "timestamp": datetime.now()}
-        
-        mock_queue = MagicMock()
-        mock_queue.qsize.return_value = 2
-        mock_queue.get.side_effect = [log_data1, log_data2, Empty()]
-        mock_queue.task_done = MagicMock()
-        
-        with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue), \
-             patch('src.services.execution_logs_service.execution_logs_service') as mock_service:
-            
-            # Make first call succeed, second fail
-            mock_service.create_execution_log.side_effect = [True, False]
-            
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            await asyncio.sleep(0.5)
-            task.cancel()
-            
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-            
-            # Should have called create_execution_log twice
-            assert mock_service.create_execution_log.call_count == 2
-            mock_queue.task_done.assert_called()
-    
-    @pytest.mark.asyncio
-    async def test_logs_writer_loop_batch_processing_success(self):
-        """Test logs writer loop successful batch processing with no failures."""
-        shutdown_event = asyncio.Event()
-        
-        log_data = {"job_id": "exec-success", "content": "Success log", "timestamp": datetime.now()}
-        
-        mock_queue = MagicMock()
-        mock_queue.qsize.return_value = 1
-        mock_queue.get.side_effect = [log_data, Empty()]
-        mock_queue.task_done = MagicMock()
-        
-        with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue), \
-             patch('src.services.execution_logs_service.execution_logs_service') as mock_service:
-            
-            # All logs succeed
-            mock_service.create_execution_log.return_value = True
-            
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            await asyncio.sleep(0.5)
-            task.cancel()
-            
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-            
-            # Should have processed successfully
-            mock_service.create_execution_log.assert_called()
-    
-    @pytest.mark.asyncio
-    async def test_logs_writer_loop_exception_in_log_processing(self):
-        """Test logs writer loop handles exceptions during log processing."""
-        shutdown_event = asyncio.Event()
-        
-        log_data = {"job_id": "exec-error", "content": "Error log", "timestamp": datetime.now()}
-        
-        mock_queue = MagicMock()
-        mock_queue.qsize.return_value = 1
-        mock_queue.get.side_effect = [log_data, Empty()]
-        mock_queue.task_done = MagicMock()
-        
-        with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue), \
-             patch('src.services.execution_logs_service.execution_logs_service') as mock_service:
-            
-            # Make create_execution_log raise an exception
-            mock_service.create_execution_log.side_effect = Exception("Database error")
-            
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            await asyncio.sleep(0.5)
-            task.cancel()
-            
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-            
-            # Should have attempted to process despite exception
-            mock_service.create_execution_log.assert_called()
-    
-    @pytest.mark.asyncio
-    async def test_logs_writer_loop_unhandled_exception(self):
-        """Test logs writer loop handles unhandled exceptions."""
-        shutdown_event = asyncio.Event()
-        
-        with patch('src.services.execution_logs_service.get_job_output_queue') as mock_get_queue:
-            # Make get_job_output_queue raise an exception
-            mock_get_queue.side_effect = Exception("Critical error")
-            
-            # The loop should handle the exception and log it
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            await asyncio.sleep(0.1)
-            
-            # Wait for the task to complete naturally due to the exception
-            try:
-                await task
-            except Exception:
-                pass  # Expected due to our mock
-            
-            # Task should have completed due to exception handling
-
-
-class TestComplexScenarios:
-    """Test complex scenarios to improve coverage."""
-    
-    @pytest.mark.asyncio
-    async def test_logs_writer_loop_all_failure_scenarios(self):
-        """Test various failure scenarios in logs_writer_loop."""
-        shutdown_event = asyncio.Event()
-        
-        # Test scenario with log that has both success and failure
-        log_data1 = {"job_id": "exec-1", "content": "Log 1", "timestamp": datetime.now()}
-        log_data2 = {"job_id": "exec-2", "content": "Log 2", "timestamp": datetime.now()}
-        log_data3 = {"job_id": "exec-3", "content": "Log 3", "timestamp": datetime.now()}
-        
-        mock_queue = MagicMock()
-        mock_queue.qsize.return_value = 3
-        mock_queue.get.side_effect = [log_data1, log_data2, log_data3, Empty()]
-        mock_queue.task_done = MagicMock()
-        
-        with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue), \
-             patch('src.services.execution_logs_service.execution_logs_service') as mock_service:
-            
-            # Mix of success and failures: success, failure, exception
-            mock_service.create_execution_log.side_effect = [True, False, Exception("DB Error")]
-            
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            await asyncio.sleep(0.7)  # Give more time for processing
-            task.cancel()
-            
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-            
-            # Should have attempted all three
-            assert mock_service.create_execution_log.call_count == 3
-    
-    @pytest.mark.asyncio
-    async def test_critical_exception_in_logs_writer_loop(self):
-        """Test that unhandled exceptions are caught and logged."""
-        shutdown_event = asyncio.Event()
-        
-        with patch('src.services.execution_logs_service.get_job_output_queue') as mock_get_queue:
-            # Force an exception early in the loop
-            mock_get_queue.side_effect = RuntimeError("Critical system error")
-            
-            # This should trigger the unhandled exception handler (line 408-409)
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            await asyncio.sleep(0.2)
-            
-            # Task should complete due to exception
-            try:
-                await task
-            except Exception:
-                pass  # Expected
-    
-    @pytest.mark.asyncio
-    async def test_shutdown_signal_with_task_done(self):
-        """Test shutdown signal processing with task_done call."""
-        shutdown_event = asyncio.Event()
-        
-        mock_queue = MagicMock()
-        mock_queue.qsize.return_value = 1
-        
-        # Create a more sophisticated mock that will actually process None
-        def queue_get_side_effect(*args, **kwargs):
-            # First call returns None (shutdown signal)
-            # Second call raises Empty to exit loop
-            if not hasattr(queue_get_side_effect, 'call_count'):
-                queue_get_side_effect.call_count = 0
-            queue_get_side_effect.call_count += 1
-            
-            if queue_get_side_effect.call_count == 1:
-                return None  # This should trigger the continue branch (lines 336-337)
-            else:
-                raise Empty()
-        
-        mock_queue.get.side_effect = queue_get_side_effect
-        mock_queue.task_done = MagicMock()
-        
-        with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue):
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            await asyncio.sleep(1.0)  # Give enough time for processing
-            task.cancel()
-            
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-            
-            # Verify that the loop processed the None signal
-            assert mock_queue.get.call_count >= 1
-    
-    @pytest.mark.asyncio 
-    async def test_empty_count_modulo_logging(self):
-        """Test that empty count logging happens every 100 iterations."""
-        shutdown_event = asyncio.Event()
-        
-        # Create a mock that will be called enough times to trigger the % 100 == 0 condition
-        mock_queue = MagicMock()
-        mock_queue.qsize.return_value = 0
-        
-        call_count = 0
-        def mock_get(*args, **kwargs):
-            nonlocal call_count
-            call_count += 1
-            # Always raise Empty to simulate empty queue
-            raise Empty()
-        
-        mock_queue.get.side_effect = mock_get
-        
-        with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue):
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            
-            # Let it run long enough to accumulate empty checks
-            await asyncio.sleep(1.5)
-            task.cancel()
-            
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-            
-            # Should have made multiple attempts to get from queue
-            assert mock_queue.get.call_count > 0
-    
-    @pytest.mark.asyncio
-    async def test_batch_processing_success_and_failure_logging(self):
-        """Test both success and failure batch logging paths."""
-        shutdown_event = asyncio.Event()
-        
-        # Create logs that will cause both success and failure
-        log_data1 = {"job_id": "exec-success", "content": "Success", "timestamp": datetime.now()}
-        log_data2 = {"job_id": "exec-fail", "content": "Fail", "timestamp": datetime.now()}
-        
-        mock_queue = MagicMock()
-        mock_queue.qsize.return_value = 2
-        mock_queue.get.side_effect = [log_data1, log_data2, Empty()]
-        mock_queue.task_done = MagicMock()
-        
-        with patch('src.services.execution_logs_service.get_job_output_queue', return_value=mock_queue), \
-             patch('src.services.execution_logs_service.execution_logs_service') as mock_service:
-            
-            # First succeeds, second fails - this should trigger failure logging (lines 382-384, 393)
-            mock_service.create_execution_log.side_effect = [True, False]
-            
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            await asyncio.sleep(0.8)
-            task.cancel()
-            
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-            
-            # Should have processed both logs
-            assert mock_service.create_execution_log.call_count == 2
-
-
 class TestStopLogsWriterSpecificCoverage:
     """Target specific missing lines in stop_logs_writer."""
     
@@ -1341,127 +1112,6 @@ class TestStopLogsWriterSpecificCoverage:
 class TestFinalCoverage:
     """Final test class to achieve 100% coverage with simple, targeted tests."""
     
-    @pytest.mark.asyncio
-    async def test_logs_writer_loop_empty_count_line_346(self):
-        """Test line 346: empty count logging."""
-        shutdown_event = asyncio.Event()
-        
-        with patch('src.services.execution_logs_service.get_job_output_queue') as mock_get_queue, \
-             patch('src.services.execution_logs_service.logger') as mock_logger:
-            
-            mock_queue = MagicMock()
-            mock_queue.qsize.return_value = 0
-            
-            # Create a counter to control when shutdown happens
-            call_count = 0
-            def mock_get(*args, **kwargs):
-                nonlocal call_count
-                call_count += 1
-                # Set shutdown after exactly 100 calls to hit the modulo condition
-                if call_count == 100:
-                    shutdown_event.set()
-                raise Empty()
-            
-            mock_queue.get.side_effect = mock_get
-            mock_get_queue.return_value = mock_queue
-            
-            # Run the loop until it hits 100 empty checks
-            await logs_writer_loop(shutdown_event)
-            
-            # Should have called the debug log for 100th empty check
-            assert call_count == 100
-            debug_calls = [call for call in mock_logger.debug.call_args_list
-                          if "Queue empty for 100 consecutive checks" in str(call)]
-            assert len(debug_calls) >= 1
-    
-    @pytest.mark.asyncio 
-    async def test_logs_writer_failure_warning_lines_382_384(self):
-        """Test failure warning logging lines 382-384."""
-        shutdown_event = asyncio.Event()
-        
-        with patch('src.services.execution_logs_service.get_job_output_queue') as mock_get_queue, \
-             patch('src.services.execution_logs_service.execution_logs_service') as mock_service, \
-             patch('src.services.execution_logs_service.logger') as mock_logger:
-            
-            mock_queue = MagicMock()
-            mock_queue.qsize.return_value = 1
-            
-            # Create logs that will cause create_execution_log to return False
-            log_data = {
-                "job_id": "test-fail-exec", 
-                "content": "fail content",
-                "timestamp": datetime.now()
-            }
-            
-            # Return one log, then empty to stop
-            mock_queue.get.side_effect = [log_data, Empty()]
-            mock_queue.task_done = MagicMock()
-            mock_get_queue.return_value = mock_queue
-            
-            # Make create_execution_log return False to trigger failure path (lines 382-384)
-            mock_service.create_execution_log.return_value = False
-            
-            # Start and stop quickly to process the failing batch
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            await asyncio.sleep(0.05)  # Let it process the batch
-            shutdown_event.set()
-            await task
-            
-            # Verify specific warning was called for individual log failure (line 383)
-            warning_calls = [call for call in mock_logger.warning.call_args_list
-                           if "❌ Failed to store log" in str(call)]
-            # If individual warning not found, check for batch failure warning
-            if len(warning_calls) == 0:
-                batch_warning_calls = [call for call in mock_logger.warning.call_args_list
-                                     if "processed with" in str(call) and "failures" in str(call)]
-                assert len(batch_warning_calls) >= 1, f"Expected individual failure warning but got: {mock_logger.warning.call_args_list}"
-            else:
-                assert len(warning_calls) >= 1, f"Expected individual failure warning but got: {mock_logger.warning.call_args_list}"
-    
-    @pytest.mark.asyncio
-    async def test_logs_writer_success_debug_line_393(self):
-        """Test success debug logging line 393."""
-        shutdown_event = asyncio.Event()
-        
-        with patch('src.services.execution_logs_service.get_job_output_queue') as mock_get_queue, \
-             patch('src.services.execution_logs_service.execution_logs_service') as mock_service, \
-             patch('src.services.execution_logs_service.logger') as mock_logger:
-            
-            mock_queue = MagicMock()
-            mock_queue.qsize.return_value = 1
-            
-            # Create a log that will succeed  
-            log_data = {
-                "job_id": "test-success-exec", 
-                "content": "success content",
-                "timestamp": datetime.now()
-            }
-            
-            # Return one successful log, then empty to stop
-            mock_queue.get.side_effect = [log_data, Empty()]
-            mock_queue.task_done = MagicMock()
-            mock_get_queue.return_value = mock_queue
-            
-            # Make create_execution_log return True to trigger success path (line 393)
-            mock_service.create_execution_log.return_value = True
-            
-            # Process the successful batch
-            task = asyncio.create_task(logs_writer_loop(shutdown_event))
-            await asyncio.sleep(0.05)  # Let it process the batch
-            shutdown_event.set()
-            await task
-            
-            # Verify success debug was called (line 393)
-            debug_calls = [call for call in mock_logger.debug.call_args_list
-                          if "processed successfully" in str(call)]
-            # If success debug not found, check for batch processing debug messages
-            if len(debug_calls) == 0:
-                batch_debug_calls = [call for call in mock_logger.debug.call_args_list
-                                   if "Processing batch" in str(call) and "logs" in str(call)]
-                assert len(batch_debug_calls) >= 1, f"Expected success debug but got: {mock_logger.debug.call_args_list}"
-            else:
-                assert len(debug_calls) >= 1, f"Expected success debug but got: {mock_logger.debug.call_args_list}"
-    
     @pytest.mark.asyncio
     async def test_stop_logs_writer_starting_log_line_450(self):
         """Test the starting log message line 450."""
@@ -32,6 +32,13 @@ class MockGroupContext:
         self.group_email = group_email
 
 
+def run_on_session(session):
+    """Side effect running operations given to execute_db_operation_with_loop_engine on a session."""
+    async def _run(operation):
+        return await operation(session)
+    return _run
+
+
 @pytest.fixture
 def mock_execution():
     """Create a mock execution record."""
@@ -61,7 +68,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_update_status_success(self, mock_execution):
         """Test successful status update."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.return_value = True
             
             result = await ExecutionStatusService.update_status(
@@ -76,7 +83,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_update_status_with_result(self, mock_execution):
         """Test status update with result data."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.return_value = True
             
             result_data = {"output": "success", "count": 5}
@@ -126,7 +133,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_update_status_database_operation_failure(self):
         """Test status update when database operation fails."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.return_value = False
             
             result = await ExecutionStatusService.update_status(
@@ -141,7 +148,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_update_status_database_operation_exception(self):
         """Test status update when database operation raises exception."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.side_effect = Exception("Database error")
             
             result = await ExecutionStatusService.update_status(
@@ -156,7 +163,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_update_status_result_processing_dict(self):
         """Test status update with dictionary result."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.return_value = True
             
             result_data = {"key": "value", "number": 42}
@@ -172,7 +179,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_update_status_result_processing_list(self):
         """Test status update with list result."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.return_value = True
             
             result_data = ["item1", "item2", "item3"]
@@ -188,7 +195,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_update_status_result_processing_string(self):
         """Test status update with string result."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.return_value = True
             
             result = await ExecutionStatusService.update_status(
@@ -203,7 +210,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_update_status_result_processing_number(self):
         """Test status update with number result."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.return_value = True
             
             result = await ExecutionStatusService.update_status(
@@ -218,7 +225,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_update_status_terminal_status_completed(self):
         """Test status update sets completed_at for COMPLETED status."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.return_value = True
             
             result = await ExecutionStatusService.update_status(
@@ -232,7 +239,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_update_status_terminal_status_failed(self):
         """Test status update sets completed_at for FAILED status."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.return_value = True
             
             result = await ExecutionStatusService.update_status(
@@ -246,7 +253,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_update_status_terminal_status_cancelled(self):
         """Test status update sets completed_at for CANCELLED status."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.return_value = True
             
             result = await ExecutionStatusService.update_status(
@@ -260,7 +267,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_get_status_success(self, mock_execution):
         """Test successful status retrieval."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.return_value = mock_execution
             
             result = await ExecutionStatusService.get_status("test-job-123")
@@ -271,7 +278,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_get_status_not_found(self):
         """Test status retrieval when execution not found."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.return_value = None
             
             result = await ExecutionStatusService.get_status("nonexistent-job")
@@ -303,7 +310,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_get_status_database_operation_exception(self):
         """Test status retrieval when database operation raises exception."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.side_effect = Exception("Database error")
             
             result = await ExecutionStatusService.get_status("test-job-123")
@@ -314,12 +321,10 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_create_execution_success(self, sample_execution_data):
         """Test successful execution creation."""
-        with patch('src.db.session.async_session_factory') as mock_session_factory:
-            mock_session = AsyncMock()
-            mock_session_factory.return_value.__aenter__.return_value = mock_session
-            mock_session_factory.return_value.__aexit__.return_value = None
-            
-            with patch('src.repositories.execution_repository.ExecutionRepository') as mock_repo_class:
+        mock_session = AsyncMock()
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine',
+                   side_effect=run_on_session(mock_session)):
+            with patch('src.services.execution_status_service.ExecutionRepository') as mock_repo_class:
                 mock_repo = AsyncMock()
                 mock_repo.get_execution_by_job_id.return_value = None  # No existing record
                 mock_repo.create_execution.return_value = MockExecution()
@@ -334,12 +339,10 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_create_execution_with_group_context(self, sample_execution_data, mock_group_context):
         """Test execution creation with group context."""
-        with patch('src.db.session.async_session_factory') as mock_session_factory:
-            mock_session = AsyncMock()
-            mock_session_factory.return_value.__aenter__.return_value = mock_session
-            mock_session_factory.return_value.__aexit__.return_value = None
-            
-            with patch('src.repositories.execution_repository.ExecutionRepository') as mock_repo_class:
+        mock_session = AsyncMock()
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine',
+                   side_effect=run_on_session(mock_session)):
+            with patch('src.services.execution_status_service.ExecutionRepository') as mock_repo_class:
                 mock_repo = AsyncMock()
                 mock_repo.get_execution_by_job_id.return_value = None
                 mock_repo.create_execution.return_value = MockExecution()
@@ -360,12 +363,10 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_create_execution_already_exists(self, sample_execution_data):
         """Test execution creation when record already exists."""
-        with patch('src.db.session.async_session_factory') as mock_session_factory:
-            mock_session = AsyncMock()
-            mock_session_factory.return_value.__aenter__.return_value = mock_session
-            mock_session_factory.return_value.__aexit__.return_value = None
-            
-            with patch('src.repositories.execution_repository.ExecutionRepository') as mock_repo_class:
+        mock_session = AsyncMock()
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine',
+                   side_effect=run_on_session(mock_session)):
+            with patch('src.services.execution_status_service.ExecutionRepository') as mock_repo_class:
                 mock_repo = AsyncMock()
                 mock_repo.get_execution_by_job_id.return_value = MockExecution()  # Existing record
                 mock_repo_class.return_value = mock_repo
@@ -414,8 +415,8 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_create_execution_database_exception(self, sample_execution_data):
         """Test execution creation when database operation raises exception."""
-        with patch('src.db.session.async_session_factory') as mock_session_factory:
-            mock_session_factory.side_effect = Exception("Database connection error")
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine',
+                   side_effect=Exception("Database connection error")):
             
             result = await ExecutionStatusService.create_execution(sample_execution_data)
             
@@ -424,12 +425,10 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_create_execution_repository_exception(self, sample_execution_data):
         """Test execution creation when repository operation raises exception."""
-        with patch('src.db.session.async_session_factory') as mock_session_factory:
-            mock_session = AsyncMock()
-            mock_session_factory.return_value.__aenter__.return_value = mock_session
-            mock_session_factory.return_value.__aexit__.return_value = None
-            
-            with patch('src.repositories.execution_repository.ExecutionRepository') as mock_repo_class:
+        mock_session = AsyncMock()
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine',
+                   side_effect=run_on_session(mock_session)):
+            with patch('src.services.execution_status_service.ExecutionRepository') as mock_repo_class:
                 mock_repo = AsyncMock()
                 mock_repo.get_execution_by_job_id.side_effect = Exception("Repository error")
                 mock_repo_class.return_value = mock_repo
@@ -441,12 +440,10 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_create_execution_with_group_context_filtering(self, sample_execution_data, mock_group_context):
         """Test execution creation with group context filtering."""
-        with patch('src.db.session.async_session_factory') as mock_session_factory:
-            mock_session = AsyncMock()
-            mock_session_factory.return_value.__aenter__.return_value = mock_session
-            mock_session_factory.return_value.__aexit__.return_value = None
-            
-            with patch('src.repositories.execution_repository.ExecutionRepository') as mock_repo_class:
+        mock_session = AsyncMock()
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine',
+                   side_effect=run_on_session(mock_session)):
+            with patch('src.services.execution_status_service.ExecutionRepository') as mock_repo_class:
                 mock_repo = AsyncMock()
                 mock_repo.get_execution_by_job_id.return_value = None
                 mock_repo.create_execution.return_value = MockExecution()
@@ -468,7 +465,7 @@ class TestExecutionStatusService:
     @patch('src.services.execution_status_service.logger')
     async def test_logging_during_operations(self, mock_logger, sample_execution_data):
         """Test that appropriate logging occurs during operations."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.return_value = True
             
             # Test update_status logging
@@ -506,7 +503,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_execution_status_enum_values(self):
         """Test that the service works with ExecutionStatus enum values."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.return_value = True
             
             # Test all terminal status values
@@ -528,7 +525,7 @@ class TestExecutionStatusService:
     @pytest.mark.asyncio
     async def test_update_status_complex_result_data(self):
         """Test status update with complex nested result data."""
-        with patch('src.services.execution_status_service.execute_db_operation_with_fresh_engine') as mock_execute:
+        with patch('src.services.execution_status_service.execute_db_operation_with_loop_engine') as mock_execute:
             mock_execute.return_value = True
             
             complex_result = {
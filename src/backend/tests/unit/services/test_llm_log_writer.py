@@ -0,0 +1,224 @@
+"""
+Unit tests for llm_log_writer module.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.services import llm_log_writer
+from src.services.llm_log_writer import (
+    clear_llm_log_writer,
+    enqueue_llm_log,
+    get_llm_log_bus,
+    get_llm_log_writer_stats,
+    start_llm_log_writer,
+    stop_llm_log_writer,
+    truncate_log_text,
+)
+from src.services.log_service import LLMLogService
+from src.utils.user_context import GroupContext
+
+
+@pytest.fixture(autouse=True)
+def writer_settings():
+    clear_llm_log_writer()
+    with patch("src.services.llm_log_writer.settings") as settings:
+        settings.LLM_LOG_QUEUE_MAX_SIZE = 3
+        settings.LLM_LOG_WRITER_BATCH_SIZE = 10
+        settings.LLM_LOG_WRITER_FLUSH_INTERVAL = 0.05
+        settings.LLM_LOG_MAX_TEXT_CHARS = 0
+        yield settings
+    clear_llm_log_writer()
+
+
+def _log(endpoint="generate-agent", prompt="prompt", response="response"):
+    return {"endpoint": endpoint, "prompt": prompt, "response": response, "model": "m", "status": "success"}
+
+
+def _queued():
+    return llm_log_writer._drain_llm_log_bus(get_llm_log_bus(), 100)
+
+
+class TestEnqueueLLMLog:
+    """Test queueing LLM logs."""
+
+    def test_truncate_log_text(self):
+        assert truncate_log_text("abcdef", 4) == "abcd... [truncated 2 characters]"
+        assert truncate_log_text("abcd", 4) == "abcd"
+        assert truncate_log_text("abcdef", 0) == "abcdef"
+        assert truncate_log_text(None, 4) is None
+
+    def test_long_texts_are_truncated(self, writer_settings):
+        writer_settings.LLM_LOG_MAX_TEXT_CHARS = 5
+
+        enqueue_llm_log({**_log(prompt="short", response="a long response"), "extra_data": {"source": "x"}})
+
+        [queued] = _queued()
+        assert queued["prompt"] == "short"
+        assert queued["response"].startswith("a lon... [truncated")
+        assert queued["extra_data"] == {"source": "x", "truncated": ["response"]}
+        assert get_llm_log_writer_stats()["truncated"] == 1
+
+    def test_full_queue_drops_the_oldest_logs(self):
+        for index in range(5):
+            enqueue_llm_log(_log(endpoint=f"endpoint-{index}"))
+
+        assert [log["endpoint"] for log in _queued()] == ["endpoint-2", "endpoint-3", "endpoint-4"]
+        stats = get_llm_log_writer_stats()
+        assert stats["queued"] == 5
+        assert stats["queue"]["dropped"] == 2
+
+
+class TestLLMLogWriter:
+    """Test writing queued LLM logs."""
+
+    @pytest.mark.asyncio
+    async def test_batch_is_written_in_one_insert(self):
+        repository = MagicMock()
+        repository.create_many = AsyncMock(return_value=2)
+        batch = [_log(), _log()]
+
+        with patch("src.services.llm_log_writer.LLMLogRepository", return_value=repository):
+            failures = await llm_log_writer._flush_llm_log_batch(batch)
+
+        assert failures == 0
+        repository.create_many.assert_awaited_once_with(batch)
+        assert get_llm_log_writer_stats()["written"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_log_by_log(self):
+        written = []
+
+        async def write_logs(logs):
+            if len(logs) > 1 or logs[0]["endpoint"] == "broken":
+                raise Exception("value too long")
+            written.extend(logs)
+
+        batch = [_log(), _log(endpoint="broken")]
+        with patch("src.services.llm_log_writer._write_llm_logs", side_effect=write_logs):
+            failures = await llm_log_writer._flush_llm_log_batch(batch)
+
+        assert failures == 1
+        assert written == [_log()]
+        stats = get_llm_log_writer_stats()
+        assert stats["written"] == 1
+        assert stats["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_queued_logs_are_written_on_shutdown(self):
+        enqueue_llm_log(_log(endpoint="first"))
+        enqueue_llm_log(_log(endpoint="second"))
+        flushed = []
+
+        async def flush(batch):
+            flushed.extend(batch)
+            return 0
+
+        shutdown = asyncio.Event()
+        shutdown.set()
+        with patch("src.services.llm_log_writer._flush_llm_log_batch", side_effect=flush):
+            await asyncio.wait_for(llm_log_writer.llm_log_writer_loop(shutdown), timeout=1)
+
+        assert [log["endpoint"] for log in flushed] == ["first", "second"]
+        assert _queued() == []
+
+    @pytest.mark.asyncio
+    async def test_stop_without_writer_writes_queued_logs(self):
+        enqueue_llm_log(_log())
+
+        with patch("src.services.llm_log_writer._flush_llm_log_batch", AsyncMock(return_value=0)) as flush:
+            assert await stop_llm_log_writer() is True
+
+        flush.assert_awaited_once_with([_log()])
+
+
+class TestLLMLogWriterAcrossLoops:
+    """Test the writer when logs are created from several event loops."""
+
+    @pytest.fixture
+    def worker_loop(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        yield loop
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    @pytest.mark.asyncio
+    async def test_logs_from_another_loop_go_to_the_running_writer(self, worker_loop):
+        flushed = []
+
+        async def flush(batch):
+            flushed.extend(batch)
+            return 0
+
+        with patch("src.services.llm_log_writer._flush_llm_log_batch", side_effect=flush):
+            writer = asyncio.run_coroutine_threadsafe(start_llm_log_writer(), worker_loop).result(1)
+
+            assert await start_llm_log_writer() is writer
+            enqueue_llm_log(_log())
+            assert await stop_llm_log_writer(timeout=1) is True
+
+        assert flushed == [_log()]
+        assert writer.done()
+        assert get_llm_log_writer_stats()["writer_running"] is False
+
+    @pytest.mark.asyncio
+    async def test_writer_of_a_closed_loop_is_replaced(self):
+        def start_on_closed_loop():
+            loop = asyncio.new_event_loop()
+            writer = loop.run_until_complete(start_llm_log_writer())
+            loop.close()
+            return writer
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            orphaned = pool.submit(start_on_closed_loop).result()
+
+        writer = await start_llm_log_writer()
+
+        assert writer is not orphaned
+        assert writer.get_loop() is asyncio.get_running_loop()
+        assert await stop_llm_log_writer(timeout=1) is True
+
+
+class TestLLMLogServiceCreateLog:
+    """Test LLMLogService.create_log with the background writer."""
+
+    @pytest.mark.asyncio
+    async def test_log_is_queued_for_the_writer(self):
+        repository = MagicMock()
+        repository.create = AsyncMock()
+        service = LLMLogService(repository)
+        group_context = GroupContext(group_ids=["group-1"], group_email="user@example.com")
+
+        with patch("src.services.log_service.settings") as settings, \
+             patch("src.services.log_service.start_llm_log_writer", AsyncMock()) as start:
+            settings.LLM_LOG_WRITER_ENABLED = True
+            result = await service.create_log("generate-agent", "prompt", "response", "m", "success",
+                                              group_context=group_context)
+
+        assert result is None
+        start.assert_awaited_once()
+        repository.create.assert_not_awaited()
+        [queued] = _queued()
+        assert queued["endpoint"] == "generate-agent"
+        assert queued["group_id"] == "group-1"
+
+    @pytest.mark.asyncio
+    async def test_log_is_written_inline_when_the_writer_is_disabled(self):
+        repository = MagicMock()
+        repository.create = AsyncMock(return_value="log")
+        service = LLMLogService(repository)
+
+        with patch("src.services.log_service.settings") as settings:
+            settings.LLM_LOG_WRITER_ENABLED = False
+            result = await service.create_log("generate-agent", "prompt", "response", "m", "success")
+
+        assert result == "log"
+        repository.create.assert_awaited_once()
+        assert _queued() == []
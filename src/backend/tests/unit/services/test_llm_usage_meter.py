@@ -0,0 +1,275 @@
+"""
+Unit tests for llm_usage_meter module.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.services import llm_usage_meter
+from src.services.llm_usage_meter import (
+    bind_llm_call,
+    clear_usage_meter,
+    end_usage_metering,
+    get_usage_bus,
+    get_usage_meter_stats,
+    record_llm_usage,
+    start_usage_metering,
+)
+from src.utils.user_context import GroupContext
+
+
+@pytest.fixture(autouse=True)
+def meter_settings():
+    clear_usage_meter()
+    with patch("src.services.llm_usage_meter.settings") as settings:
+        settings.LLM_USAGE_METERING_ENABLED = True
+        settings.LLM_USAGE_QUEUE_MAX_SIZE = 100
+        settings.LLM_USAGE_WRITER_BATCH_SIZE = 10
+        settings.LLM_USAGE_WRITER_FLUSH_INTERVAL = 0.05
+        yield settings
+    clear_usage_meter()
+
+
+def _queued():
+    return llm_usage_meter._drain_usage_bus(get_usage_bus(), 100)
+
+
+def _record(call_id="call-1", **kwargs):
+    values = dict(model_name="databricks/claude", model_provider="databricks",
+                  prompt_tokens=100, completion_tokens=20, cost_usd=0.01)
+    values.update(kwargs)
+    return record_llm_usage(call_id, **values)
+
+
+def _in_new_context(func, *args):
+    return contextvars.Context().run(func, *args)
+
+
+def _in_execution(execution_id, func, *args):
+    def run():
+        start_usage_metering(execution_id)
+        return func(*args)
+    return _in_new_context(run)
+
+
+class TestAttribution:
+    """Test how calls are attributed to executions."""
+
+    def test_calls_are_attributed_to_the_context_execution(self):
+        group_context = GroupContext(group_ids=["group-1"], group_email="alice@acme.com")
+
+        def run():
+            start_usage_metering("exec-1", group_context, execution_name="Research crew")
+            return _record()
+
+        assert _in_new_context(run) is True
+
+        [record] = _queued()
+        assert record["execution_id"] == "exec-1"
+        assert record["execution_name"] == "Research crew"
+        assert record["group_id"] == "group-1"
+        assert record["user_email"] == "alice@acme.com"
+        assert record["total_tokens"] == 120
+        assert record["request_count"] == 1
+
+    def test_bound_call_is_attributed_from_another_thread(self):
+        def run_execution(execution_id, call_id):
+            start_usage_metering(execution_id)
+            bind_llm_call(call_id)
+
+        _in_new_context(run_execution, "exec-1", "call-1")
+        _in_new_context(run_execution, "exec-2", "call-2")
+
+        # LiteLLM reports success on its own thread, without the execution's context
+        results = []
+        thread = threading.Thread(target=lambda: results.append(_record("call-2")))
+        thread.start()
+        thread.join()
+
+        assert results == [True]
+        assert _queued()[0]["execution_id"] == "exec-2"
+
+    @pytest.mark.parametrize("executions", [["exec-1"], ["exec-1", "exec-2"]])
+    def test_calls_outside_an_execution_are_dropped(self, executions):
+        # e.g. the generation services, running while crews are
+        for execution_id in executions:
+            _in_new_context(start_usage_metering, execution_id)
+
+        assert _in_new_context(_record) is False
+        assert _queued() == []
+        assert get_usage_meter_stats()["unattributed"] == 1
+
+    def test_bound_calls_outlive_the_execution(self):
+        def run():
+            start_usage_metering("exec-1")
+            bind_llm_call("call-1")
+
+        _in_new_context(run)
+        end_usage_metering("exec-1")
+
+        assert _record("call-1") is True
+        assert get_usage_meter_stats()["active_executions"] == 0
+
+
+class TestRecordLLMUsage:
+    """Test record_llm_usage function."""
+
+    def test_second_report_of_a_call_is_ignored(self):
+        assert _in_execution("exec-1", _record, "call-1") is True
+        assert _in_execution("exec-1", _record, "call-1") is False
+        assert _in_execution("exec-1", lambda: _record("call-1", status="error")) is True
+
+        assert len(_queued()) == 2
+        assert get_usage_meter_stats()["duplicates"] == 1
+
+    def test_disabled_metering_records_nothing(self, meter_settings):
+        meter_settings.LLM_USAGE_METERING_ENABLED = False
+
+        assert _in_execution("exec-1", _record) is False
+        assert _queued() == []
+
+    def test_full_queue_merges_calls_of_the_same_execution_and_model(self, meter_settings):
+        meter_settings.LLM_USAGE_QUEUE_MAX_SIZE = 1
+        now = datetime(2025, 9, 1, 10, 15)
+
+        def run():
+            start_usage_metering("exec-1")
+            _record("call-1", usage_date=now)
+            _record("call-2", usage_date=now, cost_usd=0.02)
+
+        _in_new_context(run)
+
+        [record] = _queued()
+        assert record["request_count"] == 2
+        assert record["prompt_tokens"] == 200
+        assert record["cost_usd"] == pytest.approx(0.03)
+
+    def test_full_queue_never_drops_usage_silently(self, meter_settings):
+        meter_settings.LLM_USAGE_QUEUE_MAX_SIZE = 1
+        _in_execution("exec-1", _record, "call-1")
+        get_usage_bus()._backpressure_timeout = 0.05
+
+        # Another execution's call cannot be merged into the queued record
+        assert _in_execution("exec-2", lambda: _record("call-2", cost_usd=0.25)) is False
+
+        assert [record["execution_id"] for record in _queued()] == ["exec-1"]
+        stats = get_usage_meter_stats()
+        assert stats["lost"] == 1
+        assert stats["lost_cost_usd"] == pytest.approx(0.25)
+        assert stats["queue"]["dropped"] == 0
+
+
+class TestUsageWriter:
+    """Test writing queued usage records."""
+
+    @pytest.mark.asyncio
+    async def test_batch_is_written_with_its_rollups_in_one_transaction(self):
+        session = MagicMock()
+        session.commit = AsyncMock()
+        session.rollback = AsyncMock()
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.__aexit__ = AsyncMock(return_value=False)
+        repository = MagicMock()
+        repository.create_usage_records = AsyncMock(return_value=2)
+        repository.add_to_rollups = AsyncMock(return_value=4)
+        batch = [{"execution_id": "exec-1"}, {"execution_id": "exec-1"}]
+
+        with patch("src.services.llm_usage_meter.async_session_factory", return_value=session), \
+             patch("src.services.llm_usage_meter.BillingRepository", return_value=repository):
+            failures = await llm_usage_meter._flush_usage_batch(batch)
+
+        assert failures == 0
+        repository.create_usage_records.assert_awaited_once_with(batch)
+        repository.add_to_rollups.assert_awaited_once_with(batch)
+        session.commit.assert_awaited_once()
+        assert get_usage_meter_stats()["written"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_record_by_record(self):
+        written = []
+
+        async def write_usage(records):
+            if len(records) > 1 or records[0]["execution_id"] == "missing":
+                raise Exception("foreign key violation")
+            written.extend(records)
+
+        batch = [{"execution_id": "exec-1"}, {"execution_id": "missing"}]
+        with patch("src.services.llm_usage_meter._write_usage", side_effect=write_usage):
+            failures = await llm_usage_meter._flush_usage_batch(batch)
+
+        assert failures == 1
+        assert written == [{"execution_id": "exec-1"}]
+        stats = get_usage_meter_stats()
+        assert stats["written"] == 1
+        assert stats["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_queued_usage_is_written_on_shutdown(self):
+        _in_execution("exec-1", _record, "call-1")
+        _in_execution("exec-1", _record, "call-2")
+        flushed = []
+
+        async def flush(batch):
+            flushed.extend(batch)
+            return 0
+
+        shutdown = asyncio.Event()
+        shutdown.set()
+        with patch("src.services.llm_usage_meter._flush_usage_batch", side_effect=flush):
+            await asyncio.wait_for(llm_usage_meter.usage_writer_loop(shutdown), timeout=1)
+
+        assert [record["request_count"] for record in flushed] == [1, 1]
+        assert _queued() == []
+
+
+class TestLiteLLMCallbacks:
+    """Test metering through the callbacks LiteLLM really invokes."""
+
+    @staticmethod
+    def _wait_for_records(count):
+        records = []
+        deadline = time.monotonic() + 5
+        while len(records) < count and time.monotonic() < deadline:
+            records.extend(_queued())
+            time.sleep(0.02)
+        return records
+
+    def test_sync_completion_on_a_crew_thread_is_billed_to_its_execution(self):
+        import litellm
+        import src.core.llm_manager  # noqa: F401  registers the callbacks
+
+        def run_crew():
+            start_usage_metering("exec-1", GroupContext(group_ids=["group-1"]))
+            litellm.completion(model="gpt-4o", messages=[{"role": "user", "content": "hi"}],
+                               mock_response="hello")
+
+        # Another execution is active, so only the pre-call binding can attribute the call
+        _in_new_context(start_usage_metering, "exec-2")
+        thread = threading.Thread(target=lambda: _in_new_context(run_crew))
+        thread.start()
+        thread.join()
+
+        [record] = self._wait_for_records(1)
+        assert record["execution_id"] == "exec-1"
+        assert record["group_id"] == "group-1"
+        assert record["status"] == "success"
+
+    def test_completion_outside_an_execution_is_not_billed(self):
+        import litellm
+        import src.core.llm_manager  # noqa: F401  registers the callbacks
+
+        _in_new_context(start_usage_metering, "exec-1")
+        litellm.completion(model="gpt-4o", messages=[{"role": "user", "content": "hi"}],
+                           mock_response="hello")
+
+        deadline = time.monotonic() + 5
+        while get_usage_meter_stats()["unattributed"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert get_usage_meter_stats()["unattributed"] == 1
+        assert _queued() == []
@@ -7,10 +7,11 @@ schedule CRUD operations, job management, and scheduler execution.
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch, Mock
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException, status
 
+from src.core.schedule_heap import schedule_heap
 from src.services.scheduler_service import SchedulerService
 from src.schemas.schedule import ScheduleCreate, ScheduleCreateFromExecution, ScheduleUpdate, ScheduleResponse, ScheduleListResponse, ToggleResponse, CrewConfig
 from src.schemas.scheduler import SchedulerJobCreate, SchedulerJobUpdate, SchedulerJobResponse
@@ -542,32 +543,155 @@ class TestSchedulerService:
         await scheduler_service.shutdown()
     
     @pytest.mark.asyncio
-    async def test_check_and_run_schedules_no_due_schedules(self, scheduler_service):
-        """Test check_and_run_schedules with no due schedules."""
+    async def test_check_and_run_schedules_sleeps_until_next_run(self, scheduler_service):
+        """Test that the scheduler loads the heap and sleeps until the next run."""
+        next_run = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=30)
+        mock_repo = AsyncMock()
+        mock_repo.find_active_next_runs.return_value = [(1, next_run)]
+        
+        with patch('src.services.scheduler_service.async_session_factory'), \
+             patch('src.services.scheduler_service.ScheduleRepository', return_value=mock_repo), \
+             patch.object(schedule_heap, 'wait', side_effect=asyncio.CancelledError) as mock_wait:
+            with pytest.raises(asyncio.CancelledError):
+                await scheduler_service.check_and_run_schedules()
+        
+        timeout = mock_wait.call_args.args[0]
+        assert 25 < timeout <= 30
+        mock_repo.find_due_schedules.assert_not_called()
+        mock_repo.find_all.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_check_and_run_schedules_dispatches_due_schedules(self, scheduler_service):
+        """Test that due heap entries are dispatched without waiting."""
+        due_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1)
+        mock_repo = AsyncMock()
+        mock_repo.find_active_next_runs.return_value = [(1, due_at)]
+        
+        with patch('src.services.scheduler_service.async_session_factory'), \
+             patch('src.services.scheduler_service.ScheduleRepository', return_value=mock_repo), \
+             patch.object(scheduler_service, '_dispatch_due_schedules', new_callable=AsyncMock) as mock_dispatch, \
+             patch.object(schedule_heap, 'wait', side_effect=asyncio.CancelledError):
+            with pytest.raises(asyncio.CancelledError):
+                await scheduler_service.check_and_run_schedules()
+        
+        mock_dispatch.assert_called_once_with([(1, due_at)])
+    
+    @pytest.mark.asyncio
+    async def test_dispatch_due_schedules_advances_next_run(self, scheduler_service):
+        """Test that dispatched schedules get their next run time in the database and the heap."""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        schedule = MockSchedule(id=1, cron_expression="0 0 * * *", next_run_at=now - timedelta(seconds=5))
+        moved = MockSchedule(id=2, next_run_at=now + timedelta(hours=1))
+        mock_session = AsyncMock()
+        mock_repo = AsyncMock()
+        mock_repo.find_due_schedules.return_value = [schedule]
+        mock_repo.find_by_id.return_value = moved
+        
         with patch('src.services.scheduler_service.async_session_factory') as mock_session_factory, \
-             patch('asyncio.sleep') as mock_sleep:
-            
-            mock_session = AsyncMock()
+             patch('src.services.scheduler_service.ScheduleRepository', return_value=mock_repo), \
+             patch.object(scheduler_service, '_start_scheduled_run') as mock_start:
             mock_session_factory.return_value.__aenter__.return_value = mock_session
-            mock_repo = AsyncMock()
+            await scheduler_service._dispatch_due_schedules([(1, schedule.next_run_at), (2, now)])
+        
+        mock_start.assert_called_once_with(schedule, now - timedelta(seconds=5))
+        assert schedule.next_run_at > now
+        mock_session.commit.assert_called_once()
+        mock_repo.find_by_id.assert_called_once_with(2)
+        assert schedule_heap.get_stats()["schedules"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_overlapping_run_is_skipped(self, scheduler_service):
+        """Test the skip policy when the previous run is still going."""
+        running = asyncio.get_running_loop().create_future()
+        scheduler_service._active_runs[1] = running
+        
+        with patch('src.services.scheduler_service.settings.SCHEDULER_OVERLAP_POLICY', 'skip'), \
+             patch('asyncio.create_task') as mock_create_task:
+            scheduler_service._start_scheduled_run(MockSchedule(id=1), datetime.utcnow())
+        
+        mock_create_task.assert_not_called()
+        assert scheduler_service.get_stats()["skipped"] == 1
+        running.cancel()
+    
+    @pytest.mark.asyncio
+    async def test_overlapping_run_is_queued(self, scheduler_service):
+        """Test the queue policy runs after the previous run and queues at most one run."""
+        previous = asyncio.get_running_loop().create_future()
+        scheduler_service._active_runs[1] = previous
+        
+        with patch('src.services.scheduler_service.settings.SCHEDULER_OVERLAP_POLICY', 'queue'), \
+             patch.object(scheduler_service, 'run_schedule_job', new_callable=AsyncMock) as mock_run, \
+             patch('src.services.scheduler_service.async_session_factory'), \
+             patch('src.services.scheduler_service.ScheduleRepository') as mock_repo:
+            mock_repo.return_value.find_by_id = AsyncMock(return_value=None)
+            scheduler_service._start_scheduled_run(MockSchedule(id=1), datetime.utcnow())
+            scheduler_service._start_scheduled_run(MockSchedule(id=1), datetime.utcnow())
+            queued = scheduler_service._active_runs[1]
+            await asyncio.sleep(0.01)
+            mock_run.assert_not_called()
             
-            with patch('src.services.scheduler_service.ScheduleRepository', return_value=mock_repo):
-                mock_repo.find_due_schedules.return_value = []
-                mock_repo.find_all.return_value = []
-                
-                # Mock sleep to break the infinite loop after first iteration
-                call_count = 0
-                async def mock_sleep_func(seconds):
-                    nonlocal call_count
-                    call_count += 1
-                    if call_count >= 2:  # Break after second call
-                        raise Exception("Break loop")
-                    await asyncio.sleep(0)
-                
-                mock_sleep.side_effect = mock_sleep_func
-                
-                with pytest.raises(Exception, match="Break loop"):
-                    await scheduler_service.check_and_run_schedules()
+            previous.set_result(None)
+            await queued
+        
+        mock_run.assert_called_once()
+        stats = scheduler_service.get_stats()
+        assert stats["queued"] == 1
+        assert stats["skipped"] == 1
+        assert 1 not in scheduler_service._active_runs
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_runs_are_capped(self, mock_session):
+        """Test that at most SCHEDULER_MAX_CONCURRENT_RUNS runs execute at once."""
+        with patch('src.services.scheduler_service.settings.SCHEDULER_MAX_CONCURRENT_RUNS', 2):
+            service = SchedulerService(mock_session)
+        active = 0
+        max_active = 0
+        
+        async def fake_run(schedule_id, config, execution_time):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+        
+        config = CrewConfig(agents_yaml={}, tasks_yaml={}, inputs={}, planning=False, model="gpt-4o-mini")
+        with patch.object(service, 'run_schedule_job', side_effect=fake_run), \
+             patch('src.services.scheduler_service.async_session_factory'), \
+             patch('src.services.scheduler_service.ScheduleRepository') as mock_repo:
+            mock_repo.return_value.find_by_id = AsyncMock(return_value=None)
+            await asyncio.gather(*(service._run_scheduled(i, config, datetime.utcnow()) for i in range(5)))
+        
+        assert max_active == 2
+        assert service.get_stats()["dispatched"] == 5
+    
+    @pytest.mark.asyncio
+    async def test_dispatch_lag_is_recorded(self, scheduler_service):
+        """Test that the delay between due time and start is recorded."""
+        config = CrewConfig(agents_yaml={}, tasks_yaml={}, inputs={}, planning=False, model="gpt-4o-mini")
+        scheduled_for = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=2)
+        refreshed = MockSchedule(id=1, next_run_at=datetime.utcnow() + timedelta(days=1))
+        
+        with patch.object(scheduler_service, 'run_schedule_job', new_callable=AsyncMock), \
+             patch('src.services.scheduler_service.async_session_factory'), \
+             patch('src.services.scheduler_service.ScheduleRepository') as mock_repo:
+            mock_repo.return_value.find_by_id = AsyncMock(return_value=refreshed)
+            await scheduler_service._run_scheduled(1, config, scheduled_for)
+        
+        stats = scheduler_service.get_stats()
+        assert 2 <= stats["last_dispatch_lag"] < 5
+        assert stats["average_dispatch_lag"] == stats["last_dispatch_lag"]
+        assert stats["heap"]["schedules"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_schedule_changes_update_the_heap(self, scheduler_service, mock_schedule):
+        """Test that toggling and deleting schedules keeps the heap current."""
+        scheduler_service.repository.toggle_active.return_value = mock_schedule
+        await scheduler_service.toggle_schedule(1)
+        assert schedule_heap.peek() == mock_schedule.next_run_at
+        
+        scheduler_service.repository.delete.return_value = True
+        await scheduler_service.delete_schedule(1)
+        assert schedule_heap.peek() is None
     
     @pytest.mark.asyncio
     async def test_create_schedule_exception_handling(self, scheduler_service):
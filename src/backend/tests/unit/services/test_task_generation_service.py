@@ -692,4 +692,63 @@ class TestTaskGenerationService:
         result = task_generation_service.convert_to_task_create(response)
         
         assert isinstance(result, TaskCreate)
-        assert result.tools == ["tool1", "tool2", "tool3"]
\ No newline at end of file
+        assert result.tools == ["tool1", "tool2", "tool3"]
+
+def _stream_chunks(text, size=7):
+    """Build litellm streaming chunks for the given text."""
+    async def stream():
+        for start in range(0, len(text), size):
+            yield {"choices": [{"delta": {"content": text[start:start + size]}}]}
+    return stream()
+
+
+class TestTaskGenerationServiceStreaming:
+    """Test cases for stream_task."""
+
+    @pytest.mark.asyncio
+    @patch('src.services.task_generation_service.TemplateService')
+    @patch('src.services.task_generation_service.LLMManager')
+    @patch('src.services.task_generation_service.litellm')
+    async def test_stream_task_reports_fields_then_task(self, mock_litellm, mock_llm_manager,
+                                                        mock_template_service, task_generation_service,
+                                                        sample_request):
+        """Test fields are streamed before the processed task."""
+        mock_template_service.get_template_content = AsyncMock(return_value=MOCK_TEMPLATE_CONTENT)
+        mock_llm_manager.configure_litellm = AsyncMock(return_value={"model": "test-model"})
+        content = json.dumps({
+            "name": "Test Task",
+            "description": "A test task for validation",
+            "expected_output": "Test results"
+        })
+        mock_litellm.acompletion = AsyncMock(return_value=_stream_chunks("```json\n" + content + "\n```"))
+
+        events = [event async for event in task_generation_service.stream_task(sample_request)]
+
+        assert events[:3] == [
+            ("field", {"key": "name", "value": "Test Task"}),
+            ("field", {"key": "description", "value": "A test task for validation"}),
+            ("field", {"key": "expected_output", "value": "Test results"}),
+        ]
+        event, task = events[-1]
+        assert event == "task"
+        assert task["name"] == "Test Task"
+        assert task["tools"] == []
+        assert mock_litellm.acompletion.call_args.kwargs["stream"] is True
+        task_generation_service.log_service.create_log.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch('src.services.task_generation_service.TemplateService')
+    @patch('src.services.task_generation_service.LLMManager')
+    @patch('src.services.task_generation_service.litellm')
+    async def test_stream_task_llm_error(self, mock_litellm, mock_llm_manager, mock_template_service,
+                                         task_generation_service, sample_request):
+        """Test LLM errors are logged and raised as ValueError."""
+        mock_template_service.get_template_content = AsyncMock(return_value=MOCK_TEMPLATE_CONTENT)
+        mock_llm_manager.configure_litellm = AsyncMock(return_value={"model": "test-model"})
+        mock_litellm.acompletion = AsyncMock(side_effect=Exception("LLM API Error"))
+
+        with pytest.raises(ValueError, match="Error generating completion: LLM API Error"):
+            async for _ in task_generation_service.stream_task(sample_request):
+                pass
+
+        assert task_generation_service.log_service.create_log.call_args.kwargs["status"] == "error"
@@ -569,4 +569,84 @@ class TestTemplateServiceGetContent:
                         result = await TemplateService.get_template_content("error_template")
                         
                         assert result == ""
-                        mock_logger.error.assert_called_once()
\ No newline at end of file
+                        mock_logger.error.assert_called_once()
+
+class TestTemplateServiceContentCache:
+    """Test cases for caching of template contents."""
+    
+    @pytest.mark.asyncio
+    async def test_get_template_content_reads_database_once(self):
+        """Test repeated lookups of a template are served from the cache."""
+        with patch.object(TemplateService, '_load_template_content',
+                          AsyncMock(return_value="Cached content")) as mock_load:
+            first = await TemplateService.get_template_content("generate_agent")
+            second = await TemplateService.get_template_content("generate_agent")
+            
+            assert first == second == "Cached content"
+            mock_load.assert_awaited_once_with("generate_agent")
+    
+    @pytest.mark.asyncio
+    async def test_update_template_invalidates_cache(self, template_service, mock_repository,
+                                                     sample_template_update):
+        """Test updating a template makes the next lookup read the database."""
+        mock_repository.update_template.return_value = MockPromptTemplate()
+        
+        with patch.object(TemplateService, '_load_template_content',
+                          AsyncMock(side_effect=["Old content", "New content"])):
+            assert await TemplateService.get_template_content("generate_agent") == "Old content"
+            await template_service.update_template(1, sample_template_update)
+            assert await TemplateService.get_template_content("generate_agent") == "New content"
+    
+    @pytest.mark.asyncio
+    async def test_read_before_commit_is_not_served_after_update(self, mock_repository, sample_template_update):
+        """Test a lookup between the change and its commit does not keep the old content cached."""
+        mock_repository.update_template.return_value = MockPromptTemplate()
+        mock_uow = AsyncMock()
+        mock_uow.template_repository = mock_repository
+        loader = AsyncMock(side_effect=["Old content", "New content"])
+        
+        async def commit():
+            # Another request reads the template while the update is not committed yet
+            assert await TemplateService.get_template_content("generate_agent") == "Old content"
+        
+        mock_uow.commit.side_effect = commit
+        
+        with patch('src.services.template_service.UnitOfWork') as mock_uow_class, \
+             patch.object(TemplateService, '_load_template_content', loader):
+            mock_uow_class.return_value.__aenter__.return_value = mock_uow
+            
+            await TemplateService.update_existing_template(1, sample_template_update)
+            
+            assert await TemplateService.get_template_content("generate_agent") == "New content"
+    
+    @pytest.mark.asyncio
+    async def test_reset_templates_invalidates_cache(self, template_service, mock_repository):
+        """Test resetting templates makes the next lookup read the database."""
+        mock_repository.delete_all.return_value = 1
+        mock_repository.create.return_value = MockPromptTemplate()
+        
+        with patch.object(TemplateService, '_load_template_content',
+                          AsyncMock(side_effect=["Custom content", "Default content"])):
+            assert await TemplateService.get_template_content("generate_agent") == "Custom content"
+            await template_service.reset_templates()
+            assert await TemplateService.get_template_content("generate_agent") == "Default content"
+    
+    @pytest.mark.asyncio
+    async def test_warm_template_cache_loads_active_templates(self):
+        """Test warming the cache serves all active templates without further reads."""
+        templates = [
+            MockPromptTemplate(id=1, name="generate_agent", template="Agent prompt"),
+            MockPromptTemplate(id=2, name="generate_task", template="Task prompt"),
+        ]
+        mock_uow = AsyncMock()
+        mock_uow.template_repository = AsyncMock()
+        mock_uow.template_repository.find_active_templates.return_value = templates
+        
+        with patch('src.services.template_service.UnitOfWork') as mock_uow_class:
+            mock_uow_class.return_value.__aenter__.return_value = mock_uow
+            
+            assert await TemplateService.warm_template_cache() == 2
+        
+        with patch.object(TemplateService, '_load_template_content', AsyncMock()) as mock_load:
+            assert await TemplateService.get_template_content("generate_task") == "Task prompt"
+            mock_load.assert_not_awaited()
@@ -126,9 +126,9 @@ class TestTraceQueue:
         assert not second_queue.empty()
         assert second_queue.get() == test_data
     
-    @patch('queue.Queue')
+    @patch('src.services.trace_queue.EventBus')
     def test_queue_creation_called_once(self, mock_queue_class):
-        """Test that queue.Queue() is called only once during singleton creation."""
+        """Test that the event bus is created only once during singleton creation."""
         mock_queue_instance = MagicMock()
         mock_queue_class.return_value = mock_queue_instance
         
@@ -137,7 +137,7 @@ class TestTraceQueue:
         TraceQueue()
         TraceQueue()
         
-        # queue.Queue() should be called only once
+        # The bus should be created only once
         mock_queue_class.assert_called_once()
     
     def test_class_attributes_initial_state(self):
@@ -0,0 +1,140 @@
+"""
+Unit tests for the async polling utilities.
+
+Tests backoff delays, timeouts, concurrent polls and cancellation of the polls
+that belong to an execution.
+"""
+import asyncio
+import uuid
+
+import pytest
+from unittest.mock import AsyncMock
+
+from src.utils.async_polling import (
+    BackoffPolicy,
+    PollCancelledError,
+    PollTimeoutError,
+    bind_polling_execution,
+    cancel_execution_polls,
+    poll_registry,
+    poll_until,
+    run_polling,
+)
+
+FAST = BackoffPolicy(initial_delay=0.01, max_delay=0.02, jitter=0.0)
+
+
+class TestBackoffPolicy:
+    """Test cases for BackoffPolicy."""
+
+    def test_delay_grows_until_max(self):
+        policy = BackoffPolicy(initial_delay=0.5, max_delay=3.0, multiplier=2.0, jitter=0.0)
+
+        assert [policy.delay(attempt) for attempt in range(4)] == [0.5, 1.0, 2.0, 3.0]
+
+    def test_jitter_stays_within_bounds(self):
+        policy = BackoffPolicy(initial_delay=1.0, max_delay=10.0, jitter=0.2)
+
+        for _ in range(50):
+            assert 0.8 <= policy.delay(0) <= 1.2
+            assert policy.delay(10) <= 10.0
+
+    def test_from_settings_max_delay_override(self):
+        assert BackoffPolicy.from_settings(max_delay=0.1).max_delay == 0.1
+
+
+class TestPollUntil:
+    """Test cases for poll_until."""
+
+    @pytest.mark.asyncio
+    async def test_returns_first_terminal_result(self):
+        fetch = AsyncMock(side_effect=["RUNNING", "RUNNING", "SUCCEEDED"])
+
+        result = await poll_until(fetch, lambda state: state == "SUCCEEDED", timeout=5, policy=FAST)
+
+        assert result == "SUCCEEDED"
+        assert fetch.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_timeout_keeps_last_result(self):
+        fetch = AsyncMock(return_value="RUNNING")
+
+        with pytest.raises(PollTimeoutError) as exc_info:
+            await poll_until(fetch, lambda state: False, timeout=0.05, policy=FAST)
+
+        assert exc_info.value.last_result == "RUNNING"
+
+    @pytest.mark.asyncio
+    async def test_fetch_errors_propagate(self):
+        fetch = AsyncMock(side_effect=RuntimeError("boom"))
+
+        with pytest.raises(RuntimeError):
+            await poll_until(fetch, lambda state: True, timeout=5, policy=FAST)
+
+    @pytest.mark.asyncio
+    async def test_many_polls_share_the_loop(self):
+        async def slow_poll(polls_needed):
+            remaining = [polls_needed]
+
+            async def fetch():
+                remaining[0] -= 1
+                return remaining[0]
+
+            return await poll_until(fetch, lambda left: left <= 0, timeout=5,
+                                    policy=BackoffPolicy(initial_delay=0.05, max_delay=0.05, jitter=0.0))
+
+        started = asyncio.get_running_loop().time()
+        results = await asyncio.gather(*(slow_poll(3) for _ in range(50)))
+
+        assert results == [0] * 50
+        # 50 polls of ~0.1s each finish together instead of one after another
+        assert asyncio.get_running_loop().time() - started < 1.0
+
+
+class TestExecutionCancellation:
+    """Test cases for cancelling the polls of an execution."""
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_running_polls(self):
+        execution_id = str(uuid.uuid4())
+        fetch = AsyncMock(return_value="RUNNING")
+        poll = asyncio.create_task(
+            poll_until(fetch, lambda state: False, timeout=5, policy=FAST, execution_id=execution_id)
+        )
+        await asyncio.sleep(0.03)
+        assert poll_registry.active_count(execution_id) == 1
+
+        assert cancel_execution_polls(execution_id) == 1
+
+        with pytest.raises(PollCancelledError):
+            await poll
+        assert poll_registry.active_count(execution_id) == 0
+
+    @pytest.mark.asyncio
+    async def test_polls_after_cancel_fail_immediately(self):
+        execution_id = str(uuid.uuid4())
+        cancel_execution_polls(execution_id)
+        fetch = AsyncMock(return_value="SUCCEEDED")
+
+        with pytest.raises(PollCancelledError):
+            await poll_until(fetch, lambda state: True, timeout=5, policy=FAST, execution_id=execution_id)
+        fetch.assert_not_called()
+
+    def test_run_polling_uses_bound_execution(self):
+        execution_id = str(uuid.uuid4())
+        bind_polling_execution(execution_id)
+        try:
+            cancel_execution_polls(execution_id)
+            fetch = AsyncMock(return_value="SUCCEEDED")
+
+            with pytest.raises(PollCancelledError):
+                run_polling(poll_until(fetch, lambda state: True, timeout=5, policy=FAST), timeout=5)
+        finally:
+            bind_polling_execution(None)
+
+    def test_run_polling_without_execution(self):
+        fetch = AsyncMock(side_effect=["RUNNING", "SUCCEEDED"])
+
+        result = run_polling(poll_until(fetch, lambda state: state == "SUCCEEDED", timeout=5, policy=FAST), timeout=5)
+
+        assert result == "SUCCEEDED"
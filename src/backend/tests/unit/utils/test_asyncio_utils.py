@@ -4,11 +4,14 @@ Unit tests for asyncio_utils module.
 
 import pytest
 import asyncio
+import concurrent.futures
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.utils.asyncio_utils import (
+    LoopEngineRegistry,
     execute_db_operation_with_fresh_engine,
+    execute_db_operation_with_loop_engine,
     create_and_run_loop,
     create_task_lifecycle_callback,
     run_in_thread_with_loop
@@ -84,6 +87,140 @@ class TestExecuteDbOperationWithFreshEngine:
                 mock_engine.dispose.assert_called_once()
 
 
+class TestLoopEngineRegistry:
+    """Test the per event loop engine registry."""
+    
+    @pytest.fixture
+    def mock_engines(self):
+        def _engine(*args, **kwargs):
+            engine = MagicMock()
+            engine.dispose = AsyncMock()
+            return engine
+        
+        with patch('src.utils.asyncio_utils.create_async_engine', side_effect=_engine) as mock_create:
+            yield mock_create
+    
+    @pytest.mark.asyncio
+    async def test_engine_reused_on_same_loop(self, mock_engines):
+        """Test that one loop gets one engine."""
+        registry = LoopEngineRegistry()
+        
+        first = registry.session_factory()
+        second = registry.session_factory()
+        
+        assert first is second
+        mock_engines.assert_called_once()
+        assert registry.engine_count() == 1
+    
+    def test_each_loop_gets_its_own_engine(self, mock_engines):
+        """Test that engines are not shared between loops and closed loops are pruned."""
+        registry = LoopEngineRegistry()
+        
+        async def _factory():
+            return registry.session_factory()
+        
+        first_loop = asyncio.new_event_loop()
+        first = first_loop.run_until_complete(_factory())
+        first_loop.close()
+        second_loop = asyncio.new_event_loop()
+        second = second_loop.run_until_complete(_factory())
+        second_loop.close()
+        
+        assert first is not second
+        assert mock_engines.call_count == 2
+        # Both loops are closed now, their engines are released
+        assert registry.engine_count() == 0
+    
+    @pytest.mark.asyncio
+    async def test_dispose_running_loop_engine(self, mock_engines):
+        """Test disposing the engine of the running loop."""
+        registry = LoopEngineRegistry()
+        registry.session_factory()
+        engine = registry._engines[id(asyncio.get_running_loop())][1]
+        
+        await registry.dispose()
+        
+        engine.dispose.assert_awaited_once()
+        assert registry.engine_count() == 0
+    
+    @pytest.mark.asyncio
+    async def test_execute_db_operation_with_loop_engine(self):
+        """Test running an operation on the loop engine session."""
+        mock_session = AsyncMock(spec=AsyncSession)
+        mock_session_context = AsyncMock()
+        mock_session_context.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session_context.__aexit__ = AsyncMock(return_value=None)
+        
+        async def mock_operation(session):
+            assert session is mock_session
+            return "test_result"
+        
+        with patch('src.utils.asyncio_utils.loop_engine_registry') as mock_registry:
+            mock_registry.session_factory.return_value = Mock(return_value=mock_session_context)
+            
+            result = await execute_db_operation_with_loop_engine(mock_operation)
+        
+        assert result == "test_result"
+
+
+class TestLoopEngineDisposal:
+    """Test that closing a throwaway loop closes its pooled connections."""
+    
+    @pytest.fixture
+    def closed_connections(self, tmp_path):
+        from sqlalchemy import event
+        from sqlalchemy.ext.asyncio import create_async_engine as real_create_async_engine
+        
+        closed = []
+        
+        def _engine(*args, **kwargs):
+            engine = real_create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", pool_size=2)
+            event.listen(engine.sync_engine.pool, "close", lambda dbapi_connection, record: closed.append(dbapi_connection))
+            return engine
+        
+        with patch('src.utils.asyncio_utils.create_async_engine', side_effect=_engine):
+            yield closed
+    
+    @staticmethod
+    async def _query(session):
+        from sqlalchemy import text
+        return (await session.execute(text("SELECT 1"))).scalar()
+    
+    def test_task_lifecycle_callback_closes_loop_connections(self, closed_connections):
+        """Test the lifecycle callback closes the connections its loop opened."""
+        from src.utils.asyncio_utils import loop_engine_registry
+        results = []
+        
+        class StatusCallback:
+            async def on_task_start(self, task_obj):
+                results.append(await execute_db_operation_with_loop_engine(TestLoopEngineDisposal._query))
+        
+        callback_fn = create_task_lifecycle_callback('on_task_start', [StatusCallback()], 'test_task')
+        with patch('src.utils.asyncio_utils.logger') as mock_logger:
+            callback_fn(Mock())
+            
+            assert results == [1]
+            assert len(closed_connections) == 1
+            assert loop_engine_registry.engine_count() == 0
+            mock_logger.warning.assert_not_called()
+    
+    def test_run_in_thread_with_loop_closes_loop_connections(self, closed_connections):
+        """Test run_in_thread_with_loop closes the connections of the loop it created."""
+        from src.utils.asyncio_utils import loop_engine_registry
+        
+        def query():
+            loop = asyncio.get_event_loop()
+            return loop.run_until_complete(execute_db_operation_with_loop_engine(self._query))
+        
+        # A worker thread has no event loop, so run_in_thread_with_loop creates one
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(run_in_thread_with_loop, query).result()
+        
+        assert result == 1
+        assert len(closed_connections) == 1
+        assert loop_engine_registry.engine_count() == 0
+
+
 class TestCreateAndRunLoop:
     """Test create_and_run_loop function."""
     
@@ -0,0 +1,110 @@
+"""
+Unit tests for the background event loop.
+
+Tests that coroutines submitted from synchronous code run on one long-lived
+loop and that its pooled resources are reused.
+"""
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.utils.background_loop import BackgroundEventLoop
+
+
+@pytest.fixture
+def background_loop():
+    loop = BackgroundEventLoop("test-background-loop")
+    yield loop
+    loop.shutdown()
+
+
+class TestBackgroundEventLoop:
+    """Test cases for BackgroundEventLoop."""
+
+    def test_run_returns_result_on_loop_thread(self, background_loop):
+        async def _work():
+            await asyncio.sleep(0)
+            return threading.current_thread().name
+
+        assert background_loop.run(_work()) == "test-background-loop"
+
+    def test_calls_share_one_loop(self, background_loop):
+        async def _current_loop():
+            return asyncio.get_running_loop()
+
+        first = background_loop.run(_current_loop())
+        second = background_loop.run(_current_loop())
+
+        assert first is second is background_loop.loop
+
+    def test_run_propagates_exceptions(self, background_loop):
+        async def _fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            background_loop.run(_fail())
+
+    def test_run_from_loop_thread_raises(self, background_loop):
+        async def _nested():
+            async def _inner():
+                return 1
+            return background_loop.run(_inner())
+
+        with pytest.raises(RuntimeError):
+            background_loop.run(_nested())
+
+    def test_run_timeout(self, background_loop):
+        async def _slow():
+            await asyncio.sleep(10)
+
+        with pytest.raises(Exception):
+            background_loop.run(_slow(), timeout=0.05)
+
+    def test_session_factory_is_reused(self, background_loop):
+        async def _factories():
+            return background_loop.session_factory(), background_loop.session_factory()
+
+        with patch('src.utils.asyncio_utils.create_async_engine', return_value=MagicMock()) as mock_create:
+            first, second = background_loop.run(_factories())
+
+        assert first is second
+        mock_create.assert_called_once()
+
+    def test_session_factory_outside_the_loop_is_rejected(self, background_loop):
+        with pytest.raises(RuntimeError):
+            background_loop.session_factory()
+
+    def test_shutdown_disposes_the_loop_engine(self, background_loop):
+        engine = MagicMock()
+        engine.dispose = AsyncMock()
+
+        async def _factory():
+            return background_loop.session_factory()
+
+        with patch('src.utils.asyncio_utils.create_async_engine', return_value=engine):
+            background_loop.run(_factory())
+        background_loop.shutdown()
+
+        engine.dispose.assert_awaited_once()
+
+    def test_owns_running_loop(self, background_loop):
+        async def _owns():
+            return background_loop.owns_running_loop()
+
+        assert background_loop.run(_owns()) is True
+        assert background_loop.owns_running_loop() is False
+
+    def test_shutdown_stops_thread(self, background_loop):
+        async def _noop():
+            return None
+
+        background_loop.run(_noop())
+        thread = background_loop._thread
+
+        background_loop.shutdown()
+
+        assert not thread.is_alive()
+        # The loop restarts on the next call
+        assert background_loop.run(_noop()) is None
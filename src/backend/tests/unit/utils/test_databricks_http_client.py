@@ -0,0 +1,109 @@
+"""
+Unit tests for the pooled Databricks HTTP client.
+
+Tests session reuse per workspace and event loop, auth token caching and the
+connection reuse metrics.
+"""
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.utils.databricks_http_client import DatabricksHttpClientPool, databricks_http_session
+
+
+@pytest_asyncio.fixture
+async def pool():
+    pool = DatabricksHttpClientPool()
+    yield pool
+    await pool.close()
+
+
+class TestDatabricksHttpClientPool:
+    """Test cases for DatabricksHttpClientPool."""
+
+    @pytest.mark.asyncio
+    async def test_session_reused_per_workspace(self, pool):
+        first = pool.get_session("https://a.databricks.com")
+        second = pool.get_session("https://a.databricks.com")
+        other = pool.get_session("https://b.databricks.com")
+
+        assert first is second
+        assert other is not first
+        assert pool.get_stats()["sessions_created"] == 2
+        assert pool.get_stats()["open_sessions"] == 2
+
+    @pytest.mark.asyncio
+    async def test_closed_session_is_replaced(self, pool):
+        first = pool.get_session("https://a.databricks.com")
+        await first.close()
+
+        assert pool.get_session("https://a.databricks.com") is not first
+
+    @pytest.mark.asyncio
+    async def test_close_closes_loop_sessions(self, pool):
+        session = pool.get_session("https://a.databricks.com")
+
+        await pool.close()
+
+        assert session.closed
+        assert pool.get_stats()["open_sessions"] == 0
+
+    @pytest.mark.asyncio
+    async def test_context_manager_keeps_session_open(self):
+        with patch('src.utils.databricks_http_client.databricks_http_pool', DatabricksHttpClientPool()) as test_pool:
+            async with databricks_http_session("https://a.databricks.com") as session:
+                pass
+
+            assert not session.closed
+            await test_pool.close()
+
+    @pytest.mark.asyncio
+    async def test_user_token_is_not_cached(self, pool):
+        resolve = AsyncMock(return_value="pat")
+
+        assert await pool.get_auth_token("https://a", "user-token", resolve) == "user-token"
+        resolve.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_auth_token_cached_until_refresh_margin(self, pool):
+        resolve = AsyncMock(side_effect=["pat-1", "pat-2"])
+
+        assert await pool.get_auth_token("https://a", None, resolve) == "pat-1"
+        assert await pool.get_auth_token("https://a", None, resolve) == "pat-1"
+
+        # Age the cached token into the refresh margin before the TTL expires
+        resolved_at, token = pool._tokens["https://a"]
+        pool._tokens["https://a"] = (resolved_at - 280.0, token)
+        assert await pool.get_auth_token("https://a", None, resolve) == "pat-2"
+
+        stats = pool.get_stats()
+        assert stats["auth_token_refreshes"] == 2
+        assert stats["auth_token_cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_auth_token_cache_disabled(self, pool):
+        resolve = AsyncMock(side_effect=["pat-1", "pat-2"])
+
+        with patch('src.utils.databricks_http_client.settings') as mock_settings:
+            mock_settings.DATABRICKS_AUTH_TOKEN_CACHE_TTL = 0
+            assert await pool.get_auth_token("https://a", None, resolve) == "pat-1"
+            assert await pool.get_auth_token("https://a", None, resolve) == "pat-2"
+
+    @pytest.mark.asyncio
+    async def test_unauthorized_response_invalidates_token(self, pool):
+        resolve = AsyncMock(side_effect=["pat-1", "pat-2"])
+        await pool.get_auth_token("https://a", None, resolve)
+
+        params = MagicMock()
+        params.response.status = 401
+        await pool._make_on_request_end("https://a")(None, None, params)
+
+        assert await pool.get_auth_token("https://a", None, resolve) == "pat-2"
+
+    @pytest.mark.asyncio
+    async def test_connection_reuse_ratio(self, pool):
+        await pool._on_connection_create_end(None, None, None)
+        for _ in range(3):
+            await pool._on_connection_reuseconn(None, None, None)
+
+        assert pool.get_stats()["connection_reuse_ratio"] == 0.75
@@ -9,8 +9,9 @@ import base64
 from pathlib import Path
 from unittest.mock import Mock, patch, mock_open
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import serialization
 
-from src.utils.encryption_utils import EncryptionUtils
+from src.utils.encryption_utils import EncryptionUtils, get_secret_cache_stats, invalidate_secret_cache
 
 
 class TestEncryptionUtils:
@@ -372,4 +373,64 @@ class TestEncryptionIntegration:
             with patch('src.utils.encryption_utils.EncryptionUtils.is_ssh_encrypted', return_value=False):
                 # Decrypt using main method
                 decrypted = EncryptionUtils.decrypt_value(encrypted)
-                assert decrypted == test_value
\ No newline at end of file
+                assert decrypted == test_value
+
+
+class TestSecretCache:
+    """Test caching of key material and decrypted values."""
+    
+    def test_decrypted_value_is_cached(self):
+        """Test that a value is decrypted once until the cache is invalidated."""
+        private_key, public_key = EncryptionUtils.generate_ssh_key_pair()
+        
+        with patch('src.utils.encryption_utils.EncryptionUtils.get_or_create_ssh_keys',
+                   return_value=(private_key, public_key)):
+            encrypted = EncryptionUtils.encrypt_value("secret")
+            with patch.object(EncryptionUtils, 'decrypt_with_ssh', wraps=EncryptionUtils.decrypt_with_ssh) as mock_decrypt:
+                assert EncryptionUtils.decrypt_value(encrypted) == "secret"
+                assert EncryptionUtils.decrypt_value(encrypted) == "secret"
+                assert mock_decrypt.call_count == 1
+                
+                invalidate_secret_cache()
+                assert EncryptionUtils.decrypt_value(encrypted) == "secret"
+                assert mock_decrypt.call_count == 2
+        
+        stats = get_secret_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["invalidations"] == 1
+    
+    def test_failed_decryption_is_not_cached(self):
+        """Test that failed decryptions are retried."""
+        with patch.object(EncryptionUtils, 'is_ssh_encrypted', return_value=True), \
+             patch.object(EncryptionUtils, 'decrypt_with_ssh', return_value="") as mock_decrypt:
+            assert EncryptionUtils.decrypt_value("value") == ""
+            assert EncryptionUtils.decrypt_value("value") == ""
+            
+            assert mock_decrypt.call_count == 2
+    
+    def test_cache_disabled(self):
+        """Test that a TTL of 0 decrypts on every call."""
+        with patch('src.utils.encryption_utils.settings') as mock_settings, \
+             patch.object(EncryptionUtils, 'is_ssh_encrypted', return_value=True), \
+             patch.object(EncryptionUtils, 'decrypt_with_ssh', return_value="secret") as mock_decrypt:
+            mock_settings.SECRET_CACHE_TTL = 0
+            EncryptionUtils.decrypt_value("value")
+            EncryptionUtils.decrypt_value("value")
+            
+            assert mock_decrypt.call_count == 2
+    
+    def test_key_material_is_parsed_once(self):
+        """Test that the private key is parsed once per process."""
+        private_key, public_key = EncryptionUtils.generate_ssh_key_pair()
+        
+        with patch('src.utils.encryption_utils.EncryptionUtils.get_or_create_ssh_keys',
+                   return_value=(private_key, public_key)):
+            first = EncryptionUtils.encrypt_with_ssh("a")
+            second = EncryptionUtils.encrypt_with_ssh("b")
+            with patch('src.utils.encryption_utils.serialization.load_pem_private_key',
+                       wraps=serialization.load_pem_private_key) as mock_load:
+                assert EncryptionUtils.decrypt_with_ssh(first) == "a"
+                assert EncryptionUtils.decrypt_with_ssh(second) == "b"
+                
+                assert mock_load.call_count == 1
+
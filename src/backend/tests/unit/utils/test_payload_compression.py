@@ -0,0 +1,119 @@
+"""
+Unit tests for payload_compression module.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.payload_compression import (
+    compress_payload,
+    decompress_payload,
+    load_payload_columns,
+    make_preview,
+    pack_payload_columns,
+)
+
+
+@pytest.fixture
+def compression_settings():
+    with patch("src.utils.payload_compression.settings") as settings:
+        settings.PAYLOAD_COMPRESSION_ENABLED = True
+        settings.PAYLOAD_COMPRESSION_MIN_BYTES = 100
+        settings.PAYLOAD_PREVIEW_CHARS = 20
+        yield settings
+
+
+class TestPackPayloadColumns:
+    """Test pack_payload_columns function."""
+
+    def test_large_value_is_compressed_with_a_preview(self, compression_settings):
+        output = "x" * 1000
+
+        row = pack_payload_columns({"job_id": "job-1", "output": output}, ("output",))
+
+        assert row["job_id"] == "job-1"
+        assert row["output"].startswith("x" * 20)
+        assert "[preview, 1002 bytes in total]" in row["output"]
+        assert len(row["payload"]) < 1000
+        assert decompress_payload(row["payload"]) == {"output": output}
+
+    def test_small_values_stay_inline(self, compression_settings):
+        row = pack_payload_columns({"output": "short", "trace_metadata": {"a": 1}}, ("output", "trace_metadata"))
+
+        assert row == {"output": "short", "trace_metadata": {"a": 1}, "payload": None}
+
+    def test_only_large_columns_are_compressed(self, compression_settings):
+        metadata = {"agent_role": "Researcher", "raw": "y" * 500}
+
+        row = pack_payload_columns({"output": "short", "trace_metadata": metadata}, ("output", "trace_metadata"))
+
+        assert row["output"] == "short"
+        assert row["trace_metadata"]["agent_role"] == "Researcher"
+        assert row["trace_metadata"]["raw"] == "y" * 20 + " ..."
+        assert decompress_payload(row["payload"]) == {"trace_metadata": metadata}
+
+    def test_disabled_compression_clears_the_payload(self, compression_settings):
+        compression_settings.PAYLOAD_COMPRESSION_ENABLED = False
+
+        row = pack_payload_columns({"result": "x" * 1000}, ("result",))
+
+        assert row == {"result": "x" * 1000, "payload": None}
+
+    def test_values_without_payload_columns_are_unchanged(self, compression_settings):
+        values = {"status": "completed"}
+
+        assert pack_payload_columns(values, ("result",)) is values
+
+
+class TestMakePreview:
+    """Test make_preview function."""
+
+    def test_short_string_is_kept(self, compression_settings):
+        assert make_preview("short", 5) == "short"
+
+    def test_list_is_previewed_as_json(self, compression_settings):
+        preview = make_preview(list(range(100)), 290)
+
+        assert preview.startswith("[0, 1, 2")
+        assert "[preview, 290 bytes in total]" in preview
+
+
+class TestDecompressPayload:
+    """Test decompress_payload function."""
+
+    def test_zlib_payload(self):
+        with patch("src.utils.payload_compression.zstandard", None):
+            blob = compress_payload(b'{"result": {"content": "done"}}')
+
+        assert blob.startswith(b"zlib:")
+        assert decompress_payload(blob) == {"result": {"content": "done"}}
+
+    def test_unknown_codec(self):
+        with pytest.raises(ValueError):
+            decompress_payload(b"lz4:data")
+
+
+class TestLoadPayloadColumns:
+    """Test load_payload_columns function."""
+
+    def test_full_values_replace_the_previews(self, compression_settings):
+        class Row:
+            pass
+
+        row = Row()
+        row.__dict__.update(pack_payload_columns({"result": "x" * 1000}, ("result",)))
+
+        with patch("src.utils.payload_compression.set_committed_value", side_effect=setattr):
+            assert load_payload_columns(row) is row
+
+        assert row.result == "x" * 1000
+
+    def test_objects_without_payload_are_unchanged(self):
+        class Row:
+            result = "preview"
+
+        row = Row()
+
+        assert load_payload_columns(row) is row
+        assert load_payload_columns(None) is None
@@ -0,0 +1,119 @@
+"""
+Unit tests for streaming_json module.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.streaming_json import IncrementalJSONParser, completion_chunk_text
+
+
+CREW = {
+    "agents": [
+        {"name": "Researcher", "role": "Finds {facts}, [sources]", "tools": ["SerperDevTool"]},
+        {"name": "Writer", "role": "Writes \"reports\"", "advanced_config": {"max_iter": [1, 2]}},
+    ],
+    "tasks": [
+        {"name": "research", "agent": "Researcher", "context": []},
+        {"name": "write", "agent": "Writer", "context": ["research"]},
+    ],
+}
+
+
+def _feed_in_chunks(parser, text, size):
+    events = []
+    for start in range(0, len(text), size):
+        events.extend(parser.feed(text[start:start + size]))
+    return events
+
+
+class TestIncrementalJSONParser:
+    """Test IncrementalJSONParser class."""
+
+    @pytest.mark.parametrize("size", [1, 3, 17, 10000])
+    def test_array_items_are_reported_as_they_close(self, size):
+        text = "Here is the crew:\n```json\n" + json.dumps(CREW, indent=2) + "\n```"
+        parser = IncrementalJSONParser(item_keys=("agents", "tasks"))
+
+        events = _feed_in_chunks(parser, text, size)
+
+        assert [(event.key, event.index, event.value) for event in events] == [
+            ("agents", 0, CREW["agents"][0]),
+            ("agents", 1, CREW["agents"][1]),
+            ("tasks", 0, CREW["tasks"][0]),
+            ("tasks", 1, CREW["tasks"][1]),
+        ]
+        assert parser.done
+        assert parser.close() == CREW
+
+    def test_item_is_reported_by_the_chunk_that_closes_it(self):
+        parser = IncrementalJSONParser(item_keys=("agents",))
+
+        assert parser.feed('{"agents": [{"name": "Researcher"') == []
+        [event] = parser.feed('}, {"name": ')
+
+        assert event.value == {"name": "Researcher"}
+
+    def test_nested_arrays_with_the_same_key_are_not_reported(self):
+        parser = IncrementalJSONParser(item_keys=("tasks",))
+
+        events = parser.feed('{"agents": [{"tasks": [{"name": "nested"}]}], "tasks": [{"name": "top"}]}')
+
+        assert [event.value for event in events] == [{"name": "top"}]
+
+    def test_top_level_fields_are_reported(self):
+        agent = {"name": "Analyst", "role": "Data, analysis", "advanced_config": {"llm": "m", "max_iter": 25},
+                 "tools": [], "verbose": False, "max_rpm": 10}
+        parser = IncrementalJSONParser(emit_fields=True)
+
+        events = _feed_in_chunks(parser, json.dumps(agent), 2)
+
+        assert {event.key: event.value for event in events} == agent
+        assert [event.key for event in events] == list(agent)
+
+    def test_text_after_the_document_is_ignored(self):
+        parser = IncrementalJSONParser()
+        parser.feed('{"name": "a"}\n```\nLet me know if you need { more')
+
+        assert parser.close() == {"name": "a"}
+
+    def test_trailing_commas_are_repaired_on_close(self):
+        parser = IncrementalJSONParser(item_keys=("agents",))
+
+        events = parser.feed('{"agents": [{"name": "a",}, {"name": "b"},]}')
+
+        # The broken element is skipped while streaming but kept in the result
+        assert [event.value for event in events] == [{"name": "b"}]
+        assert parser.close() == {"agents": [{"name": "a"}, {"name": "b"}]}
+
+    def test_truncated_document_is_closed(self):
+        parser = IncrementalJSONParser(item_keys=("agents",))
+        parser.feed('{"agents": [{"name": "a"}, {"name": "trunc')
+
+        assert not parser.done
+        assert parser.close() == {"agents": [{"name": "a"}, {"name": "trunc"}]}
+
+    def test_text_without_json_raises(self):
+        parser = IncrementalJSONParser()
+        parser.feed("I cannot help with that.")
+
+        with pytest.raises(ValueError):
+            parser.close()
+
+
+class TestCompletionChunkText:
+    """Test completion_chunk_text function."""
+
+    def test_object_chunk(self):
+        chunk = SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="abc"))])
+
+        assert completion_chunk_text(chunk) == "abc"
+
+    def test_dict_chunk(self):
+        assert completion_chunk_text({"choices": [{"delta": {"content": "abc"}}]}) == "abc"
+
+    def test_chunk_without_content(self):
+        assert completion_chunk_text(SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=None))])) == ""
+        assert completion_chunk_text({"choices": []}) == ""
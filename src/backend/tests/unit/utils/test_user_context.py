@@ -16,7 +16,8 @@ from src.utils.user_context import (
     GroupContext, UserContext, 
     extract_user_token_from_request, extract_group_context_from_request, 
     extract_user_context_from_request, user_context_middleware,
-    is_databricks_app_context, _is_databricks_apps_enabled
+    is_databricks_app_context, _is_databricks_apps_enabled,
+    invalidate_group_membership_cache, invalidate_apps_enabled_cache
 )
 
 
@@ -685,6 +686,81 @@ class TestIsDatabricksAppsEnabled:
         assert result is False
 
 
+class TestRequestContextCaching:
+    """Test cases for the group membership and apps-enabled caches."""
+    
+    def teardown_method(self):
+        invalidate_group_membership_cache()
+        invalidate_apps_enabled_cache()
+    
+    @pytest.mark.asyncio
+    @patch('src.db.session.async_session_factory')
+    async def test_group_memberships_are_cached(self, mock_session_factory):
+        """Test that repeated lookups for the same email hit the cache."""
+        mock_session_factory.return_value.__aenter__.return_value = AsyncMock()
+        mock_session_factory.return_value.__aexit__.return_value = None
+        
+        with patch('src.services.group_service.GroupService') as mock_service_class:
+            mock_service = AsyncMock()
+            mock_service.get_user_group_memberships.return_value = [MagicMock(id="group-1")]
+            mock_service_class.return_value = mock_service
+            
+            first = await GroupContext._get_user_group_memberships("user@test.com")
+            second = await GroupContext._get_user_group_memberships("User@Test.com")
+            
+            assert first == second == ["group-1"]
+            mock_service.get_user_group_memberships.assert_called_once()
+            
+            # Membership changes invalidate the cached entry
+            invalidate_group_membership_cache("user@test.com")
+            await GroupContext._get_user_group_memberships("user@test.com")
+            assert mock_service.get_user_group_memberships.call_count == 2
+    
+    @pytest.mark.asyncio
+    @patch('src.db.session.async_session_factory')
+    async def test_failed_group_lookup_is_not_cached(self, mock_session_factory):
+        """Test that lookup errors are retried on the next request."""
+        mock_session_factory.side_effect = Exception("Connection error")
+        
+        assert await GroupContext._get_user_group_memberships("user@test.com") == []
+        assert await GroupContext._get_user_group_memberships("user@test.com") == []
+        assert mock_session_factory.call_count == 2
+    
+    @pytest.mark.asyncio
+    @patch('src.core.unit_of_work.UnitOfWork')
+    @patch('src.services.databricks_service.DatabricksService')
+    async def test_apps_enabled_flag_is_cached(self, mock_service_class, mock_uow_class):
+        """Test that the apps-enabled flag is read once until invalidated."""
+        mock_uow_class.return_value.__aenter__.return_value = AsyncMock()
+        mock_uow_class.return_value.__aexit__.return_value = None
+        mock_service = AsyncMock()
+        mock_service_class.from_unit_of_work = AsyncMock(return_value=mock_service)
+        mock_service.get_databricks_config.return_value = MagicMock(apps_enabled=True)
+        
+        assert await _is_databricks_apps_enabled() is True
+        assert await _is_databricks_apps_enabled() is True
+        mock_service.get_databricks_config.assert_called_once()
+        
+        invalidate_apps_enabled_cache()
+        mock_service.get_databricks_config.return_value = MagicMock(apps_enabled=False)
+        assert await _is_databricks_apps_enabled() is False
+    
+    @pytest.mark.asyncio
+    @patch('src.utils.user_context._is_databricks_apps_enabled')
+    @patch('src.utils.user_context.extract_group_context_from_request')
+    async def test_middleware_skips_allowlisted_paths(self, mock_extract_group_context, mock_is_apps_enabled):
+        """Test that static assets and health checks skip context resolution."""
+        mock_request = MagicMock(spec=Request)
+        mock_request.url.path = "/static/js/main.js"
+        mock_call_next = AsyncMock(return_value="response")
+        
+        result = await user_context_middleware(mock_request, mock_call_next)
+        
+        assert result == "response"
+        mock_is_apps_enabled.assert_not_called()
+        mock_extract_group_context.assert_not_called()
+
+
 class TestIsDatabricksAppContext:
     """Test cases for is_databricks_app_context function."""
     
@@ -0,0 +1,97 @@
+"""
+Unit tests for VectorIndex.
+
+Tests cosine top-k search against a brute-force reference and incremental
+insert, update and delete handling.
+"""
+import math
+import random
+
+import pytest
+
+from src.utils.vector_index import VectorIndex
+
+
+def _cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def _brute_force(rows, query, k):
+    scored = [(row_id, _cosine(vector, query)) for row_id, vector in rows.items()]
+    scored = [item for item in scored if item[1] > 0]
+    scored.sort(key=lambda item: -item[1])
+    return [row_id for row_id, _ in scored[:k]]
+
+
+@pytest.fixture
+def rows():
+    rng = random.Random(42)
+    return {i: [rng.uniform(-1, 1) for _ in range(16)] for i in range(1, 301)}
+
+
+class TestVectorIndex:
+    """Test cases for VectorIndex."""
+
+    def test_search_matches_brute_force(self, rows):
+        index = VectorIndex()
+        index.rebuild(rows.items())
+        query = rows[7]
+
+        result = index.search(query, 5)
+
+        assert [row_id for row_id, _ in result] == _brute_force(rows, query, 5)
+        assert result[0][0] == 7
+        assert result[0][1] == pytest.approx(1.0, abs=1e-5)
+
+    def test_search_batch(self, rows):
+        index = VectorIndex()
+        index.rebuild(rows.items())
+
+        results = index.search_batch([rows[1], rows[2]], 3)
+
+        assert [r[0][0] for r in results] == [1, 2]
+        assert all(len(r) == 3 for r in results)
+
+    def test_only_positive_similarity_is_returned(self):
+        index = VectorIndex()
+        index.rebuild([(1, [1.0, 0.0]), (2, [-1.0, 0.0]), (3, [0.0, 0.0])])
+
+        assert [row_id for row_id, _ in index.search([1.0, 0.0], 10)] == [1]
+
+    def test_upsert_and_remove(self, rows):
+        index = VectorIndex()
+        index.rebuild(rows.items())
+
+        index.remove([7])
+        del rows[7]
+        rows[1000] = [1.0] * 16
+        index.upsert([(1000, rows[1000])])
+        rows[8] = [-1.0] * 16
+        index.upsert([(8, rows[8])])
+
+        assert len(index) == len(rows)
+        assert index.ids() == set(rows)
+        query = [1.0] * 16
+        assert [row_id for row_id, _ in index.search(query, 5)] == _brute_force(rows, query, 5)
+
+    def test_grows_past_initial_capacity(self):
+        last = VectorIndex._INITIAL_CAPACITY * 3
+        index = VectorIndex()
+        index.upsert((i, [0.0, 1.0]) for i in range(1, last))
+        index.upsert([(last, [1.0, 0.0])])
+
+        assert len(index) == last
+        assert index.search([1.0, 0.0], 1)[0][0] == last
+        assert index.search([0.0, 1.0], 1)[0][0] != last
+
+    def test_mismatched_dimensions_are_ignored(self):
+        index = VectorIndex()
+        index.rebuild([(1, [1.0, 0.0]), (2, [1.0, 0.0, 0.0])])
+
+        assert index.ids() == {1}
+        assert index.search([1.0, 0.0, 0.0], 5) == []
+
+    def test_empty_index(self):
+        assert VectorIndex().search([1.0, 0.0], 5) == []